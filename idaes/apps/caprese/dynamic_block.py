@@ -17,6 +17,8 @@ by time.
 
 from collections import OrderedDict
 
+import numpy as np
+
 import idaes.logger as idaeslog
 from idaes.apps.caprese.util import initialize_by_element_in_range
 from idaes.apps.caprese.common.config import (
@@ -57,6 +59,9 @@ from pyomo.core.base.range import remainder
 from pyomo.dae.set_utils import deactivate_model_at
 from pyomo.dae.flatten import flatten_dae_components
 
+# Marks a data object with no value in a suffix
+_missing = object()
+
 class _DynamicBlockData(_BlockData):
     """ This class adds methods and data structures that are useful
     for working with dynamic models. These include methods for
@@ -138,6 +143,11 @@ class _DynamicBlockData(_BlockData):
         self.sample_points = [time.first(), time.last()]
         self.sample_point_indices = [1, len(time)]
 
+        # Caches for shifting values in time. See `get_time_shift_map`
+        # and `get_vardata_array`.
+        self._time_shift_maps = {}
+        self._vardata_arrays = {}
+
     _var_name = 'var'
     _block_suffix = '_BLOCK'
     _set_suffix = '_SET'
@@ -496,6 +506,59 @@ class _DynamicBlockData(_BlockData):
         for var, val in zip(self.measurement_vars, measured):
             var[t0].fix(val)
 
+    def get_time_shift_map(self, t_shift, tolerance=1e-8):
+        """ Get the positions in the time set of the points whose values
+        are updated when shifting by `t_shift`, and the positions of the
+        points their values are taken from. Points whose shifted time
+        is outside the horizon are not included.
+
+        The map is computed once for each shift and tolerance, so the
+        repeated calls made in a rolling horizon do not call
+        `find_nearest_index` for every time point.
+
+        Returns:
+            Two arrays of zero-based positions in the time set:
+            destination and source.
+        """
+        time = self.time
+        key = (t_shift, tolerance, len(time))
+        shift_map = self._time_shift_maps.get(key, None)
+        if shift_map is None:
+            dest = []
+            src = []
+            for i, t in enumerate(time):
+                idx = time.find_nearest_index(t + t_shift, tolerance)
+                if idx is None:
+                    # t + t_shift is outside the model's "horizon"
+                    continue
+                dest.append(i)
+                # find_nearest_index returns a one-based index
+                src.append(idx - 1)
+            shift_map = (np.array(dest, dtype=int), np.array(src, dtype=int))
+            self._time_shift_maps[key] = shift_map
+        return shift_map
+
+    def get_vardata_array(self, ctype):
+        """ Get a two-dimensional object array of the data objects of
+        the variables of the specified ctypes (one row per variable,
+        one column per time point). The array is built on the first
+        call for each combination of ctypes, and rebuilt if points are
+        added to time or variables of those ctypes are added.
+        """
+        if type(ctype) is not tuple:
+            ctype = (ctype,)
+        time = self.time
+        variables = list(self.component_objects(ctype))
+        shape = (len(variables), len(time))
+        array = self._vardata_arrays.get(ctype, None)
+        if array is None or array.shape != shape:
+            array = np.empty(shape, dtype=object)
+            for i, var in enumerate(variables):
+                for j, t in enumerate(time):
+                    array[i, j] = var[t]
+            self._vardata_arrays[ctype] = array
+        return array
+
     def advance_by_time(self,
             t_shift,
             ctype=(DiffVar, DerivVar, AlgVar, InputVar, FixedVar),
@@ -506,20 +569,14 @@ class _DynamicBlockData(_BlockData):
         """ Set values for the variables of the specified ctypes
         to their values `t_shift` in the future.
         """
-        time = self.time
-        # The outer loop is over time so we don't have to call
-        # `find_nearest_index` for every variable.
-        # I am assuming that `find_nearest_index` is slower than
-        # accessing `component_objects`
-        for t in time:
-            ts = t + t_shift
-            idx = time.find_nearest_index(ts, tolerance)
-            if idx is None:
-                # t + sample_time is outside the model's "horizon"
-                continue
-            ts = time[idx]
-            for var in self.component_objects(ctype):
-                var[t].set_value(var[ts].value)
+        dest, src = self.get_time_shift_map(t_shift, tolerance)
+        vardata = self.get_vardata_array(ctype)
+        # Gather all the source values before setting any, then scatter.
+        # Values come from the same variable, so they do not need to be
+        # validated against its domain again.
+        values = [v.value for v in vardata[:, src].flat]
+        for v, val in zip(vardata[:, dest].flat, values):
+            v.set_value(val, True)
 
     def advance_one_sample(self,
             ctype=(DiffVar, DerivVar, AlgVar, InputVar, FixedVar),
@@ -624,25 +681,18 @@ class _DynamicBlockData(_BlockData):
         """ Set the values of bound multipliers to the corresponding
         values a time `t_shift` in the future.
         """
-        zL = self.ipopt_zL_in
-        zU = self.ipopt_zU_in
-        time = self.time
-        # The outer loop is over time so we don't have to call
-        # `find_nearest_index` for every variable.
-        # I am assuming that `find_nearest_index` is slower than
-        # accessing `component_objects`
-        for t in time:
-            ts = t + t_shift
-            idx = time.find_nearest_index(ts, tolerance)
-            if idx is None:
-                # t + sample_time is outside the model's "horizon"
-                continue
-            ts = time[idx]
-            for var in self.component_objects(ctype):
-                if var[t] in zL and var[ts] in zL:
-                    zL[var[t]] = zL[var[ts]]
-                if var[t] in zU and var[ts] in zU:
-                    zU[var[t]] = zU[var[ts]]
+        dest, src = self.get_time_shift_map(t_shift, tolerance)
+        vardata = self.get_vardata_array(ctype)
+        dest_data = vardata[:, dest].ravel()
+        src_data = vardata[:, src].ravel()
+        for suffix in (self.ipopt_zL_in, self.ipopt_zU_in):
+            # A multiplier is only shifted if both data objects have
+            # values in the suffix.
+            values = [suffix[v] if v in suffix else _missing
+                    for v in src_data]
+            for v, val in zip(dest_data, values):
+                if val is not _missing and v in suffix:
+                    suffix[v] = val
 
     def advance_ipopt_multipliers_one_sample(self,
             ctype=(
@@ -917,6 +917,73 @@ class TestDynamicBlock(object):
                 for v in blk.component_objects(ctypes_to_not_shift):
                     assert v[t].value == t
 
+    @pytest.mark.unit
+    def test_get_time_shift_map(self):
+        blk = self.make_block()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+
+        shift = (tl - t0)/2
+        dest, src = blk.get_time_shift_map(shift)
+        assert len(dest) == len(src)
+        for i, j in zip(dest, src):
+            assert time[i+1] + shift == pytest.approx(time[j+1])
+        assert [time[i+1] for i in dest] == [t for t in time if t <= shift]
+
+        # The map is only computed once for each shift
+        assert blk.get_time_shift_map(shift) is blk.get_time_shift_map(shift)
+        assert blk.get_time_shift_map(shift) is not \
+                blk.get_time_shift_map(tl - t0)
+
+        vardata = blk.get_vardata_array(DiffVar)
+        assert vardata is blk.get_vardata_array((DiffVar,))
+        assert vardata.shape == (len(list(blk.component_objects(DiffVar))),
+                len(time))
+        for row, var in zip(vardata, blk.component_objects(DiffVar)):
+            assert list(row) == [var[t] for t in time]
+
+        # The array is rebuilt when variables of the ctype are added
+        blk.extra_diffvar = DiffVar(time)
+        vardata = blk.get_vardata_array(DiffVar)
+        assert vardata.shape == (len(list(blk.component_objects(DiffVar))),
+                len(time))
+        for row, var in zip(vardata, blk.component_objects(DiffVar)):
+            assert list(row) == [var[t] for t in time]
+        assert any(row[0] is blk.extra_diffvar[t0] for row in vardata)
+
+    @pytest.mark.unit
+    def test_advance_ipopt_multipliers(self):
+        blk = self.make_block()
+        blk.add_ipopt_suffixes()
+        time = blk.time
+        t0 = time.first()
+        tl = time.last()
+        ctypes = (DiffVar, AlgVar, InputVar)
+
+        for v in blk.component_objects(ctypes):
+            for t in time:
+                blk.ipopt_zL_in[v[t]] = t
+                if t != tl:
+                    # Multipliers not present at the end of the horizon
+                    # should not be shifted
+                    blk.ipopt_zU_in[v[t]] = -t
+
+        shift = (tl - t0)/2
+        blk.advance_ipopt_multipliers(shift)
+        for v in blk.component_objects(ctypes):
+            for t in time:
+                if t <= shift:
+                    assert blk.ipopt_zL_in[v[t]] == t + shift
+                else:
+                    assert blk.ipopt_zL_in[v[t]] == t
+                if t == tl:
+                    assert v[t] not in blk.ipopt_zU_in
+                elif t + shift < tl:
+                    assert blk.ipopt_zU_in[v[t]] == -(t + shift)
+                else:
+                    assert blk.ipopt_zU_in[v[t]] == -t
+
     @pytest.mark.unit
     def test_generate_time_in_sample(self):
         blk = self.make_block()
@@ -16,15 +16,18 @@ Tests for Caprese helper utility functions.
 import pytest
 from pytest import approx
 
-from pyomo.environ import SolverFactory, Var, value, Reference
+from pyomo.environ import (SolverFactory, Var, value, Reference,
+        ConcreteModel, Constraint, TransformationFactory, TerminationCondition)
 from pyomo.common.collections import ComponentSet, ComponentMap
 from pyomo.core.expr.visitor import identify_variables
+from pyomo.dae import ContinuousSet, DerivativeVar
 from pyomo.dae.flatten import flatten_dae_components
 
 from idaes.core.util.model_statistics import (
         degrees_of_freedom, 
         activated_equalities_generator,
         )
+from idaes.core.util.testing import NewtonTestSolver
 from idaes.apps.caprese.util import *
 from idaes.apps.caprese.common.config import NoiseBoundOption
 from idaes.apps.caprese.examples.cstr_model import make_model
@@ -87,6 +90,49 @@ def test_initialize_by_element_in_range():
     assert mod.fs.cstr.outlet.conc_mol[2, 'P'].value == approx(0.4372, abs=1e-4)
 
 
+@pytest.mark.unit
+@pytest.mark.parametrize("linking", [False, True])
+def test_initialize_by_element_in_range_subproblems(linking):
+    m = ConcreteModel()
+    m.time = ContinuousSet(bounds=(0, 2))
+    m.x = Var(m.time, initialize=1.0)
+    m.y = Var(m.time, initialize=1.0)
+    m.dxdt = DerivativeVar(m.x, wrt=m.time, initialize=0.0)
+    m.ode = Constraint(m.time, rule=lambda m, t: m.dxdt[t] == -m.y[t])
+    m.alg = Constraint(m.time, rule=lambda m, t: m.y[t] == m.x[t]**2)
+    TransformationFactory("dae.collocation").apply_to(
+        m, wrt=m.time, nfe=4, ncp=2, scheme="LAGRANGE-RADAU")
+    m.x[0].fix(1.0)
+    m.dxdt[0].fix(-1.0)
+    m.ode[0].deactivate()
+    m.y[0].fix(1.0)
+    m.alg[0].deactivate()
+
+    scalar_vars, dae_vars = flatten_dae_components(m, m.time, Var)
+    solver = NewtonTestSolver()
+    stats = initialize_by_element_in_range(
+        m, m.time, 0, 1.5, solver=solver, dae_vars=dae_vars,
+        time_linking_vars=[m.x] if linking else [],
+        warm_start="extrapolate")
+
+    assert [n for n, _ in solver.calls] == [6, 6, 6]
+    assert [s["element"] for s in stats] == [1, 2, 3]
+    assert all(s["termination_condition"] == TerminationCondition.optimal
+               for s in stats)
+    for t in m.time:
+        if t <= 1.5:
+            assert m.x[t].value == approx(1/(1 + t), rel=1e-2)
+        else:
+            assert m.x[t].value == 1.0
+    assert all(c.active for t in m.time if t != 0
+               for c in (m.ode[t], m.alg[t]))
+    assert not any(m.x[t].fixed for t in m.time if t != 0)
+
+    with pytest.raises(ValueError):
+        initialize_by_element_in_range(m, m.time, 0, 0.5, solver=solver,
+                                       dae_vars=dae_vars, warm_start="linear")
+
+
 @pytest.mark.unit
 def test_get_violated_bounds():
     bounds = (1., 2.)
@@ -15,8 +15,13 @@
 A module of helper functions for working with flattened DAE models.
 """
 
+import time as wall_clock
+
+import numpy as np
+
 from pyomo.environ import (
         Constraint,
+        Objective,
         Var,
         TerminationCondition,
         SolverFactory,
@@ -35,6 +40,10 @@ from idaes.core.util.dyn_utils import (
         get_implicit_index_of_set,
         get_fixed_dict, 
         deactivate_constraints_unindexed_by, 
+        get_suffix_block,
+        get_subproblem_block,
+        extrapolate_values_at_time,
+        get_warm_start_order,
         )
 from idaes.apps.caprese.common.config import NoiseBoundOption
 import idaes.logger as idaeslog
@@ -89,6 +98,10 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
     """Function for solving a square model, time element-by-time element,
     between specified start and end times.
 
+    The components to activate for each finite element are found once,
+    before any element is solved, and each element is solved as a
+    subproblem which refers only to these components.
+
     Args:
         model : Flowsheet model to solve
         t_start : Beginning of timespan over which to solve
@@ -97,12 +110,26 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
     Kwargs:
         solver : Solver option used to solve portions of the square model
         outlvl : idaes.logger output level
+        warm_start : 'constant' (default) to initialize variables in each
+                     finite element with their values at the initial time
+                     point of the element, or 'extrapolate' to extrapolate
+                     linearly from the last two time points of the previous
+                     element
+
+    Returns:
+        A list with a dict of statistics for the solve of each finite
+        element in the range, with keys 'element', 'time' (time points solved
+        for), 'setup' (seconds spent activating, fixing and initializing
+        variables), 'solve' (seconds spent in the solver) and
+        'termination_condition'.
     """
     solver = kwargs.pop('solver', SolverFactory('ipopt'))
     outlvl = kwargs.pop('outlvl', idaeslog.NOTSET)
     init_log = idaeslog.getInitLogger('nmpc', outlvl)
     solver_log = idaeslog.getSolveLogger('nmpc', outlvl)
     solve_initial_conditions = kwargs.pop('solve_initial_conditions', False)
+    warm_start = kwargs.pop('warm_start', 'constant')
+    warm_start_order = get_warm_start_order(warm_start)
 
     #TODO: Move to docstring
     # Variables that will be fixed for time points outside the finite element
@@ -167,31 +194,52 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
                 time.first(),
                 outlvl=idaeslog.ERROR)[time.first()]
 
+    # Anything still active is solved along with every finite element
+    always_active = list(model.component_data_objects(
+        (Constraint, Objective), active=True))
+
+    # Components to activate in each finite element
+    element_comps = {}
+    for i in fe_in_range:
+        fe = [time[k] for k in range((i-1)*ncp+2, i*ncp+2)]
+        element_comps[i] = [comp for t in fe for comp in deactivated[t]
+                            if was_originally_active[id(comp)]]
+    suffix_block = get_suffix_block(
+        model, [comp for comps in element_comps.values() for comp in comps]
+        + always_active)
+
+    # Values of DAE variables, by column of time point
+    time_points = list(time)
+    time_positions = {t: k for k, t in enumerate(time_points)}
+    var_array = np.empty((len(dae_vars), len(time_points)), dtype=object)
+    for j, _slice in enumerate(dae_vars):
+        for k, t in enumerate(time_points):
+            var_array[j, k] = _slice[t]
+
     # "Integration" loop
+    stats = []
     for i in fe_in_range:
+        start = wall_clock.time()
         t_prev = time[(i-1)*ncp+1]
 
         fe = [time[k] for k in range((i-1)*ncp+2, i*ncp+2)]
 
-        con_list = []
-        for t in fe:
-            # These will be fixed vars in constraints at t
-            # Probably not necessary to record at what t
-            # they occur
-            for comp in deactivated[t]:
-                if was_originally_active[id(comp)]:
-                   comp.activate()
-                   if not time_linking_vars:
-                       if isinstance(comp, _ConstraintData):
-                           con_list.append(comp)
-                       elif isinstance(comp, _BlockData):
-                           # Active here should be independent of whether block
-                           # was active
-                           con_list.extend(
-                               list(comp.component_data_objects(Constraint,
-                                                                 active=True)))
+        comps = element_comps[i]
+        for comp in comps:
+            comp.activate()
+        element = get_subproblem_block(comps + always_active, suffix_block)
 
         if not time_linking_vars:
+            con_list = []
+            for comp in comps:
+                # These will be fixed vars in constraints at t
+                if isinstance(comp, _ConstraintData):
+                    con_list.append(comp)
+                elif isinstance(comp, _BlockData):
+                    # Active here should be independent of whether block
+                    # was active
+                    con_list.extend(comp.component_data_objects(Constraint,
+                                                                active=True))
             fixed_vars = []
             for con in con_list:
                 for var in identify_variables(con.expr,
@@ -234,17 +282,24 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
         # In either case need to record whether variable was previously fixed
         # so I know if I should unfix it or not.
 
-        for t in fe:
-            for _slice in dae_vars:
-                if not _slice[t].fixed:
-                    # Fixed DAE variables are time-dependent disturbances,
-                    # whose values should not be altered by this function.
-                    _slice[t].set_value(_slice[t_prev].value)
+        # Fixed DAE variables are time-dependent disturbances, whose values
+        # are not altered by this.
+        extrapolate_values_at_time(
+            var_array, time_points, [time_positions[t] for t in fe],
+            time_positions[t_prev], order=warm_start_order)
 
-        assert degrees_of_freedom(model) == 0
+        assert degrees_of_freedom(element) == 0
 
+        setup = wall_clock.time() - start
         with idaeslog.solver_log(solver_log, level=idaeslog.DEBUG) as slc:
-            results = solver.solve(model, tee=slc.tee)
+            results = solver.solve(element, tee=slc.tee)
+        stats.append({
+            'element': i,
+            'time': fe,
+            'setup': setup,
+            'solve': wall_clock.time() - start - setup,
+            'termination_condition': results.solver.termination_condition,
+            })
         if results.solver.termination_condition == TerminationCondition.optimal:
             pass
         else:
@@ -252,9 +307,8 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
                 'Failed to solve for finite element %s' %i
                 )
 
-        for t in fe:
-            for comp in deactivated[t]:
-                comp.deactivate()
+        for comp in comps:
+            comp.deactivate()
 
         for var in fixed_vars:
             if not was_originally_fixed[id(var)]:
@@ -265,6 +319,13 @@ def initialize_by_element_in_range(model, time, t_start, t_end,
             if was_originally_active[id(comp)]:
                 comp.activate()
 
+    init_log.info('Solved {} finite elements in {:.2f} s ({:.2f} s in solver)'
+                  .format(n_fe_in_range,
+                          sum(s['setup'] + s['solve'] for s in stats),
+                          sum(s['solve'] for s in stats)))
+    return stats
+
+
 def get_violated_bounds(val, bounds):
     """ This function tests a value against a lower and an upper bound,
     returning which if either is violated, as well as a direction
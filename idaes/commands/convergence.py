@@ -77,8 +77,18 @@ def convergence_sample(
     help="Addtional module that registers ConvergenceEvaluation classes")
 @click.option('--single-sample', default=None, type=str,
     help="Run only a single sample with given name")
+@click.option('-b', '--backend', default="mpi",
+    type=click.Choice(["mpi", "process"]),
+    help="Run samples with MPI (serial if mpi4py is not available) or a pool "
+         "of local worker processes")
+@click.option('-n', '--workers', default=None, type=int,
+    help="Number of worker processes for the process backend")
+@click.option('--results-file', default=None, type=str,
+    help="File to stream per-sample results to, samples with results already "
+         "in the file are skipped (to resume an interrupted run)")
 def convergence_eval(
-    sample_file, dmf, report_file, json_file, convergence_module, single_sample):
+    sample_file, dmf, report_file, json_file, convergence_module, single_sample,
+    backend, workers, results_file):
     import idaes.convergence
     if convergence_module is not None:
         mod = importlib.import_module(convergence_module)
@@ -90,7 +100,10 @@ def convergence_eval(
             return -1
     if single_sample is None:
         (inputs, samples, results) = cnv.run_convergence_evaluation_from_sample_file(
-            sample_file=sample_file
+            sample_file=sample_file,
+            backend=backend,
+            max_workers=workers,
+            results_file=results_file,
         )
         if results is not None:
             cnv.save_convergence_statistics(
@@ -137,6 +137,21 @@ within this flowsheet if not otherwise specified,
         """
         return True
 
+    def initialize_sequential_modular(self, **kwargs):
+        """
+        Initialize the units of the flowsheet in sequence, converging tear
+        streams for any recycles (see
+        idaes.core.util.initialization.initialize_sequential_modular for
+        the keyword arguments).
+
+        Returns:
+            A dict of convergence information and statistics for each unit
+        """
+        # Imported here, as the initialization module imports FlowsheetBlock
+        from idaes.core.util.initialization import \
+            initialize_sequential_modular
+        return initialize_sequential_modular(self, **kwargs)
+
     def model_check(self):
         """
         This method runs model checks on all unit models in a flowsheet.
@@ -54,12 +54,22 @@ ConvergenceEvaluationSpecification), to run a convergence evaluation
 (run_convergence_evaluation), and print the results in table form
 (print_convergence_statistics).
 
+Samples can be run in parallel either with MPI (the "mpi" backend, which runs
+serially if mpi4py is not available) or with a pool of local processes (the
+"process" backend). With the process backend, each worker builds and
+initializes the model once and restores the initialized state with the
+model_serializer before each sample. Results for each sample can also be
+streamed to a results file as they complete, so that a run which is
+interrupted can be resumed without repeating the completed samples.
+
 However, this package can also be executed using the command-line interface.
 See the documentation in convergence.py for more information.
 """
 # stdlib
 from collections import OrderedDict
+import concurrent.futures
 import getpass
+import glob
 import importlib as il
 import json
 import logging
@@ -74,6 +84,7 @@ from pyomo.opt import TerminationCondition
 from pyomo.common.log import LoggingIntercept
 # idaes
 import idaes.core.util.convergence.mpi_utils as mpiu
+from idaes.core.util import model_serializer
 from idaes.dmf import resource
 import idaes.logger as idaeslog
 
@@ -409,7 +420,21 @@ def write_sample_file(eval_spec,
         json.dump(jsondict, fd, indent=3)
 
 
-def run_convergence_evaluation_from_sample_file(sample_file):
+def run_convergence_evaluation_from_sample_file(
+        sample_file, backend="mpi", max_workers=None, results_file=None):
+    """
+    Run convergence evaluation for the samples in a sample file, see
+    run_convergence_evaluation for a description of the optional arguments.
+
+    Parameters
+    ----------
+    sample_file : str
+        Path of the sample file created by write_sample_file
+
+    Returns
+    -------
+       Tuple with (inputs, samples, results)
+    """
     # load the sample file
     try:
         with open(sample_file, 'r') as fd:
@@ -430,7 +455,12 @@ def run_convergence_evaluation_from_sample_file(sample_file):
         raise ValueError(
                 f'Invalid value specified for convergence_evaluation_class_str:'
                 '{convergence_evaluation_class_str} in sample file: {sample_file}')
-    return run_convergence_evaluation(jsondict, conv_eval)
+    return run_convergence_evaluation(
+        jsondict,
+        conv_eval,
+        backend=backend,
+        max_workers=max_workers,
+        results_file=results_file)
 
 def run_single_sample_from_sample_file(sample_file, name):
     # load the sample file
@@ -464,38 +494,126 @@ def run_single_sample(sample_file_dict, conv_eval, name):
     return _run_ipopt_with_stats(model, solver)
 
 
-def run_convergence_evaluation(sample_file_dict, conv_eval):
+def _sample_results_dict(sample_name, sample_point, solved, iters, time):
+    if not solved:
+        _log.error(f'Sample: {sample_name} failed to converge.')
+
+    results_dict = OrderedDict()
+    results_dict['name'] = sample_name
+    results_dict['sample_point'] = sample_point
+    results_dict['solved'] = solved
+    results_dict['iters'] = iters
+    results_dict['time'] = time
+    return results_dict
+
+
+def _rank_results_file(results_file, rank):
     """
-    Run convergence evaluation and generate the statistics based on information
-    in the sample_file.
+    Name of the results file written by an MPI process. The root process
+    (and a run without MPI) writes to results_file itself, and each other
+    process to its own file next to it, so that processes never write to the
+    same file.
+    """
+    if not rank:
+        return results_file
+    return f'{results_file}.rank{rank}'
 
-    Parameters
-    ----------
-    sample_file_dict : dict
-        Dictionary created by ConvergenceEvaluationSpecification that contains
-        the input and sample point information
 
-    conv_eval : ConvergenceEvaluation
-        The ConvergenceEvaluation object that should be used
+def _read_results_file(results_file):
+    """
+    Read the per-sample results streamed to a results file, and the results
+    files of other MPI processes, by an earlier (possibly interrupted) run.
+    The files have one json object per line, and lines which are not valid
+    json (e.g. truncated by a crash while writing) are ignored.
 
     Returns
     -------
-       N/A
+       OrderedDict of results dictionaries keyed by sample name
     """
-    inputs = sample_file_dict['inputs']
-    samples = sample_file_dict['samples']
-
-    # current parallel task manager code does not work with dictionaries, so
-    # convert samples to a list
-    # ToDo: fix and test parallel task manager with dictionaries and change
-    # this
-    samples_list = list()
-    for k, v in samples.items():
-        v['_name'] = k
-        samples_list.append(v)
-    n_samples = len(samples_list)
-
-    task_mgr = mpiu.ParallelTaskManager(n_samples)
+    results = OrderedDict()
+    if results_file is None:
+        return results
+    rank_files = sorted(glob.glob(glob.escape(results_file) + '.rank*'))
+    for fname in [results_file] + rank_files:
+        try:
+            with open(fname, 'r') as fd:
+                for line in fd:
+                    try:
+                        r = json.loads(line, object_pairs_hook=OrderedDict)
+                    except ValueError:
+                        continue
+                    results[r['name']] = r
+        except FileNotFoundError:
+            pass
+    return results
+
+
+class _ResultsWriter(object):
+    """
+    Append per-sample results to a results file as they are completed. Each
+    result is written as a single line of json and flushed immediately. If
+    rank is given (the rank of this MPI process), the results are written to
+    the results file of that process.
+    """
+    def __init__(self, results_file, rank=None):
+        self._fd = None
+        if results_file is not None:
+            fname = _rank_results_file(results_file, rank)
+            self._fd = open(fname, 'a')
+            # Start a new line after a line truncated by an earlier crash, so
+            # that the next result is not joined onto it
+            if self._fd.tell() > 0:
+                with open(fname, 'rb') as fd:
+                    fd.seek(-1, 2)
+                    if fd.read(1) != b'\n':
+                        self._fd.write('\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, et, ev, tb):
+        if self._fd is not None:
+            self._fd.close()
+
+    def write(self, results_dict):
+        if self._fd is None:
+            return
+        self._fd.write(json.dumps(results_dict) + '\n')
+        self._fd.flush()
+
+
+# State of a process backend worker, the model is built and initialized once
+# per worker process and its initialized state restored for each sample.
+_worker = {}
+
+
+def _process_worker_initializer(conv_eval, inputs):
+    output_buffer = StringIO()
+    with LoggingIntercept(output_buffer, 'idaes', logging.ERROR):
+        with capture_output():
+            model = conv_eval.get_initialized_model()
+    _worker['model'] = model
+    _worker['inputs'] = inputs
+    _worker['solver'] = conv_eval.get_solver()
+    _worker['state'] = model_serializer.to_json(model, return_dict=True)
+
+
+def _process_worker_run_sample(sample_point):
+    model = _worker['model']
+    output_buffer = StringIO()
+    with LoggingIntercept(output_buffer, 'idaes', logging.ERROR):
+        with capture_output():
+            model_serializer.from_json(model, sd=_worker['state'])
+            _set_model_parameters_from_sample(
+                model, _worker['inputs'], sample_point)
+            (status_obj, solved, iters, time) = \
+                _run_ipopt_with_stats(model, _worker['solver'])
+    return _sample_results_dict(
+        sample_point['_name'], sample_point, solved, iters, time)
+
+
+def _run_samples_mpi(samples_list, inputs, conv_eval, results_writer):
+    task_mgr = mpiu.ParallelTaskManager(len(samples_list))
     local_samples_list = task_mgr.global_to_local_data(samples_list)
 
     results = list()
@@ -517,18 +635,116 @@ def run_convergence_evaluation(sample_file_dict, conv_eval):
                 (status_obj, solved, iters, time) = \
                     _run_ipopt_with_stats(model, solver)
 
-        if not solved:
-            _log.error(f'Sample: {sample_name} failed to converge.')
-
-        results_dict = OrderedDict()
-        results_dict['name'] = sample_name
-        results_dict['sample_point'] = ss
-        results_dict['solved'] = solved
-        results_dict['iters'] = iters
-        results_dict['time'] = time
+        results_dict = _sample_results_dict(
+            sample_name, ss, solved, iters, time)
+        results_writer.write(results_dict)
         results.append(results_dict)
 
-    global_results = task_mgr.gather_global_data(results)
+    return task_mgr.gather_global_data(results)
+
+
+def _run_samples_process(
+        samples_list, inputs, conv_eval, results_writer, max_workers):
+    results = list()
+    if len(samples_list) == 0:
+        return results
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_process_worker_initializer,
+            initargs=(conv_eval, inputs)) as executor:
+        futures = [executor.submit(_process_worker_run_sample, ss)
+                   for ss in samples_list]
+        for (si, f) in enumerate(concurrent.futures.as_completed(futures)):
+            results_dict = f.result()
+            results_writer.write(results_dict)
+            results.append(results_dict)
+            _progress_bar(float(si + 1) / float(len(samples_list)),
+                          'Completed: {}'.format(results_dict['name']))
+    return results
+
+
+def run_convergence_evaluation(
+        sample_file_dict,
+        conv_eval,
+        backend="mpi",
+        max_workers=None,
+        results_file=None):
+    """
+    Run convergence evaluation and generate the statistics based on information
+    in the sample_file.
+
+    Parameters
+    ----------
+    sample_file_dict : dict
+        Dictionary created by ConvergenceEvaluationSpecification that contains
+        the input and sample point information
+
+    conv_eval : ConvergenceEvaluation
+        The ConvergenceEvaluation object that should be used
+
+    backend : str
+        How samples are executed, either "mpi" to distribute samples over MPI
+        processes (serial if mpi4py is not available) building a new model
+        for each sample, or "process" to use a pool of local worker processes
+        which each build the model once and restore its initialized state
+        before each sample. For the "process" backend, conv_eval must be
+        picklable.
+
+    max_workers : int or None
+        Number of worker processes for the "process" backend, if None the
+        number of processors on the machine is used
+
+    results_file : str or None
+        If given, the results of each sample are appended to this file (one
+        json object per line) as they complete. With the "mpi" backend, each
+        process other than the root writes to its own file, named
+        results_file with ".rank<N>" appended. Samples which already have
+        results in these files are not run again, which allows an
+        interrupted evaluation to be resumed.
+
+    Returns
+    -------
+       Tuple with (inputs, samples, results), results is None on non-root MPI
+       processes
+    """
+    inputs = sample_file_dict['inputs']
+    samples = sample_file_dict['samples']
+
+    # current parallel task manager code does not work with dictionaries, so
+    # convert samples to a list
+    # ToDo: fix and test parallel task manager with dictionaries and change
+    # this
+    samples_list = list()
+    for k, v in samples.items():
+        v['_name'] = k
+        samples_list.append(v)
+
+    # results from a previous run, only run the remaining samples
+    previous_results = _read_results_file(results_file)
+    remaining_list = [ss for ss in samples_list
+                      if ss['_name'] not in previous_results]
+
+    rank = mpiu.MPIInterface().rank if backend == "mpi" else None
+    with _ResultsWriter(results_file, rank) as results_writer:
+        if backend == "mpi":
+            new_results = _run_samples_mpi(
+                remaining_list, inputs, conv_eval, results_writer)
+        elif backend == "process":
+            new_results = _run_samples_process(
+                remaining_list, inputs, conv_eval, results_writer,
+                max_workers)
+        else:
+            raise ValueError(
+                f'Invalid convergence evaluation backend {backend}, expected '
+                '"mpi" or "process".')
+
+    if new_results is None:
+        # non-root MPI process
+        return inputs, samples, None
+
+    # put results in sample order
+    previous_results.update((r['name'], r) for r in new_results)
+    global_results = [previous_results[ss['_name']] for ss in samples_list]
     return inputs, samples, global_results
 
 
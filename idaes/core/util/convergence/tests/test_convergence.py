@@ -239,6 +239,139 @@ def test_convergence_evaluation_fixedvar_mutableparam():
     #     os.remove(results_fname)
 
 
+def _write_ceval_sample_file(fname, n_points=3):
+    ceval_class = cb._class_import(ceval_fixedvar_mutableparam_str)
+    spec = ceval_class().get_specification()
+    cb.write_sample_file(spec, fname, ceval_fixedvar_mutableparam_str,
+                         n_points=n_points, seed=43)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("backend", ["mpi", "process"])
+def test_convergence_evaluation_resume(backend):
+    fname = os.path.join(wrtdir, 'ceval_resume.3.43.json')
+    rname = os.path.join(wrtdir, 'ceval_resume.3.43.results.jsonl')
+    _write_ceval_sample_file(fname)
+
+    # results file from a previous run, out of order and with a truncated
+    # last line as if the run crashed while writing it
+    with open(rname, 'w') as f:
+        for i in [2, 3, 1]:
+            f.write(json.dumps({"name": f"Sample-{i}",
+                                "sample_point": {},
+                                "solved": True,
+                                "iters": i,
+                                "time": 0.1}) + '\n')
+        f.write('{"name": "Sample-4", "sam')
+
+    # all samples have results so nothing should be solved
+    inputs, samples, results = \
+        cb.run_convergence_evaluation_from_sample_file(
+            fname, backend=backend, results_file=rname)
+
+    assert [r['name'] for r in results] == ['Sample-1', 'Sample-2', 'Sample-3']
+    assert [r['iters'] for r in results] == [1, 2, 3]
+
+    os.remove(fname)
+    os.remove(rname)
+
+
+@pytest.mark.unit
+def test_results_writer():
+    rname = os.path.join(wrtdir, 'ceval_writer.results.jsonl')
+    rank_name = rname + '.rank1'
+
+    def _result(i):
+        return {"name": f"Sample-{i}", "sample_point": {}, "solved": True,
+                "iters": i, "time": 0.1}
+
+    with open(rname, 'w') as f:
+        f.write(json.dumps(_result(1)) + '\n')
+        f.write('{"name": "Sample-2", "sam')
+
+    # a result appended after a truncated line is kept
+    with cb._ResultsWriter(rname) as writer:
+        writer.write(_result(3))
+    # other MPI processes write to their own files
+    with cb._ResultsWriter(rname, rank=1) as writer:
+        writer.write(_result(4))
+    assert os.path.exists(rank_name)
+
+    results = cb._read_results_file(rname)
+    assert list(results) == ['Sample-1', 'Sample-3', 'Sample-4']
+    assert results['Sample-4']['iters'] == 4
+
+    os.remove(rname)
+    os.remove(rank_name)
+
+
+@pytest.mark.unit
+def test_convergence_evaluation_invalid_backend():
+    fname = os.path.join(wrtdir, 'ceval_backend.3.43.json')
+    _write_ceval_sample_file(fname)
+    with pytest.raises(ValueError):
+        cb.run_convergence_evaluation_from_sample_file(fname, backend="spam")
+    os.remove(fname)
+
+
+@pytest.mark.unit
+def test_convergence_evaluation_process_worker(monkeypatch):
+    fname = os.path.join(wrtdir, 'ceval_worker.3.43.json')
+    _write_ceval_sample_file(fname)
+    with open(fname) as f:
+        sample_file_dict = json.load(f)
+    os.remove(fname)
+
+    solved_states = []
+    def _solve(model, solver):
+        # record the state the model is solved from, then move the solution
+        solved_states.append(
+            (pe.value(model.var_a), pe.value(model.param_b),
+             model.x.value, model.y.value))
+        model.x.value = 42
+        model.y.value = 42
+        model.var_a.unfix()
+        return None, True, 10, 0.5
+    monkeypatch.setattr(cb, "_run_ipopt_with_stats", _solve)
+
+    ceval = cb._class_import(ceval_fixedvar_mutableparam_str)()
+    cb._process_worker_initializer(ceval, sample_file_dict['inputs'])
+    for k, v in sample_file_dict['samples'].items():
+        v['_name'] = k
+        r = cb._process_worker_run_sample(v)
+        assert r['name'] == k
+        assert r['solved']
+        assert r['iters'] == 10
+
+    # each sample is solved from the initialized state
+    for (k, v), state in zip(
+            sample_file_dict['samples'].items(), solved_states):
+        assert state == pytest.approx((v['var_a'], v['param_b'], 2.0, 2.0))
+    assert len(solved_states) == 3
+
+
+@pytest.mark.skipif(not ipopt_available, reason="Ipopt solver not available")
+@pytest.mark.unit
+def test_convergence_evaluation_process_backend():
+    fname = os.path.join(wrtdir, 'ceval_process.3.43.json')
+    rname = os.path.join(wrtdir, 'ceval_process.3.43.results.jsonl')
+    _write_ceval_sample_file(fname)
+
+    inputs, samples, mpi_results = \
+        cb.run_convergence_evaluation_from_sample_file(fname)
+    inputs, samples, results = \
+        cb.run_convergence_evaluation_from_sample_file(
+            fname, backend="process", max_workers=2, results_file=rname)
+
+    for r, mr in zip(results, mpi_results):
+        assert r['name'] == mr['name']
+        assert r['solved'] == mr['solved']
+        assert r['iters'] == mr['iters']
+    assert len(cb._read_results_file(rname)) == 3
+
+    os.remove(fname)
+    os.remove(rname)
+
 if __name__ == '__main__':
     # test_convergence_evaluation_specification_file_fixedvar_mutableparam()
     # test_convergence_evaluation_specification_file_unfixedvar_mutableparam()
@@ -15,11 +15,19 @@
 This module contains utility functions for dynamic IDAES models.
 """
 
-from pyomo.environ import Block, Constraint, Var
+import numpy as np
+
+from pyomo.environ import (Block, Constraint, Objective, Reference, Suffix,
+                           Var)
+from pyomo.core.base.block import _BlockData
+from pyomo.core.base.constraint import _ConstraintData
+from pyomo.core.base.objective import _ObjectiveData
+from pyomo.core.base.suffix import active_export_suffix_generator
+from pyomo.core.expr.visitor import identify_variables
 from pyomo.dae import DerivativeVar
 from pyomo.dae.set_utils import (
     is_explicitly_indexed_by, is_in_block_indexed_by, get_index_set_except)
-from pyomo.common.collections import ComponentSet
+from pyomo.common.collections import ComponentMap, ComponentSet
 
 import idaes.logger as idaeslog
 
@@ -590,6 +598,9 @@ def copy_non_time_indexed_values(
 
     Returns:
         None
+
+    To copy values between the same two flowsheets repeatedly, construct a
+    ValueCorrespondence once and use its copy_non_time_indexed_values method.
     """
     time_tgt = fs_tgt.time
 
@@ -692,6 +703,9 @@ def copy_values_at_time(fs_tgt, fs_src, t_target, t_source,
 
     Returns:
         None
+
+    To copy values between the same two flowsheets repeatedly, construct a
+    ValueCorrespondence once and use its copy_values_at_time method.
     """
     time_target = fs_tgt.time
     var_visited = set()
@@ -802,3 +816,496 @@ def copy_values_at_time(fs_tgt, fs_src, t_target, t_source,
                                     var_target.index()]
                     var_target.set_value(var_source.value)
 
+
+def _follow_path(blk, path):
+    """
+    Follows a list of (local_name, index) tuples, as returned by
+    path_from_block, from blk. Raises AttributeError or KeyError if the
+    path does not exist in blk.
+    """
+    for name, index in path:
+        blk = getattr(blk, name)[index]
+    return blk
+
+
+class ValueCorrespondence(object):
+    """
+    Correspondence between the variables of two structurally identical
+    flowsheets, built once so that values can be copied between them many
+    times, as when initializing a plant or controller model from another
+    model in every cycle of moving horizon estimation or model predictive
+    control.
+
+    The variables copied are the same as those of copy_values_at_time and
+    copy_non_time_indexed_values, but source variables are located by name
+    only when the correspondence is constructed. Time-indexed variables are
+    stored in two object arrays, with one row for each time-indexed
+    "slice" of a variable and one column for each point in the target and
+    source time sets, so a copy between two time points is a single gather
+    from a column of one array and scatter into a column of the other.
+
+    Args:
+        fs_tgt : Flowsheet into which values will be copied
+        fs_src : Flowsheet from which values will be copied. Could be the
+                 target flowsheet. Its time set may differ from that of the
+                 target flowsheet.
+        outlvl : Outlevel for the IDAES logger
+
+    Attributes:
+        target_to_source : ComponentMap from each non-time-indexed VarData
+                           in the target flowsheet to the corresponding
+                           VarData in the source flowsheet
+    """
+    def __init__(self, fs_tgt, fs_src, outlvl=idaeslog.NOTSET):
+        self.target = fs_tgt
+        self.source = fs_src
+        self.time_target = fs_tgt.time
+        self.time_source = fs_src.time
+        self._init_log = idaeslog.getInitLogger(__name__, outlvl)
+
+        self.target_to_source = ComponentMap()
+        self._add_non_time_indexed_vars()
+
+        self._target_rows = []
+        self._source_rows = []
+        self._add_time_indexed_vars()
+        self._add_time_indexed_blocks()
+
+        n_rows = len(self._target_rows)
+        self.target_array = np.empty(
+            (n_rows, len(self.time_target)), dtype=object)
+        self.source_array = np.empty(
+            (n_rows, len(self.time_source)), dtype=object)
+        # Maps each time-indexed target VarData to its row
+        self._row_map = ComponentMap()
+        for i, (tgt_row, src_row) in enumerate(
+                zip(self._target_rows, self._source_rows)):
+            for j, var in enumerate(tgt_row):
+                self.target_array[i, j] = var
+                self._row_map[var] = i
+            for j, var in enumerate(src_row):
+                self.source_array[i, j] = var
+        del self._target_rows
+        del self._source_rows
+
+        self._target_positions = {
+            t: i for i, t in enumerate(self.time_target)}
+        self._source_positions = {
+            t: i for i, t in enumerate(self.time_source)}
+
+    def _warn_missing(self, name):
+        self._init_log.warning(
+            'Warning copying values: ' + name +
+            ' does not exist in source block ' + self.source.name)
+
+    def _add_non_time_indexed_vars(self):
+        fs_tgt = self.target
+        fs_src = self.source
+        time_tgt = self.time_target
+
+        var_visited = set()
+        for var_tgt in fs_tgt.component_objects(Var, descend_into=False):
+            if id(var_tgt) in var_visited:
+                continue
+            var_visited.add(id(var_tgt))
+            if is_explicitly_indexed_by(var_tgt, time_tgt):
+                continue
+            var_src = fs_src.find_component(var_tgt.local_name)
+            if var_src is None:
+                self._warn_missing(var_tgt.local_name)
+                continue
+            for index in var_tgt:
+                self.target_to_source[var_tgt[index]] = var_src[index]
+
+        blk_visited = set()
+        for blk_tgt in fs_tgt.component_objects(Block):
+            if id(blk_tgt) in blk_visited:
+                continue
+            blk_visited.add(id(blk_tgt))
+            if (is_in_block_indexed_by(blk_tgt, time_tgt) or
+                    is_explicitly_indexed_by(blk_tgt, time_tgt)):
+                continue
+            for b_index in blk_tgt:
+                for var_tgt in blk_tgt[b_index].component_objects(
+                        Var, descend_into=False):
+                    if is_explicitly_indexed_by(var_tgt, time_tgt):
+                        continue
+                    path = path_from_block(var_tgt, fs_tgt)
+                    try:
+                        var_src = getattr(_follow_path(fs_src, path),
+                                          var_tgt.local_name)
+                    except (AttributeError, KeyError):
+                        self._warn_missing(
+                            var_tgt.getname(fully_qualified=True,
+                                            relative_to=fs_tgt))
+                        continue
+                    for index in var_tgt:
+                        self.target_to_source[var_tgt[index]] = \
+                            var_src[index]
+
+    def _add_time_indexed_vars(self):
+        fs_tgt = self.target
+        fs_src = self.source
+        time_tgt = self.time_target
+        time_src = self.time_source
+
+        var_visited = set()
+        for var_tgt in fs_tgt.component_objects(Var):
+            if id(var_tgt) in var_visited:
+                continue
+            var_visited.add(id(var_tgt))
+            if not is_explicitly_indexed_by(var_tgt, time_tgt):
+                continue
+
+            varname = var_tgt.getname(fully_qualified=True, relative_to=fs_tgt)
+            var_src = fs_src.find_component(varname)
+            if var_src is None:
+                self._warn_missing(varname)
+                continue
+
+            if var_tgt.index_set().dimen == 1:
+                self._target_rows.append([var_tgt[t] for t in time_tgt])
+                self._source_rows.append([var_src[t] for t in time_src])
+            else:
+                index_info = get_index_set_except(var_tgt, time_tgt)
+                index_getter = index_info['index_getter']
+                for non_time_index in index_info['set_except']:
+                    self._target_rows.append(
+                        [var_tgt[index_getter(non_time_index, t)]
+                         for t in time_tgt])
+                    self._source_rows.append(
+                        [var_src[index_getter(non_time_index, t)]
+                         for t in time_src])
+
+    def _add_time_indexed_blocks(self):
+        fs_tgt = self.target
+        fs_src = self.source
+        time_tgt = self.time_target
+        time_src = self.time_source
+
+        blk_visited = set()
+        for blk_tgt in fs_tgt.component_objects(Block):
+            if id(blk_tgt) in blk_visited:
+                continue
+            blk_visited.add(id(blk_tgt))
+            if not is_explicitly_indexed_by(blk_tgt, time_tgt):
+                continue
+
+            blkname = blk_tgt.getname(fully_qualified=True, relative_to=fs_tgt)
+            blk_src = fs_src.find_component(blkname)
+            if blk_src is None:
+                self._warn_missing(blkname)
+                continue
+
+            if blk_tgt.index_set().dimen == 1:
+                index_getters = [lambda t: t]
+            else:
+                index_info = get_index_set_except(blk_tgt, time_tgt)
+                index_getter = index_info['index_getter']
+                index_getters = [
+                    (lambda t, nti=nti: index_getter(nti, t))
+                    for nti in index_info['set_except']]
+
+            for get_index in index_getters:
+                # The variables of the block data at the first point in
+                # time are located in the block data at every other point,
+                # by the same path.
+                template = blk_tgt[get_index(time_tgt.first())]
+                for var_tgt in template.component_data_objects(Var):
+                    path = path_from_block(var_tgt, template,
+                                           include_comp=True)
+                    try:
+                        tgt_row = [_follow_path(blk_tgt[get_index(t)], path)
+                                   for t in time_tgt]
+                        src_row = [_follow_path(blk_src[get_index(t)], path)
+                                   for t in time_src]
+                    except (AttributeError, KeyError):
+                        self._warn_missing(var_tgt.getname(
+                            fully_qualified=True, relative_to=fs_tgt))
+                        continue
+                    self._target_rows.append(tgt_row)
+                    self._source_rows.append(src_row)
+
+    def _get_rows(self, variables):
+        """
+        Rows of the time-indexed arrays that contain any data object of
+        the specified target components. These may be indexed components,
+        including References, or VarData objects.
+        """
+        row_map = self._row_map
+        rows = set()
+        for comp in variables:
+            data = comp.values() if comp.is_indexed() else (comp,)
+            for var in data:
+                if var in row_map:
+                    rows.add(row_map[var])
+        return np.array(sorted(rows), dtype=int)
+
+    def copy_values_at_time(self, t_target, t_source, copy_fixed=True,
+                            variables=None):
+        """
+        Sets the values of all time-indexed variables in the target
+        flowsheet at t_target to the values of the corresponding variables
+        in the source flowsheet at t_source.
+
+        Args:
+            t_target : Target time point
+            t_source : Source time point
+            copy_fixed : Bool of whether or not to copy over fixed variables
+                         in the target flowsheet
+            variables : Optional iterable of target time-indexed components
+                        or data objects (for instance References to a
+                        category of variables). If provided, only their
+                        values are copied.
+
+        Returns:
+            None
+        """
+        try:
+            i_tgt = self._target_positions[t_target]
+        except KeyError:
+            raise KeyError('%s is not a point in time set %s'
+                           % (t_target, self.time_target.name))
+        try:
+            i_src = self._source_positions[t_source]
+        except KeyError:
+            raise KeyError('%s is not a point in time set %s'
+                           % (t_source, self.time_source.name))
+
+        if variables is None:
+            targets = self.target_array[:, i_tgt]
+            sources = self.source_array[:, i_src]
+        else:
+            rows = self._get_rows(variables)
+            targets = self.target_array[rows, i_tgt]
+            sources = self.source_array[rows, i_src]
+        _set_values(targets, [var.value for var in sources], copy_fixed)
+
+    def copy_non_time_indexed_values(self, copy_fixed=True, variables=None):
+        """
+        Sets the values of all variables in the target flowsheet that are
+        not (implicitly or explicitly) indexed by time to the values of the
+        corresponding variables in the source flowsheet.
+
+        Args:
+            copy_fixed : Bool of whether or not to copy over fixed variables
+                         in the target flowsheet
+            variables : Optional iterable of target components or data
+                        objects. If provided, only their values are copied.
+
+        Returns:
+            None
+        """
+        target_to_source = self.target_to_source
+        if variables is None:
+            targets = list(target_to_source.keys())
+        else:
+            targets = []
+            for comp in variables:
+                data = comp.values() if comp.is_indexed() else (comp,)
+                targets.extend(var for var in data if var in target_to_source)
+        _set_values(targets,
+                    [target_to_source[var].value for var in targets],
+                    copy_fixed)
+
+
+def _set_values(targets, values, copy_fixed):
+    # Source and target variables have the same domains, so values are
+    # not validated again.
+    if copy_fixed:
+        for var, val in zip(targets, values):
+            var.set_value(val, True)
+    else:
+        for var, val in zip(targets, values):
+            if not var.fixed:
+                var.set_value(val, True)
+
+
+def get_suffix_block(model, components):
+    """
+    Function to collect the export Suffixes (e.g. scaling factors) that apply
+    to a set of components of a model, for use with get_subproblem_block.
+    These are the active export Suffixes of the Blocks in model (including
+    model itself) which contain the components. Suffixes of Blocks among the
+    components are not collected, as they are exported along with their
+    Blocks.
+
+    Args:
+        model : Block containing the components
+        components : Iterable of ConstraintData, ObjectiveData and BlockData
+                     objects
+
+    Returns:
+        A new concrete Block containing a copy of each Suffix, or None if
+        there are no Suffixes to export
+    """
+    parents = ComponentSet()
+    for comp in components:
+        b = comp.parent_block()
+        while b is not None and b not in parents:
+            parents.add(b)
+            if b is model:
+                break
+            b = b.parent_block()
+
+    suffix_block = None
+    for b in parents:
+        for name, suffix in active_export_suffix_generator(b):
+            if suffix_block is None:
+                suffix_block = Block(concrete=True)
+            copy = suffix_block.component(name)
+            if copy is None:
+                copy = Suffix(direction=Suffix.EXPORT,
+                              datatype=suffix.get_datatype())
+                suffix_block.add_component(name, copy)
+            for comp, val in suffix.items():
+                copy[comp] = val
+    return suffix_block
+
+
+def get_subproblem_block(components, suffix_block=None):
+    """
+    Function to create a Block which refers to some of the constraints,
+    objectives and blocks of a model, so that they can be solved as a
+    subproblem (e.g. a single finite element) without the rest of the model
+    being searched or written for the solver. The components must be active
+    when the Block is created, as the Block also refers to the variables in
+    the active constraints and objectives among them.
+
+    Values of variables are loaded into the model when the subproblem is
+    solved, but values of import Suffixes (e.g. duals) are not.
+
+    Args:
+        components : Iterable of ConstraintData, ObjectiveData and BlockData
+                     objects
+        suffix_block : Block returned by get_suffix_block for the components,
+                       if they should be solved with the Suffixes of the
+                       Blocks containing them
+
+    Returns:
+        A new concrete Block
+    """
+    constraints = []
+    objectives = []
+    blocks = []
+    for comp in components:
+        if isinstance(comp, _ConstraintData):
+            constraints.append(comp)
+        elif isinstance(comp, _ObjectiveData):
+            objectives.append(comp)
+        elif isinstance(comp, _BlockData):
+            blocks.append(comp)
+        else:
+            raise TypeError(
+                'Subproblem components must be ConstraintData, '
+                'ObjectiveData or BlockData objects, not %s' % type(comp))
+    if suffix_block is not None:
+        blocks.append(suffix_block)
+
+    subproblem = Block(concrete=True)
+    subproblem.constraints = Reference(dict(enumerate(constraints)),
+                                       ctype=Constraint)
+    subproblem.objectives = Reference(dict(enumerate(objectives)),
+                                      ctype=Objective)
+    subproblem.blocks = Reference(dict(enumerate(blocks)), ctype=Block)
+    # Variables are written for the solver only if they can be found in the
+    # Block being solved
+    variables = ComponentSet()
+    for comp in subproblem.component_data_objects((Constraint, Objective),
+                                                  active=True):
+        variables.update(identify_variables(comp.expr))
+    subproblem.variables = Reference(dict(enumerate(variables)), ctype=Var)
+    return subproblem
+
+
+# Order of extrapolation used for each warm_start option of the functions
+# which initialize a model one finite element at a time
+_WARM_START_ORDER = {'constant': 0, 'extrapolate': 1}
+
+
+def get_warm_start_order(warm_start):
+    """
+    Function to get the order of extrapolation used to initialize each finite
+    element for a warm_start option of initialize_by_time_element or
+    initialize_by_element_in_range.
+
+    Args:
+        warm_start : 'constant' to copy values from the end of the previous
+                     finite element, or 'extrapolate' to extrapolate them
+                     linearly
+
+    Returns:
+        The order to pass to extrapolate_values_at_time
+    """
+    if warm_start not in _WARM_START_ORDER:
+        raise ValueError('Unrecognized warm_start option %s. Must be one of %s'
+                         % (warm_start, list(_WARM_START_ORDER)))
+    return _WARM_START_ORDER[warm_start]
+
+
+def extrapolate_values_at_time(var_array, time_points, targets, source,
+                               order=1):
+    """
+    Function to set the values of time-indexed variables at some points in
+    time by extrapolating their values at and before another point in time,
+    as when initializing a finite element from the previous one. Fixed
+    variables are not changed.
+
+    Args:
+        var_array : Two-dimensional array of VarData objects, with one row
+                    for each time-indexed slice of a variable and one column
+                    for each point in time (e.g. the target_array of a
+                    ValueCorrespondence)
+        time_points : List of the points in time of the columns of var_array
+        targets : List of the columns of var_array whose values will be set
+        source : Column of var_array from which values are extrapolated
+        order : 0 to copy the values at source, or 1 (default) to extrapolate
+                linearly from the values in the column before source and in
+                source. Values at source are copied if it is the first
+                column, and for variables that are not continuous. Values
+                extrapolated linearly are projected onto the bounds of the
+                variables.
+
+    Returns:
+        None
+    """
+    if order not in (0, 1):
+        raise ValueError('Order of extrapolation must be 0 or 1, not %s'
+                         % order)
+    targets = list(targets)
+    if not targets or var_array.shape[0] == 0:
+        return
+    target_vars = var_array[:, targets]
+
+    source_values = _float_values(var_array[:, source])
+    values = np.repeat(source_values[:, None], len(targets), axis=1)
+    if order == 1 and source > 0:
+        slope = ((source_values - _float_values(var_array[:, source-1]))
+                 / (time_points[source] - time_points[source-1]))
+        continuous = np.fromiter(
+            (var.is_continuous() for var in var_array[:, source]),
+            dtype=bool, count=len(slope))
+        slope[np.isnan(slope) | ~continuous] = 0.0
+        dt = np.array([time_points[j] - time_points[source]
+                       for j in targets])
+        values += slope[:, None]*dt[None, :]
+        lower = np.array([[-np.inf if var.lb is None else var.lb
+                           for var in row] for row in target_vars],
+                         dtype=float)
+        upper = np.array([[np.inf if var.ub is None else var.ub
+                           for var in row] for row in target_vars],
+                         dtype=float)
+        values = np.clip(values, lower, upper)
+
+    # Values that are not known at source (nan) are copied as None.
+    # Extrapolated values are projected onto the bounds of each variable,
+    # and copied values are those of the same variable at source, so they
+    # are not validated again.
+    for var, val in zip(target_vars.flat, values.flat):
+        if not var.fixed:
+            var.set_value(None if np.isnan(val) else float(val), True)
+
+
+def _float_values(variables):
+    return np.array([np.nan if var.value is None else var.value
+                     for var in variables], dtype=float)
@@ -18,13 +18,21 @@ __author__ = "Andrew Lee"
 
 import logging
 
+import numpy as np
+from scipy.sparse.linalg import spsolve
+
 from pyomo.environ import (Block,
+                           Objective,
                            SolverFactory,
                            TerminationCondition)
 from pyomo.core.base.var import _VarData
+from pyomo.common.collections import ComponentMap
+from pyomo.common.modeling import unique_component_name
 from pyomo.contrib.parmest.ipopt_solver_wrapper import ipopt_solve_with_stats
+from pyomo.contrib.pynumero.asl import AmplInterface
+from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
 
-from idaes.core.util.model_serializer import to_json, from_json
+from idaes.core.util.model_serializer import StateCheckpoint
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.exceptions import ConfigurationError
 import idaes.logger as idaeslog
@@ -34,7 +42,8 @@ _log = idaeslog.getLogger(__name__)
 def homotopy(model, variables, targets,
              max_solver_iterations=50, max_solver_time=10,
              step_init=0.1, step_cut=0.5, iter_target=4, step_accel=0.5,
-             max_step=1, min_step=0.05, max_eval=200):
+             max_step=1, min_step=0.05, max_eval=200,
+             predictor=False, predictor_tol=1e-2):
     """
     Homotopy meta-solver routine using Ipopt as the non-linear solver. This
     routine takes a model along with a list of fixed variables in that model
@@ -42,6 +51,14 @@ def homotopy(model, variables, targets,
     iteratively move the values of the fixed variables to their target values
     using an adaptive step size.
 
+    If predictor is True, a predictor-corrector scheme is used instead: at
+    each accepted point the tangent of the solution path is found from the
+    Jacobian of the equality constraints (using PyNumero), the values of the
+    free variables are extrapolated along it to the next step (predictor)
+    and Ipopt is started from the extrapolated values (corrector). The step
+    size is then adapted from the difference between the predicted and
+    corrected solutions rather than from the number of solver iterations.
+
     Args:
         model : model to be solved
         variables : list of Pyomo Var objects to be varied using homotopy.
@@ -62,6 +79,11 @@ def homotopy(model, variables, targets,
         min_step : minimum homotopy step size (default=0.05)
         max_eval : maximum number of homotopy evaluations (both successful and
                    unsuccessful) (default=200)
+        predictor : if True, use tangent predictor steps (default=False)
+        predictor_tol : target for the largest relative difference between
+                    predicted and corrected values of the free variables,
+                    used to adapt the step size when predictor is True
+                    (default=1e-2)
 
     Returns:
         Termination Condition : A Pyomo TerminationCondition Enum indicating
@@ -176,6 +198,13 @@ def homotopy(model, variables, targets,
     if not isinstance(max_eval, int):
         raise ConfigurationError("Invalid value for max_eval ({}). Must be "
                                  "an an integer.".format(iter_target))
+    if not predictor_tol > 0:
+        raise ConfigurationError("Invalid value for predictor_tol ({}). Must "
+                                 "be greater than 0.".format(predictor_tol))
+    if predictor and not AmplInterface.available():
+        raise ConfigurationError("Homotopy predictor steps require the "
+                                 "PyNumero ASL interface, which is not "
+                                 "available.")
 
     # Create solver object
     solver_obj = SolverFactory('ipopt')
@@ -200,13 +229,20 @@ def homotopy(model, variables, targets,
     for i in range(len(variables)):
         v_init.append(variables[i].value)
 
+    if predictor:
+        path = _TangentPredictor(
+            model, variables, [targets[i] - v_init[i]
+                               for i in range(len(variables))])
+        tangent = path.tangent()
+
     n_0 = 0.0  # Homotopy progress variable
     s = step_init  # Set step size to step_init
     iter_count = 0  # Counter for homotopy iterations
 
-    # Save model state to dict
-    # TODO : for very large models, it may be necessary to dump this to a file
-    current_state = to_json(model, return_dict=True)
+    # Save model state, the checkpoint lays out the model once so repeated
+    # captures and restores do not need to walk the model
+    current_state = StateCheckpoint(model)
+    current_state.capture()
 
     while n_0 < 1.0:
         iter_count += 1  # Increase iter_count regardless of success or failure
@@ -224,6 +260,11 @@ def homotopy(model, variables, targets,
         for i in range(len(variables)):
             variables[i].fix(targets[i]*n_1 + v_init[i]*(1-n_1))
 
+        # Extrapolate free variables along the tangent of the solution path
+        predicted = None
+        if predictor and tangent is not None:
+            predicted = path.predict(tangent, n_1-n_0)
+
         # Solve model at new state
         results, solved, sol_iter, sol_time, sol_reg = ipopt_solve_with_stats(
             model, solver_obj, max_solver_iterations, max_solver_time)
@@ -231,13 +272,26 @@ def homotopy(model, variables, targets,
         # Check solver output for convergence
         if solved:
             # Step succeeded - accept current state
-            current_state = to_json(model, return_dict=True)
+            current_state.capture()
 
             # Update n_0 to accept current step
             n_0 = n_1
 
-            # Check solver iterations and calculate next step size
-            s_proposed = s*(1 + step_accel*(iter_target/sol_iter-1))
+            if predicted is not None:
+                # Calculate next step size from predictor error, which is
+                # proportional to the square of the step size
+                error = path.error(predicted)
+                if error > 0:
+                    s_proposed = s*(
+                        1 + step_accel*((predictor_tol/error)**0.5-1))
+                else:
+                    s_proposed = max_step
+            else:
+                # Check solver iterations and calculate next step size
+                s_proposed = s*(1 + step_accel*(iter_target/sol_iter-1))
+
+            if predictor:
+                tangent = path.tangent()
 
             if s_proposed > max_step:
                 s = max_step
@@ -246,8 +300,9 @@ def homotopy(model, variables, targets,
             else:
                 s = s_proposed
         else:
-            # Step failed - reload old state
-            from_json(model, current_state)
+            # Step failed - reload old state. The tangent at the old state is
+            # still valid, so does not need to be found again.
+            current_state.restore()
 
             # Try to cut back step size
             if s > min_step:
@@ -274,3 +329,111 @@ def homotopy(model, variables, targets,
                 "Homotopy failed - converged at target values with "
                 "regularization in {} iterations.".format(iter_count))
         return TerminationCondition.other, n_0, iter_count
+
+
+class _TangentPredictor(object):
+    """
+    Predictor for the solution of a model along a homotopy path, from the
+    tangent dx/dn = -inv(J_x)*J_p*dp/dn of its equality constraints, where x
+    are the free variables, p the homotopy variables and n the homotopy
+    progress. The PyNumero NLP is built once, so each tangent only needs one
+    Jacobian evaluation.
+
+    Args:
+        model : model being solved
+        variables : list of homotopy variables (fixed)
+        deltas : list of the difference between the target and initial value
+                 of each homotopy variable
+    """
+    def __init__(self, model, variables, deltas):
+        # PyNumero requires an objective, and the homotopy variables must be
+        # free so that the Jacobian has columns for them
+        dummy_objective_name = None
+        if next(model.component_data_objects(Objective, active=True),
+                None) is None:
+            dummy_objective_name = unique_component_name(
+                model, "homotopy_objective")
+            model.add_component(dummy_objective_name, Objective(expr=0))
+        for v in variables:
+            v.unfix()
+        try:
+            self.nlp = PyomoNLP(model)
+        finally:
+            for v in variables:
+                v.fix()
+            if dummy_objective_name is not None:
+                model.del_component(dummy_objective_name)
+
+        self._vars = self.nlp.get_pyomo_variables()
+        delta_map = ComponentMap(zip(variables, deltas))
+        self._p_idx = [j for j, v in enumerate(self._vars) if v in delta_map]
+        self._x_idx = [j for j, v in enumerate(self._vars)
+                       if v not in delta_map]
+        self._dp = np.array([delta_map[self._vars[j]] for j in self._p_idx],
+                            dtype=float)
+        self._x_vars = [self._vars[j] for j in self._x_idx]
+        self._lb = np.array([-np.inf if v.lb is None else v.lb
+                             for v in self._x_vars], dtype=float)
+        self._ub = np.array([np.inf if v.ub is None else v.ub
+                             for v in self._x_vars], dtype=float)
+
+    def _x_values(self):
+        return np.array([np.nan if v.value is None else v.value
+                         for v in self._x_vars], dtype=float)
+
+    def tangent(self):
+        """
+        Find the tangent of the solution path at the current values of the
+        model variables.
+
+        Returns:
+            Array of dx/dn for the free variables, or None if it could not be
+            found (e.g. the Jacobian is singular)
+        """
+        primals = np.array([np.nan if v.value is None else v.value
+                            for v in self._vars], dtype=float)
+        if not np.all(np.isfinite(primals)):
+            return None
+        self.nlp.set_primals(primals)
+        jac = self.nlp.evaluate_jacobian_eq().tocsc()
+        if jac.shape[0] != len(self._x_idx):
+            return None
+        rhs = -(jac[:, self._p_idx] @ self._dp)
+        try:
+            dx = spsolve(jac[:, self._x_idx], rhs)
+        except RuntimeError:
+            return None
+        dx = np.atleast_1d(dx)
+        if not np.all(np.isfinite(dx)):
+            _log.warning("Homotopy - could not find tangent of solution "
+                         "path, taking step without predictor.")
+            return None
+        return dx
+
+    def predict(self, tangent, step):
+        """
+        Set the values of the free variables to those extrapolated along a
+        tangent, projected onto their bounds.
+
+        Args:
+            tangent : array returned by tangent()
+            step : change in homotopy progress
+
+        Returns:
+            Array of predicted values
+        """
+        predicted = np.clip(self._x_values() + step*tangent,
+                            self._lb, self._ub)
+        for v, val in zip(self._x_vars, predicted):
+            v.set_value(float(val), True)
+        return predicted
+
+    def error(self, predicted):
+        """
+        Largest relative difference between predicted values and the current
+        values of the free variables.
+        """
+        if len(predicted) == 0:
+            return 0.0
+        x = self._x_values()
+        return float(np.max(np.abs(x - predicted)/np.maximum(1, np.abs(x))))
@@ -14,25 +14,43 @@
 """
 This module contains utility functions for initialization of IDAES models.
 """
+import collections
+import concurrent.futures
+import multiprocessing
+import time as wall_clock
 
-from pyomo.environ import Block, Var, TerminationCondition, Constraint
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import (connected_components,
+                                  maximum_bipartite_matching)
+
+from pyomo.environ import (Block, Var, TerminationCondition, Constraint,
+                           Objective, Reference, value)
 from pyomo.network import Arc
-from pyomo.dae import ContinuousSet
+from pyomo.opt import SolverResults, check_optimal_termination
 from pyomo.core.expr.visitor import identify_variables
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.common.collections import ComponentMap, ComponentSet
+from pyomo.dae import ContinuousSet
+from pyomo.util.calc_var_value import calculate_variable_from_constraint
 
-from idaes.core import FlowsheetBlock
+from idaes.core import (FlowsheetBlock, FlowsheetBlockData,
+                        UnitModelBlockData)
 from idaes.core.util.exceptions import ConfigurationError
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.core.util.dyn_utils import (
     get_activity_dict,
     deactivate_model_at, deactivate_constraints_unindexed_by,
-    fix_vars_unindexed_by, get_derivatives_at, copy_values_at_time,
-    get_implicit_index_of_set)
+    fix_vars_unindexed_by, get_derivatives_at, get_implicit_index_of_set,
+    ValueCorrespondence, get_suffix_block, get_subproblem_block,
+    extrapolate_values_at_time, get_warm_start_order)
 import idaes.logger as idaeslog
 from idaes.core.util import get_solver
 
 __author__ = "Andrew Lee, John Siirola, Robert Parker"
 
+_log = idaeslog.getLogger(__name__)
+
 
 def fix_state_vars(blk, state_args=None):
     """
@@ -162,24 +180,115 @@ def propagate_state(stream, direction="forward"):
 
 
 # HACK, courtesy of J. Siirola
-def solve_indexed_blocks(solver, blocks, **kwds):
+def solve_indexed_blocks(solver, blocks, group_size=None, max_workers=1,
+                         **kwds):
     """
     This method allows for solving of Indexed Block components as if they were
     a single Block. A temporary Block object is created which is populated with
     the contents of the objects in the blocks argument and then solved.
 
+    If group_size or max_workers is given, the elements of the blocks are
+    instead solved separately, in groups of up to group_size elements with one
+    solver call per group. This is only done if the groups are decoupled, i.e.
+    no unfixed variable appears in the active constraints of more than one
+    group; otherwise all blocks are solved together as above. If max_workers
+    is greater than one, the groups are solved concurrently in forked worker
+    processes, each writing its own problem file, and the values of the
+    variables in each group are then loaded back into the model (other
+    solution information, such as duals, is not).
+
     Args:
         solver : a Pyomo solver object to use when solving the Indexed Block
         blocks : an object which inherits from Block, or a list of Blocks
+        group_size : number of block elements to solve together. If None
+            (default) and max_workers is greater than one, the elements are
+            split into one group per worker.
+        max_workers : number of worker processes used to solve groups of
+            block elements. If None, the number of processors on the machine
+            is used. Default = 1 (solve in this process).
         kwds : a dict of argumnets to be passed to the solver
 
     Returns:
-        A Pyomo solver results object
+        A Pyomo solver results object. When the blocks are solved in groups,
+        this is the results of the first group which did not terminate
+        optimally, or of the first group if all did. Groups which did not
+        terminate optimally are logged as warnings, with the names of their
+        blocks.
     """
     # Check blocks argument, and convert to a list of Blocks
     if isinstance(blocks, Block):
         blocks = [blocks]
+    for b in blocks:
+        # Check that object is a Block
+        if not isinstance(b, Block):
+            raise TypeError("Trying to apply solve_indexed_blocks to "
+                            "object containing non-Block objects")
+
+    if group_size is None and max_workers == 1:
+        return _solve_blocks_together(solver, blocks, kwds)
+
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    block_data = [bd for b in blocks for bd in b.values() if bd.active]
+    if group_size is None:
+        group_size = -(-len(block_data) // max_workers)
+    group_size = max(1, group_size)
+    groups = [block_data[i:i+group_size]
+              for i in range(0, len(block_data), group_size)]
+    group_vars = _decoupled_group_variables(groups)
+    if group_vars is None:
+        _log.warning("Blocks are coupled by shared variables and will be "
+                     "solved together.")
+        return _solve_blocks_together(solver, blocks, kwds)
+    # Groups without constraints have nothing to solve
+    nonempty = [i for i, v in enumerate(group_vars) if len(v) > 0]
+    if not nonempty:
+        return _solve_blocks_together(solver, blocks, kwds)
+    groups = [groups[i] for i in nonempty]
+    group_vars = [group_vars[i] for i in nonempty]
+
+    max_workers = min(max_workers, len(groups))
+    if (max_workers > 1 and
+            "fork" not in multiprocessing.get_all_start_methods()):
+        _log.warning("Worker processes require the fork start method, which "
+                     "is not available on this platform. Blocks will be "
+                     "solved in serial.")
+        max_workers = 1
 
+    if max_workers <= 1:
+        results = [_solve_block_group(solver, g, kwds) for g in groups]
+    else:
+        # The model is passed to the workers by forking, as it can not
+        # generally be pickled.
+        _solve_worker['groups'] = groups
+        _solve_worker['group_vars'] = group_vars
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("fork")) \
+                    as executor:
+                futures = [executor.submit(_solve_worker_group, i, solver,
+                                           kwds)
+                           for i in range(len(groups))]
+                results = []
+                for f, variables in zip(futures, group_vars):
+                    values, res = f.result()
+                    for v, val in zip(variables, values):
+                        v.set_value(val, True)
+                    results.append(res)
+        finally:
+            _solve_worker.clear()
+
+    failed = [(g, res) for g, res in zip(groups, results)
+              if not check_optimal_termination(res)]
+    for g, res in failed:
+        _log.warning("Solve of blocks {} terminated with condition: {}"
+                     .format(", ".join(bd.name for bd in g),
+                             res.solver.termination_condition))
+    return failed[0][1] if failed else results[0]
+
+
+def _solve_blocks_together(solver, blocks, kwds):
     try:
         # Create a temporary Block
         tmp = Block(concrete=True)
@@ -188,10 +297,6 @@ def solve_indexed_blocks(solver, blocks, **kwds):
 
         # Iterate over indexed objects
         for i, b in enumerate(blocks):
-            # Check that object is a Block
-            if not isinstance(b, Block):
-                raise TypeError("Trying to apply solve_indexed_blocks to "
-                                "object containing non-Block objects")
             # Append components of BlockData to temporary Block
             try:
                 tmp._decl["block_%s" % i] = i
@@ -217,6 +322,53 @@ def solve_indexed_blocks(solver, blocks, **kwds):
     return results
 
 
+def _decoupled_group_variables(groups):
+    """
+    Get the unfixed variables in the active constraints and objectives of
+    each group of block elements, or None if a variable appears in more than
+    one group.
+    """
+    group_of_var = ComponentMap()
+    group_vars = []
+    for i, group in enumerate(groups):
+        variables = []
+        for bd in group:
+            for c in bd.component_data_objects((Constraint, Objective),
+                                               active=True,
+                                               descend_into=True):
+                expr = c.body if c.ctype is Constraint else c.expr
+                for v in identify_variables(expr, include_fixed=False):
+                    if v not in group_of_var:
+                        group_of_var[v] = i
+                        variables.append(v)
+                    elif group_of_var[v] != i:
+                        return None
+        group_vars.append(variables)
+    return group_vars
+
+
+def _solve_block_group(solver, group, kwds):
+    tmp = Block(concrete=True)
+    tmp.blocks = Reference(dict(enumerate(group)), ctype=Block)
+    return solver.solve(tmp, **kwds)
+
+
+# Model shared with worker processes by solve_indexed_blocks
+_solve_worker = {}
+
+
+def _solve_worker_group(i, solver, kwds):
+    res = _solve_block_group(solver, _solve_worker['groups'][i], kwds)
+    values = [v.value for v in _solve_worker['group_vars'][i]]
+    # Return only the status of the solve, as the full results can refer to
+    # the model
+    summary = SolverResults()
+    summary.solver.status = res.solver.status
+    summary.solver.termination_condition = res.solver.termination_condition
+    summary.solver.message = res.solver.message
+    return values, summary
+
+
 def initialize_by_time_element(fs, time, **kwargs):
     """
     Function to initialize Flowsheet fs element-by-element along 
@@ -225,15 +377,29 @@ def initialize_by_time_element(fs, time, **kwargs):
     and each subsequent finite element can be solved by fixing differential
     and derivative variables at the initial time point of that finite element.
 
+    The components to activate for each finite element are found once,
+    before any element is solved, and each element is solved as a
+    subproblem which refers only to these components, so the rest of the
+    (deactivated) flowsheet is not searched or written for the solver.
+
     Args:
         fs : Flowsheet to initialize
         time : Set whose elements will be solved for individually
         solver : Pyomo solver object initialized with user's desired options
         outlvl : IDAES logger outlvl
         ignore_dof : Bool. If True, checks for square problems will be skipped.
+        warm_start : How variables in each finite element are initialized
+                     before it is solved. 'constant' (default) copies their
+                     values at the initial time point of the element, and
+                     'extrapolate' extrapolates linearly from the last two
+                     time points of the previous element.
 
     Returns:
-        None
+        A list with a dict of statistics for the solve of the initial
+        conditions (element 0) and of each finite element, with keys
+        'element', 'time' (time points solved for), 'setup' (seconds spent
+        activating, fixing and initializing variables), 'solve' (seconds spent
+        in the solver) and 'termination_condition'.
     """
     if not isinstance(fs, FlowsheetBlock):
         raise TypeError('First arg must be a FlowsheetBlock')
@@ -277,6 +443,8 @@ def initialize_by_time_element(fs, time, **kwargs):
     ignore_dof = kwargs.pop('ignore_dof', False)
     solver = kwargs.pop('solver', get_solver())
     fix_diff_only = kwargs.pop('fix_diff_only', True)
+    warm_start = kwargs.pop('warm_start', 'constant')
+    warm_start_order = get_warm_start_order(warm_start)
     # This option makes the assumption that the only variables that
     # link constraints to previous points in time (which must be fixed)
     # are the derivatives and differential variables. Not true if a controller
@@ -313,8 +481,17 @@ def initialize_by_time_element(fs, time, **kwargs):
 
     init_log.info(
     'Model is inactive except at t=0. Solving for consistent initial conditions.')
+    stats = []
+    start = wall_clock.time()
     with idaeslog.solver_log(solver_log, level=idaeslog.DEBUG) as slc:
         results = solver.solve(fs, tee=slc.tee)
+    stats.append({
+        'element': 0,
+        'time': [time.first()],
+        'setup': 0.0,
+        'solve': wall_clock.time() - start,
+        'termination_condition': results.solver.termination_condition,
+        })
     if results.solver.termination_condition == TerminationCondition.optimal:
         init_log.info('Successfully solved for consistent initial conditions')
     else:
@@ -330,7 +507,11 @@ def initialize_by_time_element(fs, time, **kwargs):
     con_unindexed_by_time = deactivate_constraints_unindexed_by(fs, time)
     var_unindexed_by_time = fix_vars_unindexed_by(fs, time)
 
-    # Now model is completely inactive
+    # Now model should be completely inactive. Anything still active is
+    # solved along with every finite element, as it would be if the whole
+    # flowsheet were solved.
+    always_active = list(fs.component_data_objects((Constraint, Objective),
+                                                   active=True))
 
     # For each timestep, we need to
     # 1. Activate model at points we're solving for
@@ -346,21 +527,36 @@ def initialize_by_time_element(fs, time, **kwargs):
                          for d in derivs_at_time[t]]
                          for t in time}
 
+    # Components to activate in each finite element: those that were active
+    # in the presumably square original system
+    element_comps = []
+    for i in range(1, nfe+1):
+        fe = [time[k] for k in range((i-1)*ncp+2, i*ncp+2)]
+        element_comps.append([comp for t in fe for comp in deactivated[t]
+                              if was_originally_active[id(comp)]])
+    suffix_block = get_suffix_block(
+        fs, [comp for comps in element_comps for comp in comps]
+        + always_active)
+
+    # Values of all time-indexed variables, by column of time point
+    var_array = ValueCorrespondence(fs, fs).target_array
+    time_points = list(fs.time)
+    time_positions = {t: k for k, t in enumerate(time_points)}
+
     # Perform a solve for 1 -> nfe; i is the index of the finite element
     init_log.info('Flowsheet has been deactivated. Beginning element-wise initialization')
     for i in range(1, nfe+1):
+        start = wall_clock.time()
         t_prev = time[(i-1)*ncp+1]
         # Non-initial time points in the finite element:
         fe = [time[k] for k in range((i-1)*ncp+2, i*ncp+2)]
 
         init_log.info(f'Entering step {i}/{nfe} of initialization')
 
-        # Activate components of model that were active in the presumably
-        # square original system
-        for t in fe:
-            for comp in deactivated[t]:
-                if was_originally_active[id(comp)]:
-                    comp.activate()
+        comps = element_comps[i-1]
+        for comp in comps:
+            comp.activate()
+        element = get_subproblem_block(comps + always_active, suffix_block)
 
         # Get lists of derivative and differential variables
         # at initial time point of finite element
@@ -385,7 +581,8 @@ def initialize_by_time_element(fs, time, **kwargs):
                 if not dv.value is None:
                     dv.fix()
         else:
-            for con in fs.component_data_objects(Constraint, active=True):
+            for con in element.component_data_objects(Constraint,
+                                                      active=True):
                 for var in identify_variables(con.expr,
                                               include_fixed=False):
                     t_idx = get_implicit_index_of_set(var, time)
@@ -395,24 +592,33 @@ def initialize_by_time_element(fs, time, **kwargs):
                         fixed_vars.append(var)
                         var.fix()
 
-        # Initialize finite element from its initial conditions
-        for t in fe:
-            copy_values_at_time(fs, fs, t, t_prev, copy_fixed=False,
-                                outlvl=idaeslog.ERROR)
+        # Initialize finite element from its initial conditions, or from
+        # the trajectory of the previous finite element
+        extrapolate_values_at_time(
+            var_array, time_points, [time_positions[t] for t in fe],
+            time_positions[t_prev], order=warm_start_order)
 
         # Log that we are solving finite element {i}
         init_log.info(f'Solving finite element {i}')
 
         if not ignore_dof:
-            if degrees_of_freedom(fs) != 0:
+            if degrees_of_freedom(element) != 0:
                 msg = (f'Model has nonzero degrees of freedom at finite element'
                       ' {i}. This was unexpected. '
                       'Use keyword arg igore_dof=True to skip this check.')
                 init_log.error(msg)
                 raise ValueError('Nonzero degrees of freedom')
         
+        setup = wall_clock.time() - start
         with idaeslog.solver_log(solver_log, level=idaeslog.DEBUG) as slc:
-            results = solver.solve(fs, tee=slc.tee)
+            results = solver.solve(element, tee=slc.tee)
+        stats.append({
+            'element': i,
+            'time': fe,
+            'setup': setup,
+            'solve': wall_clock.time() - start - setup,
+            'termination_condition': results.solver.termination_condition,
+            })
         if results.solver.termination_condition == TerminationCondition.optimal:
            init_log.info(f'Successfully solved finite element {i}')
         else:
@@ -420,9 +626,8 @@ def initialize_by_time_element(fs, time, **kwargs):
            raise ValueError('Failure in initialization solve')
 
         # Deactivate components that may have been activated
-        for t in fe:
-            for comp in deactivated[t]:
-                comp.deactivate()
+        for comp in comps:
+            comp.deactivate()
 
         # Unfix variables that have been fixed
         for var in fixed_vars:
@@ -444,3 +649,663 @@ def initialize_by_time_element(fs, time, **kwargs):
 
     # Logger message that initialization is finished
     init_log.info('Initialization completed. Model has been reactivated')
+    init_log.info('Solved {} finite elements in {:.2f} s ({:.2f} s in solver)'
+                  .format(nfe, sum(s['setup'] + s['solve'] for s in stats),
+                          sum(s['solve'] for s in stats)))
+    return stats
+
+
+class BlockTriangularizationInitializer(object):
+    """
+    Initializer for square models, which finds a block triangular
+    decomposition of the active equality constraints and the unfixed
+    variables in them, and solves the resulting strongly connected blocks of
+    constraints one at a time, in order, with the variables of earlier blocks
+    fixed. Blocks with a single variable are solved with
+    calculate_variable_from_constraint, blocks with up to max_newton_size
+    variables by Newton's method, and larger blocks (or small blocks for
+    which these fail) with a solver.
+
+    The decomposition is kept between calls to initialize, and is only found
+    again if constraints are activated or deactivated or variables are fixed
+    or unfixed. The variables in each constraint are only searched for once,
+    so the expressions of constraints should not be changed between calls.
+    Active inequality constraints and objectives are ignored.
+
+    Args:
+        block : model to initialize
+        solver : Pyomo solver object for large blocks (default from
+                 get_solver)
+        max_newton_size : largest number of variables in a block which is
+                          solved by Newton's method (default=10)
+        tol : tolerance on the largest constraint residual of blocks solved
+              by Newton's method (default=1e-8)
+        max_iter : maximum number of Newton iterations (default=20)
+    """
+    def __init__(self, block, solver=None, max_newton_size=10, tol=1e-8,
+                 max_iter=20):
+        if solver is None:
+            solver = get_solver()
+        self.block = block
+        self.solver = solver
+        self.max_newton_size = max_newton_size
+        self.tol = tol
+        self.max_iter = max_iter
+
+        # Variables in each constraint, including fixed variables
+        self._incidence = ComponentMap()
+        self._structure = None
+        self._blocks = None
+
+    def _get_structure(self, cons):
+        return ([id(c) for c in cons],
+                [id(v) for c in cons for v in self._incidence[c] if v.fixed])
+
+    def _equality_constraints(self):
+        cons = []
+        for c in self.block.component_data_objects(Constraint, active=True):
+            if c.equality:
+                cons.append(c)
+                if c not in self._incidence:
+                    self._incidence[c] = list(identify_variables(c.body))
+        return cons
+
+    @property
+    def blocks(self):
+        """
+        List of the blocks of the decomposition of the model as it is now, in
+        the order in which they are solved. Each block is a tuple of a list
+        of variables and a list of constraints.
+        """
+        cons = self._equality_constraints()
+        structure = self._get_structure(cons)
+        if self._blocks is None or structure != self._structure:
+            self._blocks = self._decompose(cons)
+            self._structure = structure
+        return [(variables, constraints)
+                for variables, constraints, _ in self._blocks]
+
+    def _decompose(self, cons):
+        var_idx = ComponentMap()
+        variables = []
+        rows = []
+        cols = []
+        for i, c in enumerate(cons):
+            for v in self._incidence[c]:
+                if v.fixed:
+                    continue
+                j = var_idx.get(v)
+                if j is None:
+                    j = var_idx[v] = len(variables)
+                    variables.append(v)
+                rows.append(i)
+                cols.append(j)
+        n = len(cons)
+        if len(variables) != n:
+            raise ConfigurationError(
+                "{} has {} active equality constraints and {} unfixed "
+                "variables in them. Block triangularization requires a "
+                "square system.".format(self.block.name, n, len(variables)))
+        incidence = sparse.csr_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(n, n))
+
+        # Assign a variable to each constraint
+        matching = maximum_bipartite_matching(incidence, perm_type="column")
+        if np.any(matching < 0):
+            raise ConfigurationError(
+                "{} is structurally singular: no variable can be assigned to "
+                "{} of its equality constraints."
+                .format(self.block.name, int(np.sum(matching < 0))))
+
+        # A constraint depends on the constraints whose assigned variables
+        # appear in it. Dependencies which form cycles are strongly connected
+        # blocks, which are ordered so that each only depends on earlier ones.
+        depends = incidence[:, matching].tocsr()
+        n_blocks, labels = connected_components(
+            depends, directed=True, connection="strong")
+        dep_rows, dep_cols = depends.nonzero()
+        between = labels[dep_rows] != labels[dep_cols]
+        edges = set(zip(labels[dep_cols[between]], labels[dep_rows[between]]))
+        successors = [[] for k in range(n_blocks)]
+        n_predecessors = np.zeros(n_blocks, dtype=int)
+        for a, b in edges:
+            successors[a].append(b)
+            n_predecessors[b] += 1
+        order = []
+        ready = collections.deque(np.flatnonzero(n_predecessors == 0))
+        while ready:
+            a = ready.popleft()
+            order.append(a)
+            for b in successors[a]:
+                n_predecessors[b] -= 1
+                if n_predecessors[b] == 0:
+                    ready.append(b)
+
+        members = [[] for k in range(n_blocks)]
+        for i in range(n):
+            members[labels[i]].append(i)
+        blocks = []
+        for k in order:
+            block_vars = [variables[matching[i]] for i in members[k]]
+            block_cons = [cons[i] for i in members[k]]
+            in_block = set(matching[i] for i in members[k])
+            # Variables of earlier blocks, which are fixed while solving
+            # this block with a solver
+            external = [variables[j] for j in
+                        np.unique(incidence[members[k]].indices)
+                        if j not in in_block]
+            blocks.append((block_vars, block_cons, external))
+        return blocks
+
+    def initialize(self, outlvl=idaeslog.NOTSET):
+        """
+        Solve the blocks of the decomposition of the model in order.
+
+        Args:
+            outlvl : IDAES logger output level
+
+        Returns:
+            None
+        """
+        init_log = idaeslog.getInitLogger(self.block.name, outlvl)
+        solver_log = idaeslog.getSolveLogger(self.block.name, outlvl)
+
+        blocks = self.blocks
+        n_newton = 0
+        for k, (block_vars, block_cons, external) in enumerate(self._blocks):
+            if len(block_vars) == 1:
+                x0 = block_vars[0].value
+                try:
+                    calculate_variable_from_constraint(
+                        block_vars[0], block_cons[0])
+                    n_newton += 1
+                    continue
+                except (ValueError, RuntimeError, ArithmeticError):
+                    # Start the fallbacks from the initial guess, not the
+                    # last value of the failed attempt
+                    block_vars[0].set_value(x0, True)
+            if len(block_vars) <= self.max_newton_size:
+                if self._newton(block_vars, block_cons):
+                    n_newton += 1
+                    continue
+
+            for v in external:
+                v.fix()
+            try:
+                subproblem = get_subproblem_block(block_cons)
+                with idaeslog.solver_log(solver_log,
+                                         level=idaeslog.DEBUG) as slc:
+                    results = self.solver.solve(subproblem, tee=slc.tee)
+            finally:
+                for v in external:
+                    v.unfix()
+            if not check_optimal_termination(results):
+                init_log.error(
+                    "Failed to solve block {} of {} ({} variables)"
+                    .format(k+1, len(blocks), len(block_vars)))
+                raise ValueError("Failure in initialization solve")
+
+        init_log.info(
+            "Initialization complete: solved {} blocks, {} by Newton's method "
+            "and {} with solver".format(
+                len(blocks), n_newton, len(blocks) - n_newton))
+
+    def _newton(self, variables, constraints):
+        # Solve a block by Newton's method with a backtracking line search,
+        # keeping variables within their bounds. Returns False (with the
+        # original values restored) if the method fails.
+        x0 = [v.value for v in variables]
+        lb = np.array([-np.inf if v.lb is None else v.lb for v in variables])
+        ub = np.array([np.inf if v.ub is None else v.ub for v in variables])
+        x = np.array([0.0 if val is None else val for val in x0])
+        x = np.clip(x, lb, ub)
+        try:
+            self._set_values(variables, x)
+            res = self._residuals(constraints)
+            for i in range(self.max_iter):
+                if np.max(np.abs(res)) <= self.tol:
+                    return True
+                jac = np.array(
+                    [differentiate(c.body, wrt_list=variables)
+                     for c in constraints], dtype=float)
+                step = np.linalg.solve(jac, -res)
+                norm = np.linalg.norm(res)
+                alpha = 1.0
+                while True:
+                    x_new = np.clip(x + alpha*step, lb, ub)
+                    self._set_values(variables, x_new)
+                    res_new = self._residuals(constraints)
+                    if np.linalg.norm(res_new) < norm or alpha < 1e-4:
+                        break
+                    alpha *= 0.5
+                x, res = x_new, res_new
+            if np.max(np.abs(res)) <= self.tol:
+                return True
+        except (ValueError, ArithmeticError, np.linalg.LinAlgError):
+            pass
+        for v, val in zip(variables, x0):
+            v.set_value(val, True)
+        return False
+
+    @staticmethod
+    def _set_values(variables, x):
+        for v, val in zip(variables, x):
+            v.set_value(float(val), True)
+
+    @staticmethod
+    def _residuals(constraints):
+        res = np.array([value(c.body) - value(c.upper) for c in constraints],
+                       dtype=float)
+        if not np.all(np.isfinite(res)):
+            raise ValueError("Constraint residual is not finite")
+        return res
+
+
+def initialize_sequential_modular(fs, tear_guesses=None, tear_tol=1e-5,
+                                  max_iter=20, accel="wegstein",
+                                  unit_kwargs=None, max_workers=1,
+                                  outlvl=idaeslog.NOTSET):
+    """
+    Function to initialize the units of a flowsheet in sequence, propagating
+    the state of each Arc from its source unit before its destination unit
+    is initialized. The units and Arcs of the flowsheet form a directed
+    graph; if it has cycles (recycles), tear streams are selected to break
+    them, and the sequence is repeated until the values on both sides of
+    each tear stream agree. Units in the same stage of the sequence (i.e.
+    which do not depend on each other) can be initialized concurrently in
+    forked worker processes. After the first pass, only the units in a
+    recycle, or downstream of one, are initialized again.
+
+    The units are the Blocks directly within fs which contain Ports connected
+    by an Arc in fs, along with any other UnitModelBlocks and sub-flowsheets
+    directly within fs. Each unit must have an initialize method, except for
+    sub-flowsheets, which are initialized by initialize_sequential_modular in
+    turn. Ports declared directly on fs are the feeds and products of the
+    flowsheet: Arcs from them are propagated before the units they feed are
+    initialized, and Arcs to them once all passes are complete. The members
+    of each Port at the destination of an Arc must be Vars (as for
+    propagate_state).
+
+    Args:
+        fs : Flowsheet to initialize
+        tear_guesses : a dict (or ComponentMap) of tear Arcs to dicts of
+                values for the members of their destination Ports (with
+                dicts of values keyed by index for indexed members), used as
+                initial guesses for the tear streams. Guesses for Arcs which
+                are not selected as tears are ignored. If not given, the
+                current values of the destination Ports are used.
+        tear_tol : tolerance on the relative difference between values on
+                both sides of each tear stream (default=1e-5)
+        max_iter : maximum number of passes through the sequence of units
+                (default=20)
+        accel : method used to update tear stream guesses: 'wegstein'
+                (default), 'broyden' or 'direct' (direct substitution)
+        unit_kwargs : a dict (or ComponentMap) of units to dicts of keyword
+                arguments for their initialize methods. outlvl is passed to
+                every unit unless given here.
+        max_workers : number of worker processes used to initialize units in
+                the same stage of the sequence. If None, the number of
+                processors on the machine is used. Default = 1 (initialize
+                in this process). Only the values of the variables in each
+                unit are returned from the workers.
+        outlvl : IDAES logger output level
+
+    Returns:
+        A dict with keys 'converged' (whether the tear streams converged),
+        'iterations' (number of passes through the sequence), 'tears' (list
+        of tear Arcs), 'order' (list of stages, each a list of units) and
+        'units' (a ComponentMap of each unit to a dict with keys 'calls',
+        the number of times it was initialized, and 'time', the total
+        seconds spent initializing it).
+    """
+    if not isinstance(fs, FlowsheetBlock):
+        raise TypeError('First arg must be a FlowsheetBlock')
+    if accel not in ("wegstein", "broyden", "direct"):
+        raise ValueError("Unrecognized accel option {}. Must be one of "
+                         "'wegstein', 'broyden' or 'direct'.".format(accel))
+    if max_iter < 1:
+        raise ValueError("max_iter must be at least 1, not {}"
+                         .format(max_iter))
+    init_log = idaeslog.getInitLogger(fs.name, outlvl)
+    if unit_kwargs is None:
+        unit_kwargs = {}
+    unit_kwargs = ComponentMap(unit_kwargs.items())
+    if tear_guesses is None:
+        tear_guesses = {}
+    tear_guesses = ComponentMap(tear_guesses.items())
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    if (max_workers > 1 and
+            "fork" not in multiprocessing.get_all_start_methods()):
+        _log.warning("Worker processes require the fork start method, which "
+                     "is not available on this platform. Units will be "
+                     "initialized in serial.")
+        max_workers = 1
+
+    units, arcs, products = _flowsheet_graph(fs)
+    tears, order = _select_tears(
+        units, [(arc, i, j) for arc, i, j in arcs if i is not None])
+    inlets = ComponentMap((u, []) for u in units)
+    for arc, i, j in arcs:
+        if arc not in tears:
+            inlets[units[j]].append(arc)
+    # Units whose inlets can change between passes: those in a recycle, or
+    # downstream of one
+    in_recycle = np.zeros(len(units), dtype=bool)
+    stack = []
+    for arc, i, j in arcs:
+        if arc in tears and not in_recycle[j]:
+            in_recycle[j] = True
+            stack.append(j)
+    successors = [[] for u in units]
+    for arc, i, j in arcs:
+        if i is not None:
+            successors[i].append(j)
+    while stack:
+        for j in successors[stack.pop()]:
+            if not in_recycle[j]:
+                in_recycle[j] = True
+                stack.append(j)
+    in_recycle = ComponentSet(u for u, r in zip(units, in_recycle) if r)
+    stats = ComponentMap((u, {"calls": 0, "time": 0.0}) for u in units)
+    for u in units:
+        if not (isinstance(u, FlowsheetBlockData) or
+                hasattr(u, "initialize")):
+            raise TypeError("Unit {} does not have an initialize method"
+                            .format(u.name))
+        kwargs = unit_kwargs.setdefault(u, {})
+        kwargs.setdefault("outlvl", outlvl)
+
+    tear_src = []
+    tear_dest = []
+    for arc in tears:
+        src_vars, dest_vars = _port_vars(arc)
+        guess = tear_guesses.get(arc, {})
+        for name, val in guess.items():
+            member = arc.destination.vars[name]
+            if isinstance(val, dict):
+                for k, v in val.items():
+                    member[k].set_value(v)
+            else:
+                member.set_value(val)
+        tear_src.extend(src_vars)
+        tear_dest.extend(dest_vars)
+    if tears:
+        init_log.info("Tear streams: {}".format(
+            ", ".join(arc.name for arc in tears)))
+    lb = np.array([-np.inf if v.lb is None else v.lb for v in tear_dest],
+                  dtype=float)
+    ub = np.array([np.inf if v.ub is None else v.ub for v in tear_dest],
+                  dtype=float)
+
+    x = _values(tear_dest)
+    x_prev = g_prev = f_prev = None
+    inv_jac = -np.eye(len(x))
+    converged = False
+    for k in range(1, max_iter+1):
+        init_log.info("Initializing units, pass {}".format(k))
+        for stage in order:
+            if k > 1:
+                stage = [u for u in stage if u in in_recycle]
+            for u in stage:
+                for arc in inlets[u]:
+                    propagate_state(arc)
+            _initialize_stage(stage, unit_kwargs, stats, max_workers)
+
+        g = _values(tear_src)
+        err = np.abs(g - x)/np.maximum(1, np.abs(g))
+        err = np.max(err[np.isfinite(err)], initial=0.0)
+        init_log.info_high("Pass {}: largest relative tear stream error {}"
+                           .format(k, err))
+        if err <= tear_tol:
+            converged = True
+            for arc in tears:
+                propagate_state(arc)
+            break
+
+        if accel == "wegstein" and x_prev is not None:
+            dx = x - x_prev
+            with np.errstate(divide="ignore", invalid="ignore"):
+                slope = (g - g_prev)/dx
+                q = slope/(slope - 1)
+            q[~np.isfinite(q)] = 0.0
+            q = np.clip(q, -5, 0)
+            x_new = q*x + (1 - q)*g
+        elif accel == "broyden":
+            f = g - x
+            if x_prev is not None:
+                dx = x - x_prev
+                df = f - f_prev
+                h_df = inv_jac @ df
+                denom = dx @ h_df
+                if np.isfinite(denom) and abs(denom) > 1e-12:
+                    inv_jac += np.outer(dx - h_df, dx @ inv_jac)/denom
+            x_new = x - inv_jac @ f
+            f_prev = f
+        else:
+            x_new = g.copy()
+        # Use direct substitution where values are not known
+        unknown = ~np.isfinite(x_new)
+        x_new[unknown] = g[unknown]
+        x_new = np.clip(x_new, lb, ub)
+
+        x_prev, g_prev = x, g
+        for v, val in zip(tear_dest, x_new):
+            if not np.isnan(val):
+                v.set_value(float(val), True)
+        x = x_new
+
+    for arc in products:
+        propagate_state(arc)
+    if converged:
+        init_log.info("Flowsheet initialization converged in {} passes"
+                      .format(k))
+    else:
+        init_log.warning("Tear streams did not converge in {} passes"
+                         .format(max_iter))
+    for u in units:
+        init_log.info_high("{}: {} initialize calls in {:.2f} s".format(
+            u.name, stats[u]["calls"], stats[u]["time"]))
+
+    return {"converged": converged,
+            "iterations": k,
+            "tears": tears,
+            "order": order,
+            "units": stats}
+
+
+def _flowsheet_graph(fs):
+    """
+    Get the units of a flowsheet, a list of tuples of each Arc to a unit
+    with the positions of its source and destination units (None if its
+    source is a Port of the flowsheet itself), and a list of the Arcs to
+    Ports of the flowsheet itself.
+    """
+    units = []
+    unit_idx = ComponentMap()
+    for b in fs.component_data_objects(Block, descend_into=False):
+        if isinstance(b, (UnitModelBlockData, FlowsheetBlockData)):
+            unit_idx[b] = len(units)
+            units.append(b)
+
+    def unit_of(port):
+        b = port.parent_block()
+        if b is fs:
+            return None
+        while b is not None and b.parent_block() is not fs:
+            b = b.parent_block()
+        if b is None:
+            raise ConfigurationError("Port {} is not in flowsheet {}"
+                                     .format(port.name, fs.name))
+        if b not in unit_idx:
+            unit_idx[b] = len(units)
+            units.append(b)
+        return unit_idx[b]
+
+    arcs = []
+    products = []
+    for arc in fs.component_data_objects(Arc, descend_into=False):
+        i = unit_of(arc.source)
+        j = unit_of(arc.destination)
+        if j is None:
+            products.append(arc)
+        else:
+            arcs.append((arc, i, j))
+    return units, arcs, products
+
+
+def _select_tears(units, arcs):
+    """
+    Select Arcs to tear so that the remaining graph of units has no cycles,
+    and order the units in stages, such that each unit only depends on units
+    in earlier stages through Arcs which are not torn. Tears are any Arcs
+    from a unit back to itself, and the Arcs to units on the current path of
+    a depth-first search of each strongly connected set of units, starting
+    from a unit fed from outside the set.
+
+    Returns:
+        list of tear Arcs, list of stages (lists of units)
+    """
+    n = len(units)
+    if arcs:
+        adjacency = sparse.csr_matrix(
+            (np.ones(len(arcs)), ([i for _, i, _ in arcs],
+                                  [j for _, _, j in arcs])), shape=(n, n))
+    else:
+        adjacency = sparse.csr_matrix((n, n))
+    n_sets, labels = connected_components(adjacency, directed=True,
+                                          connection="strong")
+    out_arcs = [[] for i in range(n)]
+    fed_from_outside = np.zeros(n, dtype=bool)
+    tears = ComponentSet()
+    for arc, i, j in arcs:
+        if i == j:
+            tears.add(arc)
+        elif labels[i] == labels[j]:
+            out_arcs[i].append((arc, j))
+        else:
+            fed_from_outside[j] = True
+
+    visited = np.zeros(n, dtype=bool)
+    for k in range(n_sets):
+        members = np.flatnonzero(labels == k)
+        if len(members) == 1:
+            continue
+        start = [i for i in members if fed_from_outside[i]]
+        start = start[0] if start else members[0]
+        # Iterative depth-first search, tearing Arcs back to the path
+        on_path = np.zeros(n, dtype=bool)
+        visited[start] = on_path[start] = True
+        stack = [(start, iter(out_arcs[start]))]
+        while stack:
+            i, it = stack[-1]
+            for arc, j in it:
+                if on_path[j]:
+                    tears.add(arc)
+                elif not visited[j]:
+                    visited[j] = on_path[j] = True
+                    stack.append((j, iter(out_arcs[j])))
+                    break
+            else:
+                on_path[i] = False
+                stack.pop()
+
+    successors = [[] for i in range(n)]
+    n_predecessors = np.zeros(n, dtype=int)
+    for arc, i, j in arcs:
+        if arc not in tears:
+            successors[i].append(j)
+            n_predecessors[j] += 1
+    order = []
+    stage = list(np.flatnonzero(n_predecessors == 0))
+    while stage:
+        order.append([units[i] for i in stage])
+        next_stage = []
+        for i in stage:
+            for j in successors[i]:
+                n_predecessors[j] -= 1
+                if n_predecessors[j] == 0:
+                    next_stage.append(j)
+        stage = next_stage
+    return list(tears), order
+
+
+def _port_vars(arc):
+    """
+    Get lists of the VarData objects in the source and destination Ports of
+    an Arc, in corresponding order.
+    """
+    src_vars = []
+    dest_vars = []
+    for name, member in arc.source.vars.items():
+        dest_member = arc.destination.vars[name]
+        if not isinstance(dest_member, Var):
+            raise TypeError("Port contains one or more members which are "
+                            "not Vars. Tear streams can only be converged "
+                            "for Ports of Vars.")
+        for i in member:
+            src_vars.append(member[i])
+            dest_vars.append(dest_member[i])
+    return src_vars, dest_vars
+
+
+def _values(variables):
+    return np.array([np.nan if value(v, exception=False) is None
+                     else value(v) for v in variables], dtype=float)
+
+
+def _initialize_stage(stage, unit_kwargs, stats, max_workers):
+    """
+    Initialize the units in a stage, in worker processes if max_workers is
+    greater than one.
+    """
+    n_workers = min(max_workers, len(stage))
+    if n_workers <= 1:
+        for u in stage:
+            start = wall_clock.time()
+            _initialize_unit(u, unit_kwargs[u])
+            stats[u]["calls"] += 1
+            stats[u]["time"] += wall_clock.time() - start
+        return
+
+    # The model is passed to the workers by forking, as it can not generally
+    # be pickled. A new pool is used for each stage, so that workers are
+    # forked after the previous stages are initialized.
+    _init_worker["units"] = stage
+    _init_worker["unit_vars"] = [
+        list(u.component_data_objects(Var, descend_into=True))
+        for u in stage]
+    _init_worker["unit_kwargs"] = [unit_kwargs[u] for u in stage]
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=multiprocessing.get_context("fork")) as executor:
+            futures = [executor.submit(_initialize_worker_unit, i)
+                       for i in range(len(stage))]
+            for f, u, variables in zip(
+                    futures, stage, _init_worker["unit_vars"]):
+                values, elapsed = f.result()
+                for v, val in zip(variables, values):
+                    v.set_value(val, True)
+                stats[u]["calls"] += 1
+                stats[u]["time"] += elapsed
+    finally:
+        _init_worker.clear()
+
+
+def _initialize_unit(unit, kwargs):
+    if isinstance(unit, FlowsheetBlockData):
+        initialize_sequential_modular(unit, **kwargs)
+    else:
+        unit.initialize(**kwargs)
+
+
+# Model shared with worker processes by initialize_sequential_modular
+_init_worker = {}
+
+
+def _initialize_worker_unit(i):
+    start = wall_clock.time()
+    _initialize_unit(_init_worker["units"][i], _init_worker["unit_kwargs"][i])
+    elapsed = wall_clock.time() - start
+    return [v.value for v in _init_worker["unit_vars"][i]], elapsed
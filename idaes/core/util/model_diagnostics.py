@@ -20,12 +20,13 @@ __author__ = "Alexander Dowling"
 
 import pyomo.environ as pyo
 from pyomo.core.expr.visitor import identify_variables
-from pyomo.contrib.pynumero.interfaces.pyomo_nlp import PyomoNLP
 import numpy as np
 from scipy.sparse.linalg import svds
 from scipy.sparse import issparse, find
 
 from idaes.core.util.model_statistics import large_residuals_set, variables_near_bounds_set
+from idaes.core.util.scaling import (DiagnosticsSession,
+                                     smallest_singular_values)
 
 from pyomo.opt import SolverStatus, TerminationCondition
 
@@ -36,12 +37,15 @@ from operator import itemgetter
 
 class DegeneracyHunter():
 
-    def __init__(self, block_or_jac, solver=None):
+    def __init__(self, block_or_jac, solver=None, session=None):
         ''' Initialize Degeneracy Hunter Object
     
         Arguments:
             block_or_jac: Pyomo model or Jacobian
             solver: Pyomo SolverFactory
+            session: DiagnosticsSession for the model, to share its Pynumero
+                NLP with other diagnostics tools (a new session is created
+                if None)
             
         Notes:
             Passing a Jacobian to Degeneracy Hunter is current untested.
@@ -60,7 +64,11 @@ class DegeneracyHunter():
             self.block = block_or_jac
         
             # setup pynumero interface
-            self.nlp = PyomoNLP(self.block)
+            if session is None:
+                session = DiagnosticsSession(self.block)
+            self.session = session
+
+            self.nlp = session.nlp
 
             # calculate Jacobian of equality constraints in COO sparse matrix format
             jac_eq = self.nlp.evaluate_jacobian_eq()
@@ -69,7 +77,7 @@ class DegeneracyHunter():
             self.jac_eq = jac_eq
         
             # Create a list of equality constraint names            
-            self.eq_con_list = PyomoNLP.get_pyomo_equality_constraints(self.nlp)
+            self.eq_con_list = self.nlp.get_pyomo_equality_constraints()
         
             self.candidate_eqns = None
         
@@ -491,12 +499,15 @@ class DegeneracyHunter():
             return None, None
         
     
-    def svd_analysis(self, n_smallest_sv=10):
+    def svd_analysis(self, n_smallest_sv=10, shift_invert=False):
         '''
         Perform SVD analysis of the constraint Jacobian
         
         Args:
             n_smallest_sv: number of smallest singular values to compute
+            shift_invert: if True, use shift-invert iterations with a sparse
+                LU factorization (see smallest_singular_values), which
+                converge much faster than svds for large models
             
         Returns:
             Nothing
@@ -519,7 +530,10 @@ class DegeneracyHunter():
             # And V is a n_var x n_var
             # (U or V may be smaller in economy mode)
             # Thus we really only care about U
-            u, s, v = svds(self.jac_eq, k = n_sv, which='SM')
+            if shift_invert:
+                u, s, v = smallest_singular_values(self.jac_eq, k=n_sv)
+            else:
+                u, s, v = svds(self.jac_eq, k = n_sv, which='SM')
         
             # Save results
             self.u = u
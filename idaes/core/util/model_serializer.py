@@ -23,6 +23,8 @@ import datetime
 import time
 import gzip
 
+import numpy as np
+
 # Some more inforation about this module
 __author__ = "John Eslick"
 __format_version__ = 4
@@ -857,3 +859,441 @@ def from_json(o, sd=None, fname=None, s=None, wts=None, gz=None, root_name=None)
     pdict["etime_read_dict"] = read_time - dict_time
     pdict["etime_read_suffixes"] = suffix_time - read_time
     return pdict
+
+
+class SnapshotLayout(object):
+    """
+    A flat, ordered layout of the component data in a Pyomo component for
+    columnar (array based) state snapshots. The component tree is walked
+    once, following the same StoreSpec rules as to_json, and the data
+    objects to save are stored in three tables: variables, mutable
+    parameters and components with an active attribute. A snapshot is then a
+    dictionary of NumPy arrays, one column per stored attribute, and saving
+    or loading a snapshot on the same model structure is a loop over a
+    precomputed list of data objects with no name lookups.
+
+    Suffixes and StoreSpec write callbacks are not supported in columnar
+    snapshots, use to_json for these.
+
+    Args:
+        o: The Pyomo component (usually a model or a block) to lay out
+        wts: StoreSpec object specifying what to save and load, if None the
+            default StoreSpec is used
+
+    Attributes:
+        var_attrs: Tuple of variable attributes stored
+        var_data: List of variable data objects
+        param_data: List of mutable parameter data objects
+        active_data: List of components and component data objects with an
+            active attribute stored
+    """
+    _var_columns = ("value", "fixed", "stale", "lb", "ub")
+
+    def __init__(self, o, wts=None):
+        if wts is None:
+            wts = StoreSpec()
+        self.root = o
+        self.wts = wts
+        self.var_attrs = None
+        self.var_filter = None
+        self.var_data = []
+        self.param_data = []
+        self.active_data = []
+        self._names = None
+        self._add_component(o)
+        if self.var_attrs is None:
+            self.var_attrs = ()
+
+    def _add_component(self, o):
+        alist, ff = self.wts.get_class_attr_list(o)
+        if alist is None:
+            return
+        if "active" in alist:
+            self.active_data.append(o)
+        if isinstance(o, Suffix):
+            return
+        if isinstance(o, ComponentData):
+            items = [o]
+        else:
+            items = o.values()
+        frst = True
+        for el in items:
+            if frst:
+                alist, ff = self.wts.get_data_class_attr_list(el)
+                if alist is None:
+                    return
+                frst = False
+            self._add_component_data(el, alist, ff)
+            if _may_have_subcomponents(el):
+                for o2 in el.component_objects(descend_into=False):
+                    self._add_component(o2)
+
+    def _add_component_data(self, el, alist, ff):
+        if isinstance(el, pyomo.core.base.var._VarData):
+            attrs = tuple(a for a in self._var_columns if a in alist)
+            if self.var_attrs is None:
+                self.var_attrs = attrs
+                self.var_filter = ff
+            elif attrs != self.var_attrs or ff is not self.var_filter:
+                raise ValueError(
+                    "Columnar snapshots require all variables to store the "
+                    "same attributes, {} stores {} not {}".format(
+                        el.name, attrs, self.var_attrs))
+            self.var_data.append(el)
+        elif isinstance(el, pyomo.core.base.param._ParamData):
+            if "value" in alist and el.parent_component()._mutable:
+                self.param_data.append(el)
+        elif "active" in alist and isinstance(el, ComponentData):
+            # scalar components are their own data and may already be added
+            if not (self.active_data and self.active_data[-1] is el):
+                self.active_data.append(el)
+
+    @property
+    def names(self):
+        """
+        Dictionary with the lists of names (relative to the root component)
+        of the objects in each table, keys are "var", "param" and "active".
+        """
+        if self._names is None:
+            buf = {}
+            if self.root.parent_block() is None:
+                n0 = 0
+            else:
+                n0 = len(self.root.getname(
+                    fully_qualified=True, name_buffer=buf)) + 1
+            def _names(objs):
+                return [
+                    "" if c is self.root else
+                    c.getname(fully_qualified=True, name_buffer=buf)[n0:]
+                    for c in objs]
+            self._names = {
+                "var": _names(self.var_data),
+                "param": _names(self.param_data),
+                "active": _names(self.active_data)}
+        return self._names
+
+    def capture(self, out=None):
+        """
+        Take a snapshot of the current state of the laid out component.
+
+        Args:
+            out: Optional dictionary of arrays from a previous call to
+                capture() to write the snapshot into, rather than allocating
+                new arrays.
+
+        Returns:
+            Dictionary of NumPy arrays, keys are "var_<attr>" for each
+            variable attribute stored, "param_value" and "active". Values,
+            and bounds which are None are stored as NaN.
+        """
+        if out is None:
+            out = {}
+        vd = self.var_data
+        n = len(vd)
+        for a in self.var_attrs:
+            if a == "value":
+                col = np.fromiter(
+                    (_nan_none(v.value) for v in vd), dtype=float, count=n)
+            elif a == "fixed":
+                col = np.fromiter((v.fixed for v in vd), dtype=bool, count=n)
+            elif a == "stale":
+                col = np.fromiter((v.stale for v in vd), dtype=bool, count=n)
+            elif a == "lb":
+                col = np.fromiter(
+                    (_nan_none(v.lb) for v in vd), dtype=float, count=n)
+            else:
+                col = np.fromiter(
+                    (_nan_none(v.ub) for v in vd), dtype=float, count=n)
+            _set_column(out, "var_" + a, col)
+        _set_column(out, "param_value", np.fromiter(
+            (_nan_none(p.value) for p in self.param_data),
+            dtype=float,
+            count=len(self.param_data)))
+        _set_column(out, "active", np.fromiter(
+            (c.active for c in self.active_data),
+            dtype=bool,
+            count=len(self.active_data)))
+        return out
+
+    def restore(self, sd, names=None):
+        """
+        Load a snapshot into the laid out component.
+
+        Args:
+            sd: Dictionary of arrays created by capture(), or read from a file
+                written by to_npz
+            names: If None, the snapshot is assumed to have been taken with
+                this layout (or one of an identical model). Otherwise, a
+                dictionary of name lists like the names attribute for the
+                layout the snapshot was taken with, which is used to match
+                snapshot entries to data objects by name.
+
+        Returns:
+            None
+        """
+        if names is None:
+            var_idx = param_idx = active_idx = None
+        else:
+            var_idx = self._match(names["var"], self.names["var"])
+            param_idx = self._match(names["param"], self.names["param"])
+            active_idx = self._match(names["active"], self.names["active"])
+
+        # activate and deactivate first, so values are loaded in the same
+        # order as from_json
+        if "active" in sd:
+            for c, a in _pairs(self.active_data, sd["active"], active_idx):
+                if a:
+                    c.activate()
+                else:
+                    c.deactivate()
+        elif self.active_data and not self.wts.ignore_missing:
+            raise KeyError("active")
+
+        if "param_value" in sd:
+            for p, x in _pairs(self.param_data, sd["param_value"], param_idx):
+                p.value = None if x != x else x
+        elif self.param_data and not self.wts.ignore_missing:
+            raise KeyError("param_value")
+
+        if not self.var_data:
+            return
+        # snapshot columns in layout order
+        if var_idx is None:
+            vd = self.var_data
+            cols = {a: sd["var_" + a] for a in self.var_attrs
+                    if "var_" + a in sd}
+        else:
+            vd = [v for v, i in zip(self.var_data, var_idx) if i >= 0]
+            present = var_idx[var_idx >= 0]
+            cols = {a: sd["var_" + a][present] for a in self.var_attrs
+                    if "var_" + a in sd}
+        if len(cols) < len(self.var_attrs) and not self.wts.ignore_missing:
+            raise KeyError([a for a in self.var_attrs if a not in cols])
+
+        if "fixed" in cols:
+            for v, f in zip(vd, cols["fixed"].tolist()):
+                if f:
+                    v.fix()
+                else:
+                    v.unfix()
+        if "value" in cols:
+            if self.var_filter is None:
+                load = None
+            elif self.var_filter is _only_fixed and "fixed" in cols:
+                # only load values for variables fixed in the snapshot
+                load = cols["fixed"]
+            else:
+                load = np.fromiter(
+                    ("value" in self.var_filter(
+                        v, {a: cols[a][i] for a in cols})
+                     for i, v in enumerate(vd)),
+                    dtype=bool,
+                    count=len(vd))
+            if load is None:
+                for v, x in zip(vd, cols["value"].tolist()):
+                    v.value = None if x != x else x
+            else:
+                for v, x, l in zip(
+                        vd, cols["value"].tolist(), load.tolist()):
+                    if l:
+                        v.value = None if x != x else x
+        if "stale" in cols:
+            for v, x in zip(vd, cols["stale"].tolist()):
+                v.stale = x
+        if "lb" in cols:
+            for v, x in zip(vd, cols["lb"].tolist()):
+                v.setlb(None if x != x else x)
+        if "ub" in cols:
+            for v, x in zip(vd, cols["ub"].tolist()):
+                v.setub(None if x != x else x)
+
+    def _match(self, snapshot_names, names):
+        # Index of each of names in snapshot_names, or -1 if missing
+        if len(snapshot_names) == len(names) and \
+                all(a == b for a, b in zip(snapshot_names, names)):
+            return None
+        lookup = {n: i for i, n in enumerate(snapshot_names)}
+        idx = np.fromiter(
+            (lookup.get(n, -1) for n in names), dtype=int, count=len(names))
+        if not self.wts.ignore_missing and (idx < 0).any():
+            raise KeyError(names[int(np.argmax(idx < 0))])
+        return idx
+
+
+def _nan_none(x):
+    return np.nan if x is None else x
+
+
+def _set_column(sd, key, col):
+    # Store a column in a snapshot, in place if the snapshot already has it
+    if key in sd:
+        sd[key][...] = col
+    else:
+        sd[key] = col
+
+
+def _pairs(objs, col, idx):
+    # Pair data objects with snapshot column entries, using the index array
+    # from SnapshotLayout._match if the snapshot has a different layout
+    col = col.tolist()
+    if idx is None:
+        return zip(objs, col)
+    return ((o, col[i]) for o, i in zip(objs, idx.tolist()) if i >= 0)
+
+
+class StateCheckpoint(object):
+    """
+    Reusable in-memory checkpoints of the state of a Pyomo component, for
+    loops which repeatedly save and restore a model state (e.g. homotopy
+    steps, rolling horizons and parameter sweeps). The component is laid out
+    once for the given StoreSpec (see SnapshotLayout) when the checkpoint is
+    created, and each capture writes the state into arrays preallocated for
+    a fixed number of slots, so neither capturing nor restoring walks the
+    model or builds dictionaries.
+
+    The model structure must not change while the checkpoint is used.
+    Suffixes are not stored.
+
+    Args:
+        o: The Pyomo component (usually a model or a block) to checkpoint
+        wts: StoreSpec object specifying what to save and restore, if None
+            the default StoreSpec is used
+        slots: number of states which can be held at once
+    """
+    def __init__(self, o, wts=None, slots=1):
+        self.layout = SnapshotLayout(o, wts)
+        self._slots = []
+        for i in range(slots):
+            self._slots.append(self.layout.capture())
+        self._captured = [False]*slots
+
+    @property
+    def slots(self):
+        """Number of states which can be held at once."""
+        return len(self._slots)
+
+    def capture(self, slot=0):
+        """
+        Save the current state of the component in a slot, overwriting any
+        state previously captured in it.
+
+        Args:
+            slot: index of the slot to save the state in
+
+        Returns:
+            None
+        """
+        self.layout.capture(out=self._slots[slot])
+        self._captured[slot] = True
+
+    def restore(self, slot=0):
+        """
+        Restore the component to the state captured in a slot. The captured
+        state is kept, so it can be restored more than once.
+
+        Args:
+            slot: index of the slot to restore the state from
+
+        Returns:
+            None
+        """
+        if not self._captured[slot]:
+            raise ValueError(
+                "No state has been captured in checkpoint slot {}."
+                .format(slot))
+        self.layout.restore(self._slots[slot])
+
+    def has_state(self, slot=0):
+        """Returns True if a state has been captured in the given slot."""
+        return self._captured[slot]
+
+
+def to_npz(o, fname, wts=None, layout=None, compress=False, metadata=None):
+    """
+    Save the state of a model to a columnar NumPy .npz file. This is an
+    alternative to to_json, which is much faster to write and read for large
+    models, but does not store suffixes. The file contains the names of
+    the saved data objects (relative to o) and one array per attribute.
+
+    Args:
+        o: The Pyomo component object to save
+        fname: .npz file name or file object to save model state to
+        wts: StoreSpec object specifying what to save, if None the default
+            is used which saves the complete model state (except suffixes)
+        layout: SnapshotLayout of o to use, if a model is saved repeatedly
+            this avoids walking the model each time. If a layout is given,
+            wts is ignored.
+        compress: if True, compress the arrays in the file
+        metadata: A dictionary of additional metadata to add, must be json
+            serializable
+
+    Returns:
+        The SnapshotLayout used to save the model
+    """
+    if layout is None:
+        layout = SnapshotLayout(o, wts)
+    if metadata is None:
+        metadata = {}
+    now = datetime.datetime.now()
+    md = {
+        "format_version": __format_version__,
+        "date": datetime.date.isoformat(now.date()),
+        "time": datetime.time.isoformat(now.time()),
+        "var_attrs": list(layout.var_attrs),
+        "other": metadata}
+    arrays = layout.capture()
+    names = layout.names
+    for k in names:
+        md["n_" + k] = len(names[k])
+    for k in names:
+        # names are stored as newline separated utf-8 text, which is much
+        # smaller than a fixed width unicode array
+        arrays[k + "_names"] = np.frombuffer(
+            "\n".join(names[k]).encode("utf-8"), dtype=np.uint8)
+    arrays["__metadata__"] = np.array(json.dumps(md))
+    if compress:
+        np.savez_compressed(fname, **arrays)
+    else:
+        np.savez(fname, **arrays)
+    return layout
+
+
+def from_npz(o, fname, wts=None, layout=None):
+    """
+    Load the state of a Pyomo component from a .npz file written by to_npz.
+    Entries are matched to data objects by name, so the model must have the
+    same structure as the saved model, though as in from_json components
+    missing from the file are ignored if the StoreSpec ignore_missing
+    option is True.
+
+    Args:
+        o: Pyomo component for which to load state
+        fname: .npz file name or file object to load
+        wts: StoreSpec object specifying what to load, if None the default
+            is used
+        layout: SnapshotLayout of o to use, if a model is loaded repeatedly
+            this avoids walking the model each time. If a layout is given,
+            wts is ignored.
+
+    Returns:
+        Dictionary with some perfomance information. The keys are
+        "etime_load_file", how long in seconds it took to load the file
+        "etime_read_dict", how long in seconds it took to read models state
+    """
+    start_time = time.time()
+    with np.load(fname) as f:
+        sd = {k: f[k] for k in f.files}
+    md = json.loads(str(sd.pop("__metadata__")))
+    names = {}
+    for k in ("var", "param", "active"):
+        n = sd.pop(k + "_names").tobytes().decode("utf-8")
+        names[k] = n.split("\n") if md["n_" + k] else []
+    load_time = time.time()
+    if layout is None:
+        layout = SnapshotLayout(o, wts)
+    layout.restore(sd, names=names)
+    read_time = time.time()
+    pdict = {}
+    pdict["etime_load_file"] = load_time - start_time
+    pdict["etime_read_dict"] = read_time - load_time
+    return pdict
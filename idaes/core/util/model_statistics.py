@@ -14,16 +14,604 @@
 """
 This module contains utility functions for reporting structural statistics of
 IDAES models.
+
+All of the statistics methods in this module accept either a Pyomo Block or a
+ModelCensus of one. A ModelCensus collects everything these methods need in a
+single walk of the block tree, so when several statistics are needed for the
+same model (e.g. in report_statistics) a ModelCensus should be created once
+and passed to each method in turn.
 """
 
 __author__ = "Andrew Lee"
 
 import sys
 
+import numpy as np
+
 from pyomo.environ import Block, Constraint, Expression, Objective, Var, value
 from pyomo.dae import DerivativeVar
 from pyomo.core.expr.current import identify_variables
-from pyomo.common.collections import ComponentSet
+from pyomo.common.collections import ComponentSet, ComponentMap
+
+
+# -------------------------------------------------------------------------
+# Model census
+class ModelCensus(object):
+    """
+    Structural snapshot of a model, collected in a single walk of the block
+    tree.
+
+    The census records all Blocks, Constraints, Objectives, Vars,
+    DerivativeVars and Expressions in the model along with their
+    active/fixed states. Variable-constraint incidence and variable bounds
+    and values are gathered the first time they are needed, and are stored as
+    index arrays so that subsequent queries do not need to revisit the model.
+
+    The census is a snapshot of the model when it was taken (or when the
+    incidence and bounds were first needed); if the model is modified
+    afterwards (e.g. by fixing variables or deactivating constraints) the
+    census must be refreshed or a new ModelCensus created.
+
+    Args:
+        block : model to be studied
+        incidence : (optional) ComponentMap of Constraints to the Vars which
+            appear in them, used to avoid searching constraint expressions
+            which have already been searched. Newly searched constraints are
+            added to the map.
+    """
+    def __init__(self, block, incidence=None):
+        self.block = block
+        self._incidence_map = incidence
+
+        self._blocks = [block]
+        self._block_states = None
+        self._active_blocks = []
+        self._constraints = []
+        self._objectives = []
+        self._variables = ComponentMap()
+        self._derivative_vars = ComponentSet()
+        self._expressions = ComponentSet()
+
+        # Constraints and Objectives local to block are always collected,
+        # but Vars and Expressions are only collected if block is active (to
+        # match component_data_objects with active=True).
+        self._collect(block, block.active)
+        if block.active:
+            self._active_blocks.append(block)
+
+        # Walk the rest of the block tree in prefix depth-first order. Only
+        # Blocks reached through activated Blocks are searched for components.
+        stack = [(block, bool(block.active))]
+        while stack:
+            blk, active = stack.pop()
+            if blk is not block:
+                self._blocks.append(blk)
+                if active:
+                    self._active_blocks.append(blk)
+                    self._collect(blk, True)
+            children = list(blk.component_data_objects(
+                ctype=Block, active=None, descend_into=False))
+            for b in reversed(children):
+                stack.append((b, active and b.active))
+
+        self._var_list = list(self._variables)
+        self._n_block_vars = len(self._var_list)
+
+        # Lazily populated incidence and bounds data
+        self._con_var_ptr = None
+        self._con_var_idx = None
+        self._con_var_rows = None
+        self._read_states()
+        self._block_states = self._get_block_states()
+
+    def _read_states(self):
+        cons = self._constraints
+        self._con_equality = np.zeros(len(cons), dtype=bool)
+        self._con_inequality = np.zeros(len(cons), dtype=bool)
+        for i, c in enumerate(cons):
+            if c.upper is None or c.lower is None:
+                self._con_inequality[i] = True
+            elif value(c.upper) == value(c.lower):
+                self._con_equality[i] = True
+
+        self._con_active = np.fromiter(
+            (c.active for c in cons), dtype=bool, count=len(cons))
+        # Active constraints are only searched for variables if block itself
+        # is active
+        self._con_in_tree = self._con_active & bool(self.block.active)
+
+        objs = self._objectives
+        self._obj_active = np.fromiter(
+            (o.active for o in objs), dtype=bool, count=len(objs))
+
+        self._var_fixed = None
+        self._bounds = None
+
+    def _get_block_states(self):
+        # Activity of each block and the identity and number of data of each
+        # modelling component declared on it, used to detect changes in the
+        # structure of the model
+        return [(b.active,
+                 tuple((id(c), len(c)) for c in b.component_objects(
+                     (Block, Constraint, Objective, Var, Expression),
+                     descend_into=False)))
+                for b in self._blocks]
+
+    def refresh(self):
+        """
+        Update the active and fixed states, values and bounds and the
+        equality/inequality classification of Constraints recorded in the
+        census without searching constraint expressions for variables again.
+
+        A refresh still visits every component in the census (and every
+        component declared on its Blocks, to check the structure of the
+        model), so its cost is proportional to the size of the model; it
+        only avoids rebuilding the variable-constraint incidence.
+
+        Changes to the structure of the model (Blocks activated or
+        deactivated, components added to or removed from any Block, or
+        elements added to or removed from indexed components) cannot
+        be captured by a refresh, and a new census must be taken. Changes to
+        the variables appearing in existing Constraints are not detected.
+
+        Returns:
+            False if the structure of the model has changed and a new census
+            is needed, otherwise True.
+        """
+        if self._get_block_states() != self._block_states:
+            return False
+        self._read_states()
+        if self._con_var_rows is not None and \
+                np.any(self._con_in_tree & ~self._con_var_rows):
+            # Incidence is needed for newly activated constraints
+            self._con_var_ptr = None
+        return True
+
+    def _collect(self, blk, active):
+        for c in blk.component_data_objects(
+                ctype=(Var, DerivativeVar, Expression, Constraint, Objective),
+                active=None,
+                descend_into=False):
+            ctype = c.ctype
+            if ctype is Constraint:
+                self._constraints.append(c)
+            elif ctype is Objective:
+                self._objectives.append(c)
+            elif not active:
+                continue
+            elif ctype is Var:
+                if c not in self._variables:
+                    self._variables[c] = len(self._variables)
+            elif ctype is DerivativeVar:
+                self._derivative_vars.add(c)
+            else:
+                self._expressions.add(c)
+
+    # ---------------------------------------------------------------------
+    # Lazily computed data
+    def _incidence(self):
+        # Build compressed-row incidence of variables in the active
+        # constraints. Variables which are not part of the model but appear
+        # in its constraints are appended to the variable list.
+        if self._con_var_ptr is None:
+            var_map = self._variables
+            inc_map = self._incidence_map
+            ptr = np.zeros(len(self._constraints) + 1, dtype=np.int64)
+            idx = []
+            for i, c in enumerate(self._constraints):
+                if self._con_in_tree[i]:
+                    if inc_map is None:
+                        con_vars = identify_variables(c.body)
+                    else:
+                        con_vars = inc_map.get(c)
+                        if con_vars is None:
+                            con_vars = inc_map[c] = tuple(
+                                identify_variables(c.body))
+                    for v in con_vars:
+                        j = var_map.get(v)
+                        if j is None:
+                            j = var_map[v] = len(self._var_list)
+                            self._var_list.append(v)
+                        idx.append(j)
+                ptr[i+1] = len(idx)
+            self._con_var_ptr = ptr
+            self._con_var_idx = np.array(idx, dtype=np.int64)
+            self._con_var_rows = self._con_in_tree.copy()
+        return self._con_var_ptr, self._con_var_idx
+
+    def _fixed(self):
+        if self._var_fixed is None or \
+                len(self._var_fixed) != len(self._var_list):
+            n = len(self._var_list)
+            fixed = np.empty(n, dtype=bool)
+            if self._var_fixed is not None:
+                fixed[:len(self._var_fixed)] = self._var_fixed
+                start = len(self._var_fixed)
+            else:
+                start = 0
+            for j in range(start, n):
+                fixed[j] = self._var_list[j].fixed
+            self._var_fixed = fixed
+        return self._var_fixed
+
+    def _bounds_arrays(self):
+        # Values and bounds of the model variables, with nan for None
+        if self._bounds is None:
+            n = self._n_block_vars
+            val = np.empty(n)
+            lb = np.empty(n)
+            ub = np.empty(n)
+            for j in range(n):
+                v = self._var_list[j]
+                x = v.value
+                val[j] = np.nan if x is None else x
+                x = v.lb
+                lb[j] = np.nan if x is None else x
+                x = v.ub
+                ub[j] = np.nan if x is None else x
+            self._bounds = (val, lb, ub)
+        return self._bounds
+
+    def _vars_in_constraints(self, mask, fixed=None):
+        # Indices of variables appearing in the constraints selected by mask,
+        # in order of first appearance
+        ptr, idx = self._incidence()
+        entries = idx[np.repeat(mask, np.diff(ptr))]
+        found, first = np.unique(entries, return_index=True)
+        found = found[np.argsort(first, kind="stable")]
+        if fixed is not None:
+            found = found[self._fixed()[found] == fixed]
+        return found
+
+    def _select_vars(self, indices):
+        var_list = self._var_list
+        return [var_list[j] for j in indices]
+
+    @staticmethod
+    def _select(items, mask):
+        return [items[i] for i in np.flatnonzero(mask)]
+
+    # ---------------------------------------------------------------------
+    # Blocks
+    def total_blocks(self):
+        """
+        Returns a list of all Blocks in the model (including the model itself)
+        """
+        return list(self._blocks)
+
+    def activated_blocks(self):
+        """
+        Returns a list of all activated Blocks in the model (including the
+        model itself)
+        """
+        return list(self._active_blocks)
+
+    def deactivated_blocks(self):
+        """
+        Returns a list of all deactivated Blocks in the model (including the
+        model itself)
+        """
+        active = ComponentSet(self._active_blocks)
+        return [b for b in self._blocks if b not in active]
+
+    # ---------------------------------------------------------------------
+    # Constraints
+    def total_constraints(self):
+        """
+        Returns a list of all Constraints in activated Blocks in the model
+        """
+        return list(self._constraints)
+
+    def activated_constraints(self):
+        """
+        Returns a list of all activated Constraints in the model
+        """
+        return self._select(self._constraints, self._con_active)
+
+    def deactivated_constraints(self):
+        """
+        Returns a list of all deactivated Constraints in the model
+        """
+        return self._select(self._constraints, ~self._con_active)
+
+    def total_equalities(self):
+        """
+        Returns a list of all equality Constraints in the model
+        """
+        return self._select(self._constraints, self._con_equality)
+
+    def activated_equalities(self):
+        """
+        Returns a list of all activated equality Constraints in the model
+        """
+        return self._select(
+            self._constraints, self._con_in_tree & self._con_equality)
+
+    def deactivated_equalities(self):
+        """
+        Returns a list of all deactivated equality Constraints in the model
+        """
+        return self._select(
+            self._constraints, ~self._con_active & self._con_equality)
+
+    def total_inequalities(self):
+        """
+        Returns a list of all inequality Constraints in the model
+        """
+        return self._select(self._constraints, self._con_inequality)
+
+    def activated_inequalities(self):
+        """
+        Returns a list of all activated inequality Constraints in the model
+        """
+        return self._select(
+            self._constraints, self._con_in_tree & self._con_inequality)
+
+    def deactivated_inequalities(self):
+        """
+        Returns a list of all deactivated inequality Constraints in the model
+        """
+        return self._select(
+            self._constraints, ~self._con_active & self._con_inequality)
+
+    # ---------------------------------------------------------------------
+    # Variables
+    def variables(self):
+        """
+        Returns a list of all Vars in the model
+        """
+        return self._var_list[:self._n_block_vars]
+
+    def fixed_variables(self):
+        """
+        Returns a list of all fixed Vars in the model
+        """
+        return self._select(
+            self._var_list, self._fixed()[:self._n_block_vars])
+
+    def unfixed_variables(self):
+        """
+        Returns a list of all unfixed Vars in the model
+        """
+        return self._select(
+            self._var_list, ~self._fixed()[:self._n_block_vars])
+
+    def variables_near_bounds(
+            self, tol=1e-4, relative=True, skip_lb=False, skip_ub=False):
+        """
+        Returns a list of all Vars in the model which have a value within tol
+        of a bound. See variables_near_bounds_generator for arguments.
+        """
+        val, lb, ub = self._bounds_arrays()
+        has_lb = ~np.isnan(lb)
+        has_ub = ~np.isnan(ub)
+        with np.errstate(invalid="ignore"):
+            if relative:
+                # Apply tol to (upper - lower) if both bounds are present,
+                # otherwise to the value of the bound
+                atol = np.where(
+                    has_lb & has_ub,
+                    (ub - lb)*tol,
+                    np.where(has_ub, np.abs(ub*tol), np.abs(lb*tol)))
+                check = ~np.isnan(val) & (has_lb | has_ub)
+            else:
+                atol = tol
+                check = ~np.isnan(val)
+
+            near = np.zeros(len(val), dtype=bool)
+            if not skip_lb:
+                near |= has_ub & (ub - val <= atol)
+            if not skip_ub:
+                near |= has_lb & (val - lb <= atol)
+        return self._select(self._var_list, check & near)
+
+    def variables_in_activated_constraints(self):
+        """
+        Returns a list of all Vars which appear in activated Constraints
+        """
+        return self._select_vars(self._vars_in_constraints(self._con_in_tree))
+
+    def variables_in_activated_equalities(self, fixed=None):
+        """
+        Returns a list of all Vars which appear in activated equality
+        Constraints
+
+        Args:
+            fixed : if True (False) only return fixed (unfixed) Vars, if None
+                return all Vars (default = None)
+        """
+        return self._select_vars(self._vars_in_constraints(
+            self._con_in_tree & self._con_equality, fixed))
+
+    def variables_in_activated_inequalities(self, fixed=None):
+        """
+        Returns a list of all Vars which appear in activated inequality
+        Constraints
+
+        Args:
+            fixed : if True (False) only return fixed (unfixed) Vars, if None
+                return all Vars (default = None)
+        """
+        return self._select_vars(self._vars_in_constraints(
+            self._con_in_tree & self._con_inequality, fixed))
+
+    def variables_only_in_inequalities(self, fixed=None):
+        """
+        Returns a list of all Vars which appear only in activated inequality
+        Constraints
+
+        Args:
+            fixed : if True (False) only return fixed (unfixed) Vars, if None
+                return all Vars (default = None)
+        """
+        ineq = self._vars_in_constraints(
+            self._con_in_tree & self._con_inequality, fixed)
+        eq = self._vars_in_constraints(
+            self._con_in_tree & self._con_equality)
+        return self._select_vars(ineq[~np.isin(ineq, eq)])
+
+    def unused_variables(self, fixed=None):
+        """
+        Returns a list of all Vars in the model which do not appear in any
+        activated Constraint
+
+        Args:
+            fixed : if True (False) only return fixed (unfixed) Vars, if None
+                return all Vars (default = None)
+        """
+        in_cons = self._vars_in_constraints(self._con_in_tree)
+        used = np.zeros(len(self._var_list), dtype=bool)
+        used[in_cons] = True
+        unused = ~used[:self._n_block_vars]
+        if fixed is not None:
+            unused &= self._fixed()[:self._n_block_vars] == fixed
+        return self._select(self._var_list, unused)
+
+    def derivative_variables(self):
+        """
+        Returns a list of all DerivativeVars in the model
+        """
+        return list(self._derivative_vars)
+
+    def active_variables_in_deactivated_blocks(self):
+        """
+        Returns a list of all Vars which appear in activated Constraints but
+        belong to deactivated Blocks
+        """
+        active = ComponentSet(self._active_blocks)
+        return [v for v in self.variables_in_activated_constraints()
+                if v.parent_block() not in active]
+
+    # ---------------------------------------------------------------------
+    # Objectives and Expressions
+    def total_objectives(self):
+        """
+        Returns a list of all Objectives in activated Blocks in the model
+        """
+        return list(self._objectives)
+
+    def activated_objectives(self):
+        """
+        Returns a list of all activated Objectives in the model
+        """
+        return self._select(self._objectives, self._obj_active)
+
+    def deactivated_objectives(self):
+        """
+        Returns a list of all deactivated Objectives in the model
+        """
+        return self._select(self._objectives, ~self._obj_active)
+
+    def expressions(self):
+        """
+        Returns a list of all Expressions in the model
+        """
+        return list(self._expressions)
+
+    # ---------------------------------------------------------------------
+    # Other statistics
+    def degrees_of_freedom(self):
+        """
+        Returns the degrees of freedom of the model
+        """
+        eq = self._con_in_tree & self._con_equality
+        return (len(self._vars_in_constraints(eq, fixed=False)) -
+                int(np.count_nonzero(eq)))
+
+    def large_residuals(self, tol=1e-5):
+        """
+        Returns a dict of all activated Constraints with a residual greater
+        than tol, with the residual as the value
+        """
+        residual_values = dict()
+        for i in np.flatnonzero(self._con_in_tree):
+            c = self._constraints[i]
+            r = 0.0
+            if c.lower is not None:
+                r = max(r, value(c.lower - c.body()))
+            if c.upper is not None:
+                r = max(r, value(c.body() - c.upper))
+            if r > tol:
+                residual_values[c] = r
+        return residual_values
+
+
+class IncidenceCache(object):
+    """
+    Context manager which caches the variable-constraint incidence of a model
+    for use by the statistics methods in this module.
+
+    Within the context, statistics methods called on block (or any Block
+    within it) reuse a ModelCensus of the Block they were called on, which is
+    refreshed on each call to pick up any variables which have been fixed or
+    unfixed and any Constraints which have been activated or deactivated.
+    Constraint expressions are only searched for variables once, so repeated
+    calls (e.g. to degrees_of_freedom during sequential initialization) avoid
+    rebuilding the incidence, although each call still visits every
+    component of the Block.
+
+    If Blocks are activated or deactivated or components are added to or
+    removed from the model, a new census is taken on the next call, but the
+    variables in existing Constraints are not searched for again. Thus,
+    the expressions of existing Constraints should not be changed within the
+    context.
+
+    Args:
+        block : model to cache incidence for
+
+    Example:
+        with IncidenceCache(m):
+            m.fs.unit.initialize()
+    """
+    def __init__(self, block):
+        self.block = block
+        self._incidence = ComponentMap()
+        self._censuses = ComponentMap()
+
+    def __enter__(self):
+        _incidence_caches.append(self)
+        return self
+
+    def __exit__(self, ex_type, ex_value, ex_traceback):
+        _incidence_caches.remove(self)
+        self._incidence = ComponentMap()
+        self._censuses = ComponentMap()
+
+    def covers(self, block):
+        """
+        Returns True if block is the cached model or a Block within it.
+        """
+        b = block
+        while b is not None:
+            if b is self.block:
+                return True
+            b = b.parent_block()
+        return False
+
+    def census(self, block):
+        """
+        Returns an up to date ModelCensus of block, which must be covered by
+        the cache.
+        """
+        census = self._censuses.get(block)
+        if census is None or not census.refresh():
+            census = self._censuses[block] = ModelCensus(
+                block, incidence=self._incidence)
+        return census
+
+
+# Stack of IncidenceCaches currently in use
+_incidence_caches = []
+
+
+def _census(block):
+    # Allow statistics methods to be called with either a Block or a census
+    if isinstance(block, ModelCensus):
+        return block
+    for cache in reversed(_incidence_caches):
+        if cache.covers(block):
+            return cache.census(block)
+    return ModelCensus(block)
 
 
 # -------------------------------------------------------------------------
@@ -39,11 +627,7 @@ def total_blocks_set(block):
         A ComponentSet including all Block components in block (including block
         itself)
     """
-    total_blocks_set = ComponentSet(
-            block.component_data_objects(
-                    ctype=Block, active=None, descend_into=True))
-    total_blocks_set.add(block)
-    return total_blocks_set
+    return ComponentSet(_census(block).total_blocks())
 
 
 def number_total_blocks(block):
@@ -56,11 +640,7 @@ def number_total_blocks(block):
     Returns:
         Number of Block components in block (including block itself)
     """
-    b = 1  # Start at 1 to include main model
-    for o in block.component_data_objects(
-                ctype=Block, active=None, descend_into=True):
-        b += 1
-    return b
+    return len(_census(block).total_blocks())
 
 
 def activated_blocks_set(block):
@@ -75,13 +655,7 @@ def activated_blocks_set(block):
         A ComponentSet including all activated Block components in block
         (including block itself)
     """
-    block_set = ComponentSet()
-    if block.active:
-        block_set.add(block)
-        for b in block.component_data_objects(
-                ctype=Block, active=True, descend_into=True):
-            block_set.add(b)
-    return block_set
+    return ComponentSet(_census(block).activated_blocks())
 
 
 def number_activated_blocks(block):
@@ -94,13 +668,7 @@ def number_activated_blocks(block):
     Returns:
         Number of activated Block components in block (including block itself)
     """
-    b = 0
-    if block.active:
-        b = 1
-        for o in block.component_data_objects(
-                        ctype=Block, active=True, descend_into=True):
-            b += 1
-    return b
+    return len(_census(block).activated_blocks())
 
 
 def deactivated_blocks_set(block):
@@ -115,9 +683,7 @@ def deactivated_blocks_set(block):
         A ComponentSet including all deactivated Block components in block
         (including block itself)
     """
-    # component_data_objects active=False does not seem to work as expected
-    # Use difference of total and active block sets
-    return total_blocks_set(block) - activated_blocks_set(block)
+    return ComponentSet(_census(block).deactivated_blocks())
 
 
 def number_deactivated_blocks(block):
@@ -131,9 +697,7 @@ def number_deactivated_blocks(block):
         Number of deactivated Block components in block (including block
         itself)
     """
-    # component_data_objects active=False does not seem to work as expected
-    # Use difference of total and active block sets
-    return number_total_blocks(block) - number_activated_blocks(block)
+    return len(_census(block).deactivated_blocks())
 
 
 # -------------------------------------------------------------------------
@@ -148,8 +712,7 @@ def total_constraints_set(block):
     Returns:
         A ComponentSet including all Constraint components in block
     """
-    return ComponentSet(activated_block_component_generator(
-            block, ctype=Constraint))
+    return ComponentSet(_census(block).total_constraints())
 
 
 def number_total_constraints(block):
@@ -162,10 +725,7 @@ def number_total_constraints(block):
     Returns:
         Number of Constraint components in block
     """
-    tc = 0
-    for c in activated_block_component_generator(block, ctype=Constraint):
-        tc += 1
-    return tc
+    return len(_census(block).total_constraints())
 
 
 def activated_constraints_generator(block):
@@ -178,9 +738,8 @@ def activated_constraints_generator(block):
     Returns:
         A generator which returns all activated Constraint components block
     """
-    for c in activated_block_component_generator(block, ctype=Constraint):
-        if c.active:
-            yield c
+    for c in _census(block).activated_constraints():
+        yield c
 
 
 def activated_constraints_set(block):
@@ -194,7 +753,7 @@ def activated_constraints_set(block):
     Returns:
         A ComponentSet including all activated Constraint components in block
     """
-    return ComponentSet(activated_constraints_generator(block))
+    return ComponentSet(_census(block).activated_constraints())
 
 
 def number_activated_constraints(block):
@@ -207,10 +766,7 @@ def number_activated_constraints(block):
     Returns:
         Number of activated Constraint components in block
     """
-    tc = 0
-    for c in activated_constraints_generator(block):
-        tc += 1
-    return tc
+    return len(_census(block).activated_constraints())
 
 
 def deactivated_constraints_generator(block):
@@ -223,9 +779,8 @@ def deactivated_constraints_generator(block):
     Returns:
         A generator which returns all deactivated Constraint components block
     """
-    for c in activated_block_component_generator(block, ctype=Constraint):
-        if not c.active:
-            yield c
+    for c in _census(block).deactivated_constraints():
+        yield c
 
 
 def deactivated_constraints_set(block):
@@ -239,7 +794,7 @@ def deactivated_constraints_set(block):
     Returns:
         A ComponentSet including all deactivated Constraint components in block
     """
-    return ComponentSet(deactivated_constraints_generator(block))
+    return ComponentSet(_census(block).deactivated_constraints())
 
 
 def number_deactivated_constraints(block):
@@ -253,10 +808,7 @@ def number_deactivated_constraints(block):
     Returns:
         Number of deactivated Constraint components in block
     """
-    tc = 0
-    for c in deactivated_constraints_generator(block):
-        tc += 1
-    return tc
+    return len(_census(block).deactivated_constraints())
 
 
 # -------------------------------------------------------------------------
@@ -271,11 +823,8 @@ def total_equalities_generator(block):
     Returns:
         A generator which returns all equality Constraint components block
     """
-    for c in activated_block_component_generator(block, ctype=Constraint):
-        if (c.upper is not None and
-                c.lower is not None and
-                c.upper == c.lower):
-            yield c
+    for c in _census(block).total_equalities():
+        yield c
 
 
 def total_equalities_set(block):
@@ -289,7 +838,7 @@ def total_equalities_set(block):
     Returns:
         A ComponentSet including all equality Constraint components in block
     """
-    return ComponentSet(total_equalities_generator(block))
+    return ComponentSet(_census(block).total_equalities())
 
 
 def number_total_equalities(block):
@@ -303,10 +852,7 @@ def number_total_equalities(block):
     Returns:
         Number of equality Constraint components in block
     """
-    tc = 0
-    for c in total_equalities_generator(block):
-        tc += 1
-    return tc
+    return len(_census(block).total_equalities())
 
 
 def activated_equalities_generator(block):
@@ -321,11 +867,8 @@ def activated_equalities_generator(block):
         A generator which returns all activated equality Constraint components
         block
     """
-    for c in block.component_data_objects(
-                Constraint, active=True, descend_into=True):
-        if (c.upper is not None and c.lower is not None and
-                value(c.upper) == value(c.lower)):
-            yield c
+    for c in _census(block).activated_equalities():
+        yield c
 
 
 def activated_equalities_set(block):
@@ -340,7 +883,7 @@ def activated_equalities_set(block):
         A ComponentSet including all activated equality Constraint components
         in block
     """
-    return ComponentSet(activated_equalities_generator(block))
+    return ComponentSet(_census(block).activated_equalities())
 
 
 def number_activated_equalities(block):
@@ -354,10 +897,7 @@ def number_activated_equalities(block):
     Returns:
         Number of activated equality Constraint components in block
     """
-    tc = 0
-    for o in activated_equalities_generator(block):
-        tc += 1
-    return tc
+    return len(_census(block).activated_equalities())
 
 
 def deactivated_equalities_generator(block):
@@ -372,9 +912,8 @@ def deactivated_equalities_generator(block):
         A generator which returns all deactivated equality Constraint
         components block
     """
-    for c in total_equalities_generator(block):
-        if not c.active:
-            yield c
+    for c in _census(block).deactivated_equalities():
+        yield c
 
 
 def deactivated_equalities_set(block):
@@ -389,7 +928,7 @@ def deactivated_equalities_set(block):
         A ComponentSet including all deactivated equality Constraint components
         in block
     """
-    return ComponentSet(deactivated_equalities_generator(block))
+    return ComponentSet(_census(block).deactivated_equalities())
 
 
 def number_deactivated_equalities(block):
@@ -403,10 +942,7 @@ def number_deactivated_equalities(block):
     Returns:
         Number of deactivated equality Constraint components in block
     """
-    tc = 0
-    for c in deactivated_equalities_generator(block):
-        tc += 1
-    return tc
+    return len(_census(block).deactivated_equalities())
 
 
 # -------------------------------------------------------------------------
@@ -422,9 +958,8 @@ def total_inequalities_generator(block):
     Returns:
         A generator which returns all inequality Constraint components block
     """
-    for c in activated_block_component_generator(block, ctype=Constraint):
-        if c.upper is None or c.lower is None:
-            yield c
+    for c in _census(block).total_inequalities():
+        yield c
 
 
 def total_inequalities_set(block):
@@ -438,7 +973,7 @@ def total_inequalities_set(block):
     Returns:
         A ComponentSet including all inequality Constraint components in block
     """
-    return ComponentSet(total_inequalities_generator(block))
+    return ComponentSet(_census(block).total_inequalities())
 
 
 def number_total_inequalities(block):
@@ -452,10 +987,7 @@ def number_total_inequalities(block):
     Returns:
         Number of inequality Constraint components in block
     """
-    c = 0
-    for o in total_inequalities_generator(block):
-        c += 1
-    return c
+    return len(_census(block).total_inequalities())
 
 
 def activated_inequalities_generator(block):
@@ -470,10 +1002,8 @@ def activated_inequalities_generator(block):
         A generator which returns all activated inequality Constraint
         components block
     """
-    for c in block.component_data_objects(
-                Constraint, active=True, descend_into=True):
-        if c.upper is None or c.lower is None:
-            yield c
+    for c in _census(block).activated_inequalities():
+        yield c
 
 
 def activated_inequalities_set(block):
@@ -488,7 +1018,7 @@ def activated_inequalities_set(block):
         A ComponentSet including all activated inequality Constraint components
         in block
     """
-    return ComponentSet(activated_inequalities_generator(block))
+    return ComponentSet(_census(block).activated_inequalities())
 
 
 def number_activated_inequalities(block):
@@ -502,10 +1032,7 @@ def number_activated_inequalities(block):
     Returns:
         Number of activated inequality Constraint components in block
     """
-    c = 0
-    for o in activated_inequalities_generator(block):
-        c += 1
-    return c
+    return len(_census(block).activated_inequalities())
 
 
 def deactivated_inequalities_generator(block):
@@ -520,9 +1047,8 @@ def deactivated_inequalities_generator(block):
         A generator which returns all indeactivated equality Constraint
         components block
     """
-    for c in total_inequalities_generator(block):
-        if not c.active:
-            yield c
+    for c in _census(block).deactivated_inequalities():
+        yield c
 
 
 def deactivated_inequalities_set(block):
@@ -537,7 +1063,7 @@ def deactivated_inequalities_set(block):
         A ComponentSet including all deactivated inequality Constraint
         components in block
     """
-    return ComponentSet(deactivated_inequalities_generator(block))
+    return ComponentSet(_census(block).deactivated_inequalities())
 
 
 def number_deactivated_inequalities(block):
@@ -551,10 +1077,7 @@ def number_deactivated_inequalities(block):
     Returns:
         Number of deactivated inequality Constraint components in block
     """
-    c = 0
-    for o in deactivated_inequalities_generator(block):
-        c += 1
-    return c
+    return len(_census(block).deactivated_inequalities())
 
 
 # -------------------------------------------------------------------------
@@ -571,8 +1094,7 @@ def variables_set(block):
     Returns:
         A ComponentSet including all Var components in block
     """
-    return ComponentSet(block.component_data_objects(
-            ctype=Var, active=True, descend_into=True))
+    return ComponentSet(_census(block).variables())
 
 
 def number_variables(block):
@@ -585,7 +1107,7 @@ def number_variables(block):
     Returns:
         Number of Var components in block
     """
-    return len(variables_set(block))
+    return len(_census(block).variables())
 
 
 def fixed_variables_generator(block):
@@ -598,10 +1120,8 @@ def fixed_variables_generator(block):
     Returns:
         A generator which returns all fixed Var components block
     """
-    for v in block.component_data_objects(
-            ctype=Var, active=True, descend_into=True):
-        if v.fixed:
-            yield v
+    for v in _census(block).fixed_variables():
+        yield v
 
 
 def fixed_variables_set(block):
@@ -614,7 +1134,7 @@ def fixed_variables_set(block):
     Returns:
         A ComponentSet including all fixed Var components in block
     """
-    return ComponentSet(fixed_variables_generator(block))
+    return ComponentSet(_census(block).fixed_variables())
 
 
 def number_fixed_variables(block):
@@ -627,7 +1147,7 @@ def number_fixed_variables(block):
     Returns:
         Number of fixed Var components in block
     """
-    return len(fixed_variables_set(block))
+    return len(_census(block).fixed_variables())
 
 
 def unfixed_variables_generator(block):
@@ -640,10 +1160,8 @@ def unfixed_variables_generator(block):
     Returns:
         A generator which returns all unfixed Var components block
     """
-    for v in block.component_data_objects(
-            ctype=Var, active=True, descend_into=True):
-        if not v.fixed:
-            yield v
+    for v in _census(block).unfixed_variables():
+        yield v
 
 
 def unfixed_variables_set(block):
@@ -656,7 +1174,7 @@ def unfixed_variables_set(block):
     Returns:
         A ComponentSet including all unfixed Var components in block
     """
-    return ComponentSet(unfixed_variables_generator(block))
+    return ComponentSet(_census(block).unfixed_variables())
 
 
 def number_unfixed_variables(block):
@@ -669,7 +1187,7 @@ def number_unfixed_variables(block):
     Returns:
         Number of unfixed Var components in block
     """
-    return len(unfixed_variables_set(block))
+    return len(_census(block).unfixed_variables())
 
 
 def variables_near_bounds_generator(
@@ -689,33 +1207,9 @@ def variables_near_bounds_generator(
         A generator which returns all Var components block that are close to a
         bound
     """
-    for v in block.component_data_objects(
-            ctype=Var, active=True, descend_into=True):
-        # To avoid errors, check that v has a value
-        if v.value is None:
-            continue
-
-        if relative:
-            # First, determine absolute tolerance to apply to bounds
-            if v.ub is not None and v.lb is not None:
-                # Both upper and lower bounds, apply tol to (upper - lower)
-                atol = value((v.ub - v.lb)*tol)
-            elif v.ub is not None:
-                # Only upper bound, apply tol to bound value
-                atol = abs(value(v.ub*tol))
-            elif v.lb is not None:
-                # Only lower bound, apply tol to bound value
-                atol = abs(value(v.lb*tol))
-            else:
-                continue
-        else:
-            atol = tol
-
-        if v.ub is not None and not skip_lb and value(v.ub - v.value) <= atol:
-            yield v
-        elif (v.lb is not None and not skip_ub and
-              value(v.value - v.lb) <= atol):
-            yield v
+    for v in _census(block).variables_near_bounds(
+            tol, relative, skip_lb, skip_ub):
+        yield v
 
 
 def variables_near_bounds_set(
@@ -735,8 +1229,8 @@ def variables_near_bounds_set(
         A ComponentSet including all Var components block that are close to a
         bound
     """
-    return ComponentSet(variables_near_bounds_generator(
-        block, tol, relative, skip_lb, skip_ub))
+    return ComponentSet(_census(block).variables_near_bounds(
+        tol, relative, skip_lb, skip_ub))
 
 
 def number_variables_near_bounds(block, tol=1e-4):
@@ -751,7 +1245,7 @@ def number_variables_near_bounds(block, tol=1e-4):
     Returns:
         Number of components block that are close to a bound
     """
-    return len(variables_near_bounds_set(block, tol))
+    return len(_census(block).variables_near_bounds(tol))
 
 
 # -------------------------------------------------------------------------
@@ -768,12 +1262,7 @@ def variables_in_activated_constraints_set(block):
         A ComponentSet including all Var components which appear within
         activated Constraints in block
     """
-    var_set = ComponentSet()
-    for c in block.component_data_objects(
-            ctype=Constraint, active=True, descend_into=True):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    return ComponentSet(_census(block).variables_in_activated_constraints())
 
 
 def number_variables_in_activated_constraints(block):
@@ -788,7 +1277,7 @@ def number_variables_in_activated_constraints(block):
         Number of Var components which appear within active Constraints in
         block
     """
-    return len(variables_in_activated_constraints_set(block))
+    return len(_census(block).variables_in_activated_constraints())
 
 
 def variables_in_activated_equalities_set(block):
@@ -803,11 +1292,7 @@ def variables_in_activated_equalities_set(block):
         A ComponentSet including all Var components which appear within
         activated equality Constraints in block
     """
-    var_set = ComponentSet()
-    for c in activated_equalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    return ComponentSet(_census(block).variables_in_activated_equalities())
 
 
 def number_variables_in_activated_equalities(block):
@@ -822,7 +1307,7 @@ def number_variables_in_activated_equalities(block):
         Number of Var components which appear within activated equality
         Constraints in block
     """
-    return len(variables_in_activated_equalities_set(block))
+    return len(_census(block).variables_in_activated_equalities())
 
 
 def variables_in_activated_inequalities_set(block):
@@ -837,11 +1322,7 @@ def variables_in_activated_inequalities_set(block):
         A ComponentSet including all Var components which appear within
         activated inequality Constraints in block
     """
-    var_set = ComponentSet()
-    for c in activated_inequalities_generator(block):
-        for v in identify_variables(c.body):
-            var_set.add(v)
-    return var_set
+    return ComponentSet(_census(block).variables_in_activated_inequalities())
 
 
 def number_variables_in_activated_inequalities(block):
@@ -856,7 +1337,7 @@ def number_variables_in_activated_inequalities(block):
         Number of Var components which appear within activated inequality
         Constraints in block
     """
-    return len(variables_in_activated_inequalities_set(block))
+    return len(_census(block).variables_in_activated_inequalities())
 
 
 def variables_only_in_inequalities(block):
@@ -871,8 +1352,7 @@ def variables_only_in_inequalities(block):
         A ComponentSet including all Var components which appear only within
         inequality Constraints in block
     """
-    return (variables_in_activated_inequalities_set(block) -
-            variables_in_activated_equalities_set(block))
+    return ComponentSet(_census(block).variables_only_in_inequalities())
 
 
 def number_variables_only_in_inequalities(block):
@@ -887,7 +1367,7 @@ def number_variables_only_in_inequalities(block):
         Number of Var components which appear only within activated inequality
         Constraints in block
     """
-    return len(variables_only_in_inequalities(block))
+    return len(_census(block).variables_only_in_inequalities())
 
 
 # -------------------------------------------------------------------------
@@ -904,11 +1384,8 @@ def fixed_variables_in_activated_equalities_set(block):
         A ComponentSet including all fixed Var components which appear within
         activated equality Constraints in block
     """
-    var_set = ComponentSet()
-    for v in variables_in_activated_equalities_set(block):
-        if v.fixed:
-            var_set.add(v)
-    return var_set
+    return ComponentSet(
+        _census(block).variables_in_activated_equalities(fixed=True))
 
 
 def number_fixed_variables_in_activated_equalities(block):
@@ -923,7 +1400,7 @@ def number_fixed_variables_in_activated_equalities(block):
         Number of fixed Var components which appear within activated equality
         Constraints in block
     """
-    return len(fixed_variables_in_activated_equalities_set(block))
+    return len(_census(block).variables_in_activated_equalities(fixed=True))
 
 
 def unfixed_variables_in_activated_equalities_set(block):
@@ -938,11 +1415,8 @@ def unfixed_variables_in_activated_equalities_set(block):
         A ComponentSet including all unfixed Var components which appear within
         activated equality Constraints in block
     """
-    var_set = ComponentSet()
-    for v in variables_in_activated_equalities_set(block):
-        if not v.fixed:
-            var_set.add(v)
-    return var_set
+    return ComponentSet(
+        _census(block).variables_in_activated_equalities(fixed=False))
 
 
 def number_unfixed_variables_in_activated_equalities(block):
@@ -957,7 +1431,7 @@ def number_unfixed_variables_in_activated_equalities(block):
         Number of unfixed Var components which appear within activated equality
         Constraints in block
     """
-    return len(unfixed_variables_in_activated_equalities_set(block))
+    return len(_census(block).variables_in_activated_equalities(fixed=False))
 
 
 def fixed_variables_only_in_inequalities(block):
@@ -972,11 +1446,8 @@ def fixed_variables_only_in_inequalities(block):
         A ComponentSet including all fixed Var components which appear only
         within activated inequality Constraints in block
     """
-    var_set = ComponentSet()
-    for v in variables_only_in_inequalities(block):
-        if v.fixed:
-            var_set.add(v)
-    return var_set
+    return ComponentSet(
+        _census(block).variables_only_in_inequalities(fixed=True))
 
 
 def number_fixed_variables_only_in_inequalities(block):
@@ -991,7 +1462,7 @@ def number_fixed_variables_only_in_inequalities(block):
         Number of fixed Var components which only appear within activated
         inequality Constraints in block
     """
-    return len(fixed_variables_only_in_inequalities(block))
+    return len(_census(block).variables_only_in_inequalities(fixed=True))
 
 
 # -------------------------------------------------------------------------
@@ -1008,7 +1479,7 @@ def unused_variables_set(block):
         A ComponentSet including all Var components which do not appear within
         any Constraints in block
     """
-    return variables_set(block) - variables_in_activated_constraints_set(block)
+    return ComponentSet(_census(block).unused_variables())
 
 
 def number_unused_variables(block):
@@ -1023,7 +1494,7 @@ def number_unused_variables(block):
         Number of Var components which do not appear within any activagted
         Constraints in block
     """
-    return len(unused_variables_set(block))
+    return len(_census(block).unused_variables())
 
 
 def fixed_unused_variables_set(block):
@@ -1038,11 +1509,7 @@ def fixed_unused_variables_set(block):
         A ComponentSet including all fixed Var components which do not appear
         within any Constraints in block
     """
-    var_set = ComponentSet()
-    for v in unused_variables_set(block):
-        if v.fixed:
-            var_set.add(v)
-    return var_set
+    return ComponentSet(_census(block).unused_variables(fixed=True))
 
 
 def number_fixed_unused_variables(block):
@@ -1057,7 +1524,7 @@ def number_fixed_unused_variables(block):
         Number of fixed Var components which do not appear within any activated
         Constraints in block
     """
-    return len(fixed_unused_variables_set(block))
+    return len(_census(block).unused_variables(fixed=True))
 
 
 def derivative_variables_set(block):
@@ -1074,8 +1541,7 @@ def derivative_variables_set(block):
         A ComponentSet including all DerivativeVar components which appear in
         block
     """
-    return ComponentSet(block.component_data_objects(
-            ctype=DerivativeVar, active=True, descend_into=True))
+    return ComponentSet(_census(block).derivative_variables())
 
 
 def number_derivative_variables(block):
@@ -1091,7 +1557,7 @@ def number_derivative_variables(block):
     Returns:
         Number of DerivativeVar components which appear in block
     """
-    return len(derivative_variables_set(block))
+    return len(_census(block).derivative_variables())
 
 
 # -------------------------------------------------------------------------
@@ -1106,7 +1572,7 @@ def total_objectives_generator(block):
     Returns:
         A generator which returns all Objective components block
     """
-    for o in activated_block_component_generator(block, ctype=Objective):
+    for o in _census(block).total_objectives():
         yield o
 
 
@@ -1121,7 +1587,7 @@ def total_objectives_set(block):
     Returns:
         A ComponentSet including all Objective components which appear in block
     """
-    return ComponentSet(total_objectives_generator(block))
+    return ComponentSet(_census(block).total_objectives())
 
 
 def number_total_objectives(block):
@@ -1134,10 +1600,7 @@ def number_total_objectives(block):
     Returns:
         Number of Objective components which appear in block
     """
-    c = 0
-    for o in total_objectives_generator(block):
-        c += 1
-    return c
+    return len(_census(block).total_objectives())
 
 
 def activated_objectives_generator(block):
@@ -1150,9 +1613,8 @@ def activated_objectives_generator(block):
     Returns:
         A generator which returns all activated Objective components block
     """
-    for o in activated_block_component_generator(block, ctype=Objective):
-        if o.active:
-            yield o
+    for o in _census(block).activated_objectives():
+        yield o
 
 
 def activated_objectives_set(block):
@@ -1167,7 +1629,7 @@ def activated_objectives_set(block):
         A ComponentSet including all activated Objective components which
         appear in block
     """
-    return ComponentSet(activated_objectives_generator(block))
+    return ComponentSet(_census(block).activated_objectives())
 
 
 def number_activated_objectives(block):
@@ -1181,10 +1643,7 @@ def number_activated_objectives(block):
     Returns:
         Number of activated Objective components which appear in block
     """
-    c = 0
-    for o in activated_objectives_generator(block):
-        c += 1
-    return c
+    return len(_census(block).activated_objectives())
 
 
 def deactivated_objectives_generator(block):
@@ -1197,9 +1656,8 @@ def deactivated_objectives_generator(block):
     Returns:
         A generator which returns all deactivated Objective components block
     """
-    for o in activated_block_component_generator(block, ctype=Objective):
-        if not o.active:
-            yield o
+    for o in _census(block).deactivated_objectives():
+        yield o
 
 
 def deactivated_objectives_set(block):
@@ -1214,7 +1672,7 @@ def deactivated_objectives_set(block):
         A ComponentSet including all deactivated Objective components which
         appear in block
     """
-    return ComponentSet(deactivated_objectives_generator(block))
+    return ComponentSet(_census(block).deactivated_objectives())
 
 
 def number_deactivated_objectives(block):
@@ -1228,10 +1686,7 @@ def number_deactivated_objectives(block):
     Returns:
         Number of deactivated Objective components which appear in block
     """
-    c = 0
-    for o in deactivated_objectives_generator(block):
-        c += 1
-    return c
+    return len(_census(block).deactivated_objectives())
 
 
 # -------------------------------------------------------------------------
@@ -1249,8 +1704,7 @@ def expressions_set(block):
         A ComponentSet including all Expression components which  appear in
         block
     """
-    return ComponentSet(block.component_data_objects(
-            ctype=Expression, active=True, descend_into=True))
+    return ComponentSet(_census(block).expressions())
 
 
 def number_expressions(block):
@@ -1264,7 +1718,7 @@ def number_expressions(block):
     Returns:
         Number of Expression components which  appear in block
     """
-    return len(expressions_set(block))
+    return len(_census(block).expressions())
 
 
 # -------------------------------------------------------------------------
@@ -1279,8 +1733,7 @@ def degrees_of_freedom(block):
     Returns:
         Number of degrees of freedom in block.
     """
-    return (number_unfixed_variables_in_activated_equalities(block) -
-            number_activated_equalities(block))
+    return _census(block).degrees_of_freedom()
 
 
 def large_residuals_set(block, tol=1e-5, return_residual_values=False):
@@ -1301,44 +1754,11 @@ def large_residuals_set(block, tol=1e-5, return_residual_values=False):
         constraint as key and residual (float) as value (if
         return_residual_values is true)
     """
-    large_residuals_set = ComponentSet()
-    if return_residual_values:
-        residual_values = dict()
-    for c in block.component_data_objects(
-            ctype=Constraint, active=True, descend_into=True):
-
-        r = 0.0  # residual
-
-        # skip if no lower bound set
-        if c.lower is None:
-            r_temp = 0
-        else:
-            r_temp = value(c.lower - c.body())
-        # update the residual
-        if r_temp > r:
-            r = r_temp
-
-        # skip if no upper bound set
-        if c.upper is None:
-            r_temp = 0
-        else:
-            r_temp = value(c.body() - c.upper)
-
-        # update the residual
-        if r_temp > r:
-            r = r_temp
-
-        # save residual if it is above threshold
-        if r > tol:
-            large_residuals_set.add(c)
-
-            if return_residual_values:
-                residual_values[c] = r
-
+    residual_values = _census(block).large_residuals(tol)
     if return_residual_values:
         return residual_values
     else:
-        return large_residuals_set
+        return ComponentSet(residual_values)
 
 
 def number_large_residuals(block, tol=1e-5):
@@ -1354,14 +1774,7 @@ def number_large_residuals(block, tol=1e-5):
         Number of Constraint components with a residual greater than tol which
         appear in block
     """
-    lr = 0
-    for c in block.component_data_objects(
-            ctype=Constraint, active=True, descend_into=True):
-        if c.active and value(c.lower - c.body()) > tol:
-            lr += 1
-        elif c.active and value(c.body() - c.upper) > tol:
-            lr += 1
-    return lr
+    return len(_census(block).large_residuals(tol))
 
 
 def active_variables_in_deactivated_blocks_set(block):
@@ -1376,12 +1789,8 @@ def active_variables_in_deactivated_blocks_set(block):
         A ComponentSet including any Var components which belong to a
         deacitvated Block but appear in an activate Constraint in block
     """
-    var_set = ComponentSet()
-    block_set = activated_blocks_set(block)
-    for v in variables_in_activated_constraints_set(block):
-        if v.parent_block() not in block_set:
-            var_set.add(v)
-    return var_set
+    return ComponentSet(
+        _census(block).active_variables_in_deactivated_blocks())
 
 
 def number_active_variables_in_deactivated_blocks(block):
@@ -1396,7 +1805,7 @@ def number_active_variables_in_deactivated_blocks(block):
         Number of Var components which belong to a deacitvated Block but appear
         in an activate Constraint in block
     """
-    return len(active_variables_in_deactivated_blocks_set(block))
+    return len(_census(block).active_variables_in_deactivated_blocks())
 
 
 # -------------------------------------------------------------------------
@@ -1415,6 +1824,10 @@ def report_statistics(block, ostream=None):
     if ostream is None:
         ostream = sys.stdout
 
+    # Collect all statistics from a single walk of the model
+    census = _census(block)
+    block = census.block
+
     tab = " "*4
     header = '='*72
 
@@ -1428,54 +1841,54 @@ def report_statistics(block, ostream=None):
     ostream.write(f"Model Statistics  {name_str} \n")
     ostream.write("\n")
     ostream.write(f"Degrees of Freedom: "
-                  f"{degrees_of_freedom(block)} \n")
+                  f"{degrees_of_freedom(census)} \n")
     ostream.write("\n")
     ostream.write(f"Total No. Variables: "
-                  f"{number_variables(block)} \n")
+                  f"{number_variables(census)} \n")
     ostream.write(f"{tab}No. Fixed Variables: "
-                  f"{number_fixed_variables(block)}"
+                  f"{number_fixed_variables(census)}"
                   f"\n")
     ostream.write(
         f"{tab}No. Unused Variables: "
-        f"{number_unused_variables(block)} (Fixed):"
-        f"{number_fixed_unused_variables(block)})"
+        f"{number_unused_variables(census)} (Fixed):"
+        f"{number_fixed_unused_variables(census)})"
         f"\n")
     nv_alias = number_variables_only_in_inequalities
     nfv_alias = number_fixed_variables_only_in_inequalities
     ostream.write(
         f"{tab}No. Variables only in Inequalities:"
-        f" {nv_alias(block)}"
-        f" (Fixed: {nfv_alias(block)}) \n")
+        f" {nv_alias(census)}"
+        f" (Fixed: {nfv_alias(census)}) \n")
     ostream.write("\n")
     ostream.write(
             f"Total No. Constraints: "
-            f"{number_total_constraints(block)} \n")
+            f"{number_total_constraints(census)} \n")
     ostream.write(
         f"{tab}No. Equality Constraints: "
-        f"{number_total_equalities(block)}"
+        f"{number_total_equalities(census)}"
         f" (Deactivated: "
-        f"{number_deactivated_equalities(block)})"
+        f"{number_deactivated_equalities(census)})"
         f"\n")
     ostream.write(
         f"{tab}No. Inequality Constraints: "
-        f"{number_total_inequalities(block)}"
+        f"{number_total_inequalities(census)}"
         f" (Deactivated: "
-        f"{number_deactivated_inequalities(block)})"
+        f"{number_deactivated_inequalities(census)})"
         f"\n")
     ostream.write("\n")
     ostream.write(
         f"No. Objectives: "
-        f"{number_total_objectives(block)}"
+        f"{number_total_objectives(census)}"
         f" (Deactivated: "
-        f"{number_deactivated_objectives(block)})"
+        f"{number_deactivated_objectives(census)})"
         f"\n")
     ostream.write("\n")
     ostream.write(
-        f"No. Blocks: {number_total_blocks(block)}"
+        f"No. Blocks: {number_total_blocks(census)}"
         f" (Deactivated: "
-        f"{number_deactivated_blocks(block)}) \n")
+        f"{number_deactivated_blocks(census)}) \n")
     ostream.write(f"No. Expressions: "
-                  f"{number_expressions(block)} \n")
+                  f"{number_expressions(census)} \n")
     ostream.write(header+"\n")
     ostream.write("\n")
 
@@ -18,6 +18,9 @@ plots.
 
 __author__ = "Alejandro Garciadiego"
 
+import concurrent.futures
+import multiprocessing
+
 # Import objects from pyomo package
 from pyomo.environ import (ConcreteModel,
                            SolverFactory,
@@ -36,6 +39,8 @@ import idaes.logger as idaeslog
 import matplotlib.pyplot as plt
 import numpy as np
 
+_log = idaeslog.getLogger(__name__)
+
 def Txy_diagram(
     model, component_1, component_2, pressure, num_points = 20, temperature = 298.15,  figure_name = None,
     print_legend = True, include_pressure = False, print_level=idaeslog.NOTSET,
@@ -76,7 +81,7 @@ def Txy_diagram(
 
 
 def Txy_data(model, component_1, component_2, pressure, num_points = 20, temperature = 298.15,
-            print_level=idaeslog.NOTSET, solver=None, solver_op=None):
+            print_level=idaeslog.NOTSET, solver=None, solver_op=None, batch=False):
     """
     Function to generate T-x-y data. The function builds a state block and extracts
     bubble and dew temperatures at P pressure for N number of compositions.
@@ -94,11 +99,21 @@ def Txy_data(model, component_1, component_2, pressure, num_points = 20, tempera
         print_level: printing level from initialization
         solver: solver to use (default=None, use IDAES default solver)
         solver_op: solver options
+        batch: If True, build one state block per composition and solve all
+        of them as a single problem. Points are only solved one at a time,
+        each starting from the solution of its neighbour, if the single
+        problem fails.
 
     Returns:
         (Class): A class containing the T-x-y data
 
     """
+    if batch:
+        data = _Txy_sweep(model, component_1, component_2, [pressure],
+                          num_points, temperature, print_level, solver,
+                          solver_op)[0]
+        return _Txy_data_class(model, component_1, component_2, pressure,
+                               data)
 
     components = list(model.params.component_list)
     components_used = [component_1, component_2]
@@ -184,6 +199,193 @@ def Txy_data(model, component_1, component_2, pressure, num_points = 20, tempera
     # Return the data class with all the information of the calculations
     return TD
 
+def Txy_data_pressures(model, component_1, component_2, pressures,
+                       num_points=20, temperature=298.15,
+                       print_level=idaeslog.NOTSET, solver=None,
+                       solver_op=None, max_workers=1):
+    """
+    Function to generate T-x-y data at a number of pressures. For each
+    pressure, the state blocks of all compositions are solved as a single
+    problem (see Txy_data with batch=True), starting from the solution at
+    the previous pressure.
+
+    Args:
+        model: Model with intialized Property package which contains data to
+        calculate bubble and dew temperatures for component 1 and component 2
+        component_1: Component 1
+        component_2: Component 2
+        pressures: Pressures at which the bubble and dew temperatures will be
+        calculated
+        num_points: Number of compositions at each pressure
+        temperature: Temperature at which to initialize state blocks
+        print_level: printing level from initialization
+        solver: solver to use (default=None, use IDAES default solver)
+        solver_op: solver options
+        max_workers: Number of worker processes. If greater than one, the
+        pressures are split into contiguous ranges which are solved in
+        parallel, each in a forked copy of the model. If None, the number of
+        processors on the machine is used.
+
+    Returns:
+        (list): A TXYDataClass for each pressure, in the order given
+    """
+    pressures = list(pressures)
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    max_workers = min(max_workers, len(pressures))
+    if (max_workers > 1 and
+            "fork" not in multiprocessing.get_all_start_methods()):
+        _log.warning("Worker processes require the fork start method, which "
+                     "is not available on this platform. Pressures will be "
+                     "solved in serial.")
+        max_workers = 1
+
+    args = (component_1, component_2, num_points, temperature, print_level,
+            solver, solver_op)
+    if max_workers <= 1:
+        data = _Txy_sweep(model, component_1, component_2, pressures,
+                          num_points, temperature, print_level, solver,
+                          solver_op)
+    else:
+        chunks = [list(c) for c in
+                  np.array_split(np.array(pressures, dtype=object),
+                                 max_workers)]
+        # The model is passed to the workers by forking, as property
+        # packages generally can not be pickled.
+        _txy_worker['model'] = model
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("fork")) \
+                    as executor:
+                futures = [executor.submit(_txy_worker_sweep, chunk, args)
+                           for chunk in chunks]
+                data = [d for f in futures for d in f.result()]
+        finally:
+            _txy_worker.clear()
+
+    return [_Txy_data_class(model, component_1, component_2, p, d)
+            for p, d in zip(pressures, data)]
+
+
+# Model used by Txy_data_pressures worker processes
+_txy_worker = {}
+
+
+def _txy_worker_sweep(pressures, args):
+    component_1, component_2, num_points, temperature, print_level, \
+        solver, solver_op = args
+    return _Txy_sweep(_txy_worker['model'], component_1, component_2,
+                      pressures, num_points, temperature, print_level,
+                      solver, solver_op)
+
+
+def _Txy_sweep(model, component_1, component_2, pressures, num_points,
+               temperature, print_level, solver, solver_op):
+    """
+    Builds model.props, indexed by composition, and solves it at each
+    pressure in turn. Returns a list of (x, Tbubb, Tdew) lists for each
+    pressure.
+    """
+    components = list(model.params.component_list)
+    components_not_used = [j for j in components
+                           if j not in (component_1, component_2)]
+
+    # Compositions are the same as those of the serial method
+    x = 0.99
+    xs = 1e-5*len(components_not_used)
+    x_d = np.linspace(x, 1 - x - xs, num_points)
+    points = list(range(1, num_points + 1))
+
+    model.props = model.params.build_state_block(
+        points, default={"defined_state": True})
+    props = model.props
+    for k, xk in zip(points, x_d):
+        props[k].mole_frac_comp[component_1].fix(xk)
+        for j in components_not_used:
+            props[k].mole_frac_comp[j].fix(1e-5)
+        props[k].mole_frac_comp[component_2].fix(1 - xk - xs)
+        props[k].flow_mol.fix(1)
+        props[k].temperature.fix(temperature)
+        props[k].pressure.fix(pressures[0])
+        props[k].calculate_scaling_factors()
+
+    props.initialize(solver=solver, optarg=solver_op, outlvl=print_level)
+
+    solver = get_solver(solver, solver_op)
+
+    data = []
+    for pressure in pressures:
+        for k in points:
+            props[k].pressure.fix(pressure)
+        converged = _solve_Txy_points(model, props, solver)
+
+        X = []
+        Tbubb = []
+        Tdew = []
+        for k, xk, ok in zip(points, x_d, converged):
+            if not ok:
+                _log.info("P = {}: no result for {} x = {:.2f}".format(
+                    pressure, component_1, xk))
+                continue
+            if hasattr(props[k], "_mole_frac_tbub"):
+                Tbubb.append(value(props[k].temperature_bubble['Vap', 'Liq']))
+            if hasattr(props[k], "_mole_frac_tdew"):
+                Tdew.append(value(props[k].temperature_dew['Vap', 'Liq']))
+            X.append(xk)
+        data.append((X, Tbubb, Tdew))
+    return data
+
+
+def _solve_Txy_points(model, props, solver):
+    """
+    Solves the state blocks of all points together. If this fails, each
+    point is solved separately, starting from the solution of the last point
+    which converged. Returns a list of bools indicating which points
+    converged.
+    """
+    status = solver.solve(model, tee=False)
+    if _is_optimal(status):
+        return [True]*len(props)
+
+    for k in props:
+        props[k].deactivate()
+    converged = []
+    last = None
+    for k in props:
+        blk = props[k]
+        blk.activate()
+        if last is not None:
+            # Neighbouring state blocks have the same structure
+            for v, v_last in zip(blk.component_data_objects(Var),
+                                 last.component_data_objects(Var)):
+                if not v.fixed:
+                    v.set_value(v_last.value)
+        status = solver.solve(model, tee=False)
+        ok = _is_optimal(status)
+        converged.append(ok)
+        if ok:
+            last = blk
+        blk.deactivate()
+    for k in props:
+        props[k].activate()
+    return converged
+
+
+def _is_optimal(status):
+    return (status.solver.status == SolverStatus.ok and
+            status.solver.termination_condition ==
+            TerminationCondition.optimal)
+
+
+def _Txy_data_class(model, component_1, component_2, pressure, data):
+    units = model.params.get_metadata().get_derived_units
+    TD = TXYDataClass(component_1, component_2, units("pressure"),
+                      units("temperature"), pressure)
+    TD.x, TD.TBubb, TD.TDew = data
+    return TD
+
+
 # Author: Alejandro Garciadiego
 class TXYDataClass:
     """
@@ -28,6 +28,8 @@ variables to calculate additional scaling factors.
 __author__ = "John Eslick, Tim Bartholomew, Robert Parker"
 
 from math import log10
+import numpy as np
+import scipy.sparse as sparse
 import scipy.sparse.linalg as spla
 import scipy.linalg as la
 
@@ -455,20 +457,27 @@ def badly_scaled_var_generator(
     Yields:
         variable data object, current absolute value of scaled value
     """
+    vlist = []
     for v in blk.component_data_objects(pyo.Var, descend_into=descend_into):
         if v.fixed and not include_fixed:
             continue
-        val = pyo.value(v, exception=False)
-        if val is None:
+        if v.value is None:
             continue
-        sf = get_scaling_factor(v, default=1)
-        sv = abs(val * sf)  # scaled value
-        if sv > large:
-            yield v, sv
-        elif sv < zero:
-            continue
-        elif sv < small:
-            yield v, sv
+        vlist.append(v)
+    if not vlist:
+        return
+    val = np.array([v.value for v in vlist], dtype=float)
+    sv = np.abs(val*_scaling_factor_vector(vlist))  # scaled values
+    bad = (sv > large) | ((sv >= zero) & (sv < small))
+    for i in np.flatnonzero(bad):
+        yield vlist[i], sv[i]
+
+
+def _scaling_factor_vector(clist, default=1):
+    """PRIVATE FUNCTION, Get an array of the scaling factors of a list of
+    components, with default for those without a scaling factor."""
+    return np.array(
+        [get_scaling_factor(c, default=default) for c in clist], dtype=float)
 
 
 def constraint_autoscale_large_jac(
@@ -477,7 +486,9 @@ def constraint_autoscale_large_jac(
     ignore_variable_scaling=False,
     max_grad=100,
     min_scale=1e-6,
-    no_scale=False
+    no_scale=False,
+    nlp=None,
+    session=None,
 ):
     """Automatically scale constraints based on the Jacobian.  This function
     imitates Ipopt's default constraint scaling.  This scales constraints down
@@ -496,10 +507,57 @@ def constraint_autoscale_large_jac(
             scaled too much.
         no_scale: just calculate the Jacobian and scaled Jacobian, don't scale
             anything
+        nlp: (optional) Pynumero NLP returned by a previous call for the same
+            model, which is reused to evaluate the Jacobian at the current
+            variable values instead of creating a new NLP. The model structure,
+            including which variables are fixed and their values, must not
+            have changed since the NLP was created.
+        session: (optional) DiagnosticsSession for the model, from which the
+            NLP is taken (m and nlp are then ignored)
 
     Returns:
         unscaled Jacobian CSR from, scaled Jacobian CSR from, Pynumero NLP
     """
+    if session is not None:
+        nlp = session.nlp
+    elif nlp is None:
+        nlp = _create_nlp(m)
+    else:
+        _set_nlp_primals(nlp)
+    jac = nlp.evaluate_jacobian().tocsr()
+    clist = nlp.clist
+    vlist = nlp.vlist
+    # Create a scaled Jacobian to account for variable scaling, for now ignore
+    # constraint scaling
+    if ignore_variable_scaling:
+        jac_scaled = jac.copy()
+    else:
+        jac_scaled = jac @ sparse.diags(1/_scaling_factor_vector(vlist))
+    # calculate constraint scale factors
+    sc = _scaling_factor_vector(clist)
+    if not no_scale:
+        if ignore_constraint_scaling:
+            rescale = np.ones(len(clist), dtype=bool)
+        else:
+            rescale = np.array(
+                [get_scaling_factor(c) is None for c in clist], dtype=bool)
+        if len(clist) > 0:
+            mg = abs(jac_scaled).max(axis=1).toarray().ravel()
+        else:
+            mg = np.zeros(0)
+        large = rescale & (mg > max_grad)
+        sc[large] = np.maximum(min_scale, max_grad/mg[large])
+        for i in np.flatnonzero(rescale):
+            set_scaling_factor(clist[i], sc[i])
+    # update the scaled jacobian
+    jac_scaled = (sparse.diags(sc) @ jac_scaled).tocsr()
+    return jac, jac_scaled, nlp
+
+
+def _create_nlp(m):
+    """PRIVATE FUNCTION, Create a Pynumero NLP for a model, with the lists of
+    constraints and variables corresponding to the Jacobian rows and columns
+    """
     # Pynumero requires an objective, but I don't, so let's see if we have one
     n_obj = 0
     for c in m.component_data_objects(pyo.Objective, active=True):
@@ -508,46 +566,92 @@ def constraint_autoscale_large_jac(
     if n_obj == 0:
         dummy_objective_name = unique_component_name(m, "objective")
         setattr(m, dummy_objective_name, pyo.Objective(expr=0))
-    # Create NLP and calculate the objective
-    nlp = PyomoNLP(m)
-    jac = nlp.evaluate_jacobian().tocsr()
+    # Create NLP
+    try:
+        nlp = PyomoNLP(m)
+    finally:
+        # delete dummy objective
+        if n_obj == 0:
+            delattr(m, dummy_objective_name)
     # Get lists of varibles and constraints to translate Jacobian indexes
     # save them on the NLP for later, since genrating them seems to take a while
-    nlp.clist = clist = nlp.get_pyomo_constraints()
-    nlp.vlist = vlist = nlp.get_pyomo_variables()
-    # Create a scaled Jacobian to account for variable scaling, for now ignore
-    # constraint scaling
-    jac_scaled = jac.copy()
-    for i, c in enumerate(clist):
-        for j in jac_scaled[i].indices:
-            v = vlist[j]
-            if ignore_variable_scaling:
-                sv = 1
-            else:
-                sv = get_scaling_factor(v, default=1)
-            jac_scaled[i,j] = jac_scaled[i,j]/sv
-    # calculate constraint scale factors
-    for i, c in enumerate(clist):
-        sc = get_scaling_factor(c, default=1)
-        if not no_scale:
-            if (ignore_constraint_scaling or get_scaling_factor(c) is None):
-                row = jac_scaled[i]
-                for d in row.indices:
-                    row[0,d] = abs(row[0,d])
-                mg = row.max()
-                if mg > max_grad:
-                    sc = max(min_scale, max_grad/mg)
-                set_scaling_factor(c, sc)
-        for j in jac_scaled[i].indices:
-            # update the scaled jacobian
-            jac_scaled[i,j] = jac_scaled[i,j]*sc
-    # delete dummy objective
-    if n_obj == 0:
-        delattr(m, dummy_objective_name)
-    return jac, jac_scaled, nlp
+    nlp.clist = nlp.get_pyomo_constraints()
+    nlp.vlist = nlp.get_pyomo_variables()
+    return nlp
+
 
+def _set_nlp_primals(nlp):
+    """PRIVATE FUNCTION, Set the primals of a Pynumero NLP created by
+    _create_nlp to the current values of its variables"""
+    nlp.set_primals(np.array(
+        [0 if v.value is None else v.value for v in nlp.vlist], dtype=float))
 
-def get_jacobian(m, scaled=True):
+
+class DiagnosticsSession(object):
+    """
+    A Pynumero NLP for a model, shared by the scaling and diagnostics tools
+    so that the NL file for the model is only written once. The NLP is
+    created when first used, and each time it is used afterwards either the
+    primals are set to the current variable values or, if the structure of
+    the model has changed, a new NLP is created.
+
+    The structure of the model is checked from its active constraints and
+    objectives, and which of its variables are fixed along with their
+    values, since these are written into the NLP. Changes to the expressions
+    of constraints or objectives are not detected; call reset() after making
+    them.
+
+    Args:
+        m: model to diagnose
+    """
+    def __init__(self, m):
+        self.model = m
+        self.n_nlp = 0  # number of NLPs created
+        self._nlp = None
+        self._structure = None
+
+    def _get_structure(self):
+        m = self.model
+        return (
+            [id(c) for c in m.component_data_objects(
+                (pyo.Constraint, pyo.Objective), active=True)],
+            [(id(v), v.value) for v in m.component_data_objects(pyo.Var)
+             if v.fixed],
+        )
+
+    def reset(self):
+        """Discard the NLP, so that a new one is created when next used."""
+        self._nlp = None
+        self._structure = None
+
+    @property
+    def nlp(self):
+        """Pynumero NLP for the model at the current variable values, with
+        lists of its constraints (clist) and variables (vlist) corresponding
+        to the Jacobian rows and columns."""
+        structure = self._get_structure()
+        if self._nlp is None or structure != self._structure:
+            self._nlp = _create_nlp(self.model)
+            self._structure = structure
+            self.n_nlp += 1
+        else:
+            _set_nlp_primals(self._nlp)
+        return self._nlp
+
+    def get_jacobian(self, scaled=True):
+        """
+        Get the Jacobian matrix at the current model values.
+
+        Args:
+            scaled: if True return scaled Jacobian, else get unscaled
+
+        Returns:
+            Jacobian matrix in Scipy CSR format, Pynumero nlp
+        """
+        return get_jacobian(self.model, scaled=scaled, session=self)
+
+
+def get_jacobian(m, scaled=True, nlp=None, session=None):
     """
     Get the Jacobian matrix at the current model values. This function also
     returns the Pynumero NLP which can be used to identify the constraints and
@@ -556,11 +660,17 @@ def get_jacobian(m, scaled=True):
     Args:
         m: model to get Jacobian from
         scaled: if True return scaled Jacobian, else get unscaled
+        nlp: (optional) Pynumero NLP returned by a previous call for the same
+            model, to reuse if the model structure has not changed (see
+            constraint_autoscale_large_jac)
+        session: (optional) DiagnosticsSession for the model, from which the
+            NLP is taken
 
     Returns:
         Jacobian matrix in Scipy CSR format, Pynumero nlp
     """
-    jac, jac_scaled, nlp = constraint_autoscale_large_jac(m, no_scale=True)
+    jac, jac_scaled, nlp = constraint_autoscale_large_jac(
+        m, no_scale=True, nlp=nlp, session=session)
     if scaled:
         return jac_scaled, nlp
     else:
@@ -568,7 +678,8 @@ def get_jacobian(m, scaled=True):
 
 
 def extreme_jacobian_entries(
-        m=None, scaled=True, large=1e4, small=1e-4, zero=1e-10, jac=None, nlp=None):
+        m=None, scaled=True, large=1e4, small=1e-4, zero=1e-10, jac=None, nlp=None,
+        session=None):
     """
     Show very large and very small Jacobian entries.
 
@@ -577,23 +688,26 @@ def extreme_jacobian_entries(
         scaled: if true use scaled Jacobian
         large: >= to this value is consdered large
         small: <= to this and >= zero is consdered small
+        session: (optional) DiagnosticsSession for the model, from which the
+            Jacobian is taken
 
     Returns:
         (list of tuples), Jacobian entry, Constraint, Variable
     """
     if jac is None or nlp is None:
-        jac, nlp = get_jacobian(m, scaled)
-    el = []
-    for i, c in enumerate(nlp.clist):
-        for j in jac[i].indices:
-            v = nlp.vlist[j]
-            e = abs(jac[i, j])
-            if (e <= small and e > zero) or e >= large:
-                el.append((e, c, v))
-    return el
-
-
-def jacobian_cond(m=None, scaled=True, ord=None, pinv=False, jac=None):
+        jac, nlp = get_jacobian(m, scaled, nlp=nlp, session=session)
+    jac = jac.tocsr(copy=True)
+    jac.sum_duplicates()
+    rows = np.repeat(np.arange(jac.shape[0]), np.diff(jac.indptr))
+    e = np.abs(jac.data)
+    extreme = ((e <= small) & (e > zero)) | (e >= large)
+    return [(e[k], nlp.clist[rows[k]], nlp.vlist[jac.indices[k]])
+            for k in np.flatnonzero(extreme)]
+
+
+def jacobian_cond(
+        m=None, scaled=True, ord=None, pinv=False, jac=None, session=None,
+        estimate=False):
     """
     Get the condition number of the scaled or unscaled Jacobian matrix of a model.
 
@@ -603,13 +717,35 @@ def jacobian_cond(m=None, scaled=True, ord=None, pinv=False, jac=None):
         ord: norm order, None = Frobenius, see scipy.sparse.linalg.norm for more
         pinv: Use pseudoinverse, works for non-square matrixes
         jac: (optional) perviously calculated jacobian
+        session: (optional) DiagnosticsSession for the model, from which the
+            Jacobian is taken
+        estimate: if True, estimate the condition number without forming a
+            dense or inverse matrix, for large models. ord must be given as
+            1 or 2, so that estimates are not mistaken for the Frobenius norm
+            condition number returned by default. With ord 1, the condition
+            number of a square Jacobian is estimated from a sparse LU
+            factorization. With ord 2, it is found from the largest and
+            smallest singular values, and pinv or a non-square Jacobian is
+            allowed.
 
     Returns:
         (float) Condition number
     """
     if jac is None:
-        jac, nlp = get_jacobian(m, scaled)
+        jac, nlp = get_jacobian(m, scaled, session=session)
     jac = jac.tocsc()
+    if estimate:
+        if ord not in (1, 2):
+            raise ValueError(
+                f"Condition number can only be estimated for ord 1 or 2, "
+                f"not {ord}")
+        if ord == 2:
+            return _cond_2_estimate(jac)
+        if jac.shape[0] != jac.shape[1] or pinv:
+            raise ValueError(
+                "The 1-norm condition number can only be estimated for a "
+                "square Jacobian without pinv, use ord=2")
+        return _cond_1_estimate(jac)
     if jac.shape[0] != jac.shape[1] and not pinv:
         _log.warning("Nonsquare Jacobian using pseudo inverse")
         pinv = True
@@ -621,6 +757,88 @@ def jacobian_cond(m=None, scaled=True, ord=None, pinv=False, jac=None):
         return spla.norm(jac, ord)*la.norm(jac_inv, ord)
 
 
+def _cond_1_estimate(jac):
+    """PRIVATE FUNCTION, Estimate the 1-norm condition number of a square
+    sparse matrix from its LU factorization"""
+    try:
+        lu = spla.splu(jac)
+    except RuntimeError:
+        # Factor is exactly singular
+        return np.inf
+    jac_inv = spla.LinearOperator(
+        jac.shape,
+        matvec=lu.solve,
+        rmatvec=lambda x: lu.solve(x, trans="T"),
+        dtype=float)
+    return spla.norm(jac, 1)*spla.onenormest(jac_inv)
+
+
+def _cond_2_estimate(jac):
+    """PRIVATE FUNCTION, Find the 2-norm condition number of a sparse matrix
+    from its largest and smallest singular values"""
+    u, s_min, vt = smallest_singular_values(jac, k=1)
+    if min(jac.shape) > 2:
+        s_max = spla.svds(jac, k=1, which="LM", return_singular_vectors=False)
+    else:
+        s_max = la.svd(jac.toarray(), compute_uv=False)
+    s_max = np.max(s_max)
+    if s_min[0] == 0:
+        return np.inf
+    return s_max/s_min[0]
+
+
+def smallest_singular_values(jac, k=1):
+    """
+    Find the smallest singular values of a sparse matrix and the corresponding
+    singular vectors, without a dense SVD. The eigenvalues of the smaller of
+    J*J^T and J^T*J are found by shift-invert Lanczos (ARPACK) iterations with
+    a sparse LU factorization. As the singular values are square roots of these
+    eigenvalues, those smaller than about 1e-8 times the largest singular
+    value are not resolved accurately.
+
+    Args:
+        jac: sparse matrix (e.g. a Jacobian)
+        k: number of singular values to find
+
+    Returns:
+        u, s, vt as returned by scipy.sparse.linalg.svds, with singular values
+        in ascending order
+    """
+    jac = sparse.csc_matrix(jac)
+    left = jac.shape[0] <= jac.shape[1]
+    if left:
+        gram = (jac @ jac.T).tocsc()
+    else:
+        gram = (jac.T @ jac).tocsc()
+    n = gram.shape[0]
+    k = min(k, n)
+    if k >= n - 1:
+        # ARPACK needs k < n - 1, and the Gram matrix is small
+        w, vec = la.eigh(gram.toarray())
+        w = w[:k]
+        vec = vec[:, :k]
+    else:
+        # Shift slightly so that the shifted matrix can be factorized even if
+        # the Gram matrix is singular
+        sigma = -1e-10*max(spla.norm(gram, 1), 1)
+        w, vec = spla.eigsh(gram, k=k, sigma=sigma, which="LM")
+        order = np.argsort(w)
+        w = w[order]
+        vec = vec[:, order]
+    s = np.sqrt(np.maximum(w, 0))
+    if left:
+        other = jac.T @ vec
+    else:
+        other = jac @ vec
+    nonzero = s > 0
+    other[:, nonzero] /= s[nonzero]
+    other[:, ~nonzero] = 0
+    if left:
+        return vec, s, other.T
+    else:
+        return other, s, vec.T
+
+
 class CacheVars(object):
     """
     A class for saving the values of variables then reloading them,
@@ -18,8 +18,15 @@ This module contains utility functions for use in testing IDAES models.
 __author__ = "Andrew Lee"
 
 
-from pyomo.environ import Constraint, Set, units, Var
+import numpy as np
+
+from pyomo.environ import (Constraint, Set, units, Var, value,
+                           TerminationCondition)
 from pyomo.common.config import ConfigBlock
+from pyomo.common.collections import ComponentSet
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.core.expr.calculus.derivatives import differentiate
+from pyomo.opt import SolverResults, SolverStatus
 
 from idaes.core import (declare_process_block_class,
                         PhysicalParameterBlock,
@@ -53,6 +60,41 @@ def get_default_solver():
     return default_solver()
 
 
+class NewtonTestSolver(object):
+    """
+    Solver for square systems of equality constraints by Newton's method,
+    for testing methods which solve subproblems of a model without needing
+    an external solver. Records the number of constraints of each problem it
+    solves and the number of iterations it takes in the calls attribute.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def solve(self, model, **kwds):
+        cons = list(model.component_data_objects(Constraint, active=True))
+        variables = list(ComponentSet(
+            v for c in cons for v in identify_variables(c.body,
+                                                        include_fixed=False)))
+        assert len(cons) == len(variables)
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = \
+            TerminationCondition.maxIterations
+        for k in range(20):
+            res = np.array([value(c.body) - value(c.upper) for c in cons])
+            if np.max(np.abs(res)) < 1e-10:
+                results.solver.termination_condition = \
+                    TerminationCondition.optimal
+                break
+            jac = np.array([differentiate(c.body, wrt_list=variables)
+                            for c in cons], dtype=float)
+            step = np.linalg.solve(jac, -res)
+            for v, dv in zip(variables, step):
+                v.set_value(v.value + dv)
+        self.calls.append((len(cons), k))
+        return results
+
+
 def initialization_tester(m, dof=0, unit=None, **init_kwargs):
     """
     A method to test initialization methods on IDAES models. This method is
@@ -14,13 +14,15 @@
 Tests for dynamic utility methods.
 """
 
+import numpy as np
 import pytest
 from pyomo.environ import (ConcreteModel, Block, Constraint, Var, Set,
-                           TransformationFactory)
+                           TransformationFactory, Objective, Suffix, Integers)
 from pyomo.dae import ContinuousSet, DerivativeVar
 from pyomo.common.collections import ComponentSet
 import idaes.logger as idaeslog
 from idaes.core.util.dyn_utils import *
+from idaes.core.util.model_statistics import degrees_of_freedom
 
 __author__ = "Robert Parker"
 
@@ -215,6 +217,146 @@ def test_copy_non_time_indexed_values():
     assert m1.b3[3].v5.value != m2.b3[3].v5.value
 
 
+def make_correspondence_model(ntfe=5, init=1):
+    m = ConcreteModel()
+    m.time = ContinuousSet(bounds=(0, 10))
+    m.space = ContinuousSet(bounds=(0, 5))
+    m.set1 = Set(initialize=['a', 'b', 'c'])
+    m.fs = Block()
+    m.fs.v0 = Var(m.space, initialize=init)
+
+    @m.fs.Block()
+    def b1(b):
+        b.v = Var(m.time, m.space, initialize=init)
+        b.dv = DerivativeVar(b.v, wrt=m.time, initialize=init)
+
+        @b.Block(m.time)
+        def b2(b, t):
+            b.v = Var(initialize=init)
+
+    @m.fs.Block(m.time, m.space)
+    def b2(b, t, x):
+        b.v = Var(m.set1, initialize=init)
+
+        @b.Block(m.set1)
+        def b3(b, c):
+            b.v = Var(initialize=init)
+
+    disc = TransformationFactory('dae.collocation')
+    disc.apply_to(m, wrt=m.time, nfe=ntfe, ncp=2, scheme='LAGRANGE-RADAU')
+    disc.apply_to(m, wrt=m.space, nfe=2, ncp=2, scheme='LAGRANGE-RADAU')
+    return m
+
+
+@pytest.mark.unit
+def test_value_correspondence_at_time():
+    m1 = make_correspondence_model()
+    m2 = make_correspondence_model()
+    for i, var in enumerate(m2.fs.component_data_objects(Var)):
+        var.set_value(i)
+    t_src = m2.time[3]
+    for t in m1.time:
+        m1.fs.b1.v[t, m1.space.first()].fix()
+
+    corr = ValueCorrespondence(m1, m2)
+    # One row for each non-time index of b1.v, b1.dv and b2.v, and one for
+    # each variable in the blocks b1.b2 and b2[t, x]
+    n_space = len(m1.space)
+    assert corr.target_array.shape == (2*n_space + 1 + 2*3*n_space,
+                                       len(m1.time))
+    assert m1.fs.v0[m1.space.first()] in corr.target_to_source
+
+    m3 = make_correspondence_model()
+    for t in m3.time:
+        m3.fs.b1.v[t, m3.space.first()].fix()
+    for t in m1.time:
+        corr.copy_values_at_time(t, t_src, copy_fixed=False)
+        copy_values_at_time(m3, m2, t, t_src, copy_fixed=False)
+    for v1, v3 in zip(m1.fs.component_data_objects(Var),
+                      m3.fs.component_data_objects(Var)):
+        assert v1.value == v3.value
+    assert m1.fs.b1.v[0, m1.space.first()].value == 1
+    assert (m1.fs.b1.v[10, m1.space.last()].value ==
+            m2.fs.b1.v[t_src, m2.space.last()].value)
+    assert (m1.fs.b2[10, m1.space.last()].b3['c'].v.value ==
+            m2.fs.b2[t_src, m2.space.last()].b3['c'].v.value)
+
+    # Copy only the variables referenced by a slice
+    m1.fs.b1.v[:, :].set_value(-1)
+    m1.fs.b1.dv[:, :].set_value(-1)
+    corr.copy_values_at_time(m1.time.last(), t_src,
+                             variables=[m1.fs.b1.v])
+    for x in m1.space:
+        assert (m1.fs.b1.v[m1.time.last(), x].value ==
+                m2.fs.b1.v[t_src, x].value)
+        assert m1.fs.b1.dv[m1.time.last(), x].value == -1
+
+    with pytest.raises(KeyError):
+        corr.copy_values_at_time(0.123, t_src)
+
+
+@pytest.mark.unit
+def test_value_correspondence_different_time():
+    # A model with a longer horizon initialized from the end of a model
+    # with a shorter horizon
+    m1 = make_correspondence_model(ntfe=10, init=1)
+    m2 = make_correspondence_model(ntfe=5, init=2)
+    corr = ValueCorrespondence(m1, m2)
+    assert corr.source_array.shape[1] == len(m2.time)
+    for t in m1.time:
+        corr.copy_values_at_time(t, m2.time.last())
+    for var in corr.target_array.flat:
+        assert var.value == 2
+    assert m1.fs.v0[m1.space.first()].value == 1
+
+
+@pytest.mark.unit
+def test_value_correspondence_non_time_indexed():
+    def make_model(init):
+        m = ConcreteModel()
+        m.time = Set(initialize=[1, 2, 3, 4, 5])
+        m.v1 = Var(m.time, initialize=init)
+        m.v2 = Var(initialize=init)
+        m.v7 = Var(['x', 'y'], initialize=init)
+
+        @m.Block(['a', 'b'])
+        def b1(b, i):
+            b.v3 = Var(initialize=init)
+
+            @b.Block(m.time)
+            def b2(b, t):
+                b.v4 = Var(initialize=init)
+
+            @b.Block()
+            def b4(b):
+                b.v6 = Var(initialize=init)
+
+        @m.Block(m.time)
+        def b3(b, t):
+            b.v5 = Var(initialize=init)
+        return m
+
+    m1 = make_model(1)
+    m2 = make_model(2)
+    m1.b1['b'].v3.fix()
+    corr = ValueCorrespondence(m1, m2)
+    assert corr.target_to_source[m1.v7['y']] is m2.v7['y']
+    assert m1.v1[1] not in corr.target_to_source
+
+    corr.copy_non_time_indexed_values(variables=[m1.v2])
+    assert m1.v2.value == 2
+    assert m1.v7['x'].value == 1
+
+    corr.copy_non_time_indexed_values(copy_fixed=False)
+    assert m1.v7['x'].value == 2
+    assert m1.b1['a'].v3.value == 2
+    assert m1.b1['b'].v3.value == 1
+    assert m1.b1['b'].b4.v6.value == 2
+    assert m1.v1[1].value == 1
+    assert m1.b3[3].v5.value == 1
+    assert m1.b1['a'].b2[3].v4.value == 1
+
+
 @pytest.mark.unit
 def test_find_comp_in_block():
     m1 = ConcreteModel()
@@ -369,3 +511,81 @@ def test_get_implicit_index_of_set():
 
     with pytest.raises(ValueError) as exc_test:
         get_implicit_index_of_set(m.b1.b2['e',5,2].b3.v2[1], m.s1)
+
+
+@pytest.mark.unit
+def test_extrapolate_values_at_time():
+    m = ConcreteModel()
+    m.time = Set(initialize=[0, 1, 2, 4])
+    m.v = Var(m.time, ['a', 'b', 'c', 'd'], bounds=(None, 5))
+    m.i = Var(m.time, domain=Integers)
+    for t in m.time:
+        m.v[t, 'a'].set_value(t + 1)
+        m.v[t, 'b'].set_value(2*t)
+        m.i[t].set_value(t)
+    m.v[:, 'c'].fix(3)
+    var_array = np.array(
+        [[m.v[t, j] for t in m.time] for j in ['a', 'b', 'c', 'd']]
+        + [[m.i[t] for t in m.time]], dtype=object)
+    time_points = list(m.time)
+
+    extrapolate_values_at_time(var_array, time_points, [2, 3], 1, order=0)
+    assert [m.v[4, j].value for j in ['a', 'b', 'c', 'd']] == [2, 2, 3, None]
+    assert m.i[4].value == 1
+
+    extrapolate_values_at_time(var_array, time_points, [2, 3], 1)
+    assert [m.v[2, j].value for j in ['a', 'b', 'c']] == [3, 4, 3]
+    # extrapolated values are projected onto the bounds
+    assert [m.v[4, j].value for j in ['a', 'b', 'c']] == [5, 5, 3]
+    assert m.v[4, 'd'].value is None
+    # discrete variables are not extrapolated
+    assert m.i[4].value == 1
+
+    # values are copied from the first point in time
+    m.v[1, 'a'].set_value(0)
+    extrapolate_values_at_time(var_array, time_points, [1], 0)
+    assert m.v[1, 'a'].value == 1
+
+    with pytest.raises(ValueError):
+        extrapolate_values_at_time(var_array, time_points, [2], 1, order=2)
+
+
+@pytest.mark.unit
+def test_get_subproblem_block():
+    m = ConcreteModel()
+    m.time = Set(initialize=[0, 1, 2])
+    m.v = Var(m.time, initialize=1)
+    m.b = Block()
+    m.b.con = Constraint(m.time, rule=lambda b, t: m.v[t] == t)
+    m.b.scaling_factor = Suffix(direction=Suffix.EXPORT)
+    m.b.scaling_factor[m.b.con[1]] = 10
+    m.b.scaling_factor[m.v[1]] = 0.1
+    m.b.dual = Suffix(direction=Suffix.IMPORT)
+
+    @m.Block(m.time)
+    def bt(b, t):
+        b.w = Var(initialize=1)
+        b.con = Constraint(expr=b.w == m.v[t])
+        b.scaling_factor = Suffix(direction=Suffix.EXPORT)
+
+    m.obj = Objective(expr=m.v[0])
+
+    suffix_block = get_suffix_block(m, [m.b.con[1], m.bt[1]])
+    assert [s.local_name for s in suffix_block.component_objects(Suffix)] \
+        == ['scaling_factor']
+    assert suffix_block.scaling_factor[m.b.con[1]] == 10
+    assert suffix_block.scaling_factor[m.v[1]] == 0.1
+    assert get_suffix_block(m, [m.bt[1]]) is None
+
+    sub = get_subproblem_block([m.b.con[1], m.bt[1], m.obj], suffix_block)
+    assert list(sub.component_data_objects(Constraint)) == \
+        [m.b.con[1], m.bt[1].con]
+    assert list(sub.component_data_objects(Objective)) == [m.obj]
+    assert m.b.con[1].parent_block() is m.b
+    assert degrees_of_freedom(sub) == 0
+    # only active components are part of the subproblem
+    m.b.con[1].deactivate()
+    assert degrees_of_freedom(sub) == 1
+
+    with pytest.raises(TypeError):
+        get_subproblem_block([m.v[1]])
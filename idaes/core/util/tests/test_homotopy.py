@@ -20,9 +20,11 @@ import pytest
 
 from pyomo.environ import (ConcreteModel,
                            Constraint,
+                           Objective,
                            Param,
                            TerminationCondition,
                            Var)
+from pyomo.contrib.pynumero.asl import AmplInterface
 
 from idaes.core import FlowsheetBlock
 from idaes.generic_models.properties.activity_coeff_models.BTX_activity_coeff_VLE \
@@ -198,6 +200,20 @@ def test_max_eval(model):
         homotopy(model, [model.x], [20], max_eval=1.7)
 
 
+@pytest.mark.unit
+def test_predictor_tol(model):
+    with pytest.raises(ConfigurationError):
+        homotopy(model, [model.x], [20], predictor=True, predictor_tol=0)
+
+
+@pytest.mark.skipif(AmplInterface.available(),
+                    reason="PyNumero ASL interface available")
+@pytest.mark.unit
+def test_predictor_no_asl(model):
+    with pytest.raises(ConfigurationError):
+        homotopy(model, [model.x], [20], predictor=True)
+
+
 # -----------------------------------------------------------------------------
 # Test termination conditions
 @pytest.mark.skipif(solver is None, reason="Solver not available")
@@ -357,6 +373,69 @@ def test_basic_max_step(model):
     assert ni == 10
 
 
+# -----------------------------------------------------------------------------
+# Test predictor-corrector steps
+@pytest.mark.skipif(solver is None, reason="Solver not available")
+@pytest.mark.skipif(not AmplInterface.available(),
+                    reason="PyNumero ASL interface not available")
+@pytest.mark.unit
+def test_predictor_basic(model):
+    tc, prog, ni = homotopy(model, [model.x], [20], predictor=True)
+
+    assert model.y.value == pytest.approx(400)
+
+    assert tc == TerminationCondition.optimal
+    assert prog == 1
+    # Tangent steps track y = x**2 closely, so steps grow faster than with
+    # the iteration count heuristic
+    assert ni <= 4
+
+
+@pytest.mark.skipif(solver is None, reason="Solver not available")
+@pytest.mark.skipif(not AmplInterface.available(),
+                    reason="PyNumero ASL interface not available")
+@pytest.mark.unit
+def test_predictor_linear(model):
+    # Predictions are exact for a linear path, so the step after the first
+    # goes straight to the target
+    model.c.deactivate()
+    model.c2 = Constraint(expr=model.y == 3*model.x)
+
+    tc, prog, ni = homotopy(model, [model.x], [20], predictor=True,
+                            max_step=1)
+
+    assert model.y.value == pytest.approx(60)
+
+    assert tc == TerminationCondition.optimal
+    assert prog == 1
+    assert ni == 2
+
+
+@pytest.mark.skipif(solver is None, reason="Solver not available")
+@pytest.mark.skipif(not AmplInterface.available(),
+                    reason="PyNumero ASL interface not available")
+@pytest.mark.unit
+def test_predictor_constraint_violation(model):
+    model.c2 = Constraint(expr=model.y <= 300)
+
+    tc, prog, ni = homotopy(model, [model.x], [20], predictor=True)
+
+    assert model.y.value <= 300 + 1e-6
+    assert tc == TerminationCondition.minStepLength
+    assert prog < 1
+
+
+@pytest.mark.skipif(solver is None, reason="Solver not available")
+@pytest.mark.skipif(not AmplInterface.available(),
+                    reason="PyNumero ASL interface not available")
+@pytest.mark.unit
+def test_predictor_no_objective_added(model):
+    homotopy(model, [model.x], [20], predictor=True)
+
+    assert len(list(model.component_objects(Objective))) == 0
+    assert model.x.fixed
+
+
 # -----------------------------------------------------------------------------
 # Test a more complex problem
 @pytest.fixture()
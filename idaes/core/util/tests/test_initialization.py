@@ -14,14 +14,20 @@
 Tests for math util methods.
 """
 
+from math import log
+
 import pytest
 from pyomo.environ import (Block, ConcreteModel, Constraint, Expression, exp,
                            Set, Var, value, Param, Reals,
                            TransformationFactory, TerminationCondition)
 from pyomo.network import Arc, Port
+from pyomo.opt import SolverResults, SolverStatus
 from pyomo.core.base.units_container import UnitsError
+from pyomo.core.expr.visitor import identify_variables
+from pyomo.dae import DerivativeVar
 
 from idaes.core import (FlowsheetBlock,
+                        ProcessBlockData,
                         MaterialBalanceType,
                         EnergyBalanceType,
                         MomentumBalanceType,
@@ -33,7 +39,8 @@ from idaes.core import (FlowsheetBlock,
                         ReactionBlockBase,
                         ReactionBlockDataBase,
                         MaterialFlowBasis)
-from idaes.core.util.testing import PhysicalParameterTestBlock
+from idaes.core.util.testing import (PhysicalParameterTestBlock,
+                                     NewtonTestSolver)
 from idaes.core.util.model_statistics import degrees_of_freedom
 from idaes.generic_models.unit_models import CSTR
 from idaes.core.util.exceptions import ConfigurationError
@@ -41,8 +48,12 @@ from idaes.core.util.initialization import (fix_state_vars,
                                             revert_state_vars,
                                             propagate_state,
                                             solve_indexed_blocks,
-                                            initialize_by_time_element)
+                                            initialize_by_time_element,
+                                            BlockTriangularizationInitializer,
+                                            initialize_sequential_modular)
 from idaes.core.util import get_solver
+import idaes.core.util.initialization as initialization
+import idaes.logger as idaeslog
 
 __author__ = "Andrew Lee"
 
@@ -790,6 +801,93 @@ def test_solve_indexed_block_IndexedBlock():
         assert value(m.b[i].v == 2.0)
 
 
+class _AssignmentSolver(object):
+    """
+    Solver for constraints of the form v == rhs, which assigns rhs to v and
+    reports an infeasible problem if rhs is negative.
+    """
+    def __init__(self):
+        self.calls = []
+
+    def solve(self, model, **kwds):
+        results = SolverResults()
+        results.solver.status = SolverStatus.ok
+        results.solver.termination_condition = TerminationCondition.optimal
+        n = 0
+        for c in model.component_data_objects(Constraint, active=True,
+                                              descend_into=True):
+            for v in identify_variables(c.body, include_fixed=False):
+                v.set_value(value(c.upper))
+            if value(c.upper) < 0:
+                results.solver.termination_condition = \
+                    TerminationCondition.infeasible
+            n += 1
+        self.calls.append(n)
+        return results
+
+
+def _assignment_model(n):
+    m = ConcreteModel()
+    m.s = Set(initialize=range(n))
+
+    def block_rule(b, x):
+        b.v = Var(initialize=1.0)
+        b.c = Constraint(expr=b.v == x)
+    m.b = Block(m.s, rule=block_rule)
+    return m
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("group_size,max_workers,calls", [
+    (None, 1, [5]),
+    (1, 1, [1, 1, 1, 1, 1]),
+    (2, 1, [2, 2, 1]),
+    (None, 2, []),
+    (1, 3, [])])
+def test_solve_indexed_block_groups(group_size, max_workers, calls):
+    m = _assignment_model(5)
+    solver = _AssignmentSolver()
+    results = solve_indexed_blocks(solver, m.b, group_size=group_size,
+                                   max_workers=max_workers)
+    assert results.solver.termination_condition == \
+        TerminationCondition.optimal
+    # groups solved in worker processes are not seen here
+    assert solver.calls == calls
+    for i in m.s:
+        assert m.b[i].v.value == i
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_solve_indexed_block_groups_failed(max_workers, caplog):
+    m = _assignment_model(4)
+    m.b[2].c.set_value(m.b[2].v == -1)
+    results = solve_indexed_blocks(_AssignmentSolver(), [m.b], group_size=1,
+                                   max_workers=max_workers)
+    assert results.solver.termination_condition == \
+        TerminationCondition.infeasible
+    assert "Solve of blocks b[2] terminated" in caplog.text
+    assert "b[1]" not in caplog.text
+    assert [m.b[i].v.value for i in m.s] == [0, 1, -1, 3]
+
+
+@pytest.mark.unit
+def test_solve_indexed_block_groups_coupled():
+    m = _assignment_model(4)
+    m.x = Var(initialize=0)
+    m.b[3].c2 = Constraint(expr=m.b[3].v + m.x == 5)
+    m.b[0].c2 = Constraint(expr=m.b[0].v + m.x == 5)
+    # fixed variables do not couple the blocks
+    m.x.fix()
+    solver = _AssignmentSolver()
+    solve_indexed_blocks(solver, m.b, group_size=1)
+    assert solver.calls == [2, 1, 1, 2]
+    m.x.unfix()
+    solver = _AssignmentSolver()
+    solve_indexed_blocks(solver, m.b, group_size=1)
+    assert solver.calls == [6]
+
+
 @pytest.mark.unit
 def test_solve_indexed_block_error():
     # Try solve_indexed_block on non-block object
@@ -907,3 +1005,420 @@ def test_initialize_by_time_element():
 
     results = solver.solve(m.fs)
     assert results.solver.termination_condition == TerminationCondition.optimal
+
+
+def _ode_model(nfe, ncp):
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": True, "time_set": [0, 2]})
+    m.fs.x = Var(m.fs.time, initialize=1.0)
+    m.fs.y = Var(m.fs.time, initialize=1.0)
+    m.fs.dxdt = DerivativeVar(m.fs.x, wrt=m.fs.time, initialize=0.0)
+    m.fs.ode = Constraint(m.fs.time,
+                          rule=lambda b, t: b.dxdt[t] == -b.y[t])
+    m.fs.alg = Constraint(m.fs.time,
+                          rule=lambda b, t: b.y[t] == b.x[t]**2)
+    TransformationFactory("dae.collocation").apply_to(
+        m.fs, wrt=m.fs.time, nfe=nfe, ncp=ncp, scheme="LAGRANGE-RADAU")
+    m.fs.x[0].fix(1.0)
+    return m
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("warm_start", ["constant", "extrapolate"])
+def test_initialize_by_time_element_stats(warm_start):
+    m = _ode_model(nfe=4, ncp=2)
+    solver = NewtonTestSolver()
+    stats = initialize_by_time_element(m.fs, m.fs.time, solver=solver,
+                                       warm_start=warm_start)
+
+    # x = 1/(1 + t) is the solution of dx/dt = -x**2 with x(0) = 1
+    for t in m.fs.time:
+        assert m.fs.x[t].value == pytest.approx(1/(1 + t), rel=1e-2)
+    # each finite element is solved by itself
+    assert [n for n, _ in solver.calls] == [2, 6, 6, 6, 6]
+    assert [s["element"] for s in stats] == [0, 1, 2, 3, 4]
+    assert stats[2]["time"] == [t for t in m.fs.time][3:5]
+    for s in stats:
+        assert s["termination_condition"] == TerminationCondition.optimal
+        assert s["setup"] >= 0 and s["solve"] >= 0
+
+    # model is reactivated, and already solved
+    assert degrees_of_freedom(m) == 0
+    assert all(c.active for c in m.fs.component_data_objects(Constraint))
+    assert not any(m.fs.x[t].fixed for t in m.fs.time if t != 0)
+    solver.solve(m.fs)
+    assert solver.calls[-1] == (26, 0)
+
+
+@pytest.mark.unit
+def test_initialize_by_time_element_warm_start():
+    iterations = {}
+    for warm_start in ["constant", "extrapolate"]:
+        m = _ode_model(nfe=8, ncp=1)
+        solver = NewtonTestSolver()
+        initialize_by_time_element(m.fs, m.fs.time, solver=solver,
+                                   warm_start=warm_start)
+        iterations[warm_start] = [k for _, k in solver.calls]
+    # first element can only be initialized with constant values
+    assert iterations["extrapolate"][:2] == iterations["constant"][:2]
+    assert sum(iterations["extrapolate"]) < sum(iterations["constant"])
+
+    m = _ode_model(nfe=2, ncp=1)
+    with pytest.raises(ValueError):
+        initialize_by_time_element(m.fs, m.fs.time, solver=NewtonTestSolver(),
+                                   warm_start="linear")
+
+
+def _btf_model():
+    m = ConcreteModel()
+    m.x = Var([1, 2, 3, 4, 5], initialize=1.0)
+    m.p = Var(initialize=2.0)
+    m.p.fix()
+    # Written in reverse order of solution
+    m.c5 = Constraint(expr=m.x[5] == m.x[4] + m.x[1])
+    m.c4 = Constraint(expr=m.x[4]**2 + m.x[3] == 20)
+    m.c3 = Constraint(expr=m.x[3] == m.x[4] + m.x[2])
+    m.c2 = Constraint(expr=m.x[2]*m.x[1] == 3)
+    m.c1 = Constraint(expr=exp(m.x[1]) == m.p)
+    m.ineq = Constraint(expr=m.x[1] <= 100)
+    return m
+
+
+@pytest.mark.unit
+def test_btf_blocks():
+    m = _btf_model()
+    init = BlockTriangularizationInitializer(m)
+
+    blocks = init.blocks
+    assert [[v.name for v in variables] for variables, _ in blocks] == \
+        [["x[1]"], ["x[2]"], ["x[4]", "x[3]"], ["x[5]"]] or \
+        [[v.name for v in variables] for variables, _ in blocks] == \
+        [["x[1]"], ["x[2]"], ["x[3]", "x[4]"], ["x[5]"]]
+    assert [set(c.name for c in cons) for _, cons in blocks] == \
+        [{"c1"}, {"c2"}, {"c3", "c4"}, {"c5"}]
+
+    # Decomposition is found again when the structure changes
+    m.x[1].fix(1)
+    m.c1.deactivate()
+    blocks = init.blocks
+    assert len(blocks) == 3
+    assert blocks[0][1] == [m.c2]
+
+
+@pytest.mark.unit
+def test_btf_initialize():
+    m = _btf_model()
+    solver = NewtonTestSolver()
+    init = BlockTriangularizationInitializer(m, solver=solver)
+    init.initialize()
+
+    assert m.x[1].value == pytest.approx(log(2))
+    assert m.x[2].value == pytest.approx(3/log(2))
+    assert m.x[4].value**2 + m.x[3].value == pytest.approx(20)
+    assert m.x[3].value == pytest.approx(m.x[4].value + m.x[2].value)
+    assert m.x[5].value == pytest.approx(m.x[4].value + log(2))
+    # All blocks are small enough for Newton's method
+    assert solver.calls == []
+    assert not m.x[1].fixed
+
+
+@pytest.mark.unit
+def test_btf_initialize_with_solver():
+    m = _btf_model()
+    solver = NewtonTestSolver()
+    init = BlockTriangularizationInitializer(m, solver=solver,
+                                             max_newton_size=1)
+    init.initialize()
+
+    # The 2x2 block is solved with the solver, with x[2] fixed
+    assert [n for n, _ in solver.calls] == [2]
+    assert m.x[4].value**2 + m.x[3].value == pytest.approx(20)
+    assert m.x[5].value == pytest.approx(m.x[4].value + log(2))
+    assert not m.x[2].fixed
+
+    # Solving again reuses the decomposition
+    init.initialize()
+    assert [n for n, _ in solver.calls] == [2, 2]
+
+
+@pytest.mark.unit
+def test_btf_initialize_calculate_fails(monkeypatch):
+    m = ConcreteModel()
+    m.x = Var(initialize=1.0)
+    m.c = Constraint(expr=m.x**2 == 4)
+
+    def _fail(variable, constraint):
+        variable.set_value(-5.0)
+        raise RuntimeError("failed to converge")
+    monkeypatch.setattr(initialization, "calculate_variable_from_constraint",
+                        _fail)
+
+    # Newton's method starts from the initial guess, not the failed attempt
+    BlockTriangularizationInitializer(m).initialize()
+    assert m.x.value == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_btf_not_square():
+    m = _btf_model()
+    m.x[1].fix()
+    init = BlockTriangularizationInitializer(m)
+    with pytest.raises(ConfigurationError):
+        init.initialize()
+
+
+@pytest.mark.unit
+def test_btf_structurally_singular():
+    m = ConcreteModel()
+    m.x = Var([1, 2, 3], initialize=1.0)
+    m.c1 = Constraint(expr=m.x[1] == 1)
+    m.c2 = Constraint(expr=m.x[1]**2 == 1)
+    m.c3 = Constraint(expr=m.x[1] + m.x[2] + m.x[3] == 0)
+    init = BlockTriangularizationInitializer(m)
+    with pytest.raises(ConfigurationError):
+        init.blocks
+
+
+@declare_process_block_class("SMMixer")
+class SMMixerData(ProcessBlockData):
+    def build(self):
+        super(SMMixerData, self).build()
+        self.flow_in_1 = Var(initialize=0)
+        self.flow_in_2 = Var(initialize=0)
+        self.flow_out = Var(initialize=0)
+        self.inlet_1 = Port(initialize={"flow": self.flow_in_1})
+        self.inlet_2 = Port(initialize={"flow": self.flow_in_2})
+        self.outlet = Port(initialize={"flow": self.flow_out})
+        self.mixing = Constraint(
+            expr=self.flow_out == self.flow_in_1 + self.flow_in_2)
+
+    def initialize(self, outlvl=idaeslog.NOTSET):
+        self.flow_out.value = self.flow_in_1.value + self.flow_in_2.value
+
+
+@declare_process_block_class("SMSplitter")
+class SMSplitterData(ProcessBlockData):
+    def build(self):
+        super(SMSplitterData, self).build()
+        self.split_frac = Param(initialize=0.5, mutable=True)
+        self.flow_in = Var(initialize=0)
+        self.flow_out_1 = Var(initialize=0)
+        self.flow_out_2 = Var(initialize=0)
+        self.inlet = Port(initialize={"flow": self.flow_in})
+        self.outlet_1 = Port(initialize={"flow": self.flow_out_1})
+        self.outlet_2 = Port(initialize={"flow": self.flow_out_2})
+        self.splitting = Constraint(
+            expr=self.flow_out_1 == self.split_frac*self.flow_in)
+        self.balance = Constraint(
+            expr=self.flow_in == self.flow_out_1 + self.flow_out_2)
+
+    def initialize(self, outlvl=idaeslog.NOTSET):
+        self.flow_out_1.value = value(self.split_frac)*self.flow_in.value
+        self.flow_out_2.value = self.flow_in.value - self.flow_out_1.value
+
+
+@declare_process_block_class("SMRecycleUnit")
+class SMRecycleUnitData(ProcessBlockData):
+    # Unit which returns half of its mixed feed to its own recycle inlet
+    def build(self):
+        super(SMRecycleUnitData, self).build()
+        self.flow_feed = Var(initialize=0)
+        self.flow_rec_in = Var(initialize=0)
+        self.flow_prod = Var(initialize=0)
+        self.flow_rec_out = Var(initialize=0)
+        self.inlet = Port(initialize={"flow": self.flow_feed})
+        self.recycle_inlet = Port(initialize={"flow": self.flow_rec_in})
+        self.outlet = Port(initialize={"flow": self.flow_prod})
+        self.recycle_outlet = Port(initialize={"flow": self.flow_rec_out})
+        self.product = Constraint(
+            expr=self.flow_prod == 0.5*(self.flow_feed + self.flow_rec_in))
+        self.recycle = Constraint(
+            expr=self.flow_rec_out == 0.5*(self.flow_feed + self.flow_rec_in))
+
+    def initialize(self, outlvl=idaeslog.NOTSET):
+        self.flow_prod.value = 0.5*(self.flow_feed.value +
+                                    self.flow_rec_in.value)
+        self.flow_rec_out.value = self.flow_prod.value
+
+
+def _recycle_flowsheet():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.mix = SMMixer()
+    m.fs.split = SMSplitter()
+    m.fs.prod = SMMixer()
+    m.fs.feed = Arc(source=m.fs.mix.outlet, destination=m.fs.split.inlet)
+    m.fs.recycle = Arc(source=m.fs.split.outlet_2,
+                       destination=m.fs.mix.inlet_2)
+    m.fs.product = Arc(source=m.fs.split.outlet_1,
+                       destination=m.fs.prod.inlet_1)
+    m.fs.mix.flow_in_1.fix(1)
+    m.fs.prod.flow_in_2.fix(0)
+    return m
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("accel", ["wegstein", "broyden"])
+def test_initialize_sequential_modular(accel):
+    m = _recycle_flowsheet()
+    stats = m.fs.initialize_sequential_modular(accel=accel)
+
+    assert stats["converged"]
+    assert stats["tears"] == [m.fs.recycle]
+    assert stats["order"] == [[m.fs.mix], [m.fs.split], [m.fs.prod]]
+    # Secant updates are exact for a linear recycle
+    assert stats["iterations"] == 3
+    assert stats["units"][m.fs.split]["calls"] == 3
+    assert stats["units"][m.fs.split]["time"] >= 0
+
+    assert m.fs.split.flow_in.value == pytest.approx(2)
+    assert m.fs.mix.flow_in_2.value == pytest.approx(1)
+    assert m.fs.prod.flow_out.value == pytest.approx(1)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_direct():
+    m = _recycle_flowsheet()
+    stats = initialize_sequential_modular(m.fs, accel="direct", max_iter=5)
+    assert not stats["converged"]
+    assert stats["iterations"] == 5
+
+    stats = initialize_sequential_modular(m.fs, accel="direct", max_iter=50,
+                                          tear_tol=1e-8)
+    assert stats["converged"]
+    assert stats["iterations"] > 3
+    assert m.fs.split.flow_in.value == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_tear_guess():
+    m = _recycle_flowsheet()
+    stats = initialize_sequential_modular(
+        m.fs, accel="direct", tear_guesses={m.fs.recycle: {"flow": 1}})
+    assert stats["converged"]
+    assert stats["iterations"] == 1
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_self_recycle():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.unit = SMRecycleUnit()
+    m.fs.recycle = Arc(source=m.fs.unit.recycle_outlet,
+                       destination=m.fs.unit.recycle_inlet)
+    m.fs.unit.flow_feed.fix(1)
+
+    stats = initialize_sequential_modular(m.fs)
+    assert stats["converged"]
+    assert stats["tears"] == [m.fs.recycle]
+    assert stats["order"] == [[m.fs.unit]]
+    assert stats["iterations"] > 1
+    assert m.fs.unit.flow_rec_in.value == pytest.approx(1)
+    assert m.fs.unit.flow_prod.value == pytest.approx(1)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_upstream():
+    m = _recycle_flowsheet()
+    m.fs.pre = SMSplitter()
+    m.fs.pre_out = Arc(source=m.fs.pre.outlet_1,
+                       destination=m.fs.mix.inlet_1)
+    m.fs.mix.flow_in_1.unfix()
+    m.fs.pre.flow_in.fix(2)
+    stats = initialize_sequential_modular(m.fs)
+
+    assert stats["converged"]
+    assert stats["order"] == [[m.fs.pre], [m.fs.mix], [m.fs.split],
+                              [m.fs.prod]]
+    # Units upstream of the recycle are only initialized once
+    assert stats["units"][m.fs.pre]["calls"] == 1
+    assert stats["units"][m.fs.mix]["calls"] == 3
+    assert stats["units"][m.fs.prod]["calls"] == 3
+    assert m.fs.prod.flow_out.value == pytest.approx(1)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_flowsheet_ports():
+    m = _recycle_flowsheet()
+    m.fs.feed_flow = Var(initialize=0)
+    m.fs.product_flow = Var(initialize=0)
+    m.fs.feed_port = Port(initialize={"flow": m.fs.feed_flow})
+    m.fs.product_port = Port(initialize={"flow": m.fs.product_flow})
+    m.fs.feed_in = Arc(source=m.fs.feed_port, destination=m.fs.mix.inlet_1)
+    m.fs.product_out = Arc(source=m.fs.prod.outlet,
+                           destination=m.fs.product_port)
+    m.fs.mix.flow_in_1.unfix()
+    m.fs.feed_flow.fix(2)
+    stats = initialize_sequential_modular(m.fs)
+
+    assert stats["converged"]
+    assert stats["tears"] == [m.fs.recycle]
+    assert stats["order"] == [[m.fs.mix], [m.fs.split], [m.fs.prod]]
+    assert m.fs.split.flow_in.value == pytest.approx(4)
+    assert m.fs.product_flow.value == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_sub_flowsheet():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.src = SMMixer()
+    m.fs.prod = SMMixer()
+    m.fs.sub = FlowsheetBlock(default={"dynamic": False})
+    sub = m.fs.sub
+    sub.flow_feed = Var(initialize=0)
+    sub.flow_prod = Var(initialize=0)
+    sub.feed = Port(initialize={"flow": sub.flow_feed})
+    sub.product = Port(initialize={"flow": sub.flow_prod})
+    sub.mix = SMMixer()
+    sub.split = SMSplitter()
+    sub.feed_in = Arc(source=sub.feed, destination=sub.mix.inlet_1)
+    sub.mixed = Arc(source=sub.mix.outlet, destination=sub.split.inlet)
+    sub.recycle = Arc(source=sub.split.outlet_2,
+                      destination=sub.mix.inlet_2)
+    sub.product_out = Arc(source=sub.split.outlet_1,
+                          destination=sub.product)
+    m.fs.to_sub = Arc(source=m.fs.src.outlet, destination=sub.feed)
+    m.fs.from_sub = Arc(source=sub.product, destination=m.fs.prod.inlet_1)
+    m.fs.src.flow_in_1.fix(1)
+    m.fs.src.flow_in_2.fix(0)
+    m.fs.prod.flow_in_2.fix(0)
+    stats = initialize_sequential_modular(m.fs)
+
+    assert stats["converged"]
+    assert stats["tears"] == []
+    assert stats["order"] == [[m.fs.src], [m.fs.sub], [m.fs.prod]]
+    assert stats["units"][m.fs.sub]["calls"] == 1
+    assert sub.split.flow_in.value == pytest.approx(2)
+    assert m.fs.prod.flow_out.value == pytest.approx(1)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_workers():
+    m = ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    m.fs.a = SMSplitter()
+    m.fs.b = SMSplitter()
+    m.fs.mix = SMMixer()
+    m.fs.a_out = Arc(source=m.fs.a.outlet_1, destination=m.fs.mix.inlet_1)
+    m.fs.b_out = Arc(source=m.fs.b.outlet_1, destination=m.fs.mix.inlet_2)
+    m.fs.a.flow_in.fix(2)
+    m.fs.b.flow_in.fix(4)
+    m.fs.b.split_frac = 0.25
+
+    stats = initialize_sequential_modular(m.fs, max_workers=2)
+    assert stats["converged"]
+    assert stats["tears"] == []
+    assert stats["order"] == [[m.fs.a, m.fs.b], [m.fs.mix]]
+    assert stats["units"][m.fs.b]["calls"] == 1
+    assert m.fs.b.flow_out_2.value == pytest.approx(3)
+    assert m.fs.mix.flow_out.value == pytest.approx(2)
+
+
+@pytest.mark.unit
+def test_initialize_sequential_modular_errors():
+    m = _recycle_flowsheet()
+    with pytest.raises(TypeError):
+        initialize_sequential_modular(m.fs.mix)
+    with pytest.raises(ValueError):
+        initialize_sequential_modular(m.fs, accel="newton")
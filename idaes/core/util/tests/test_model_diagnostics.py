@@ -247,4 +247,9 @@ def test_problem2_with_degenerate_constraint():
     
     assert n_rank_deficient == 1
     
+    # Check the shift-invert SVD finds the same rank deficiency
+    dh2.svd_analysis(shift_invert=True)
+    
+    assert dh2.check_rank_equality_constraints() == 1
+    
     # TODO: Add MILP solver to idaes get-extensions and add more tests
\ No newline at end of file
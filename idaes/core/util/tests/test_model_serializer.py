@@ -19,6 +19,8 @@ import os
 
 from pyomo.environ import *
 from idaes.core.util import to_json, from_json, StoreSpec
+from idaes.core.util.model_serializer import (
+    to_npz, from_npz, SnapshotLayout, StateCheckpoint)
 from idaes.util.system import mkdtemp
 import shutil
 import pytest
@@ -32,16 +34,18 @@ class TestModelSerialize(unittest.TestCase):
     def setUpClass(cls):
         cls.dirname = mkdtemp()
         cls.fname = os.path.join(cls.dirname, "crAzYStuff1010202030.json")
+        cls.fname_npz = os.path.join(cls.dirname, "crAzYStuff1010202030.npz")
 
     @classmethod
     def tearDownClass(cls):
         shutil.rmtree(cls.dirname)
 
     def tearDown(self):
-        try:
-            os.remove(self.fname)
-        except:
-            pass
+        for fname in (self.fname, self.fname_npz):
+            try:
+                os.remove(fname)
+            except:
+                pass
 
     def setup_model01(self):
         model = ConcreteModel()
@@ -416,5 +420,188 @@ class TestModelSerialize(unittest.TestCase):
         assert(abs(model.ipopt_zU_out[model.x[1]] - 10) < 1e-5)
         assert(abs(model.ipopt_zU_out[model.x[2]] - 10) < 1e-5)
 
+    @pytest.mark.unit
+    def test_npz01(self):
+        """
+        Simple test of load save npz
+        """
+        model = self.setup_model01()
+        a = model.b[1].a
+        b = model.b[1].b
+        to_npz(model, self.fname_npz)
+        # change variable values
+        a.value = 0.11
+        b.value = 0.11
+        a.unfix()
+        model.b[1].deactivate()
+        b.setlb(2)
+        b.setub(4)
+        # reload values
+        from_npz(model, self.fname_npz)
+        #make sure they are right
+        assert(a.fixed)
+        assert(model.b[1].active)
+        assert(abs(value(b) - 20) < 1e-4)
+        assert(abs(value(a) - 2) < 1e-4)
+        assert(abs(b.lb - -100) < 1e-4)
+        assert(abs(b.ub - 100) < 1e-4)
+
+    @pytest.mark.unit
+    def test_npz02(self):
+        """Test params, None values and bounds, objectives and compression"""
+        model = self.setup_model02b()
+        model.x["1"].value = None
+        model.x["2"].setub(None)
+        to_npz(model, self.fname_npz, compress=True)
+        model.x["1"].value = 10
+        model.x["2"].setub(3)
+        model.p["a"] = 10
+        model.p["b"] = 10
+        model.f.deactivate()
+        model.g.deactivate()
+        from_npz(model, self.fname_npz)
+        assert model.x["1"].value is None
+        assert model.x["2"].value == pytest.approx(2.5)
+        assert model.x["2"].ub is None
+        assert value(model.p["a"]) == pytest.approx(1)
+        assert value(model.p["b"]) == pytest.approx(2)
+        assert value(model.c) == pytest.approx(4)
+        assert model.f.active
+        assert model.g.active
+
+    @pytest.mark.unit
+    def test_npz03(self):
+        """Like test04, only load values for originally fixed variables"""
+        model = self.setup_model02()
+        x = model.x
+        x[1].fix(1)
+        wts = StoreSpec.value_isfixed_isactive(only_fixed=True)
+        to_npz(model, self.fname_npz, wts=wts)
+        x[1].unfix()
+        x[1].value = 2
+        x[2].value = 10
+        model.g.deactivate()
+        from_npz(model, self.fname_npz, wts=wts)
+        assert(x[1].fixed)
+        assert(abs(value(x[1]) - 1) < 1e-5)
+        assert(abs(value(x[2]) - 10) < 1e-5)
+        assert(model.g.active)
+
+    @pytest.mark.unit
+    def test_npz04(self):
+        """Load into a sub-block and a model with a different structure"""
+        model = self.setup_model01()
+        to_npz(model.b[1], self.fname_npz)
+        model.b[1].a.value = 5
+        model.b[1].b.value = 5
+
+        model2 = self.setup_model01()
+        model2.b[1].z = Var(initialize=7)
+        from_npz(model2.b[1], self.fname_npz)
+        assert value(model2.b[1].a) == pytest.approx(2)
+        assert value(model2.b[1].b) == pytest.approx(20)
+        assert value(model2.b[1].z) == pytest.approx(7)
+
+        wts = StoreSpec(ignore_missing=False)
+        with pytest.raises(KeyError):
+            from_npz(model2.b[1], self.fname_npz, wts=wts)
+
+        from_npz(model.b[1], self.fname_npz)
+        assert value(model.b[1].a) == pytest.approx(2)
+        assert value(model.b[1].b) == pytest.approx(20)
+
+    @pytest.mark.unit
+    def test_snapshot_layout(self):
+        """Test repeated in memory snapshots with a SnapshotLayout"""
+        model = self.setup_model02()
+        layout = SnapshotLayout(model)
+        assert layout.var_attrs == ("value", "fixed", "stale", "lb", "ub")
+        assert layout.names["var"] == ["x[1]", "x[2]"]
+        assert layout.names["param"] == ["a", "b"]
+        assert layout.names["active"] == [
+            "", "f", "g", "dual", "ipopt_zL_out", "ipopt_zU_out"]
+
+        sd = layout.capture()
+        assert list(sd["var_value"]) == [1.5, 2.5]
+        assert list(sd["var_lb"]) == [-10, -10]
+        assert list(sd["param_value"]) == [1, 2]
+        assert list(sd["active"]) == [True]*6
+
+        for i in range(3):
+            model.x[1].fix(i)
+            model.a = i
+            model.g.deactivate()
+            layout.restore(sd)
+            assert not model.x[1].fixed
+            assert value(model.x[1]) == pytest.approx(1.5)
+            assert value(model.a) == pytest.approx(1)
+            assert model.g.active
+
+    @pytest.mark.unit
+    def test_state_checkpoint(self):
+        """Test capturing and restoring states in checkpoint slots"""
+        model = self.setup_model02()
+        x = model.x
+        chk = StateCheckpoint(model, slots=2)
+        assert chk.slots == 2
+        assert not chk.has_state(0)
+        with pytest.raises(ValueError):
+            chk.restore()
+
+        chk.capture()
+        x[1].fix(3)
+        model.a = 5
+        chk.capture(1)
+        x[1].unfix()
+        x[1].value = 7
+        x[2].setub(None)
+        model.a = 9
+        model.g.deactivate()
+
+        chk.restore(1)
+        assert x[1].fixed
+        assert value(x[1]) == pytest.approx(3)
+        assert x[2].ub == pytest.approx(10)
+        assert value(model.a) == pytest.approx(5)
+        assert model.g.active
+
+        # restore the same state again and then an earlier one
+        x[1].value = 7
+        chk.restore(1)
+        assert value(x[1]) == pytest.approx(3)
+        chk.restore(0)
+        assert not x[1].fixed
+        assert value(x[1]) == pytest.approx(1.5)
+        assert value(model.a) == pytest.approx(1)
+
+        # capturing again overwrites the slot in place
+        arrays = chk._slots[0]["var_value"]
+        x[2].value = 4
+        chk.capture(0)
+        assert chk._slots[0]["var_value"] is arrays
+        x[2].value = 0
+        chk.restore(0)
+        assert value(x[2]) == pytest.approx(4)
+
+    @pytest.mark.unit
+    def test_state_checkpoint_storespec(self):
+        """Like test03, only restore values of originally fixed variables"""
+        model = self.setup_model02()
+        x = model.x
+        x[1].fix(1)
+        chk = StateCheckpoint(
+            model, wts=StoreSpec.value_isfixed(only_fixed=True))
+        chk.capture()
+        x[1].unfix()
+        x[1].value = 2
+        x[2].value = 10
+        model.g.deactivate()
+        chk.restore()
+        assert(x[1].fixed)
+        assert(abs(value(x[1]) - 1) < 1e-5)
+        assert(abs(value(x[2]) - 10) < 1e-5)
+        assert(not model.g.active)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -19,6 +19,7 @@ import pytest
 from pyomo.environ import (Block,
                            ConcreteModel,
                            Constraint,
+                           ConstraintList,
                            Expression,
                            Objective,
                            Set,
@@ -529,3 +530,182 @@ def test_number_active_variables_in_deactivated_blocks(m):
 @pytest.mark.unit
 def test_report_statistics(m):
     report_statistics(m)
+
+
+# -------------------------------------------------------------------------
+# Model census
+@pytest.mark.unit
+def test_census_matches_block(m):
+    # Initialize derivative var values so no errors occur
+    for v in m.dv.keys():
+        m.dv[v] = 0
+    census = ModelCensus(m)
+
+    assert census.block is m
+    for f in [total_blocks_set,
+              activated_blocks_set,
+              deactivated_blocks_set,
+              total_constraints_set,
+              activated_constraints_set,
+              deactivated_constraints_set,
+              total_equalities_set,
+              activated_equalities_set,
+              deactivated_equalities_set,
+              total_inequalities_set,
+              activated_inequalities_set,
+              deactivated_inequalities_set,
+              variables_set,
+              fixed_variables_set,
+              unfixed_variables_set,
+              variables_near_bounds_set,
+              variables_in_activated_constraints_set,
+              variables_in_activated_equalities_set,
+              variables_in_activated_inequalities_set,
+              variables_only_in_inequalities,
+              fixed_variables_in_activated_equalities_set,
+              unfixed_variables_in_activated_equalities_set,
+              fixed_variables_only_in_inequalities,
+              unused_variables_set,
+              fixed_unused_variables_set,
+              derivative_variables_set,
+              total_objectives_set,
+              activated_objectives_set,
+              deactivated_objectives_set,
+              expressions_set,
+              large_residuals_set,
+              active_variables_in_deactivated_blocks_set]:
+        assert f(census) == f(m)
+
+    assert degrees_of_freedom(census) == degrees_of_freedom(m)
+
+
+@pytest.mark.unit
+def test_census_deactivated_block(m):
+    census = ModelCensus(m.b1)
+
+    assert number_total_blocks(census) == 2
+    assert number_activated_blocks(census) == 0
+    assert number_total_constraints(census) == 2
+    assert number_activated_equalities(census) == 0
+    assert number_variables(census) == 0
+    assert degrees_of_freedom(census) == 0
+
+
+@pytest.mark.unit
+def test_census_external_variables():
+    m = ConcreteModel()
+    m.x = Var(initialize=1)
+    m.b = Block()
+    m.b.y = Var(initialize=1)
+    m.b.deactivate()
+    m.c = Constraint(expr=m.x == m.b.y)
+
+    census = ModelCensus(m)
+    # m.b.y is in a deactivated block, so is not a variable in the model
+    assert variables_set(census) == ComponentSet([m.x])
+    assert unused_variables_set(census) == ComponentSet()
+    assert variables_in_activated_equalities_set(census) == ComponentSet(
+        [m.x, m.b.y])
+    assert active_variables_in_deactivated_blocks_set(census) == \
+        ComponentSet([m.b.y])
+    assert degrees_of_freedom(census) == 1
+
+
+@pytest.mark.unit
+def test_census_is_snapshot(m):
+    census = ModelCensus(m)
+    assert degrees_of_freedom(census) == 10
+
+    m.b2["b"].v1.unfix()
+
+    assert degrees_of_freedom(census) == 10
+    assert degrees_of_freedom(m) == 11
+    assert degrees_of_freedom(ModelCensus(m)) == 11
+
+
+@pytest.mark.unit
+def test_report_statistics_census(m):
+    report_statistics(ModelCensus(m))
+
+
+@pytest.mark.unit
+def test_census_refresh(m):
+    census = ModelCensus(m)
+    assert degrees_of_freedom(census) == 10
+
+    m.b2["b"].v1.unfix()
+    assert census.refresh()
+    assert degrees_of_freedom(census) == 11
+
+    m.b2["a"].c1.activate()
+    assert census.refresh()
+    assert degrees_of_freedom(census) == 10
+
+    # Constraints given a new expression are re-classified
+    n_eq = number_activated_equalities(census)
+    m.b2["b"].c1.set_value(2 <= m.b2["b"].v1)
+    assert census.refresh()
+    assert number_activated_equalities(census) == n_eq - 1
+    assert number_activated_inequalities(census) == \
+        number_activated_inequalities(m)
+
+    m.b1.activate()
+    assert not census.refresh()
+
+    m.b1.deactivate()
+    m.b3 = Block()
+    assert not census.refresh()
+
+
+@pytest.mark.unit
+def test_incidence_cache(m):
+    cache = IncidenceCache(m)
+    with cache:
+        assert degrees_of_freedom(m) == 10
+        census = cache.census(m)
+        assert degrees_of_freedom(m) == 10
+        assert cache.census(m) is census
+
+        m.b2["b"].v1.unfix()
+        assert degrees_of_freedom(m) == 11
+        assert cache.census(m) is census
+
+        m.b2["a"].c1.activate()
+        assert degrees_of_freedom(m) == 10
+        assert degrees_of_freedom(m.b2["a"]) == -1
+        m.b2["a"].c1.deactivate()
+
+        # Changes to model structure trigger a new census
+        m.b1.activate()
+        assert degrees_of_freedom(m) == 9
+        assert cache.census(m) is not census
+        m.b1.deactivate()
+
+        m.b3 = Block()
+        m.b3.v = Var()
+        m.b3.c = Constraint(expr=m.b3.v == 1)
+        assert degrees_of_freedom(m) == 11
+
+        # Elements added to or removed from indexed components trigger a new
+        # census
+        m.b3.v2 = Var()
+        m.b3.cl = ConstraintList()
+        m.b3.cl.add(m.b3.v2 + m.b3.v == 3)
+        assert degrees_of_freedom(m) == 11
+        census = cache.census(m)
+        m.b3.cl.add(m.b3.v2 == 2)
+        assert degrees_of_freedom(m) == 10
+        assert cache.census(m) is not census
+        del m.b3.cl[2]
+        assert degrees_of_freedom(m) == 11
+        m.b3.del_component(m.b3.cl)
+        m.b3.del_component(m.b3.v2)
+        assert degrees_of_freedom(m) == 11
+
+        # Statistics on other models are not cached
+        m2 = ConcreteModel()
+        assert not cache.covers(m2)
+        assert degrees_of_freedom(m2) == 0
+
+    assert not cache.covers(m2)
+    assert degrees_of_freedom(m) == 11
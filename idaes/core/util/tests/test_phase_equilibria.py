@@ -43,7 +43,8 @@ import idaes.generic_models.properties.core.pure.RPP5 as RPP5
 from idaes.generic_models.properties.core.generic.generic_property import (
         GenericParameterBlock)
 
-from idaes.core.util.phase_equilibria import (TXYDataClass, Txy_data)
+from idaes.core.util.phase_equilibria import (
+    TXYDataClass, Txy_data, Txy_data_pressures)
 
 
 @pytest.mark.unit
@@ -72,58 +73,62 @@ def test_Txy_dataclass():
                     pytest.approx(0.01, abs=1e-4)]
 
 
-# Author: Alejandro Garciadiego
-@pytest.mark.component
-def test_Txy_data():
-    configuration = {
-        # Specifying components
-        "components": {
-            'benzene': {"type": Component,
-                        "pressure_sat_comp": NIST,
-                        "phase_equilibrium_form": {("Vap", "Liq"): fugacity},
-                        "parameter_data": {
-                            "mw": (78.1136E-3, pyunits.kg/pyunits.mol),  # [1]
-                            "pressure_crit": (48.9e5, pyunits.Pa),  # [1]
-                            "temperature_crit": (562.2, pyunits.K),  # [1]
-                            "pressure_sat_comp_coeff":{"A": (4.72583, None),  # [2]
-                                                        "B": (1660.652, pyunits.K),
-                                                        "C": (-1.461, pyunits.K)}}},
-            'toluene': {"type": Component,
-                        "pressure_sat_comp": NIST,
-                        "phase_equilibrium_form": {("Vap", "Liq"): fugacity},
-                        "parameter_data": {
-                            "mw": (92.1405E-3, pyunits.kg/pyunits.mol),  # [1]
-                            "pressure_crit": (41e5, pyunits.Pa),  # [1]
-                            "temperature_crit": (591.8, pyunits.K),  # [1]
-                            "pressure_sat_comp_coeff":{"A": (4.07827, None),  # [2]
-                                                        "B": (1343.943, pyunits.K),
-                                                        "C": (-53.773, pyunits.K)}}}},
+configuration_benzene_toluene = {
+    # Specifying components
+    "components": {
+        'benzene': {"type": Component,
+                    "pressure_sat_comp": NIST,
+                    "phase_equilibrium_form": {("Vap", "Liq"): fugacity},
+                    "parameter_data": {
+                        "mw": (78.1136E-3, pyunits.kg/pyunits.mol),  # [1]
+                        "pressure_crit": (48.9e5, pyunits.Pa),  # [1]
+                        "temperature_crit": (562.2, pyunits.K),  # [1]
+                        "pressure_sat_comp_coeff":{"A": (4.72583, None),  # [2]
+                                                    "B": (1660.652, pyunits.K),
+                                                    "C": (-1.461, pyunits.K)}}},
+        'toluene': {"type": Component,
+                    "pressure_sat_comp": NIST,
+                    "phase_equilibrium_form": {("Vap", "Liq"): fugacity},
+                    "parameter_data": {
+                        "mw": (92.1405E-3, pyunits.kg/pyunits.mol),  # [1]
+                        "pressure_crit": (41e5, pyunits.Pa),  # [1]
+                        "temperature_crit": (591.8, pyunits.K),  # [1]
+                        "pressure_sat_comp_coeff":{"A": (4.07827, None),  # [2]
+                                                    "B": (1343.943, pyunits.K),
+                                                    "C": (-53.773, pyunits.K)}}}},
 
-        # Specifying phases
-        "phases":  {'Liq': {"type": LiquidPhase,
-                            "equation_of_state": Ideal},
-                    'Vap': {"type": VaporPhase,
-                            "equation_of_state": Ideal}},
+    # Specifying phases
+    "phases":  {'Liq': {"type": LiquidPhase,
+                        "equation_of_state": Ideal},
+                'Vap': {"type": VaporPhase,
+                        "equation_of_state": Ideal}},
 
-        # Set base units of measurement
-        "base_units": {"time": pyunits.s,
-                       "length": pyunits.m,
-                       "mass": pyunits.kg,
-                       "amount": pyunits.mol,
-                       "temperature": pyunits.K},
+    # Set base units of measurement
+    "base_units": {"time": pyunits.s,
+                   "length": pyunits.m,
+                   "mass": pyunits.kg,
+                   "amount": pyunits.mol,
+                   "temperature": pyunits.K},
 
-        # Specifying state definition
-        "state_definition": FTPx,
-        "state_bounds": {"flow_mol": (0, 100, 1000, pyunits.mol/pyunits.s),
-                         "temperature": (273.15, 300, 450, pyunits.K),
-                         "pressure": (5e4, 1e5, 1e6, pyunits.Pa)},
-        "pressure_ref": (1e5, pyunits.Pa),
-        "temperature_ref": (300, pyunits.K),
+    # Specifying state definition
+    "state_definition": FTPx,
+    "state_bounds": {"flow_mol": (0, 100, 1000, pyunits.mol/pyunits.s),
+                     "temperature": (273.15, 300, 450, pyunits.K),
+                     "pressure": (5e4, 1e5, 1e6, pyunits.Pa)},
+    "pressure_ref": (1e5, pyunits.Pa),
+    "temperature_ref": (300, pyunits.K),
 
-        # Defining phase equilibria
-        "phases_in_equilibrium": [("Vap", "Liq")],
-        "phase_equilibrium_state": {("Vap", "Liq"): smooth_VLE},
-        "bubble_dew_method": IdealBubbleDew}
+    # Defining phase equilibria
+    "phases_in_equilibrium": [("Vap", "Liq")],
+    "phase_equilibrium_state": {("Vap", "Liq"): smooth_VLE},
+    "bubble_dew_method": IdealBubbleDew}
+
+
+# Author: Alejandro Garciadiego
+@pytest.mark.component
+@pytest.mark.parametrize("batch", [False, True])
+def test_Txy_data(batch):
+    configuration = configuration_benzene_toluene
 
     model = ConcreteModel()
 
@@ -131,7 +136,8 @@ def test_Txy_data():
 
     TD = Txy_data(model, 'benzene', 'toluene', 101325,
                   num_points=3, temperature=298.15,
-                  print_level=idaeslog.CRITICAL, solver_op={'tol': 1e-6})
+                  print_level=idaeslog.CRITICAL, solver_op={'tol': 1e-6},
+                  batch=batch)
 
     assert TD.Component_1 == 'benzene'
     assert TD.Component_2 == 'toluene'
@@ -149,6 +155,43 @@ def test_Txy_data():
                     pytest.approx(0.01, abs=1e-4)]
 
 
+@pytest.mark.component
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_Txy_data_pressures(max_workers):
+    model = ConcreteModel()
+
+    model.params = GenericParameterBlock(
+        default=configuration_benzene_toluene)
+
+    TDs = Txy_data_pressures(model, 'benzene', 'toluene', [101325, 2e5],
+                             num_points=3, temperature=298.15,
+                             print_level=idaeslog.CRITICAL,
+                             solver_op={'tol': 1e-6},
+                             max_workers=max_workers)
+
+    assert [TD.P for TD in TDs] == [101325, 2e5]
+    for TD in TDs:
+        assert TD.Component_1 == 'benzene'
+        assert TD.Component_2 == 'toluene'
+        assert_units_equivalent(TD.Punits,
+                                pyunits.kg / pyunits.m / pyunits.s ** 2)
+        assert_units_equivalent(TD.Tunits, pyunits.K)
+        assert TD.x == [pytest.approx(0.99, abs=1e-4),
+                        pytest.approx(0.5, abs=1e-4),
+                        pytest.approx(0.01, abs=1e-4)]
+    assert TDs[0].TBubb == [pytest.approx(353.4853, abs=1e-4),
+                            pytest.approx(365.2127, abs=1e-4),
+                            pytest.approx(383.2909, abs=1e-4)]
+    assert TDs[0].TDew == [pytest.approx(353.7978, abs=1e-2),
+                           pytest.approx(371.8702, abs=1e-4),
+                           pytest.approx(383.5685, abs=1e-4)]
+    # Bubble and dew temperatures increase with pressure
+    for T1, T2 in zip(TDs[0].TBubb, TDs[1].TBubb):
+        assert T2 > T1
+    for T1, T2 in zip(TDs[0].TDew, TDs[1].TDew):
+        assert T2 > T1
+
+
 # Author: Alejandro Garciadiego
 @pytest.mark.component
 def test_Txy_data_no_dew():
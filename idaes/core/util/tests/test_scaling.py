@@ -15,6 +15,8 @@ This module contains tests for scaling.
 """
 
 import pytest
+import numpy as np
+import scipy.sparse as sparse
 import pyomo.environ as pyo
 import pyomo.dae as dae
 from pyomo.common.collections import ComponentSet
@@ -562,6 +564,68 @@ class TestScaleConstraintsPynumero():
         assert jac_scaled[c1_row, y_col] == pytest.approx(-1000)
         assert jac_scaled[c1_row, z_col] == pytest.approx(0.01)
 
+    @pytest.mark.unit
+    def test_jacobian_reuse_nlp(self):
+        """Make sure a Pynumero NLP can be reused to get the Jacobian at new
+        variable values.
+        """
+        m = self.model()
+        jac, nlp = sc.get_jacobian(m, scaled=False)
+        c1_row = nlp._condata_to_idx[m.c1]
+        x_col = nlp._vardata_to_idx[m.x]
+        assert jac[c1_row, x_col] == pytest.approx(-1e6)
+
+        m.y.value = 2e6
+        sc.set_scaling_factor(m.x, 1e-3)
+        jac2, nlp2 = sc.get_jacobian(m, scaled=True, nlp=nlp)
+        assert nlp2 is nlp
+        assert jac2[c1_row, x_col] == pytest.approx(-2e9)
+        assert number_activated_objectives(m) == 0
+
+    @pytest.mark.unit
+    def test_diagnostics_session(self):
+        """Make sure a DiagnosticsSession only creates a new NLP when the
+        model structure changes.
+        """
+        m = self.model()
+        session = sc.DiagnosticsSession(m)
+        jac, nlp = session.get_jacobian(scaled=False)
+        sc.constraint_autoscale_large_jac(m, session=session)
+        sc.jacobian_cond(m, session=session)
+        sc.extreme_jacobian_entries(m, session=session)
+        assert session.n_nlp == 1
+        assert number_activated_objectives(m) == 0
+
+        m.y.value = 2e6
+        jac, nlp = session.get_jacobian(scaled=False)
+        assert session.n_nlp == 1
+        c1_row = nlp._condata_to_idx[m.c1]
+        x_col = nlp._vardata_to_idx[m.x]
+        assert jac[c1_row, x_col] == pytest.approx(-2e6)
+
+        m.y.fix()
+        jac, nlp = session.get_jacobian(scaled=False)
+        assert session.n_nlp == 2
+        assert jac.shape == (3, 2)
+
+        m.c3.deactivate()
+        jac, nlp = session.get_jacobian(scaled=False)
+        assert session.n_nlp == 3
+        assert jac.shape == (2, 2)
+
+    @pytest.mark.unit
+    def test_extreme_jacobian_entries(self):
+        m = self.model()
+        el = sc.extreme_jacobian_entries(
+            m, scaled=False, large=1e4, small=0.5)
+        assert len(el) == 2
+        e, c, v = el[0] if el[0][1] is m.c1 else el[1]
+        assert e == pytest.approx(1e6)
+        assert v is m.x
+        e, c, v = el[0] if el[0][1] is m.c3 else el[1]
+        assert e == pytest.approx(3e8)
+        assert v is m.z
+
     @pytest.mark.unit
     def test_scale_no_var_scale(self):
         """Make sure the Jacobian from Pynumero matches expectation.  This is
@@ -674,6 +738,8 @@ class TestScaleConstraintsPynumero():
         assert n == pytest.approx(500, abs=200)
         n = sc.jacobian_cond(m, scaled=False)
         assert n == pytest.approx(7.5e7, abs=5e6)
+        n = sc.jacobian_cond(m, scaled=True, estimate=True, ord=2)
+        assert n == pytest.approx(500, abs=200)
 
 
     @pytest.mark.unit
@@ -712,6 +778,60 @@ class TestScaleConstraintsPynumero():
         assert m.scaling_factor[m.c1] == pytest.approx(1e-6)
 
 
+def _test_matrix(shape, singular=False):
+    jac = sparse.random(*shape, density=0.3, random_state=1, format="lil")
+    jac += sparse.eye(*shape)
+    if singular:
+        jac[3, :] = jac[4, :]
+    return jac.tocsc()
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("shape", [(30, 30), (20, 35), (35, 20), (3, 3)])
+def test_smallest_singular_values(shape):
+    jac = _test_matrix(shape)
+    u, s, vt = sc.smallest_singular_values(jac, k=2)
+    s_dense = np.linalg.svd(jac.toarray(), compute_uv=False)
+    assert s == pytest.approx(np.sort(s_dense)[:2])
+    assert u.shape == (shape[0], 2)
+    assert vt.shape == (2, shape[1])
+    assert jac @ vt.T == pytest.approx(u*s)
+
+
+@pytest.mark.unit
+def test_smallest_singular_values_singular():
+    jac = _test_matrix((30, 30), singular=True)
+    u, s, vt = sc.smallest_singular_values(jac, k=1)
+    assert s[0] == pytest.approx(0, abs=1e-6)
+    # Left singular vector shows the dependent rows
+    assert abs(u[3, 0]) == pytest.approx(abs(u[4, 0]))
+    assert abs(u[3, 0]) == pytest.approx(np.sqrt(0.5))
+
+
+@pytest.mark.unit
+def test_jacobian_cond_estimate():
+    jac = _test_matrix((30, 30))
+    dense = jac.toarray()
+    assert sc.jacobian_cond(jac=jac, estimate=True, ord=1) == pytest.approx(
+        np.linalg.cond(dense, 1))
+    assert sc.jacobian_cond(jac=jac, estimate=True, ord=2) == pytest.approx(
+        np.linalg.cond(dense, 2))
+
+    jac = _test_matrix((20, 35))
+    assert sc.jacobian_cond(jac=jac, estimate=True, ord=2) == pytest.approx(
+        np.linalg.cond(jac.toarray(), 2))
+    with pytest.raises(ValueError):
+        sc.jacobian_cond(jac=jac, estimate=True, ord=1)
+
+    jac = _test_matrix((30, 30), singular=True)
+    assert sc.jacobian_cond(jac=jac, estimate=True, ord=1) > 1e12
+
+    # The default Frobenius norm can not be estimated
+    for ord in (None, "fro"):
+        with pytest.raises(ValueError):
+            sc.jacobian_cond(jac=jac, estimate=True, ord=ord)
+
+
 class TestScaleConstraints():
     @pytest.fixture(scope="class")
     def model(self):
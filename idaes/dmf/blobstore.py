@@ -0,0 +1,224 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Content-addressed storage for the datafiles of resources.
+
+Each distinct file content is stored once, in a file named by its SHA-1
+hash. The datafiles of resources are hard links to these files, so adding
+the same content again takes no more disk space, and the number of links
+to a stored file is the number of datafiles that refer to it.
+"""
+# stdlib
+import hashlib
+import logging
+import os
+import shutil
+import stat
+import tempfile
+
+# package
+from .util import mkdir_p
+
+__author__ = "Dan Gunter"
+
+_log = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """Store of file contents ("blobs") in a directory, named by their hash.
+    """
+
+    #: Size of the blocks that are read, hashed and written when adding a file
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, root):
+        """Create for a directory, which is created when needed.
+
+        Args:
+            root (str): Directory for the stored files
+        """
+        self.root = root
+        # hashes of files added, keyed by their identity and status
+        self._hashes = {}
+
+    def path(self, digest):
+        """Path of the stored file for a hash.
+        """
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def __contains__(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def add(self, filepath, digest=None):
+        """Store the content of a file.
+
+        The file is hashed first, so content that is already stored is
+        never written again. The file is not read at all if the same file
+        (path, device and inode) was added before and still has the same size
+        and modification time. A given hash is not trusted otherwise, since
+        different files can have the same size and modification time; if it
+        does not match the content, a warning is logged and the hash of the
+        content is used.
+
+        Args:
+            filepath (str): File to add
+            digest (str): Expected SHA-1 hash of the file content, if any
+
+        Returns:
+            str: SHA-1 hash (hex digest) of the content
+
+        Raises:
+            IOError, OSError: If the file cannot be read or stored
+        """
+        st = os.stat(filepath)
+        key = (
+            os.path.abspath(filepath),
+            st.st_dev,
+            st.st_ino,
+            st.st_size,
+            st.st_mtime_ns,
+        )
+        known = self._hashes.get(key, None)
+        if known is None:
+            known = self._hashes[key] = self.hash_file(filepath)
+        if digest and digest != known:
+            _log.warning(
+                f"given hash {digest} of '{filepath}' does not match its "
+                f"content, using {known}"
+            )
+        digest = known
+        blob_path = self.path(digest)
+        if os.path.exists(blob_path):
+            _log.debug(f"content of '{filepath}' is already stored as {digest}")
+            return digest
+        mkdir_p(os.path.dirname(blob_path))
+        # copy to a temporary name, so a stored file is always complete
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".add-")
+        os.close(fd)
+        try:
+            shutil.copy2(filepath, tmp_path)
+            # The content is shared by all of its links, so it must not
+            # be changed through any one of them.
+            mode = os.stat(tmp_path).st_mode
+            os.chmod(tmp_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            os.replace(tmp_path, blob_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        _log.debug(f"stored content of '{filepath}' as {digest}")
+        return digest
+
+    @classmethod
+    def hash_file(cls, filepath):
+        """SHA-1 hash (hex digest) of the content of a file.
+        """
+        h = hashlib.sha1()
+        with open(filepath, "rb") as f:
+            blk = f.read(cls.BLOCK_SIZE)
+            while blk:
+                h.update(blk)
+                blk = f.read(cls.BLOCK_SIZE)
+        return h.hexdigest()
+
+    def link(self, digest, dest):
+        """Make a file with the stored content at a given path, replacing any
+        existing file. The file is a hard link to the stored file if possible,
+        otherwise (e.g. if `dest` is on another file system) a copy of it, and
+        in that case the stored file is removed if nothing else links to it.
+
+        Args:
+            digest (str): Hash of stored content
+            dest (str): Path of new file
+
+        Returns:
+            bool: True if a link was made, False if the content was copied
+
+        Raises:
+            IOError, OSError: If the file cannot be created
+        """
+        blob_path = self.path(digest)
+        if os.path.lexists(dest):
+            _remove(dest, other=blob_path)
+        try:
+            os.link(blob_path, dest)
+            return True
+        except OSError as err:
+            _log.debug(f"cannot link '{dest}' to {digest}, copying instead: {err}")
+        shutil.copy2(blob_path, dest)
+        self.release(digest)
+        return False
+
+    def refcount(self, digest):
+        """Number of files linked to the stored content.
+        """
+        try:
+            return os.stat(self.path(digest)).st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def unlink(self, digest, path):
+        """Remove a file made with :meth:`link`, and the stored content if no
+        other file links to it. Nothing is done if the file is not a link to
+        the stored content.
+
+        Args:
+            digest (str): Hash of stored content
+            path (str): Path of linked file
+
+        Returns:
+            bool: True if the file was removed
+        """
+        blob_path = self.path(digest)
+        try:
+            if not os.path.samefile(path, blob_path):
+                return False
+        except OSError:
+            return False
+        _remove(path, other=blob_path)
+        self.release(digest)
+        return True
+
+    def release(self, digest):
+        """Remove the stored content if no file links to it.
+
+        Returns:
+            bool: True if the stored content was removed
+        """
+        if self.refcount(digest) > 0 or digest not in self:
+            return False
+        _log.debug(f"removing unreferenced content {digest}")
+        _remove(self.path(digest))
+        try:
+            os.rmdir(os.path.dirname(self.path(digest)))
+        except OSError:
+            pass  # not empty
+        return True
+
+
+def _remove(path, other=None):
+    """Remove a file, even if it is read-only (which prevents removal on
+    Windows). If `other` is another link to the same file, its permissions
+    are restored afterwards, since they are shared with the removed link.
+    """
+    try:
+        os.unlink(path)
+    except PermissionError:
+        mode = os.stat(path).st_mode
+        restore = other is not None and os.path.exists(other) and (
+            os.path.samefile(path, other)
+        )
+        os.chmod(path, mode | stat.S_IWUSR)
+        os.unlink(path)
+        if restore:
+            os.chmod(other, mode)
@@ -1035,6 +1035,27 @@ def rm(identifier, yes, multiple, list_resources):
     click.echo(s)
 
 
+@click.command(
+    "migrate-db",
+    help="Copy the resources in the workspace into a new SQLite database file, "
+    "and use it from now on. The current database file is kept.",
+)
+@click.option(
+    "--db-file",
+    default="resourcedb.sqlite",
+    help="Name of the new database file, in the workspace directory",
+)
+def migrate_db(db_file):
+    _log.info(f"migrate resource database to '{db_file}'")
+    d = DMF()
+    try:
+        n = d.migrate_db(db_file)
+    except (ValueError, errors.DMFError) as err:
+        click.echo(f"Cannot migrate resource database: {err}")
+        sys.exit(Code.DMF_OPER.value)
+    click.echo(f"{n} resources copied to '{db_file}'")
+
+
 ######################################################################################
 
 
@@ -1293,6 +1314,7 @@ base_command.add_command(find)
 base_command.add_command(info)
 base_command.add_command(related)
 base_command.add_command(rm)
+base_command.add_command(migrate_db)
 
 # if __name__ == '__main__':
 #     base_command()
@@ -32,8 +32,10 @@ import yaml
 
 # local
 from . import errors
+from .blobstore import BlobStore
 from .resource import Resource
 from . import resourcedb
+from .tabular import TabularData
 from . import workspace
 from .util import mkdir_p, yaml_load
 
@@ -159,6 +161,9 @@ class DMF(workspace.Workspace, HasTraits):
 
     CONF_DB_FILE = "db_file"
     CONF_DATA_DIR = "datafile_dir"
+    #: Subdirectory of the datafile directory with the content of all copied
+    #: datafiles, see :class:`idaes.dmf.blobstore.BlobStore`
+    BLOB_DIR = ".blobs"
     CONF_HELP_PATH = workspace.Fields.DOC_HTML_PATH
 
     # logging should really provide this
@@ -226,10 +231,11 @@ class DMF(workspace.Workspace, HasTraits):
                 raise errors.WorkspaceError(msg)
         # set up rest of DMF
         path = os.path.join(self.root, self.db_file)
-        self._db = resourcedb.ResourceDB(path)
+        self._db = resourcedb.connect(path)
         self._datafile_path = os.path.join(self.root, self.datafile_dir)
         if not os.path.exists(self._datafile_path):
             os.mkdir(self._datafile_path, 0o750)
+        self._blobs = BlobStore(os.path.join(self._datafile_path, self.BLOB_DIR))
         # add create/modified date, and optional name/description
         _w = workspace.Workspace
         right_now = datetime.isoformat(datetime.now())
@@ -417,6 +423,14 @@ class DMF(workspace.Workspace, HasTraits):
         True the original file will be removed (after the copy is made,
         of course).
 
+        Copied files are stored once per distinct content, and the
+        copy for each resource is a link to the stored content (see
+        :class:`idaes.dmf.blobstore.BlobStore`), whose SHA-1 hash is put
+        in the `sha1` field of the datafile. A file that was already
+        stored by this DMF instance, and has not changed since, is not read
+        again. If the `sha1` field is already set and does not match the
+        content, a warning is logged and it is replaced.
+
         Resources added during the lifetime of this DMF instance are remembered,
         so that `update()` with no arguments applies to all of them.
 
@@ -479,7 +493,8 @@ class DMF(workspace.Workspace, HasTraits):
                 # The `do_copy` flag says do a copy of this datafile from its
                 # current path, say /a/path/to/file, into the resource's
                 # datafile-dir, say /a/dir/for/resources/, resulting in
-                # e.g. /a/dir/for/resources/file.
+                # e.g. /a/dir/for/resources/file. The content is added to the
+                # blob store, and the "copy" is a link to it.
                 filepath = datafile["path"]
                 _, filename = os.path.split(filepath)
                 copydir = os.path.join(ddir, filename)
@@ -487,7 +502,8 @@ class DMF(workspace.Workspace, HasTraits):
                     'Copying datafile "{}" to directory "{}"'.format(filepath, copydir)
                 )
                 try:
-                    shutil.copy2(filepath, copydir)
+                    digest = self._blobs.add(filepath, digest=datafile.get("sha1", None))
+                    self._blobs.link(digest, copydir)
                 except (IOError, OSError) as err:
                     msg = (
                         'Cannot copy datafile from "{}" to DMF '
@@ -515,6 +531,7 @@ class DMF(workspace.Workspace, HasTraits):
                     if "is_tmp" in datafile:  # remove this directive
                         del datafile["is_tmp"]
                 datafile["path"] = filename
+                datafile["sha1"] = digest
                 datafile["is_copy"] = True
                 if "do_copy" in datafile:  # remove this directive
                     del datafile["do_copy"]
@@ -528,6 +545,42 @@ class DMF(workspace.Workspace, HasTraits):
     def count(self):
         return len(self._db)
 
+    def migrate_db(self, db_file="resourcedb.sqlite") -> int:
+        """Copy all resources into a new SQLite resource database in the
+        workspace, and use that database from now on. The previous database
+        file is not modified or removed.
+
+        Args:
+            db_file: Name of the new database file, relative to the workspace
+                     root. Its extension must be one of those in
+                     :data:`resourcedb.SQLITE_EXTENSIONS`.
+        Returns:
+            Number of resources copied
+        Raises:
+            ValueError: If the extension of `db_file` is not for SQLite
+            errors.DMFError: If `db_file` already exists
+        """
+        _, ext = os.path.splitext(db_file)
+        if ext.lower() not in resourcedb.SQLITE_EXTENSIONS:
+            raise ValueError(
+                f"Database file '{db_file}' must have one of the extensions: "
+                f"{', '.join(resourcedb.SQLITE_EXTENSIONS)}"
+            )
+        path = os.path.join(self.root, db_file)
+        if os.path.exists(path):
+            raise errors.DMFError(f"Cannot migrate to '{path}': file exists")
+        new_db = resourcedb.SQLiteResourceDB(path)
+        try:
+            n = resourcedb.migrate(self._db, new_db)
+        except Exception:
+            new_db.close()
+            os.unlink(path)
+            raise
+        _log.info(f"Copied {n} resources to '{path}'")
+        self._db = new_db
+        self.db_file = db_file
+        return n
+
     def fetch_one(self, rid, id_only=False):
         """Fetch one resource, from its identifier.
 
@@ -709,6 +762,10 @@ class DMF(workspace.Workspace, HasTraits):
         Unless told otherwise, this method will scan the DB and remove
         all relations that involve this resource.
 
+        The datafiles that were copied into the workspace are also removed,
+        and the stored content of each one is removed when no other
+        resource's datafile refers to it.
+
         Args:
             identifier (str): Identifier for a resource.
             filter_dict (dict): Filter to use instead of identifier
@@ -730,11 +787,6 @@ class DMF(workspace.Workspace, HasTraits):
             rid_list = [identifier]
         else:
             id_list = list(self.find(filter_dict=filter_dict, id_only=True))
-            if id_list:
-                rid_list = []
-                for i in id_list:
-                    rsrc = self._db.get(i)
-                    rid_list.append(rsrc.id)
         if not id_list:
             _log.info(
                 "Cannot remove resource-id={} filter={}: Not found".format(
@@ -742,8 +794,12 @@ class DMF(workspace.Workspace, HasTraits):
                 )
             )
             return
-        # TODO: Delete all associated data files!!
+        removed = [self._db.get(i) for i in id_list]
+        if not identifier:
+            rid_list = [rsrc.id for rsrc in removed]
         self._db.delete(idlist=id_list, internal_ids=True)
+        for rsrc in removed:
+            self._remove_files(rsrc)
         # delete any added during this session
         for rsrc_id in id_list:
             if rsrc_id in self._resources:
@@ -765,6 +821,33 @@ class DMF(workspace.Workspace, HasTraits):
                     # save back to DMF
                     self.update(rsrc)
 
+    def _remove_files(self, rsrc):
+        """Remove the datafiles of a resource that are links to stored
+        content, with their caches (see :meth:`TabularData.load_csv`), and
+        the directory created for them if it is now empty.
+        """
+        ddir = rsrc.v.get("datafiles_dir", None)
+        if not ddir:
+            return
+        for datafile in rsrc.v["datafiles"]:
+            digest = datafile.get("sha1", None)
+            if datafile.get("is_copy", False) and digest:
+                path = os.path.join(ddir, datafile["path"])
+                try:
+                    if self._blobs.unlink(digest, path):
+                        shutil.rmtree(
+                            path + TabularData.cache_suffix, ignore_errors=True
+                        )
+                except OSError as err:
+                    _log.warning(f'Cannot remove datafile "{path}": {err}')
+        if os.path.dirname(os.path.abspath(ddir)) == os.path.abspath(
+            self._datafile_path
+        ):
+            try:
+                os.rmdir(ddir)
+            except OSError:
+                pass  # not empty, or already removed
+
     def update(
         self,
         rsrc: Resource = None,
@@ -12,11 +12,21 @@
 ##############################################################################
 """
 Resource database.
+
+There are two implementations of the database, which is selected by the
+extension of the database file (see :func:`connect`):
+
+* :class:`ResourceDB`, a JSON file read and written with TinyDB
+* :class:`SQLiteResourceDB`, an SQLite database file with indexes on the
+  fields most often used for searches
 """
 # system
 from datetime import datetime
+import json
 import logging
+import os
 import re
+import sqlite3
 
 # third party
 from tinydb import TinyDB, Query
@@ -24,7 +34,7 @@ from tinydb import TinyDB, Query
 # local
 from . import errors
 from .resource import Resource
-from .resource import Triple, triple_from_resource_relations
+from .resource import Triple, triple_from_resource_relations, RR_OBJ, RR_ROLE, RR_SUBJ
 
 __author__ = 'Dan Gunter <dkgunter@lbl.gov>'
 
@@ -238,6 +248,11 @@ class ResourceDB(object):
     def find_related(self, id_, filter_dict=None, outgoing=True, maxdepth=0, meta=None):
         """Find all resources connected to the identified one.
 
+        The search is breadth-first, and the relations of each resource
+        that is reached are looked up in an index (see
+        :meth:`_relations_to`), so the time taken depends on the number
+        of related resources rather than the size of the database.
+
         Args:
             id_ (str): Unique ID of target resource.
             filter_dict (dict): Filter to these resources
@@ -251,65 +266,81 @@ class ResourceDB(object):
         """
         if maxdepth <= 0:
             maxdepth = 9223372036854775807
-        # Get an iterator over all the resources, optionally
-        # filtered by an expression, as for find().
-        if filter_dict:
-            filter_expr = self._create_filter_expr(filter_dict)
-            resource_list = self._db.search(filter_expr)
-        else:
-            resource_list = self._db.all()
-        # build adjacency list representing connections between resources
-        relation_map = {}
-        for rsrc in resource_list:
-            # print(f"@@ process resource: {rsrc[Resource.ID_FIELD]}")
-            # print(f"@@ resource relations: {rsrc['relations']}")
-            for rrel in rsrc['relations']:
-                uuid = rsrc[Resource.ID_FIELD]
-                rel = triple_from_resource_relations(uuid, rrel)
-                # skip start of edge, get metadata, etc. at end of edge
-                if (outgoing and rel.subject == uuid) or (
-                    not outgoing and rel.object == uuid
-                ):
-                    # print(f"@@ do nothing for: {uuid}")
-                    continue
-                # add entry in map
-                key = rel.subject if outgoing else rel.object
-                # print(f"@@ add to relation map, key={key}")
-                meta_info = {k: rsrc[k] for k in meta}
-                value = (rel.subject, rel.predicate, rel.object, meta_info)
-                value_list = relation_map.get(key, None)
-                if value_list is None:
-                    relation_map[key] = [value]
-                else:
-                    value_list.append(value)
-        _log.debug(f"built relation map: {relation_map}")
-        # stop if there are no connections
-        if id_ not in relation_map:
-            return
-        # Do a depth-first search through the edges, yield-ing
+        # Optionally, only follow relations to (or from) the resources
+        # matching an expression, as for find().
+        filter_expr = self._create_filter_expr(filter_dict) if filter_dict else None
+        meta = meta or []
+
+        def relations(key):
+            result = []
+            for rel, value in self._relations_to(key, outgoing):
+                if filter_expr is None or filter_expr(value):
+                    result.append((rel, {k: value[k] for k in meta}))
+            return result
+
+        # Do a breadth-first search through the edges, yield-ing
         # the relations as we go
-        q, depth, visited = [], 0, set()
-        q.extend(relation_map[id_])
-        visited.add(id_)
+        q, depth, visited = relations(id_), 0, {id_}
         while len(q) > 0 and depth < maxdepth:
             depth += 1
             # visit all the nodes in the queue
             n = len(q)
             for i in range(n):
-                relation = Triple(*q[i][:3])
-                yield (depth, relation, q[i][3])
+                relation, meta_info = q[i]
+                yield (depth, relation, meta_info)
                 if depth < maxdepth:
                     # Follow relations from subject or object, depending on
                     # the "direction" that we are searching.
                     next_id = relation.object if outgoing else relation.subject
-                    # If there are relations, and we haven't already been to
-                    # this node, add them at the end of the queue; we will
+                    # If we haven't already been to this node, add its
+                    # relations at the end of the queue; we will
                     # visit them at the next depth increment.
-                    if next_id in relation_map and next_id not in visited:
-                        q.extend(relation_map[next_id])
+                    if next_id not in visited:
+                        q.extend(relations(next_id))
                         visited.add(next_id)
             q = q[n:]  # pop off all the nodes we just visited
 
+    def _relations_to(self, id_, outgoing):
+        """Get the relations from (if `outgoing`) or to the identified
+        resource, each with the stored value of the resource at the other
+        end of the relation.
+
+        The relations are taken from a graph of all relations in the
+        database, which is built on first use and discarded whenever the
+        database is modified.
+
+        Returns:
+            list of (Triple, dict)
+        """
+        if self._gr is None:
+            graph = {True: {}, False: {}}
+            for rsrc in self._db.all():
+                uuid = rsrc[Resource.ID_FIELD]
+                for rrel in rsrc.get("relations", ()):
+                    rel = triple_from_resource_relations(uuid, rrel)
+                    if rel.subject == rel.object:
+                        continue
+                    # the resource at the end of the edge provides the
+                    # metadata, so it is found from the start of the edge
+                    is_out = rel.object == uuid
+                    key = rel.subject if is_out else rel.object
+                    graph[is_out].setdefault(key, []).append((rel, rsrc))
+            _log.debug(
+                f"built relation graph: {len(graph[True])} subjects, "
+                f"{len(graph[False])} objects"
+            )
+            self._gr = graph
+        return self._gr[bool(outgoing)].get(id_, [])
+
+    def _documents(self, filter_dict=None):
+        """Get the stored values (dicts) of all resources matching the
+        filter, or of all resources if there is no filter.
+        """
+        if filter_dict:
+            filter_expr = self._create_filter_expr(filter_dict)
+            return self._db.search(filter_expr)
+        return self._db.all()
+
     def get(self, identifier):
         """Get a resource by identifier.
 
@@ -350,6 +381,30 @@ class ResourceDB(object):
             raise errors.DuplicateResourceError("put", resource.id)
         # add resource
         self._db.insert(resource.v)
+        self._gr = None
+
+    def put_many(self, resources):
+        """Put these resources into the database, all or none of them.
+
+        Args:
+            resources (Iterable[Resource]): The resources to add
+
+        Returns:
+            None
+
+        Raises:
+            errors.DuplicateResourceError: If there is already a resource
+                in the database, or earlier in `resources`, with the
+                same "id". In this case no resources are added.
+        """
+        resources = list(resources)
+        ids = {r[Resource.ID_FIELD] for r in self._db.all()}
+        for rsrc in resources:
+            if rsrc.id in ids:
+                raise errors.DuplicateResourceError("put_many", rsrc.id)
+            ids.add(rsrc.id)
+        self._db.insert_multiple([rsrc.v for rsrc in resources])
+        self._gr = None
 
     def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
         """Delete one or more resources with given identifiers.
@@ -379,6 +434,7 @@ class ResourceDB(object):
             else:
                 return
             self._db.remove(cond=cond)
+        self._gr = None
 
     def update(self, id_, new_dict):
         """Update the identified resource with new values.
@@ -412,3 +468,494 @@ class ResourceDB(object):
                 changed[k] = v
         _log.debug(f"update resource {id_} with new values: {changed}")
         self._db.update(changed, self._create_filter_expr(id_cond))
+        self._gr = None
+
+
+class SQLiteResourceDB(ResourceDB):
+    """Resource database stored in an SQLite file.
+
+    Each resource is stored as JSON, along with indexed columns for its
+    identifier, type, and created and modified times, and indexed rows for
+    each of its tags and aliases (the first of which is its name). Searches
+    use these indexes to select candidate resources, which are then checked
+    against the complete filter in the same way as for :class:`ResourceDB`,
+    so the filter syntax of :meth:`idaes.dmf.dmfbase.DMF.find` is unchanged.
+
+    The relations of each resource are also stored as indexed
+    (subject, predicate, object) rows, which are used by
+    :meth:`find_related` to follow the relations of one resource at a time.
+    """
+
+    #: Resource fields stored in indexed columns
+    COLUMN_FIELDS = (Resource.ID_FIELD, Resource.TYPE_FIELD, "created", "modified")
+    #: Resource fields with list values whose items are indexed
+    LIST_FIELDS = ("tags", "aliases")
+
+    _schema = [
+        "CREATE TABLE IF NOT EXISTS resources ("
+        " doc_id INTEGER PRIMARY KEY AUTOINCREMENT,"
+        " id_ TEXT NOT NULL UNIQUE,"
+        " type TEXT,"
+        " created REAL,"
+        " modified REAL,"
+        " value TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS resources_type ON resources (type)",
+        "CREATE INDEX IF NOT EXISTS resources_created ON resources (created)",
+        "CREATE INDEX IF NOT EXISTS resources_modified ON resources (modified)",
+        "CREATE TABLE IF NOT EXISTS resource_values ("
+        " doc_id INTEGER NOT NULL,"
+        " field TEXT NOT NULL,"
+        " value TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS resource_values_field"
+        " ON resource_values (field, value)",
+        "CREATE INDEX IF NOT EXISTS resource_values_doc"
+        " ON resource_values (doc_id)",
+        # One row for each item in the relations of a resource, where
+        # `role` is the role of that resource (doc_id) in the relation
+        "CREATE TABLE IF NOT EXISTS relations ("
+        " doc_id INTEGER NOT NULL,"
+        " pos INTEGER NOT NULL,"
+        " subject TEXT NOT NULL,"
+        " predicate TEXT NOT NULL,"
+        " object TEXT NOT NULL,"
+        " role TEXT NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS relations_subject"
+        " ON relations (subject, role)",
+        "CREATE INDEX IF NOT EXISTS relations_object"
+        " ON relations (object, role)",
+        "CREATE INDEX IF NOT EXISTS relations_doc ON relations (doc_id)",
+    ]
+    #: Version of the schema, stored in the database file. Tables added in a
+    #: new version are filled from the stored resources when an older
+    #: database file is opened.
+    SCHEMA_VERSION = 1
+
+    _sql_ops = {"$gt": ">", "$ge": ">=", "$lt": "<", "$le": "<="}
+
+    def __init__(self, dbfile=None, connection=None):
+        """Initialize from DMF and given configuration field.
+
+        Args:
+            dbfile (str): DB location
+            connection (sqlite3.Connection): If non-empty, this is an
+                existing connection that should be re-used, instead of
+                trying to connect to the location in `dbfile`.
+
+        Raises:
+            errors.FileError, if the database file cannot be opened
+        """
+        self._gr = None
+        if connection is not None:
+            self._conn = connection
+        else:
+            try:
+                self._conn = sqlite3.connect(dbfile)
+            except sqlite3.Error as err:
+                raise errors.FileError(f'Cannot open resource DB "{dbfile}": {err}')
+        with self._conn:
+            for statement in self._schema:
+                self._conn.execute(statement)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < 1:
+                self._index_all_relations()
+            if version < self.SCHEMA_VERSION:
+                self._conn.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _index_all_relations(self):
+        _log.debug("adding relations of all resources to relations table")
+        self._conn.execute("DELETE FROM relations")
+        rows = self._conn.execute("SELECT doc_id, value FROM resources")
+        for doc_id, text in rows.fetchall():
+            self._insert_relations(doc_id, json.loads(text))
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM resources").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    # Queries
+
+    def find(self, filter_dict, id_only=False, flags=0):
+        """Find and return records based on the provided filter.
+
+        Args:
+            filter_dict (dict): Search filter. For syntax, see docs in
+                                :meth:`.dmf.DMF.find`.
+            id_only (bool): If true, return only the identifier of each
+                resource; otherwise a Resource object is returned.
+            flags (int): Flag values for, e.g., regex searches
+
+        Returns:
+            generator of int|Resource, depending on the value of `id_only`
+        """
+        for doc_id, value in self._search(filter_dict, flags=flags, id_only=id_only):
+            if id_only:
+                yield doc_id
+            else:
+                yield self._as_resource(doc_id, value)
+
+    def _documents(self, filter_dict=None):
+        return (value for _, value in self._search(filter_dict))
+
+    def _search(self, filter_dict, flags=0, id_only=False):
+        """Generate (doc_id, value) for the resources matching the filter.
+        The value is None if `id_only` is True and the SQL query alone
+        selects exactly the matching resources.
+        """
+        filter_dict = filter_dict or {}
+        clauses, params, exact = self._sql_filter(filter_dict)
+        if id_only and exact:
+            columns = "doc_id"
+        else:
+            columns = "doc_id, value"
+        query = f"SELECT {columns} FROM resources"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY doc_id"
+        _log.debug(f"SQL query: {query} params={params}")
+        rows = self._conn.execute(query, params)
+        if id_only and exact:
+            for row in rows:
+                yield row[0], None
+            return
+        filter_expr = self._create_filter_expr(filter_dict, flags) if filter_dict else None
+        for doc_id, text in rows:
+            value = json.loads(text)
+            if filter_expr is None or filter_expr(value):
+                yield doc_id, value
+
+    @classmethod
+    def _sql_filter(cls, filter_dict):
+        """Translate the parts of a filter that apply to indexed fields
+        into SQL conditions.
+
+        Returns:
+            (clauses, params, exact): List of SQL conditions, list of their
+            parameters, and whether the conditions are exactly equivalent to
+            the filter. If not, they select a superset of the matching
+            resources, which must be filtered further.
+        """
+        clauses, params, exact = [], [], True
+        for k, v in filter_dict.items():
+            if not k:
+                continue
+            qry_all = False
+            if isinstance(v, list) and k.endswith("!"):
+                k, qry_all = k[:-1], True
+            if k in cls.COLUMN_FIELDS:
+                clause = cls._sql_column_condition(k, v, params)
+                if clause is None:
+                    exact = False
+                else:
+                    clause, clause_exact = clause
+                    clauses.append(clause)
+                    exact = exact and clause_exact
+            elif (
+                k in cls.LIST_FIELDS
+                and isinstance(v, list)
+                and len(v) > 0
+                and all(isinstance(item, str) for item in v)
+            ):
+                subquery = (
+                    "doc_id IN (SELECT doc_id FROM resource_values"
+                    " WHERE field = ? AND value {})"
+                )
+                if qry_all:
+                    for item in v:
+                        clauses.append(subquery.format("= ?"))
+                        params.extend((k, item))
+                else:
+                    marks = ", ".join("?" * len(v))
+                    clauses.append(subquery.format(f"IN ({marks})"))
+                    params.append(k)
+                    params.extend(v)
+            else:
+                exact = False
+        return clauses, params, exact
+
+    @classmethod
+    def _sql_column_condition(cls, column, v, params):
+        """SQL condition on an indexed column, or None if the filter value
+        cannot be used with an index. Returns (condition, exact).
+        """
+        if isinstance(v, dict):
+            conds = []
+            for op_key, op_value in v.items():
+                tv = cls._value_transform(op_value)
+                if op_key in cls._sql_ops and _is_number(tv):
+                    conds.append(f"{column} {cls._sql_ops[op_key]} ?")
+                    params.append(tv)
+            if not conds:
+                return None
+            return " AND ".join(conds), len(conds) == len(v)
+        tv = cls._value_transform(v)
+        if hasattr(tv, "match"):
+            # The literal prefix of a regex (which must match at the start of
+            # the value) selects the candidate values with LIKE, which is
+            # case-insensitive.
+            prefix = _regex_literal_prefix(tv.pattern)
+            if not prefix:
+                return None
+            escaped = re.sub(r"([\\%_])", r"\\\1", prefix)
+            params.append(escaped + "%")
+            return f"{column} LIKE ? ESCAPE '\\'", False
+        if isinstance(tv, str) or _is_number(tv):
+            params.append(tv)
+            return f"{column} = ?", True
+        return None
+
+    def _relations_to(self, id_, outgoing):
+        """Get the relations from (if `outgoing`) or to the identified
+        resource, each with the stored value of the resource at the other
+        end of the relation, using the indexed relations table.
+
+        Returns:
+            list of (Triple, dict)
+        """
+        if outgoing:
+            key_column, role = "subject", RR_OBJ
+        else:
+            key_column, role = "object", RR_SUBJ
+        rows = self._conn.execute(
+            "SELECT r.subject, r.predicate, r.object, v.value"
+            " FROM relations r JOIN resources v ON v.doc_id = r.doc_id"
+            f" WHERE r.{key_column} = ? AND r.role = ? AND r.subject != r.object"
+            " ORDER BY r.doc_id, r.pos",
+            (id_, role),
+        )
+        return [(Triple(s, p, o), json.loads(text)) for s, p, o, text in rows]
+
+    def get(self, identifier):
+        """Get a resource by identifier.
+
+        Args:
+          identifier: Internal identifier
+
+        Returns:
+            (Resource) A resource or None
+        """
+        row = self._conn.execute(
+            "SELECT value FROM resources WHERE doc_id = ?", (identifier,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._as_resource(identifier, json.loads(row[0]))
+
+    @staticmethod
+    def _as_resource(doc_id, value):
+        rsrc = Resource(value=value)
+        rsrc.v["doc_id"] = doc_id
+        return rsrc
+
+    # Modification
+
+    def put(self, resource):
+        """Put this resource into the database.
+
+        Args:
+            resource (Resource): The resource to add
+
+        Returns:
+            None
+
+        Raises:
+            errors.DuplicateResourceError: If there is already a resource
+                in the database with the same "id".
+        """
+        _log.debug(f"put resource id={resource.id}")
+        self.put_many([resource])
+
+    def put_many(self, resources):
+        """Put these resources into the database, in one transaction.
+
+        Args:
+            resources (Iterable[Resource]): The resources to add
+
+        Returns:
+            None
+
+        Raises:
+            errors.DuplicateResourceError: If there is already a resource
+                in the database, or earlier in `resources`, with the
+                same "id". In this case no resources are added.
+        """
+        try:
+            with self._conn:
+                for rsrc in resources:
+                    cursor = self._conn.execute(
+                        "INSERT INTO resources"
+                        " (id_, type, created, modified, value)"
+                        " VALUES (?, ?, ?, ?, ?)",
+                        self._row_values(rsrc.v),
+                    )
+                    self._insert_list_values(cursor.lastrowid, rsrc.v)
+                    self._insert_relations(cursor.lastrowid, rsrc.v)
+        except sqlite3.IntegrityError:
+            raise errors.DuplicateResourceError("put", rsrc.id)
+
+    @classmethod
+    def _row_values(cls, value):
+        return (
+            value[Resource.ID_FIELD],
+            value.get(Resource.TYPE_FIELD, None),
+            value.get("created", None),
+            value.get("modified", None),
+            json.dumps(value),
+        )
+
+    def _insert_list_values(self, doc_id, value):
+        rows = [
+            (doc_id, field, item)
+            for field in self.LIST_FIELDS
+            for item in value.get(field, None) or ()
+            if isinstance(item, str)
+        ]
+        self._conn.executemany(
+            "INSERT INTO resource_values (doc_id, field, value) VALUES (?, ?, ?)",
+            rows,
+        )
+
+    def _insert_relations(self, doc_id, value):
+        uuid = value[Resource.ID_FIELD]
+        rows = []
+        for pos, rrel in enumerate(value.get("relations", None) or ()):
+            rel = triple_from_resource_relations(uuid, rrel)
+            rows.append((doc_id, pos) + tuple(rel) + (rrel[RR_ROLE],))
+        self._conn.executemany(
+            "INSERT INTO relations"
+            " (doc_id, pos, subject, predicate, object, role)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            rows,
+        )
+
+    def delete(self, id_=None, idlist=None, filter_dict=None, internal_ids=False):
+        """Delete one or more resources with given identifiers.
+
+        Args:
+            id_ (Union[str,int]): If given, delete this id.
+            idlist (list): If given, delete ids in this list
+            filter_dict (dict): If given, perform a search and
+                           delete ids it finds.
+            internal_ids (bool): If True, treat identifiers as numeric
+                (internal) identifiers. Otherwise treat them as
+                resource (string) indentifiers.
+        Returns:
+            None
+        """
+        if internal_ids:
+            doc_ids = idlist if idlist else [id_]
+        else:
+            ID = Resource.ID_FIELD
+            if filter_dict:
+                cond = filter_dict
+            elif id_:
+                cond = {ID: id_}
+            elif idlist:
+                cond = {ID: [idlist]}
+            else:
+                return
+            doc_ids = list(self.find(cond, id_only=True))
+        rows = [(doc_id,) for doc_id in doc_ids]
+        with self._conn:
+            self._conn.executemany("DELETE FROM resources WHERE doc_id = ?", rows)
+            self._conn.executemany(
+                "DELETE FROM resource_values WHERE doc_id = ?", rows
+            )
+            self._conn.executemany("DELETE FROM relations WHERE doc_id = ?", rows)
+
+    def update(self, id_, new_dict):
+        """Update the identified resource with new values.
+
+        Args:
+            id_ (int): Identifier of resource to update
+            new_dict (dict): New dictionary of resource values
+        Returns:
+            None
+        Raises:
+            ValueError: If new resource is of wrong type
+            KeyError: If old resource is not found
+        """
+        row = self._conn.execute(
+            "SELECT doc_id, value FROM resources WHERE id_ = ?", (id_,)
+        ).fetchone()
+        if row is None:
+            raise errors.NoSuchResourceError(id_=id_)
+        doc_id, value = row[0], json.loads(row[1])
+        T = Resource.TYPE_FIELD
+        if value[T] != new_dict[T]:
+            raise ValueError(
+                'New resource type="{}" does not '
+                'match current resource type "{}"'.format(new_dict[T], value[T])
+            )
+        value.update(new_dict)
+        with self._conn:
+            self._conn.execute(
+                "UPDATE resources SET id_ = ?, type = ?, created = ?,"
+                " modified = ?, value = ? WHERE doc_id = ?",
+                self._row_values(value) + (doc_id,),
+            )
+            self._conn.execute(
+                "DELETE FROM resource_values WHERE doc_id = ?", (doc_id,)
+            )
+            self._insert_list_values(doc_id, value)
+            self._conn.execute("DELETE FROM relations WHERE doc_id = ?", (doc_id,))
+            self._insert_relations(doc_id, value)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _regex_literal_prefix(pattern):
+    """Characters that any string matched by the regex must start with."""
+    m = re.match(r"\^?([\w\- ]*)", pattern)
+    prefix = m.group(1)
+    rest = pattern[m.end():]
+    # a quantifier makes the last literal character optional
+    if rest and rest[0] in "*?{":
+        prefix = prefix[:-1]
+    # with alternatives, no common prefix is known
+    if "|" in pattern:
+        prefix = ""
+    return prefix
+
+
+#: File extensions of databases opened with :class:`SQLiteResourceDB`
+SQLITE_EXTENSIONS = (".sqlite", ".sqlite3", ".db")
+
+
+def connect(dbfile):
+    """Open the resource database in a file, with the implementation
+    for its extension: :class:`SQLiteResourceDB` for the extensions in
+    `SQLITE_EXTENSIONS`, otherwise :class:`ResourceDB`.
+
+    Args:
+        dbfile (str): DB location
+
+    Returns:
+        ResourceDB: The database
+    """
+    _, ext = os.path.splitext(str(dbfile))
+    if ext.lower() in SQLITE_EXTENSIONS:
+        return SQLiteResourceDB(dbfile)
+    return ResourceDB(dbfile)
+
+
+def migrate(src, dst):
+    """Copy all resources from one database into another, in order.
+
+    Args:
+        src (ResourceDB): Database to copy from
+        dst (ResourceDB): Database to copy into, e.g. a new SQLiteResourceDB
+
+    Returns:
+        int: Number of resources copied
+
+    Raises:
+        errors.DuplicateResourceError: If any resource is already in `dst`.
+            In this case, no resources are copied.
+    """
+    resources = [Resource(value=value) for value in src._documents()]
+    dst.put_many(resources)
+    return len(resources)
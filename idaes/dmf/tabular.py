@@ -18,7 +18,10 @@ import abc
 import csv
 import json
 import logging
+import os
 import re
+import shutil
+import tempfile
 # third-party
 import jsonschema
 try:
@@ -348,6 +351,15 @@ class TabularData(object):
     """
     embedded_units = r'(.*)\((.*)\)'
 
+    #: Default number of rows in each batch read by :meth:`iter_csv`
+    CHUNK_SIZE = 100000
+    #: Suffix of the names of error fields in arrays of CSV data
+    error_suffix = ' error'
+    #: Suffix added to the path of a CSV file for its cache directory
+    cache_suffix = '.cache'
+    _cache_meta_file = 'meta.json'
+    _cache_dtype = '<f8'
+
     _validator = jsonschema.Draft4Validator(COLUMN_SCHEMA)
 
     def __init__(self, data, error_column=False):
@@ -578,6 +590,252 @@ class TabularData(object):
         obj = TabularData(data, error_column=error_column)
         return obj
 
+    @classmethod
+    def iter_csv(cls, file_or_path, error_column=False, columns=None,
+                 chunk_size=None):
+        """Read CSV data in batches of rows, without reading the whole
+        file into memory.
+
+        The format of the file is the same as for :meth:`from_csv`.
+        Unlike :meth:`from_csv`, the length of each row is not checked:
+        missing values are NaN, and values beyond the last column in the
+        header are ignored.
+
+        Args:
+            file_or_path (file-like or str): Input file
+            error_column (bool): If True, look for an error column after each
+                           value column. Otherwise, all columns are
+                           assumed to be values.
+            columns (list[str]): If given, only read the columns with these
+                           names (without units), in this order.
+            chunk_size (int): Number of rows in each batch. The default
+                           is `CHUNK_SIZE`.
+
+        Returns:
+            generator of numpy.ndarray: Structured arrays with a float field
+            for each column, named by the column name, and with error
+            columns in fields named by :meth:`error_field`.
+
+        Raises:
+            ImportError: If `pandas` or `numpy` were never
+                successfully imported.
+            ValueError: Bad header
+            KeyError: No column by one of the names in `columns`
+        """
+        cls._check_pandas_import()
+        input_file = get_file(file_or_path)
+        try:
+            header = next(csv.reader(input_file), None)
+            if header is None:
+                raise ValueError('No header in CSV file')
+            fields, _ = cls._csv_fields(header, error_column, columns)
+            dtype = np.dtype([(name, np.float64) for name, _ in fields])
+            try:
+                reader = pd.read_csv(input_file, header=None,
+                                     usecols=[pos for _, pos in fields],
+                                     dtype=np.float64,
+                                     chunksize=chunk_size or cls.CHUNK_SIZE)
+            except pd.errors.EmptyDataError:
+                return  # no rows
+            for df in reader:
+                batch = np.empty(len(df), dtype=dtype)
+                for name, pos in fields:
+                    batch[name] = df[pos].to_numpy()
+                yield batch
+        finally:
+            if input_file is not file_or_path:
+                input_file.close()
+
+    @classmethod
+    def error_field(cls, name):
+        """Name of the field with the errors for a column in the arrays from
+        :meth:`iter_csv` and :meth:`load_csv`.
+        """
+        return name + cls.error_suffix
+
+    @classmethod
+    def _csv_fields(cls, header, error_column, columns):
+        """Get the fields (name, position in row) for the selected columns
+        of a CSV file, and the parsed header (see `_parse_csv_headers`).
+        """
+        names, data = cls._parse_csv_headers(header, error_column=error_column)
+        column_step = 2 if error_column else 1
+        if columns is None:
+            columns = names
+        fields = []
+        for name in columns:
+            try:
+                i = names.index(name)
+            except ValueError:
+                raise KeyError('Bad column name "{}", not in ({})'.format(
+                    name, ', '.join(names)))
+            pos = 1 + i * column_step
+            fields.append((name, pos))
+            if error_column:
+                fields.append((cls.error_field(name), pos + 1))
+        return fields, data
+
+    @classmethod
+    def load_csv(cls, path, error_column=False, columns=None, cache=True,
+                 cache_dir=None, chunk_size=None):
+        """Load the columns of a CSV file as arrays, using a binary cache.
+
+        The first time a file is loaded, all its columns are read in batches
+        with :meth:`iter_csv` and written to a cache directory, with one
+        file of float64 values per column. After that, and until the CSV
+        file is changed, the arrays are memory-mapped from the cache files
+        and the CSV file is not read.
+
+        Args:
+            path (str): Input file
+            error_column (bool): See :meth:`iter_csv`
+            columns (list[str]): If given, only return these columns
+            cache (bool): If False, do not use or create the cache
+            cache_dir (str): Cache directory, by default the path of the CSV
+                           file plus `cache_suffix`
+            chunk_size (int): See :meth:`iter_csv`
+
+        Returns:
+            dict: Arrays of values, keyed by column name, in the order of
+            `columns` or of the file. Error columns are included as for
+            :meth:`iter_csv`.
+
+        Raises:
+            ImportError: If `pandas` or `numpy` were never
+                successfully imported.
+            ValueError: Bad header
+            KeyError: No column by one of the names in `columns`
+        """
+        if not cache:
+            batches = list(cls.iter_csv(path, error_column=error_column,
+                                        columns=columns,
+                                        chunk_size=chunk_size))
+            if batches:
+                arr = np.concatenate(batches)
+            else:
+                arr = np.empty(0, dtype=cls._csv_dtype(path, error_column,
+                                                       columns))
+            return {name: arr[name] for name in arr.dtype.names}
+        path = str(path)
+        if cache_dir is None:
+            cache_dir = path + cls.cache_suffix
+        meta = cls._read_cache_meta(path, cache_dir, error_column)
+        if meta is None:
+            try:
+                meta = cls._write_cache(path, cache_dir, error_column,
+                                        chunk_size)
+            except OSError as err:
+                _log.warning('Cannot create cache "{}", loading without it: '
+                             '{}'.format(cache_dir, err))
+                return cls.load_csv(path, error_column=error_column,
+                                    columns=columns, cache=False,
+                                    chunk_size=chunk_size)
+        # map the requested fields
+        files = {f['name']: f['file'] for f in meta['fields']}
+        if columns is None:
+            names = [c[Fields.DATA_NAME] for c in meta['columns']]
+        else:
+            names = columns
+        result = {}
+        for name in names:
+            if name not in files:
+                raise KeyError('Bad column name "{}", not in ({})'.format(
+                    name, ', '.join(c[Fields.DATA_NAME]
+                                    for c in meta['columns'])))
+            field_names = [name]
+            if error_column:
+                field_names.append(cls.error_field(name))
+            for field in field_names:
+                if meta['rows'] == 0:
+                    result[field] = np.empty(0, dtype=np.float64)
+                else:
+                    result[field] = np.memmap(
+                        os.path.join(cache_dir, files[field]),
+                        dtype=cls._cache_dtype, mode='r',
+                        shape=(meta['rows'],))
+        return result
+
+    @classmethod
+    def _csv_dtype(cls, path, error_column, columns):
+        with open(path) as f:
+            header = next(csv.reader(f), None)
+        if header is None:
+            raise ValueError('No header in CSV file')
+        fields, _ = cls._csv_fields(header, error_column, columns)
+        return np.dtype([(name, np.float64) for name, _ in fields])
+
+    @staticmethod
+    def _source_info(path):
+        st = os.stat(path)
+        return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    @classmethod
+    def _read_cache_meta(cls, path, cache_dir, error_column):
+        """Get the metadata of the cache for a CSV file, or None if there is
+        no cache or it is out of date.
+        """
+        meta_path = os.path.join(cache_dir, cls._cache_meta_file)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (IOError, ValueError):
+            return None
+        if (meta.get('source') != cls._source_info(path) or
+                meta.get('error_column') != bool(error_column)):
+            _log.debug('cache "{}" is out of date'.format(cache_dir))
+            return None
+        return meta
+
+    @classmethod
+    def _write_cache(cls, path, cache_dir, error_column, chunk_size):
+        """Read all columns of a CSV file into a new cache directory, which
+        replaces any existing one.
+
+        Returns:
+            dict: Metadata of the cache
+        """
+        cls._check_pandas_import()
+        _log.info('creating cache "{}" for CSV file "{}"'.format(
+            cache_dir, path))
+        source = cls._source_info(path)
+        parent = os.path.dirname(os.path.abspath(cache_dir))
+        tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.cache-')
+        try:
+            with open(path) as f:
+                header = next(csv.reader(f), None)
+            if header is None:
+                raise ValueError('No header in CSV file')
+            fields, data = cls._csv_fields(header, error_column, None)
+            meta_fields = [{'name': name, 'file': '{:d}.f8'.format(i)}
+                           for i, (name, _) in enumerate(fields)]
+            files = [open(os.path.join(tmp_dir, f['file']), 'wb')
+                     for f in meta_fields]
+            rows = 0
+            try:
+                for batch in cls.iter_csv(path, error_column=error_column,
+                                          chunk_size=chunk_size):
+                    for fp, f in zip(files, meta_fields):
+                        fp.write(batch[f['name']].astype(cls._cache_dtype)
+                                 .tobytes())
+                    rows += len(batch)
+            finally:
+                for fp in files:
+                    fp.close()
+            columns = [{k: c[k] for k in (Fields.DATA_NAME, Fields.DATA_UNITS,
+                                          Fields.DATA_ERRTYPE)}
+                       for c in data]
+            meta = {'source': source, 'error_column': bool(error_column),
+                    'rows': rows, 'columns': columns, 'fields': meta_fields}
+            with open(os.path.join(tmp_dir, cls._cache_meta_file), 'w') as f:
+                json.dump(meta, f)
+            if os.path.exists(cache_dir):
+                shutil.rmtree(cache_dir)
+            os.rename(tmp_dir, cache_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return meta
+
     @classmethod
     def _parse_csv_headers(cls, headers, error_column=None):
         """Parse a row of CSV headers which are pairs
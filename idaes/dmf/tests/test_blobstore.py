@@ -0,0 +1,137 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for idaes.dmf.blobstore module
+"""
+import hashlib
+import logging
+import os
+
+import pytest
+
+from idaes.dmf.blobstore import BlobStore
+
+__author__ = "Dan Gunter"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(str(tmp_path / "blobs"))
+
+
+def make_file(path, content):
+    path.write_bytes(content)
+    return str(path)
+
+
+@pytest.mark.unit
+def test_add(store, tmp_path):
+    content = os.urandom(3 * BlobStore.BLOCK_SIZE + 17)
+    src = make_file(tmp_path / "a.bin", content)
+    digest = store.add(src)
+    assert digest == hashlib.sha1(content).hexdigest()
+    assert digest in store
+    with open(store.path(digest), "rb") as f:
+        assert f.read() == content
+    assert store.refcount(digest) == 0
+    # same content again
+    assert store.add(make_file(tmp_path / "b.bin", content)) == digest
+    assert os.listdir(store.root) == [digest[:2]]
+    # a wrong known hash is ignored if there is no such content
+    assert store.add(src, digest="0" * 40) == digest
+    with pytest.raises(IOError):
+        store.add(str(tmp_path / "missing"))
+    assert os.listdir(store.root) == [digest[:2]]
+
+
+@pytest.mark.unit
+def test_add_known_digest(store, tmp_path, monkeypatch, caplog):
+    content = os.urandom(1000)
+    src = make_file(tmp_path / "a.bin", content)
+    digest = store.add(src)
+    hashed = []
+    monkeypatch.setattr(
+        BlobStore, "hash_file", classmethod(lambda cls, p: hashed.append(p))
+    )
+    # the same unchanged file is not hashed again
+    assert store.add(src, digest=digest) == digest
+    assert hashed == []
+    monkeypatch.undo()
+    # a file with the same size and modification time as stored content
+    # is still hashed, and a wrong known hash is reported
+    other = bytes(len(content))
+    path = make_file(tmp_path / "b.bin", other)
+    st = os.stat(src)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+    monkeypatch.setattr(logging.getLogger("idaes.dmf"), "propagate", True)
+    with caplog.at_level(logging.WARNING, logger="idaes.dmf.blobstore"):
+        assert store.add(path, digest=digest) == hashlib.sha1(other).hexdigest()
+    assert "does not match" in caplog.text
+
+
+@pytest.mark.unit
+def test_link_unlink(store, tmp_path):
+    digest = store.add(make_file(tmp_path / "a.txt", b"abc"))
+    dests = [str(tmp_path / f"copy{i}.txt") for i in range(3)]
+    for dest in dests:
+        assert store.link(digest, dest)
+    assert store.refcount(digest) == 3
+    # replace an existing file
+    make_file(tmp_path / "other.txt", b"other")
+    assert store.link(digest, str(tmp_path / "other.txt"))
+    assert (tmp_path / "other.txt").read_bytes() == b"abc"
+    assert store.refcount(digest) == 4
+    # a file that is not a link is left alone
+    assert not store.unlink(digest, str(tmp_path / "a.txt"))
+    assert (tmp_path / "a.txt").exists()
+    for i, dest in enumerate(dests):
+        assert store.unlink(digest, dest)
+        assert not os.path.exists(dest)
+    assert digest in store
+    assert store.unlink(digest, str(tmp_path / "other.txt"))
+    assert digest not in store
+    assert not os.path.exists(os.path.dirname(store.path(digest)))
+    assert not store.release(digest)
+
+
+@pytest.mark.unit
+def test_link_copy(store, tmp_path, monkeypatch):
+    def no_link(src, dst):
+        raise OSError("Invalid cross-device link")
+
+    monkeypatch.setattr(os, "link", no_link)
+    digest = store.add(make_file(tmp_path / "a.txt", b"abc"))
+    dest = str(tmp_path / "copy.txt")
+    assert not store.link(digest, dest)
+    with open(dest, "rb") as f:
+        assert f.read() == b"abc"
+    # nothing links to the stored content, so it is not kept
+    assert digest not in store
+    assert not store.unlink(digest, dest)
+
+
+@pytest.mark.unit
+def test_add_again(store, tmp_path, monkeypatch):
+    src = tmp_path / "a.txt"
+    digest = store.add(make_file(src, b"abc"))
+
+    def no_hash(filepath):
+        assert False, "file should not be hashed"
+
+    monkeypatch.setattr(store, "hash_file", no_hash)
+    assert store.add(str(src)) == digest
+    monkeypatch.undo()
+    # a changed file is hashed again
+    src.write_bytes(b"abcd")
+    os.utime(src, ns=(0, 0))
+    assert store.add(str(src)) == hashlib.sha1(b"abcd").hexdigest()
@@ -32,6 +32,7 @@ import pytest
 from idaes.dmf import resource
 from idaes.dmf import errors
 from idaes.dmf.dmfbase import DMFConfig, DMF
+from idaes.dmf.tabular import TabularData
 from idaes.util.system import NamedTemporaryFile
 from .util import init_logging
 
@@ -417,6 +418,72 @@ def test_dmf_remove_filter():
     assert dmf.count() == 0
 
 
+@pytest.mark.unit
+def test_dmf_shared_datafiles(tmp_path):
+    dmf = DMF(path=tmp_path / "ws", create=True)
+    data = tmp_path / "plant.csv"
+    data.write_text("t,x\n0,1\n1,2\n")
+    other = tmp_path / "other.csv"
+    other.write_text("t,y\n0,3\n")
+    rsrcs = []
+    for i in range(3):
+        r = resource.Resource(value={"desc": f"experiment {i}"})
+        r.data = {"i": i}
+        r.v["datafiles"].append({"path": str(data), "do_copy": True})
+        if i == 0:
+            r.v["datafiles"].append({"path": str(other), "do_copy": True})
+        dmf.add(r)
+        rsrcs.append(r)
+    digest = rsrcs[0].v["datafiles"][0]["sha1"]
+    assert all(r.v["datafiles"][0]["sha1"] == digest for r in rsrcs)
+    # one stored copy of the shared content, linked from each resource
+    assert dmf._blobs.refcount(digest) == 3
+    paths = [list(r.get_datafiles())[0] for r in rsrcs]
+    assert len({p.parent for p in paths}) == 3
+    assert all(p.name == "plant.csv" for p in paths)
+    assert all(p.read_text() == data.read_text() for p in paths)
+    # removing resources removes their datafiles, and the stored content
+    # once it is no longer used
+    other_digest = rsrcs[0].v["datafiles"][1]["sha1"]
+    TabularData.load_csv(str(paths[0]))
+    dmf.remove(identifier=rsrcs[0].id)
+    assert not paths[0].exists() and not paths[0].parent.exists()
+    assert other_digest not in dmf._blobs
+    assert dmf._blobs.refcount(digest) == 2
+    assert paths[1].read_text() == data.read_text()
+    dmf.remove(filter_dict={"data.i": {"$ge": 1}})
+    assert digest not in dmf._blobs
+    assert not any(p.exists() for p in paths)
+
+
+@pytest.mark.unit
+def test_dmf_datafile_known_hash(tmp_path):
+    dmf = DMF(path=tmp_path / "ws", create=True)
+    data = tmp_path / "state.json"
+    data.write_text("{}")
+    r1 = resource.Resource(value={"desc": "first"})
+    r1.v["datafiles"].append({"path": str(data), "do_copy": True})
+    dmf.add(r1)
+    digest = r1.v["datafiles"][0]["sha1"]
+    r2 = resource.Resource(value={"desc": "second"})
+    r2.v["datafiles"].append({"path": str(data), "do_copy": True, "sha1": digest})
+    dmf.add(r2)
+    assert list(r2.get_datafiles())[0].read_text() == "{}"
+    assert dmf._blobs.refcount(digest) == 2
+    # a stale hash is not trusted, even if the file has the same size and
+    # modification time as the stored content
+    other = tmp_path / "other.json"
+    other.write_text("[]")
+    st = os.stat(data)
+    os.utime(other, ns=(st.st_atime_ns, st.st_mtime_ns))
+    r3 = resource.Resource(value={"desc": "third"})
+    r3.v["datafiles"].append({"path": str(other), "do_copy": True, "sha1": digest})
+    dmf.add(r3)
+    assert r3.v["datafiles"][0]["sha1"] != digest
+    assert list(r3.get_datafiles())[0].read_text() == "[]"
+    assert dmf._blobs.refcount(digest) == 2
+
+
 @pytest.mark.component
 def test_dmf_find():
     tmp_dir = Path(scratch_dir) / "dmf_find"
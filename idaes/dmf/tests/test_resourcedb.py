@@ -0,0 +1,267 @@
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Tests for idaes.dmf.resourcedb module, with both database implementations.
+"""
+# stdlib
+from datetime import datetime
+import logging
+import re
+
+# third-party
+from click.testing import CliRunner
+import pytest
+
+# package
+from idaes.dmf import cli, errors, resource, resourcedb
+from idaes.dmf.dmfbase import DMF, DMFConfig
+from .util import init_logging
+
+__author__ = "Dan Gunter"
+
+init_logging()
+_log = logging.getLogger(__name__)
+
+NUM_RESOURCES = 20
+
+
+def make_resources(num=NUM_RESOURCES):
+    resources = []
+    for i in range(num):
+        type_ = resource.ResourceTypes.data if i % 2 else resource.ResourceTypes.code
+        r = resource.Resource(value={"desc": f"resource {i}"}, type_=type_)
+        r.v["tags"] = ["all", f"mod3-{i % 3}"]
+        r.v["aliases"] = [f"name{i}", f"alias{i}"]
+        r.v["created"] = 1000.0 + i
+        r.data = {"i": i, "even": i % 2 == 0}
+        resources.append(r)
+    for r1, r2 in zip(resources[:-1], resources[1:]):
+        resource.create_relation(r1, resource.Predicates.uses, r2)
+    return resources
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def rdb(request, tmp_path):
+    db = resourcedb.connect(str(tmp_path / f"resourcedb.{request.param}"))
+    db.put_many(make_resources())
+    return db
+
+
+@pytest.mark.unit
+def test_connect(tmp_path):
+    assert type(resourcedb.connect(str(tmp_path / "a.json"))) is resourcedb.ResourceDB
+    for ext in resourcedb.SQLITE_EXTENSIONS:
+        db = resourcedb.connect(str(tmp_path / f"a{ext}"))
+        assert type(db) is resourcedb.SQLiteResourceDB
+
+
+# Filters, and the values of data.i of the resources they should find
+FILTERS = [
+    ({}, list(range(NUM_RESOURCES))),
+    ({"type": resource.ResourceTypes.code}, list(range(0, NUM_RESOURCES, 2))),
+    ({"tags": ["mod3-0"]}, list(range(0, NUM_RESOURCES, 3))),
+    ({"tags": ["mod3-0", "mod3-1"]}, [i for i in range(NUM_RESOURCES) if i % 3 < 2]),
+    ({"tags!": ["all", "mod3-2"]}, list(range(2, NUM_RESOURCES, 3))),
+    ({"tags!": ["mod3-1", "mod3-2"]}, []),
+    ({"aliases": ["alias5"]}, [5]),
+    ({"created": {"$ge": 1010.0, "$lt": 1012}}, [10, 11]),
+    ({"created": {"$ne": 1000.0}, "data.i": {"$le": 2}}, [1, 2]),
+    ({"created": datetime.fromtimestamp(1003.0)}, [3]),
+    ({"data.i": {"$gt": 16}}, [17, 18, 19]),
+    ({"data.even": "@true", "tags": ["mod3-0"]}, [0, 6, 12, 18]),
+    ({"desc": "~resource 1[0-2]$"}, [10, 11, 12]),
+    ({"type": "~co"}, list(range(0, NUM_RESOURCES, 2))),
+    ({"sources": True}, []),
+    ({"codes": True}, list(range(0, NUM_RESOURCES, 2))),
+    ({"codes": False, "aliases": ["name3", "name4"]}, [3]),
+]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("filter_dict,expected", FILTERS)
+def test_find(rdb, filter_dict, expected):
+    found = [r.data["i"] for r in rdb.find(filter_dict)]
+    assert found == expected
+    doc_ids = list(rdb.find(filter_dict, id_only=True))
+    assert [rdb.get(i).data["i"] for i in doc_ids] == expected
+
+
+@pytest.mark.unit
+def test_find_id(rdb):
+    r = rdb.find_one({"data.i": 7})
+    assert rdb.find_one({resource.Resource.ID_FIELD: r.id}).id == r.id
+    prefix = r.id[:8].upper()
+    found = list(rdb.find({resource.Resource.ID_FIELD: f"~{prefix}[a-z]*"},
+                          flags=re.IGNORECASE))
+    assert [f.id for f in found] == [r.id]
+
+
+@pytest.mark.unit
+def test_put_duplicate(rdb):
+    r = rdb.find_one({"data.i": 0})
+    with pytest.raises(errors.DuplicateResourceError):
+        rdb.put(r)
+    new = resource.Resource()
+    with pytest.raises(errors.DuplicateResourceError):
+        rdb.put_many([new, r])
+    # nothing was added
+    assert len(rdb) == NUM_RESOURCES
+    assert rdb.find_one({resource.Resource.ID_FIELD: new.id}) is None
+
+
+@pytest.mark.unit
+def test_update(rdb):
+    r = rdb.find_one({"data.i": 3})
+    r.v["tags"] = ["updated"]
+    r.v["aliases"] = ["renamed"]
+    r.v["data"]["i"] = 100
+    rdb.update(r.id, r.v)
+    assert rdb.find_one({"tags": ["updated"]}).id == r.id
+    assert rdb.find_one({"aliases": ["renamed"]}).id == r.id
+    assert rdb.find_one({"aliases": ["name3"]}) is None
+    assert [x.id for x in rdb.find({"data.i": {"$ge": 100}})] == [r.id]
+    r.v["type"] = resource.ResourceTypes.other
+    with pytest.raises(ValueError):
+        rdb.update(r.id, r.v)
+    with pytest.raises(errors.NoSuchResourceError):
+        rdb.update("0" * 32, r.v)
+
+
+@pytest.mark.unit
+def test_delete(rdb):
+    rdb.delete(filter_dict={"data.i": {"$lt": 5}})
+    assert len(rdb) == NUM_RESOURCES - 5
+    r = rdb.find_one({"data.i": 5})
+    rdb.delete(id_=r.id)
+    doc_ids = list(rdb.find({"tags": ["mod3-0"]}, id_only=True))
+    rdb.delete(idlist=doc_ids, internal_ids=True)
+    assert [x.data["i"] for x in rdb.find({})] == [
+        i for i in range(6, NUM_RESOURCES) if i % 3
+    ]
+    assert rdb.find_one({"tags": ["mod3-0"]}) is None
+
+
+@pytest.mark.unit
+def test_find_related(rdb):
+    start = rdb.find_one({"data.i": 0})
+    related = list(rdb.find_related(start.id, meta=["aliases"], maxdepth=3))
+    assert [depth for depth, _, _ in related] == [1, 2, 3]
+    assert [meta["aliases"][0] for _, _, meta in related] == [
+        "name1",
+        "name2",
+        "name3",
+    ]
+    related = list(rdb.find_related(start.id, meta=["aliases"],
+                                    filter_dict={"data.i": {"$lt": 3}}))
+    assert len(related) == 2
+
+
+@pytest.mark.unit
+def test_find_related_incoming(rdb):
+    end = rdb.find_one({"data.i": NUM_RESOURCES - 1})
+    related = list(rdb.find_related(end.id, meta=["aliases"], outgoing=False))
+    assert [depth for depth, _, _ in related] == list(range(1, NUM_RESOURCES))
+    assert [meta["aliases"][0] for _, _, meta in related] == [
+        f"name{i}" for i in range(NUM_RESOURCES - 2, -1, -1)
+    ]
+    rel = related[0][1]
+    assert rel.predicate == resource.Predicates.uses
+    assert rel.object == end.id
+    assert list(rdb.find_related(end.id, meta=["aliases"])) == []
+
+
+@pytest.mark.unit
+def test_find_related_modified(rdb):
+    r0, r1, r2 = [rdb.find_one({"data.i": i}) for i in range(3)]
+    # relations added to existing resources are followed
+    new = resource.Resource(value={"desc": "new", "aliases": ["new"]})
+    resource.create_relation(r1, resource.Predicates.derived, new)
+    rdb.put(new)
+    rdb.update(r1.id, r1.v)
+    related = list(rdb.find_related(r0.id, meta=["aliases"], maxdepth=2))
+    assert [(d, rel.predicate, m["aliases"][0]) for d, rel, m in related] == [
+        (1, resource.Predicates.uses, "name1"),
+        (2, resource.Predicates.uses, "name2"),
+        (2, resource.Predicates.derived, "new"),
+    ]
+    # a deleted resource ends the chain
+    rdb.delete(id_=r2.id)
+    related = list(rdb.find_related(r0.id, meta=["aliases"]))
+    assert [m["aliases"][0] for _, _, m in related] == ["name1", "new"]
+
+
+@pytest.mark.unit
+def test_sqlite_relations_upgrade(tmp_path):
+    path = str(tmp_path / "resourcedb.sqlite")
+    db = resourcedb.SQLiteResourceDB(path)
+    db.put_many(make_resources())
+    # make it look like a database created before the relations table
+    with db._conn:
+        db._conn.execute("DELETE FROM relations")
+        db._conn.execute("PRAGMA user_version = 0")
+    db.close()
+    db = resourcedb.SQLiteResourceDB(path)
+    start = db.find_one({"data.i": 0})
+    assert len(list(db.find_related(start.id, meta=["aliases"]))) == NUM_RESOURCES - 1
+    n = db._conn.execute("SELECT COUNT(*) FROM relations").fetchone()[0]
+    assert n == 2 * (NUM_RESOURCES - 1)
+    db.close()
+
+
+@pytest.mark.unit
+def test_migrate(tmp_path):
+    src = resourcedb.connect(str(tmp_path / "resourcedb.json"))
+    src.put_many(make_resources())
+    dst = resourcedb.connect(str(tmp_path / "resourcedb.sqlite"))
+    assert resourcedb.migrate(src, dst) == NUM_RESOURCES
+    assert [r.v for r in dst.find({})] == [r.v for r in src.find({})]
+    with pytest.raises(errors.DuplicateResourceError):
+        resourcedb.migrate(src, dst)
+    assert len(dst) == NUM_RESOURCES
+
+
+@pytest.mark.unit
+def test_dmf_migrate_db(tmp_path):
+    dmf = DMF(path=str(tmp_path / "ws"), create=True)
+    for r in make_resources(5):
+        dmf.add(r)
+    with pytest.raises(ValueError):
+        dmf.migrate_db("resourcedb.yaml")
+    assert dmf.migrate_db() == 5
+    assert dmf.db_file == "resourcedb.sqlite"
+    with pytest.raises(errors.DMFError):
+        dmf.migrate_db()
+    # the new database is used when the workspace is opened again
+    dmf = DMF(path=str(tmp_path / "ws"))
+    assert isinstance(dmf._db, resourcedb.SQLiteResourceDB)
+    assert dmf.count() == 5
+    r = dmf.find_one({"data.i": 2})
+    dmf.remove(identifier=r.id)
+    assert [x.data["i"] for x in dmf.find()] == [0, 1, 3, 4]
+
+
+@pytest.mark.unit
+def test_cli_migrate_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(DMFConfig, "_filename", str(tmp_path / ".dmf"))
+    wspath = tmp_path / "ws"
+    dmf = DMF(path=str(wspath), create=True, save_path=True)
+    for r in make_resources(3):
+        dmf.add(r)
+    runner = CliRunner()
+    result = runner.invoke(cli.migrate_db, ["--db-file", "rsrc.db"])
+    assert result.exit_code == 0, result.output
+    assert "3 resources" in result.output
+    assert (wspath / "rsrc.db").exists()
+    assert DMF(path=str(wspath)).db_file == "rsrc.db"
+    result = runner.invoke(cli.migrate_db, ["--db-file", "rsrc.db"])
+    assert result.exit_code == cli.Code.DMF_OPER.value
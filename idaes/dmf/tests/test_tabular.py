@@ -23,6 +23,7 @@ from io import StringIO
 import sys
 
 # third-party
+import numpy as np
 import pytest
 
 # package-local
@@ -345,8 +346,8 @@ def test_errors_dataframe(tabdata2):
 
 
 @pytest.mark.unit
-def test_td_dataframe_nopandas(tabdata):
-    tabular.pd = None
+def test_td_dataframe_nopandas(tabdata, monkeypatch):
+    monkeypatch.setattr(tabular, "pd", None)
     with pytest.raises(ImportError):
         df = tabdata.values_dataframe()
 
@@ -382,6 +383,92 @@ def test_td_csv_short():
         tabular.TabularData.from_csv(infile)
 
 
+def make_csv(path, nrows):
+    lines = ["ID,V1 (g/cm^3),Absolute Error,V2 (m/s),Relative Error"]
+    for i in range(nrows):
+        v2 = "" if i % 7 == 3 else f"{2 * i}"
+        lines.append(f"{i},{i / 10},0.01,{v2},{i / 1000}")
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+@pytest.mark.unit
+def test_td_iter_csv(tmp_path):
+    path = make_csv(tmp_path / "data.csv", 25)
+    batches = list(tabular.TabularData.iter_csv(str(path), chunk_size=10))
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert batches[0].dtype.names == ("V1", "Absolute Error", "V2", "Relative Error")
+    td = tabular.TabularData.from_csv(str(path))
+    for name in td.names():
+        values = np.concatenate([b[name] for b in batches])
+        np.testing.assert_array_equal(values, td.get_column(name).values)
+    # with error columns, and column projection
+    with path.open() as f:
+        batches = list(
+            tabular.TabularData.iter_csv(f, error_column=True, columns=["V2"])
+        )
+    err = tabular.TabularData.error_field("V2")
+    assert len(batches) == 1
+    assert batches[0].dtype.names == ("V2", err)
+    td = tabular.TabularData.from_csv(str(path), error_column=True)
+    np.testing.assert_array_equal(batches[0]["V2"], td.get_column("V2").values)
+    np.testing.assert_array_equal(batches[0][err], td.get_column("V2").errors)
+    with pytest.raises(KeyError):
+        list(tabular.TabularData.iter_csv(str(path), columns=["V3"]))
+    with pytest.raises(ValueError):
+        list(tabular.TabularData.iter_csv(StringIO("")))
+    # header only
+    assert list(tabular.TabularData.iter_csv(StringIO(ex_data2_csv[0]))) == []
+
+
+@pytest.mark.unit
+def test_td_load_csv(tmp_path, monkeypatch):
+    path = make_csv(tmp_path / "data.csv", 25)
+    td = tabular.TabularData.from_csv(str(path), error_column=True)
+    expected = {}
+    for name in td.names():
+        expected[name] = td.get_column(name).values
+        expected[tabular.TabularData.error_field(name)] = td.get_column(name).errors
+    for cache in (False, True):
+        arrays = tabular.TabularData.load_csv(
+            str(path), error_column=True, cache=cache, chunk_size=10
+        )
+        assert list(arrays) == list(expected)
+        for name, values in expected.items():
+            np.testing.assert_array_equal(arrays[name], values)
+    cache_dir = str(path) + tabular.TabularData.cache_suffix
+    assert os.path.isdir(cache_dir)
+    # the cache is used, and the file is not read again
+    def no_read(*args, **kwargs):
+        assert False, "CSV file should not be read"
+
+    monkeypatch.setattr(tabular.TabularData, "iter_csv", no_read)
+    arrays = tabular.TabularData.load_csv(str(path), error_column=True, columns=["V2"])
+    assert list(arrays) == ["V2", "V2 error"]
+    assert isinstance(arrays["V2"], np.memmap)
+    np.testing.assert_array_equal(arrays["V2"], expected["V2"])
+    with pytest.raises(KeyError):
+        tabular.TabularData.load_csv(str(path), error_column=True, columns=["V3"])
+    monkeypatch.undo()
+    # a changed file, or different options, replace the cache
+    make_csv(path, 30)
+    os.utime(path, ns=(0, 0))
+    arrays = tabular.TabularData.load_csv(str(path), columns=["V1"])
+    assert list(arrays) == ["V1"]
+    assert len(arrays["V1"]) == 30
+    assert sorted(os.listdir(tmp_path)) == ["data.csv", "data.csv.cache"]
+
+
+@pytest.mark.unit
+def test_td_load_csv_empty(tmp_path):
+    path = tmp_path / "empty.csv"
+    path.write_text(ex_data2_csv[0] + "\n")
+    for cache in (False, True):
+        arrays = tabular.TabularData.load_csv(str(path), cache=cache)
+        assert list(arrays) == ["V1", "Absolute Error", "V2", "Relative Error"]
+        assert all(len(a) == 0 for a in arrays.values())
+
+
 # class: Table
 
 
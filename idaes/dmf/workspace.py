@@ -93,6 +93,12 @@ class Workspace(object):
          +- resourcedb.json: Resource metadata "database" (uses TinyDB)
          +- files: Data files for all resources
 
+    The resource metadata may instead be in an SQLite database file, such as
+    ``resourcedb.sqlite``, which is faster to search for workspaces with
+    many resources. The database file is set by ``db_file`` in the
+    configuration file, and an existing workspace can be converted with
+    the ``dmf migrate-db`` command.
+
     The configuration file is a `YAML`_ formatted file
 
     .. _YAML: http://www.yaml.org/
@@ -32,7 +32,11 @@ from idaes.core.util.model_statistics import (degrees_of_freedom,
 from idaes.core.util import get_solver
 
 from idaes.generic_models.properties.core.generic.generic_property import (
-        GenericParameterBlock)
+        GenericParameterBlock,
+        _initialize_bubble_dew,
+        _initialize_bubble_dew_block)
+from idaes.generic_models.properties.core.generic.utility import (
+        get_array_method)
 
 from idaes.generic_models.properties.core.state_definitions import FTPx
 from idaes.generic_models.properties.core.phase_equil import SmoothVLE
@@ -290,3 +294,65 @@ class TestStateBlock(object):
     @pytest.mark.unit
     def test_report(self, model):
         model.props[1].report()
+
+
+class TestBubbleDewGuesses(object):
+    @pytest.fixture(scope="class")
+    def model(self):
+        model = ConcreteModel()
+        model.params = GenericParameterBlock(default=configuration)
+
+        model.props = model.params.build_state_block(
+                [1, 2, 3],
+                default={"defined_state": True})
+
+        # Fix state
+        for k, (T, P, x) in zip(
+                [1, 2, 3], [(368, 101325, 0.5),
+                            (350, 80000, 0.2),
+                            (390, 150000, 0.9)]):
+            model.props[k].flow_mol.fix(1)
+            model.props[k].temperature.fix(T)
+            model.props[k].pressure.fix(P)
+            model.props[k].mole_frac_comp["benzene"].fix(x)
+            model.props[k].mole_frac_comp["toluene"].fix(1-x)
+
+        return model
+
+    @pytest.mark.unit
+    def test_get_array_method(self, model):
+        assert get_array_method(
+            model.props[1], "pressure_sat_comp", "benzene") is not None
+        assert get_array_method(model.props[1], "enth_mol_ig_comp") is None
+
+    @pytest.mark.unit
+    def test_array_matches_block(self, model):
+        pp = ("Vap", "Liq")
+        comps = ["benzene", "toluene"]
+
+        _initialize_bubble_dew(model.props)
+        array_values = {}
+        for k in model.props:
+            array_values[k] = (
+                model.props[k].temperature_bubble[pp].value,
+                model.props[k].temperature_dew[pp].value,
+                [model.props[k]._mole_frac_tbub[pp, j].value for j in comps],
+                [model.props[k]._mole_frac_tdew[pp, j].value for j in comps])
+
+        for k in model.props:
+            _initialize_bubble_dew_block(model.props[k], pp, comps)
+
+            assert (model.props[k].temperature_bubble[pp].value ==
+                    pytest.approx(array_values[k][0], rel=1e-8))
+            assert (model.props[k].temperature_dew[pp].value ==
+                    pytest.approx(array_values[k][1], rel=1e-8))
+            for i, j in enumerate(comps):
+                assert (model.props[k]._mole_frac_tbub[pp, j].value ==
+                        pytest.approx(array_values[k][2][i], rel=1e-8))
+                assert (model.props[k]._mole_frac_tdew[pp, j].value ==
+                        pytest.approx(array_values[k][3][i], rel=1e-8))
+
+        # Dew point should always be above bubble point
+        for k in model.props:
+            assert (model.props[k].temperature_dew[pp].value >
+                    model.props[k].temperature_bubble[pp].value)
@@ -17,6 +17,8 @@ Framework for generic property packages
 import types
 from enum import Enum
 
+import numpy as np
+
 # Import Pyomo libraries
 from pyomo.environ import (Block,
                            Constraint,
@@ -56,7 +58,7 @@ import idaes.core.util.scaling as iscale
 from idaes.generic_models.properties.core.generic.generic_reaction import \
     equil_rxn_config
 from idaes.generic_models.properties.core.generic.utility import (
-    get_method, GenericPropertyPackageError)
+    get_method, get_array_method, GenericPropertyPackageError)
 from idaes.generic_models.properties.core.phase_equil.bubble_dew import \
     LogBubbleDew
 
@@ -1041,195 +1043,9 @@ class _GenericStateBlock(StateBlock):
 
         # ---------------------------------------------------------------------
         # If present, initialize bubble and dew point calculations
-        for k in blk.keys():
-            T_units = blk[k].params.get_metadata().default_units["temperature"]
-            # Bubble temperature initialization
-            if hasattr(blk[k], "_mole_frac_tbub"):
-                for pp in blk[k].params._pe_pairs:
-                    valid_comps = _valid_VL_component_list(blk[k], pp)
-
-                    if valid_comps == []:
-                        continue
-
-                    # Use lowest component temperature_crit as starting point
-                    # Starting high and moving down generally works better,
-                    # as it under-predicts next step due to exponential form of
-                    # Psat.
-                    # Subtract 1 to avoid potential singularities at Tcrit
-                    Tbub0 = min(blk[k].params.get_component(j)
-                                .temperature_crit.value
-                                for j in valid_comps) - 1
-
-                    err = 1
-                    counter = 0
-
-                    # Newton solver with step limiter to prevent overshoot
-                    # Tolerance only needs to be ~1e-1
-                    # Iteration limit of 30
-                    while err > 1e-1 and counter < 30:
-                        f = value(sum(
-                            get_method(blk[k], "pressure_sat_comp", j)(
-                                    blk[k],
-                                    blk[k].params.get_component(j),
-                                    Tbub0*T_units) *
-                            blk[k].mole_frac_comp[j]
-                            for j in valid_comps) -
-                            blk[k].pressure)
-                        df = value(sum(
-                               get_method(blk[k], "pressure_sat_comp", j)(
-                                          blk[k],
-                                          blk[k].params.get_component(j),
-                                          Tbub0*T_units,
-                                          dT=True)
-                               for j in valid_comps))
-
-                        # Limit temperature step to avoid excessive overshoot
-                        if f/df < -50:
-                            Tbub1 = Tbub0 + 50
-                        elif f/df > 50:
-                            Tbub1 = Tbub0 - 50
-                        else:
-                            Tbub1 = Tbub0 - f/df
-
-                        err = abs(Tbub1 - Tbub0)
-                        Tbub0 = Tbub1
-                        counter += 1
-
-                    blk[k].temperature_bubble[pp].value = Tbub0
-
-                    for j in valid_comps:
-                        blk[k]._mole_frac_tbub[pp, j].value = value(
-                                blk[k].mole_frac_comp[j] *
-                                get_method(blk[k], "pressure_sat_comp", j)(
-                                           blk[k],
-                                           blk[k].params.get_component(j),
-                                           Tbub0*T_units) /
-                                blk[k].pressure)
-
-            # Dew temperature initialization
-            if hasattr(blk[k], "_mole_frac_tdew"):
-                for pp in blk[k].params._pe_pairs:
-                    valid_comps = _valid_VL_component_list(blk[k], pp)
-
-                    if valid_comps == []:
-                        continue
-
-                    if hasattr(blk[k], "_mole_frac_tbub"):
-                        # If Tbub has been calculated above, use this as the
-                        # starting point
-                        Tdew0 = blk[k].temperature_bubble[pp].value
-                    else:
-                        # Otherwise, use lowest component critical temperature
-                        # as starting point
-                        # Subtract 1 to avoid potential singularities at Tcrit
-                        Tdew0 = min(
-                            blk[k].params.get_component(j).
-                            temperature_crit.value
-                            for j in valid_comps) - 1
-
-                    err = 1
-                    counter = 0
-
-                    # Newton solver with step limiter to prevent overshoot
-                    # Tolerance only needs to be ~1e-1
-                    # Iteration limit of 30
-                    while err > 1e-1 and counter < 30:
-                        f = value(
-                            blk[k].pressure *
-                            sum(blk[k].mole_frac_comp[j] /
-                                get_method(blk[k], "pressure_sat_comp", j)(
-                                           blk[k],
-                                           blk[k].params.get_component(j),
-                                           Tdew0*T_units)
-                                for j in valid_comps) - 1)
-                        df = -value(
-                                blk[k].pressure *
-                                sum(blk[k].mole_frac_comp[j] /
-                                    get_method(blk[k], "pressure_sat_comp", j)(
-                                           blk[k],
-                                           blk[k].params.get_component(j),
-                                           Tdew0*T_units)**2 *
-                                    get_method(blk[k], "pressure_sat_comp", j)(
-                                           blk[k],
-                                           blk[k].params.get_component(j),
-                                           Tdew0*T_units,
-                                           dT=True)
-                                    for j in valid_comps))
-
-                        # Limit temperature step to avoid excessive overshoot
-                        if f/df < -50:
-                            Tdew1 = Tdew0 + 50
-                        elif f/df > 50:
-                            Tdew1 = Tdew0 - 50
-                        else:
-                            Tdew1 = Tdew0 - f/df
-
-                        err = abs(Tdew1 - Tdew0)
-                        Tdew0 = Tdew1
-                        counter += 1
-
-                    blk[k].temperature_dew[pp].value = Tdew0
-
-                    for j in valid_comps:
-                        blk[k]._mole_frac_tdew[pp, j].value = value(
-                                blk[k].mole_frac_comp[j]*blk[k].pressure /
-                                get_method(blk[k], "pressure_sat_comp", j)(
-                                           blk[k],
-                                           blk[k].params.get_component(j),
-                                           Tdew0*T_units))
-
-            # Bubble pressure initialization
-            if hasattr(blk[k], "_mole_frac_pbub"):
-                for pp in blk[k].params._pe_pairs:
-                    valid_comps = _valid_VL_component_list(blk[k], pp)
-
-                    if valid_comps == []:
-                        continue
-
-                    blk[k].pressure_bubble[pp].value = value(
-                            sum(blk[k].mole_frac_comp[j] *
-                                blk[k].params.config.pressure_sat_comp
-                                      .pressure_sat_comp(
-                                              blk[k],
-                                              j,
-                                              blk[k].temperature*T_units)
-                                for j in valid_comps))
-
-                    for j in valid_comps:
-                        blk[k]._mole_frac_pbub[pp, j].value = value(
-                            blk[k].mole_frac_comp[j] *
-                            blk[k].params.config.pressure_sat_comp
-                                  .pressure_sat_comp(
-                                          blk[k],
-                                          j,
-                                          blk[k].temperature*T_units) /
-                            blk[k].pressure_bubble)
-
-            # Dew pressure initialization
-            if hasattr(blk[k], "_mole_frac_pdew"):
-                for pp in blk[k].params._pe_pairs:
-                    valid_comps = _valid_VL_component_list(blk[k], pp)
-
-                    if valid_comps == []:
-                        continue
-
-                    blk[k].pressure_dew[pp].value = value(
-                            sum(1/(blk[k].mole_frac_comp[j] /
-                                   blk[k].params.config.pressure_sat_comp
-                                   .pressure_sat_comp(
-                                           blk[k],
-                                           j,
-                                           blk[k].temperature*T_units))
-                                for j in valid_comps))
-
-                    for j in valid_comps:
-                        blk[k]._mole_frac_pdew[pp, j].value = value(
-                            blk[k].mole_frac_comp[j]*blk[k].pressure_bubble /
-                            blk[k].params.config.pressure_sat_comp
-                            .pressure_sat_comp(blk[k],
-                                               j,
-                                               blk[k].temperature*T_units))
+        _initialize_bubble_dew(blk)
 
+        for k in blk.keys():
             # Solve bubble and dew point constraints
             for c in blk[k].component_objects(Constraint):
                 # Deactivate all constraints not associated wtih bubble and dew
@@ -2410,6 +2226,316 @@ class GenericStateBlockData(StateBlockData):
             rule=dh_rule)
 
 
+def _initialize_bubble_dew(blk):
+    # Calculate initial guesses for bubble and dew point variables in all
+    # StateBlocks in blk. StateBlocks are grouped by phase pair, and if all
+    # components in the pair use a standard Psat correlation the guesses are
+    # calculated for the whole group at once using NumPy.
+    groups = {}
+    for k in blk.keys():
+        b = blk[k]
+        if not any(hasattr(b, n) for n in ("_mole_frac_tbub",
+                                           "_mole_frac_tdew",
+                                           "_mole_frac_pbub",
+                                           "_mole_frac_pdew")):
+            continue
+        for pp in b.params._pe_pairs:
+            valid_comps = _valid_VL_component_list(b, pp)
+
+            if valid_comps == []:
+                continue
+
+            groups.setdefault(
+                (id(b.params), pp, tuple(valid_comps)), []).append(b)
+
+    for (_, pp, valid_comps), blocks in groups.items():
+        psat = [get_array_method(blocks[0], "pressure_sat_comp", j)
+                for j in valid_comps]
+        if any(m is None for m in psat):
+            for b in blocks:
+                _initialize_bubble_dew_block(b, pp, list(valid_comps))
+        else:
+            _initialize_bubble_dew_array(blocks, pp, valid_comps, psat)
+
+
+def _initialize_bubble_dew_array(blocks, pp, valid_comps, psat):
+    # Bubble and dew point initial guesses for a list of StateBlocks
+    # using NumPy evaluations of Psat
+    b0 = blocks[0]
+    cobjs = [b0.params.get_component(j) for j in valid_comps]
+
+    x = np.array([[value(b.mole_frac_comp[j]) for j in valid_comps]
+                  for b in blocks])
+    P = np.array([value(b.pressure) for b in blocks])
+
+    def p_sat(T, dT=False):
+        # Psat for each component, in columns
+        return np.column_stack(
+            [m(b0, cobj, T, dT=dT) for m, cobj in zip(psat, cobjs)])
+
+    # Use lowest component temperature_crit as starting point
+    # Subtract 1 to avoid potential singularities at Tcrit
+    T_start = min(cobj.temperature_crit.value for cobj in cobjs) - 1
+
+    # Bubble temperature initialization
+    tbub = np.array([hasattr(b, "_mole_frac_tbub") for b in blocks])
+    if tbub.any():
+        xb = x[tbub]
+        Pb = P[tbub]
+
+        def f_bub(T, i):
+            f = np.sum(p_sat(T)*xb[i], axis=1) - Pb[i]
+            df = np.sum(p_sat(T, dT=True), axis=1)
+            return f, df
+
+        Tbub = _newton_array(f_bub, np.full(len(Pb), T_start))
+
+        mole_frac = xb*p_sat(Tbub)/Pb[:, None]
+        for i, b in enumerate(blocks[n] for n in np.flatnonzero(tbub)):
+            b.temperature_bubble[pp].value = Tbub[i]
+            for jj, j in enumerate(valid_comps):
+                b._mole_frac_tbub[pp, j].value = mole_frac[i, jj]
+
+    # Dew temperature initialization
+    tdew = np.array([hasattr(b, "_mole_frac_tdew") for b in blocks])
+    if tdew.any():
+        xd = x[tdew]
+        Pd = P[tdew]
+
+        # If Tbub has been calculated above, use this as the starting point
+        T0 = np.array([b.temperature_bubble[pp].value
+                       if hasattr(b, "_mole_frac_tbub") else T_start
+                       for b in (blocks[n] for n in np.flatnonzero(tdew))])
+
+        def f_dew(T, i):
+            ps = p_sat(T)
+            f = Pd[i]*np.sum(xd[i]/ps, axis=1) - 1
+            df = -Pd[i]*np.sum(xd[i]/ps**2*p_sat(T, dT=True), axis=1)
+            return f, df
+
+        Tdew = _newton_array(f_dew, T0)
+
+        mole_frac = xd*Pd[:, None]/p_sat(Tdew)
+        for i, b in enumerate(blocks[n] for n in np.flatnonzero(tdew)):
+            b.temperature_dew[pp].value = Tdew[i]
+            for jj, j in enumerate(valid_comps):
+                b._mole_frac_tdew[pp, j].value = mole_frac[i, jj]
+
+    # Bubble pressure initialization
+    pbub = np.array([hasattr(b, "_mole_frac_pbub") for b in blocks])
+    if pbub.any():
+        T = np.array([value(b.temperature) for b in blocks])
+        ps = p_sat(T[pbub])
+        xp = x[pbub]*ps
+        Pbub = np.sum(xp, axis=1)
+        mole_frac = xp/Pbub[:, None]
+        for i, b in enumerate(blocks[n] for n in np.flatnonzero(pbub)):
+            b.pressure_bubble[pp].value = Pbub[i]
+            for jj, j in enumerate(valid_comps):
+                b._mole_frac_pbub[pp, j].value = mole_frac[i, jj]
+
+    # Dew pressure initialization
+    pdew = np.array([hasattr(b, "_mole_frac_pdew") for b in blocks])
+    if pdew.any():
+        T = np.array([value(b.temperature) for b in blocks])
+        ps = p_sat(T[pdew])
+        xd = x[pdew]
+        Pdew = 1/np.sum(xd/ps, axis=1)
+        mole_frac = xd*Pdew[:, None]/ps
+        for i, b in enumerate(blocks[n] for n in np.flatnonzero(pdew)):
+            b.pressure_dew[pp].value = Pdew[i]
+            for jj, j in enumerate(valid_comps):
+                b._mole_frac_pdew[pp, j].value = mole_frac[i, jj]
+
+
+def _newton_array(func, T0):
+    # Newton solver with step limiter to prevent overshoot, applied to an
+    # array of independent problems. func(T, i) returns the residual and its
+    # derivative for the problems indexed by i.
+    # Tolerance only needs to be ~1e-1
+    # Iteration limit of 30
+    T = np.array(T0, dtype=float)
+    active = np.arange(len(T))
+    counter = 0
+    while len(active) > 0 and counter < 30:
+        T0 = T[active]
+        f, df = func(T0, active)
+
+        # Limit temperature step to avoid excessive overshoot
+        T1 = T0 - np.clip(f/df, -50, 50)
+
+        T[active] = T1
+        active = active[np.abs(T1 - T0) > 1e-1]
+        counter += 1
+    return T
+
+
+def _initialize_bubble_dew_block(b, pp, valid_comps):
+    # Bubble and dew point initial guesses for a single StateBlock, used
+    # when a component uses a Psat method without a NumPy implementation
+    T_units = b.params.get_metadata().default_units["temperature"]
+
+    # Bubble temperature initialization
+    if hasattr(b, "_mole_frac_tbub"):
+        # Use lowest component temperature_crit as starting point
+        # Starting high and moving down generally works better,
+        # as it under-predicts next step due to exponential form of
+        # Psat.
+        # Subtract 1 to avoid potential singularities at Tcrit
+        Tbub0 = min(b.params.get_component(j)
+                    .temperature_crit.value
+                    for j in valid_comps) - 1
+
+        err = 1
+        counter = 0
+
+        # Newton solver with step limiter to prevent overshoot
+        # Tolerance only needs to be ~1e-1
+        # Iteration limit of 30
+        while err > 1e-1 and counter < 30:
+            f = value(sum(
+                get_method(b, "pressure_sat_comp", j)(
+                        b,
+                        b.params.get_component(j),
+                        Tbub0*T_units) *
+                b.mole_frac_comp[j]
+                for j in valid_comps) -
+                b.pressure)
+            df = value(sum(
+                   get_method(b, "pressure_sat_comp", j)(
+                              b,
+                              b.params.get_component(j),
+                              Tbub0*T_units,
+                              dT=True)
+                   for j in valid_comps))
+
+            # Limit temperature step to avoid excessive overshoot
+            if f/df < -50:
+                Tbub1 = Tbub0 + 50
+            elif f/df > 50:
+                Tbub1 = Tbub0 - 50
+            else:
+                Tbub1 = Tbub0 - f/df
+
+            err = abs(Tbub1 - Tbub0)
+            Tbub0 = Tbub1
+            counter += 1
+
+        b.temperature_bubble[pp].value = Tbub0
+
+        for j in valid_comps:
+            b._mole_frac_tbub[pp, j].value = value(
+                    b.mole_frac_comp[j] *
+                    get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               Tbub0*T_units) /
+                    b.pressure)
+
+    # Dew temperature initialization
+    if hasattr(b, "_mole_frac_tdew"):
+        if hasattr(b, "_mole_frac_tbub"):
+            # If Tbub has been calculated above, use this as the
+            # starting point
+            Tdew0 = b.temperature_bubble[pp].value
+        else:
+            # Otherwise, use lowest component critical temperature
+            # as starting point
+            # Subtract 1 to avoid potential singularities at Tcrit
+            Tdew0 = min(
+                b.params.get_component(j).
+                temperature_crit.value
+                for j in valid_comps) - 1
+
+        err = 1
+        counter = 0
+
+        # Newton solver with step limiter to prevent overshoot
+        # Tolerance only needs to be ~1e-1
+        # Iteration limit of 30
+        while err > 1e-1 and counter < 30:
+            f = value(
+                b.pressure *
+                sum(b.mole_frac_comp[j] /
+                    get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               Tdew0*T_units)
+                    for j in valid_comps) - 1)
+            df = -value(
+                    b.pressure *
+                    sum(b.mole_frac_comp[j] /
+                        get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               Tdew0*T_units)**2 *
+                        get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               Tdew0*T_units,
+                               dT=True)
+                        for j in valid_comps))
+
+            # Limit temperature step to avoid excessive overshoot
+            if f/df < -50:
+                Tdew1 = Tdew0 + 50
+            elif f/df > 50:
+                Tdew1 = Tdew0 - 50
+            else:
+                Tdew1 = Tdew0 - f/df
+
+            err = abs(Tdew1 - Tdew0)
+            Tdew0 = Tdew1
+            counter += 1
+
+        b.temperature_dew[pp].value = Tdew0
+
+        for j in valid_comps:
+            b._mole_frac_tdew[pp, j].value = value(
+                    b.mole_frac_comp[j]*b.pressure /
+                    get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               Tdew0*T_units))
+
+    # Bubble pressure initialization
+    if hasattr(b, "_mole_frac_pbub"):
+        b.pressure_bubble[pp].value = value(
+                sum(b.mole_frac_comp[j] *
+                    get_method(b, "pressure_sat_comp", j)(
+                               b,
+                               b.params.get_component(j),
+                               b.temperature)
+                    for j in valid_comps))
+
+        for j in valid_comps:
+            b._mole_frac_pbub[pp, j].value = value(
+                b.mole_frac_comp[j] *
+                get_method(b, "pressure_sat_comp", j)(
+                           b,
+                           b.params.get_component(j),
+                           b.temperature) /
+                b.pressure_bubble[pp])
+
+    # Dew pressure initialization
+    if hasattr(b, "_mole_frac_pdew"):
+        b.pressure_dew[pp].value = value(
+                1/sum(b.mole_frac_comp[j] /
+                      get_method(b, "pressure_sat_comp", j)(
+                                 b,
+                                 b.params.get_component(j),
+                                 b.temperature)
+                      for j in valid_comps))
+
+        for j in valid_comps:
+            b._mole_frac_pdew[pp, j].value = value(
+                b.mole_frac_comp[j]*b.pressure_dew[pp] /
+                get_method(b, "pressure_sat_comp", j)(
+                           b,
+                           b.params.get_component(j),
+                           b.temperature))
+
+
 def _valid_VL_component_list(blk, pp):
     valid_comps = []
     # Only need to do this for V-L pairs, so check
@@ -94,6 +94,41 @@ def get_method(self, config_arg, comp=None):
                 "previous.".format(self.name, config_arg))
 
 
+def get_array_method(self, config_arg, comp=None):
+    """
+    Method to inspect configuration argument and return the NumPy evaluation
+    method associated with it, if one exists.
+
+    Standard property methods may provide a return_array method alongside
+    return_expression, which evaluates the property for an array of state
+    values using NumPy rather than by building a Pyomo expression.
+    User-defined methods generally will not provide this.
+
+    Args:
+        config_arg : the configuration argument to look up
+
+    Returns:
+        A callable method, or None if no array method is available
+    """
+    if comp is None:
+        source_block = self.params.config
+    else:
+        source_block = self.params.get_component(comp).config
+
+    c_arg = getattr(source_block, config_arg, None)
+
+    # Check to see if c_arg has an attribute with the name of the config_arg
+    # If so, assume c_arg is a class or module holding property subclasses
+    if hasattr(c_arg, config_arg):
+        c_arg = getattr(c_arg, config_arg)
+
+    mthd = getattr(c_arg, "return_array", None)
+    if callable(mthd):
+        return mthd
+    else:
+        return None
+
+
 def get_component_object(self, comp):
     """
     Utility method to get a component object from the property parameter block.
@@ -19,7 +19,9 @@ Retrieved: September 13th, 2019
 
 All parameter indicies and units based on conventions used by the source
 """
-from pyomo.environ import Expression, log, Var, units as pyunits
+import numpy as np
+
+from pyomo.environ import Expression, log, Var, units as pyunits, value
 
 from idaes.core.util.misc import set_param_from_config
 
@@ -188,6 +190,27 @@ class pressure_sat_comp():
         dp_units = units["pressure"]/units["temperature"]
         return pyunits.convert(p_sat_dT, to_units=dp_units)
 
+    @staticmethod
+    def return_array(b, cobj, T, dT=False):
+        # NumPy evaluation for an array of temperatures T (in base units)
+        A = value(cobj.pressure_sat_comp_coeff_A)
+        B = value(cobj.pressure_sat_comp_coeff_B)
+        C = value(cobj.pressure_sat_comp_coeff_C)
+
+        units = b.params.get_metadata().derived_units
+        T = T*pyunits.convert_value(
+            1, from_units=units["temperature"], to_units=pyunits.K)
+        psat = 10**(A - B/(T + C))*pyunits.convert_value(
+            1, from_units=pyunits.bar, to_units=units["pressure"])
+
+        if not dT:
+            return psat
+        return (psat*B*np.log(10)/(T + C)**2 *
+                pyunits.convert_value(
+                    1,
+                    from_units=units["pressure"]/pyunits.K,
+                    to_units=units["pressure"]/units["temperature"]))
+
 
 # -----------------------------------------------------------------------------
 class NIST(object):
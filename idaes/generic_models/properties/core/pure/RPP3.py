@@ -19,7 +19,9 @@ Reid, Prausnitz and Polling, 1977, McGraw-Hill
 All parameter indicies based on conventions used by the source
 """
 
-from pyomo.environ import exp, log, Var, units as pyunits
+import numpy as np
+
+from pyomo.environ import exp, log, Var, units as pyunits, value
 
 from idaes.core.util.misc import set_param_from_config
 
@@ -179,6 +181,27 @@ class pressure_sat_comp():
         return pyunits.convert(p_sat_dT,
                                to_units=units["pressure"]/units["temperature"])
 
+    @staticmethod
+    def return_array(b, cobj, T, dT=False):
+        # NumPy evaluation for an array of temperatures T (in base units)
+        A = value(cobj.pressure_sat_comp_coeff_A)
+        B = value(cobj.pressure_sat_comp_coeff_B)
+        C = value(cobj.pressure_sat_comp_coeff_C)
+
+        units = b.params.get_metadata().derived_units
+        T = T*pyunits.convert_value(
+            1, from_units=units["temperature"], to_units=pyunits.K)
+        psat = np.exp(A - B/(T + C))*pyunits.convert_value(
+            1, from_units=pyunits.mmHg, to_units=units["pressure"])
+
+        if not dT:
+            return psat
+        return (psat*B/(T + C)**2 *
+                pyunits.convert_value(
+                    1,
+                    from_units=units["pressure"]/pyunits.K,
+                    to_units=units["pressure"]/units["temperature"]))
+
 
 # -----------------------------------------------------------------------------
 class RPP3(object):
@@ -18,7 +18,9 @@ Reid, Prausnitz and Polling, 1987, McGraw-Hill
 
 All parameter indicies and units based on conventions used by the source
 """
-from pyomo.environ import exp, log, Var, units as pyunits
+import numpy as np
+
+from pyomo.environ import exp, log, Var, units as pyunits, value
 
 from idaes.core.util.misc import set_param_from_config
 
@@ -188,6 +190,24 @@ class pressure_sat_comp():
                   cobj.pressure_sat_comp_coeff_C*x**3 +
                   cobj.pressure_sat_comp_coeff_D*x**6)))
 
+    @staticmethod
+    def return_array(b, cobj, T, dT=False):
+        # NumPy evaluation for an array of temperatures T (in base units)
+        A = value(cobj.pressure_sat_comp_coeff_A)
+        B = value(cobj.pressure_sat_comp_coeff_B)
+        C = value(cobj.pressure_sat_comp_coeff_C)
+        D = value(cobj.pressure_sat_comp_coeff_D)
+        Tc = value(cobj.temperature_crit)
+
+        x = 1 - T/Tc
+        f = A*x + B*x**1.5 + C*x**3 + D*x**6
+        psat = np.exp(f/(1-x))*value(cobj.pressure_crit)
+
+        if not dT:
+            return psat
+        return -psat*((A + 1.5*B*x**0.5 + 3*C*x**2 + 6*D*x**5)/T +
+                      (Tc/T**2)*f)
+
 
 # -----------------------------------------------------------------------------
 class RPP4(object):
@@ -19,7 +19,9 @@ Reid, Prausnitz and Polling, 2001, McGraw-Hill
 All parameter indicies based on conventions used by the source
 """
 
-from pyomo.environ import log, Var, units as pyunits
+import numpy as np
+
+from pyomo.environ import log, Var, units as pyunits, value
 
 from idaes.core.util.misc import set_param_from_config
 
@@ -191,6 +193,28 @@ class pressure_sat_comp():
                     base_units["temperature"]**-1)
         return pyunits.convert(p_sat_dT, to_units=dp_units)
 
+    @staticmethod
+    def return_array(b, cobj, T, dT=False):
+        # NumPy evaluation for an array of temperatures T (in base units)
+        A = value(cobj.pressure_sat_comp_coeff_A)
+        B = value(cobj.pressure_sat_comp_coeff_B)
+        C = value(cobj.pressure_sat_comp_coeff_C)
+
+        base_units = b.params.get_metadata().default_units
+        p_units = (base_units["mass"] *
+                   base_units["length"]**-1 *
+                   base_units["time"]**-2)
+        psat = 10**(A - B/(T + C - 273.15))*pyunits.convert_value(
+            1, from_units=pyunits.bar, to_units=p_units)
+
+        if not dT:
+            return psat
+        return (psat*B*np.log(10)/(T + C - 273.15)**2 *
+                pyunits.convert_value(
+                    1,
+                    from_units=p_units/pyunits.K,
+                    to_units=p_units/base_units["temperature"]))
+
 
 # -----------------------------------------------------------------------------
 class RPP5(object):
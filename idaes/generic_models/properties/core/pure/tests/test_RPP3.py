@@ -26,6 +26,8 @@ Authors: Andrew Lee, Alejandro Garciadiego
 import pytest
 import types
 
+import numpy as np
+
 from pyomo.environ import ConcreteModel, Block, value, Var, units as pyunits
 from pyomo.common.config import ConfigBlock
 from pyomo.util.check_units import assert_units_equivalent
@@ -216,3 +218,22 @@ def test_pressure_sat_comp_dT(frame):
     assert value(expr) == pytest.approx(dPdT, 1e-4)
 
     assert_units_equivalent(expr, pyunits.Pa/pyunits.K)
+
+
+@pytest.mark.unit
+def test_pressure_sat_comp_array(frame):
+    pressure_sat_comp.build_parameters(frame.params)
+
+    T = np.array([300, 373.15, 450])
+    psat = pressure_sat_comp.return_array(frame.props[1], frame.params, T)
+    dpsat = pressure_sat_comp.return_array(
+        frame.props[1], frame.params, T, dT=True)
+
+    expr = pressure_sat_comp.return_expression(
+        frame.props[1], frame.params, frame.props[1].temperature)
+    dexpr = pressure_sat_comp.dT_expression(
+        frame.props[1], frame.params, frame.props[1].temperature)
+    for i, t in enumerate(T):
+        frame.props[1].temperature.value = t
+        assert psat[i] == pytest.approx(value(expr), rel=1e-8)
+        assert dpsat[i] == pytest.approx(value(dexpr), rel=1e-8)
@@ -18,7 +18,8 @@ import pyomo.environ as pyo
 from pyomo.network import Arc
 from idaes.core import FlowsheetBlock
 from idaes.generic_models.properties import iapws95
-from idaes.core.util.model_statistics import degrees_of_freedom
+from idaes.core.util.model_statistics import (
+    degrees_of_freedom, IncidenceCache)
 import idaes.core.util.scaling as iscale
 from idaes.power_generation.properties import FlueGasParameterBlock
 from idaes.power_generation.control.pid_controller import PIDController
@@ -26,7 +27,8 @@ import idaes.power_generation.flowsheets.subcritical_power_plant.subcritical_boi
 import idaes.power_generation.flowsheets.subcritical_power_plant.steam_cycle_flowsheet as stc
 from idaes.core.util.dyn_utils import (
     copy_values_at_time,
-    copy_non_time_indexed_values)
+    copy_non_time_indexed_values,
+    ValueCorrespondence)
 import idaes.logger as idaeslog
 import os
 import idaes.core.util.tables as tables
@@ -588,14 +590,21 @@ def main_dynamic():
     # Loop for remaining time periods
     tlast = m_dyn.fs_main.config.time.last()
     m_prev = m_dyn
+    # Correspondences between the variables of the current and previous
+    # models are located once and reused for every period
+    correspondences = {}
     for i in range(1, nperiod):
         m_dyn = model_list[i]
+        key = (id(m_dyn), id(m_prev))
+        if key not in correspondences:
+            correspondences[key] = ValueCorrespondence(
+                m_dyn.fs_main, m_prev.fs_main, outlvl=idaeslog.ERROR)
+        correspondence = correspondences[key]
         for t in m_dyn.fs_main.config.time:
             if itype_list[i] != itype_list[i-1] or t != tlast:
                 # Copy results from previous time period to current period as
                 # initial condition and guess
-                copy_values_at_time(m_dyn.fs_main, m_prev.fs_main, t, tlast,
-                                    copy_fixed=True, outlvl=idaeslog.ERROR)
+                correspondence.copy_values_at_time(t, tlast, copy_fixed=True)
             _log.info('Spray control windup={}'.format(
                 m_dyn.fs_main.fs_stc.spray_ctrl.integral_of_error[t].value))
             mv_unbounded = pyo.value(
@@ -799,9 +808,11 @@ def get_model(dynamic=True, time_set=None, nstep=None, init=True):
     # Add overall performation expressions
     add_overall_performance_expressions(m)
     if init:
-        # Initialize boiler and steam cycle sub-flowsheets
-        blr.initialize(m)
-        stc.initialize(m)
+        # Initialize boiler and steam cycle sub-flowsheets, caching the
+        # incidence so the many degrees of freedom checks avoid rebuilding it
+        with IncidenceCache(m):
+            blr.initialize(m)
+            stc.initialize(m)
 
     # Set arc connections between two sub-flowsheets,
     # deactivate some constraints of two sub-flowsheets
@@ -27,11 +27,23 @@ the NGFC flowsheet. The code for generating SOFC ROMS can be found on PNNL's
 Github page: https://github.com/NGFC-Lib/NGFC-Lib.
 """
 
+import hashlib
 import os
+
+import numpy as np
+
 from pyomo.environ import Block, Constraint, Param, Var, exp, value, units
+from pyomo.core.expr.numeric_expr import LinearExpression
 from pyomo.util.calc_var_value import calculate_variable_from_constraint
 from pyomo.common.fileutils import this_file_dir
 
+import idaes
+
+# dimensions of the kriging model stored in the coefficient file
+n_inputs = 9
+n_outputs = 48
+n_samples = 13424
+
 
 # creates a dictionary from a list of indices and values
 def build_dict(index, values):
@@ -41,32 +53,115 @@ def build_dict(index, values):
     return d
 
 
-# creates a dictionary with double indices
-def build_matrix(index1, index2, values):
-    d = {}
-    count = 0
-    for i in index1:
-        for j in index2:
-            d[(i, j)] = values[count]
-            count += 1
-    return d
-
-
-def build_SOFC_ROM(m):
+# creates a Param initialization rule from a 1D or 2D array; rules skip the
+# index validation done when initializing from a dict
+def build_rule(values):
+    values = np.asarray(values).tolist()
+    if values and isinstance(values[0], list):
+        def rule(b, i, j):
+            return values[i][j]
+    else:
+        def rule(b, i):
+            return values[i]
+    return rule
+
+
+def _coefficient_cache_files(path):
+    path = os.path.abspath(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    files = [os.path.splitext(path)[0] + '.npy']
+    if idaes.data_directory is not None:
+        key = hashlib.md5(path.encode('utf-8')).hexdigest()[:12]
+        files.append(os.path.join(idaes.data_directory, 'cache',
+                                  '{}_{}.npy'.format(stem, key)))
+    return files
+
+
+def load_kriging_coefficients(path=None):
+    """
+    Load the kriging coefficients for the SOFC ROM as a flat NumPy array.
+
+    The text data file is only parsed the first time it is used. The values
+    are then saved in a binary .npy file next to the data file (or in the
+    IDAES data directory if that location is not writable), which is
+    memory-mapped on later calls. The cache is regenerated whenever the data
+    file is newer than it.
+
+    Args:
+        path: data file to load, default is the kriging_coefficients.dat file
+            distributed with this module
+
+    Returns:
+        (numpy.ndarray) read-only array of coefficients
+    """
+    if path is None:
+        path = os.path.join(this_file_dir(), 'kriging_coefficients.dat')
+    mtime = os.path.getmtime(path)
+    cache_files = _coefficient_cache_files(path)
+    for cache in cache_files:
+        if os.path.exists(cache) and os.path.getmtime(cache) >= mtime:
+            try:
+                return np.load(cache, mmap_mode='r')
+            except (OSError, ValueError):
+                pass
+
+    values = np.loadtxt(path, dtype=float, ndmin=1)
+    for cache in cache_files:
+        # write to a temporary file and rename it, so concurrent builds never
+        # see a partially written cache
+        tmp = '{}.{}.tmp'.format(cache, os.getpid())
+        try:
+            os.makedirs(os.path.dirname(cache), exist_ok=True)
+            with open(tmp, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp, cache)
+            break
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    values.flags.writeable = False
+    return values
+
+
+def split_kriging_coefficients(kriging):
+    """
+    Split the flat coefficient array into the arrays of the kriging model.
+
+    Args:
+        kriging: flat array from load_kriging_coefficients
+
+    Returns:
+        (dict) arrays keyed by Param name: mean_input, sigma_input,
+        mean_output, sigma_output, ds_input (samples x inputs), theta,
+        beta (inputs + 1 x outputs) and gamma (samples x outputs)
+    """
+    shapes = [('mean_input', (n_inputs,)),
+              ('sigma_input', (n_inputs,)),
+              ('mean_output', (n_outputs,)),
+              ('sigma_output', (n_outputs,)),
+              ('ds_input', (n_samples, n_inputs)),
+              ('theta', (n_inputs,)),
+              ('beta', (n_inputs+1, n_outputs)),
+              ('gamma', (n_samples, n_outputs))]
+    size = sum(int(np.prod(shape)) for _, shape in shapes)
+    if kriging.size != size:
+        raise ValueError(
+            'SOFC ROM kriging coefficient data has {} values, expected {}.'
+            .format(kriging.size, size))
+    arrays = {}
+    start = 0
+    for name, shape in shapes:
+        end = start + int(np.prod(shape))
+        arrays[name] = kriging[start:end].reshape(shape)
+        start = end
+    return arrays
+
+
+def build_SOFC_ROM(m, kriging_file=None):
     m.SOFC = b = Block()
 
     # load kriging coefficients
-    fname = 'kriging_coefficients.dat'
-    path = os.path.join(this_file_dir(), fname)
-
-    with open(path) as file:
-        text = file.readlines()
-
-    kriging = [float(line) for line in text]
-
-    n_inputs = 9
-    n_outputs = 48
-    n_samples = 13424
+    coefs = split_kriging_coefficients(load_kriging_coefficients(kriging_file))
 
     # create indecies for vars and params
     input_index = list(range(n_inputs))
@@ -74,64 +169,37 @@ def build_SOFC_ROM(m):
     output_index = list(range(n_outputs))
     samples_index = list(range(n_samples))
 
-    # read through data file and create params
-    start_count = 0
-    end_count = n_inputs
-    values = kriging[start_count:end_count]
+    # create params from the coefficient arrays
     b.mean_input = Param(input_index,
-                         initialize=build_dict(input_index, values),
+                         initialize=build_rule(coefs['mean_input']),
                          mutable=False)
 
-    start_count += n_inputs
-    end_count += n_inputs
-    values = kriging[start_count:end_count]
     b.sigma_input = Param(input_index,
-                          initialize=build_dict(input_index, values),
+                          initialize=build_rule(coefs['sigma_input']),
                           mutable=False)
 
-    start_count += n_inputs
-    end_count += n_outputs
-    values = kriging[start_count:end_count]
     b.mean_output = Param(output_index,
-                          initialize=build_dict(output_index, values),
+                          initialize=build_rule(coefs['mean_output']),
                           mutable=False)
 
-    start_count += n_outputs
-    end_count += n_outputs
-    values = kriging[start_count:end_count]
     b.sigma_output = Param(output_index,
-                           initialize=build_dict(output_index, values),
+                           initialize=build_rule(coefs['sigma_output']),
                            mutable=False)
 
-    start_count += n_outputs
-    end_count += n_inputs*n_samples
-    values = kriging[start_count:end_count]
     b.ds_input = Param(samples_index, input_index,
-                       initialize=build_matrix(
-                           samples_index, input_index, values),
+                       initialize=build_rule(coefs['ds_input']),
                        mutable=False)
 
-    start_count += n_inputs*n_samples
-    end_count += n_inputs
-    values = kriging[start_count:end_count]
     b.theta = Param(input_index,
-                    initialize=build_dict(input_index, values),
+                    initialize=build_rule(coefs['theta']),
                     mutable=False)
 
-    start_count += n_inputs
-    end_count += (n_inputs+1)*n_outputs
-    values = kriging[start_count:end_count]
     b.beta = Param(input_plus_index, output_index,
-                   initialize=build_matrix(
-                       input_plus_index, output_index, values),
+                   initialize=build_rule(coefs['beta']),
                    mutable=False)
 
-    start_count += (n_inputs+1)*n_outputs
-    end_count += n_samples*n_outputs
-    values = kriging[start_count:end_count]
     b.gamma = Param(samples_index, output_index,
-                    initialize=build_matrix(
-                        samples_index, output_index, values),
+                    initialize=build_rule(coefs['gamma']),
                     mutable=False)
 
     # create input vars for the user to interface with
@@ -221,17 +289,29 @@ def build_SOFC_ROM(m):
 
     b.F_eqs = Constraint(input_index, rule=F_rule)
 
+    # the params are immutable, so the rules below read the coefficient
+    # values from lists rather than indexing the params for every term
+    theta = coefs['theta'].tolist()
+    ds_input = coefs['ds_input'].tolist()
+
     def R_rule(b, i):
-        return (b.R[i] == exp(-1*sum(b.theta[j] *
-                                     (b.ds_input[i, j] - b.norm_input[j])**2
+        return (b.R[i] == exp(-1*sum(theta[j] *
+                                     (ds_input[i][j] - b.norm_input[j])**2
                                      for j in input_index)))
 
     b.R_eqs = Constraint(samples_index, rule=R_rule)
 
+    # the output equations are linear in F and R, with 13434 terms each
+    linear_vars = ([b.F[j] for j in input_plus_index]
+                   + [b.R[k] for k in samples_index])
+    linear_coefs = np.concatenate(
+        (coefs['beta'], coefs['gamma'])).T.tolist()
+
     def norm_output_rule(b, i):
         return (b.norm_output[i] ==
-                sum(b.F[j]*b.beta[j, i] for j in input_plus_index)
-                + sum(b.R[k]*b.gamma[k, i] for k in samples_index))
+                LinearExpression(constant=0,
+                                 linear_coefs=linear_coefs[i],
+                                 linear_vars=linear_vars))
 
     b.norm_output_eqs = Constraint(output_index, rule=norm_output_rule)
 
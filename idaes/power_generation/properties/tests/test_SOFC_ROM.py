@@ -25,10 +25,15 @@ Tests for SOFC ROM.
 Author: Alex Noring
 """
 
+import os
+
+import numpy as np
 import pytest
 
+import idaes
 from idaes.power_generation.properties.NGFC.ROM.SOFC_ROM import \
-    build_SOFC_ROM, initialize_SOFC_ROM
+    build_SOFC_ROM, initialize_SOFC_ROM, load_kriging_coefficients, \
+    split_kriging_coefficients
 from idaes.core.util.model_statistics import (degrees_of_freedom,
                                               number_variables,
                                               number_total_constraints,
@@ -126,3 +131,84 @@ class TestSOFCROM(object):
                 value(m.SOFC.max_cell_temperature))
         assert (pytest.approx(99.9, abs=1e-1) ==
                 value(m.SOFC.deltaT_cell))
+
+    @pytest.mark.integration
+    def test_initialize_matches_kriging_arrays(self, m):
+        # initialization only evaluates the ROM equations in sequence, so the
+        # outputs must match a direct evaluation of the kriging model
+        initialize_SOFC_ROM(m.SOFC)
+        c = split_kriging_coefficients(load_kriging_coefficients())
+        x = np.array([value(m.SOFC.ROM_input[i]) for i in range(9)])
+        norm_input = (x - c['mean_input'])/c['sigma_input']
+        R = np.exp(-np.sum(c['theta']*(c['ds_input'] - norm_input)**2,
+                           axis=1))
+        F = np.concatenate(([1], norm_input))
+        output = c['mean_output'] + c['sigma_output']*(
+            F @ c['beta'] + R @ c['gamma'])
+        for i in range(48):
+            assert value(m.SOFC.ROM_output[i]) == pytest.approx(output[i],
+                                                                rel=1e-8)
+
+
+@pytest.mark.unit
+def test_load_kriging_coefficients(tmp_path, monkeypatch):
+    monkeypatch.setattr(idaes, "data_directory", str(tmp_path / "data"))
+    fname = tmp_path / "coefficients.dat"
+    values = np.arange(10, dtype=float)/3
+    np.savetxt(fname, values)
+
+    loaded = load_kriging_coefficients(str(fname))
+    np.testing.assert_array_equal(loaded, values)
+    assert not loaded.flags.writeable
+    cache = tmp_path / "coefficients.npy"
+    assert cache.exists()
+
+    # later loads memory-map the cache
+    loaded = load_kriging_coefficients(str(fname))
+    assert isinstance(loaded, np.memmap)
+    np.testing.assert_array_equal(loaded, values)
+
+    # the cache is regenerated when the data file is newer
+    np.savetxt(fname, 2*values)
+    mtime = os.path.getmtime(cache)
+    os.utime(fname, (mtime + 10, mtime + 10))
+    loaded = load_kriging_coefficients(str(fname))
+    np.testing.assert_array_equal(loaded, 2*values)
+    np.testing.assert_array_equal(np.load(cache), 2*values)
+
+
+@pytest.mark.unit
+def test_load_kriging_coefficients_read_only_dir(tmp_path, monkeypatch):
+    # when the data file directory is not writable, the cache goes in the
+    # IDAES data directory
+    monkeypatch.setattr(idaes, "data_directory", str(tmp_path / "data"))
+    fname = tmp_path / "coefficients.dat"
+    np.savetxt(fname, np.ones(4))
+    real_save = np.save
+
+    def save(f, arr):
+        if str(tmp_path / "data") not in f.name:
+            raise PermissionError("read-only")
+        real_save(f, arr)
+
+    monkeypatch.setattr(np, "save", save)
+    np.testing.assert_array_equal(
+        load_kriging_coefficients(str(fname)), np.ones(4))
+    assert not (tmp_path / "coefficients.npy").exists()
+    cached = os.listdir(tmp_path / "data" / "cache")
+    assert len(cached) == 1 and cached[0].startswith("coefficients_")
+    assert isinstance(load_kriging_coefficients(str(fname)), np.memmap)
+
+
+@pytest.mark.unit
+def test_split_kriging_coefficients():
+    n = 9 + 9 + 48 + 48 + 9*13424 + 9 + 10*48 + 13424*48
+    c = split_kriging_coefficients(np.arange(n, dtype=float))
+    assert c['ds_input'].shape == (13424, 9)
+    assert c['beta'].shape == (10, 48)
+    assert c['gamma'].shape == (13424, 48)
+    assert c['gamma'][-1, -1] == n - 1
+    assert c['theta'][0] == 9 + 9 + 48 + 48 + 9*13424
+
+    with pytest.raises(ValueError):
+        split_kriging_coefficients(np.ones(10))
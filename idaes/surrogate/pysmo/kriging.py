@@ -21,9 +21,11 @@ from matplotlib import pyplot as plt
 import numpy as np
 import pandas as pd
 import pickle
-from pyomo.core import Param, exp
+from pyomo.core import Expression, Param, Set, exp, sum_product
+from scipy import linalg
 from scipy.optimize import basinhopping
 import scipy.optimize as opt
+from scipy.spatial.distance import pdist, squareform
 # Imports from IDAES namespace
 from idaes.surrogate.pysmo.sampling import FeatureScaling as fs
 
@@ -159,13 +161,58 @@ class KrigingModel:
         self.optimal_covariance_matrix = None
         self.covariance_matrix_inverse = None
         self.optimal_y_mu = None
+        self.covariance_inverse_y_mu = None
         self.output_predictions = None
         self.training_R2 = None
         self.training_rmse = None
 
+        # Pairwise |x_i - x_j|^p of the scaled training data, keyed by p.
+        # Reused across all likelihood evaluations during training.
+        self._distance_cache = {}
+
+    def __getstate__(self):
+        # The distance cache is only needed during training and scales with
+        # the square of the number of samples; keep it out of pickle files.
+        state = self.__dict__.copy()
+        state['_distance_cache'] = {}
+        return state
+
+    @staticmethod
+    def pairwise_distance_tensor(x, p):
+        """
+        The pairwise_distance_tensor method evaluates |x_i - x_j|^p for every pair of samples i < j and every feature.
+
+        Args:
+            x                       : scaled features data
+            p                       : Kriging exponent
+
+        Returns:
+            distances               : Array of shape (n*(n-1)/2, number of features), in the condensed pair ordering of scipy's pdist
+
+        """
+        n, dims = x.shape
+        distances = np.empty((n * (n - 1) // 2, dims))
+        for k in range(dims):
+            distances[:, k] = pdist(x[:, k:k + 1], 'cityblock')
+        distances **= p
+        return distances
+
+    def _training_distances(self, x, p):
+        """
+        Returns the pairwise distance tensor for x, reusing the cached tensor when x is the scaled training data.
+        """
+        if x is not self.x_data_scaled:
+            return self.pairwise_distance_tensor(x, p)
+        cache = getattr(self, '_distance_cache', None)
+        if cache is None:
+            cache = self._distance_cache = {}
+        if p not in cache:
+            cache[p] = self.pairwise_distance_tensor(x, p)
+        return cache[p]
+
 
     @staticmethod
-    def covariance_matrix_generator(x, theta, reg_param, p):
+    def covariance_matrix_generator(x, theta, reg_param, p, distances=None):
         """
         The covariance_matrix_generator method generates the regularized co-variance matrix for a Kriging model
 
@@ -175,17 +222,66 @@ class KrigingModel:
             reg_param               : regularization parameter
             p                       : Kriging exponent, fixed at 2 for smoothness.
 
+        Keyword Args:
+            distances               : Pairwise distance tensor of x from ``pairwise_distance_tensor``. Computed when not supplied.
+
         Returns:
             cov_matrix              : Regularized co-variance matrix
 
         """
-        distance_matrix = np.zeros((x.shape[0], x.shape[0]))
-        for i in range(0, x.shape[0]):
-            distance_matrix[i, :] = (np.matmul(((np.abs(x[i, :] - x)) ** p), theta)).transpose()
-        cov_matrix = np.exp(-1 * distance_matrix)
-        cov_matrix = cov_matrix + reg_param * np.eye(cov_matrix.shape[0])  # Regularization parameter addition, see Forrester book
+        if distances is None:
+            distances = KrigingModel.pairwise_distance_tensor(x, p)
+        theta = np.asarray(theta).reshape(-1)
+        cov_matrix = squareform(np.exp(-1 * np.matmul(distances, theta)))
+        np.fill_diagonal(cov_matrix, 1 + reg_param)  # Regularization parameter addition, see Forrester book
         return cov_matrix
 
+    @staticmethod
+    def cross_covariance_generator(x_pred, x, theta, p, chunk_size=None):
+        """
+        The cross_covariance_generator method evaluates the correlations between the points in x_pred and the training points x,
+        yielding them in blocks of rows to bound the memory used for large prediction sets.
+
+        Args:
+            x_pred                  : scaled points to evaluate
+            x                       : scaled features data
+            theta                   : Kriging weights
+            p                       : Kriging exponent
+
+        Keyword Args:
+            chunk_size              : Number of rows of x_pred per block. Defaults to about one million matrix entries per block.
+
+        Yields:
+            (start, psi)            : Index of the first row of the block and the correlation matrix of the block
+        """
+        theta = np.asarray(theta).reshape(-1)
+        if chunk_size is None:
+            chunk_size = max(1, 2 ** 20 // max(1, x.shape[0]))
+        for start in range(0, x_pred.shape[0], chunk_size):
+            block = x_pred[start:start + chunk_size, :]
+            dist = np.zeros((block.shape[0], x.shape[0]))
+            for k in range(x.shape[1]):
+                dist += theta[k] * np.abs(block[:, k:k + 1] - x[:, k]) ** p
+            yield start, np.exp(-1 * dist)
+
+    @staticmethod
+    def covariance_solve(cov_mat, rhs):
+        """
+        The covariance_solve method solves cov_mat * z = rhs using the Cholesky factorization of the co-variance matrix,
+        falling back to a least-squares solution when the matrix is not positive definite.
+
+        Args:
+            cov_mat                 : Regularized co-variance matrix
+            rhs                     : Right-hand side vector or matrix
+
+        Returns:
+            z                       : Solution of the system
+        """
+        try:
+            return linalg.cho_solve(linalg.cho_factor(cov_mat, lower=True, check_finite=False), rhs, check_finite=False)
+        except np.linalg.LinAlgError:
+            return np.linalg.lstsq(cov_mat, rhs, rcond=None)[0]
+
     @staticmethod
     def covariance_inverse_generator(x):
         """
@@ -199,9 +295,12 @@ class KrigingModel:
 
         """
         try:
-            inverse_x = np.linalg.inv(x)
-        except np.linalg.LinAlgError as LAE:
-            inverse_x = np.linalg.pinv(x)
+            inverse_x = linalg.cho_solve(linalg.cho_factor(x, lower=True, check_finite=False), np.eye(x.shape[0]), check_finite=False)
+        except np.linalg.LinAlgError:
+            try:
+                inverse_x = np.linalg.inv(x)
+            except np.linalg.LinAlgError as LAE:
+                inverse_x = np.linalg.pinv(x)
         return inverse_x
 
     @staticmethod
@@ -284,18 +383,19 @@ class KrigingModel:
         reg_param = var_vector[-1]
         theta = 10 ** theta  # Assumes log(theta) provided
         ns = y.shape[0]
-        cov_mat = self.covariance_matrix_generator(x, theta, reg_param, p)
+        cov_mat = self.covariance_matrix_generator(x, theta, reg_param, p, distances=self._training_distances(x, p))
         try:  # Check Cholesky factorization
-            L = np.linalg.cholesky(cov_mat)
-            lndetcov = 2 * np.sum(np.log(np.abs(np.diag(L))))  # Approximation to 2nd term from Forrester book, making use of the Ch. factorization
-            cov_inv = self.covariance_inverse_generator(cov_mat)
-            km = self.kriging_mean(cov_inv, y)
-            y_mu = self.y_mu_calculation(y, km)
-            ssd = self.kriging_sd(cov_inv, y_mu, ns)
+            L = linalg.cho_factor(cov_mat, lower=True, check_finite=False)
+            lndetcov = 2 * np.sum(np.log(np.abs(np.diag(L[0]))))  # Approximation to 2nd term from Forrester book, making use of the Ch. factorization
+            # Solve for C^-1 * [1, y] with the factorization instead of forming the inverse
+            y_vec = y.reshape(ns)
+            sol = linalg.cho_solve(L, np.column_stack((np.ones(ns), y_vec)), check_finite=False)
+            km = np.sum(sol[:, 1]) / np.sum(sol[:, 0])
+            y_mu = y_vec - km
+            ssd = np.dot(y_mu, sol[:, 1] - km * sol[:, 0]) / ns
             # log_like = (0.5 * ns * np.log(ssd)) + (0.5 * np.log(np.abs(np.linalg.det(cov_mat))))
-            log_like = (0.5 * ns * np.log(ssd)) + (0.5 * lndetcov)
-            conc_log_like = log_like[0, 0]
-        except:  # When Cholesky fails - non-positive definite covariance matrix
+            conc_log_like = (0.5 * ns * np.log(ssd)) + (0.5 * lndetcov)
+        except np.linalg.LinAlgError:  # When Cholesky fails - non-positive definite covariance matrix
             conc_log_like = 1e4
         return conc_log_like
 
@@ -399,7 +499,8 @@ class KrigingModel:
         reg_param = var_vector[-1]
         theta = 10 ** theta  # Assumes log(theta) provided. Ensures that theta is always positive
         ns = self.y_data.shape[0]
-        cov_mat = self.covariance_matrix_generator(self.x_data_scaled, theta, reg_param, p)
+        cov_mat = self.covariance_matrix_generator(self.x_data_scaled, theta, reg_param, p,
+                                                   distances=self._training_distances(self.x_data_scaled, p))
         cov_inv = self.covariance_inverse_generator(cov_mat)
         mean = self.kriging_mean(cov_inv, self.y_data)
         y_mu = self.y_mu_calculation(self.y_data, mean)
@@ -429,11 +530,10 @@ class KrigingModel:
             y_prediction    : Predicted values of y
 
         """
+        cov_inv_y_mu = np.matmul(cov_inv, y_mu)
         y_prediction = np.zeros((x.shape[0], 1))
-        for i in range(0, x.shape[0]):
-            cmt = (np.matmul(((np.abs(x[i, :] - x)) ** p), theta)).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_prediction[i, 0] = mean + np.matmul(np.matmul(cov_matrix_tests.transpose(), cov_inv), y_mu)
+        for start, psi in KrigingModel.cross_covariance_generator(x, x, theta, p):
+            y_prediction[start:start + psi.shape[0], :] = mean + np.matmul(psi, cov_inv_y_mu)
         ss_error = (1 / y_data.shape[0]) * (np.sum((y_data - y_prediction) ** 2))
         rmse_error = np.sqrt(ss_error)
         return ss_error, rmse_error, y_prediction
@@ -474,13 +574,22 @@ class KrigingModel:
         x_pred = x_pred_scaled.reshape(x_pred.shape)
         if x_pred.ndim == 1:
             x_pred = x_pred.reshape(1, len(x_pred))
+        cov_inv_y_mu = self._covariance_inverse_y_mu()
         y_pred = np.zeros((x_pred.shape[0], 1))
-        for i in range(0, x_pred.shape[0]):
-            cmt = (np.matmul(((np.abs(x_pred[i, :] - self.x_data_scaled)) ** self.optimal_p), self.optimal_weights)).transpose()
-            cov_matrix_tests = np.exp(-1 * cmt)
-            y_pred[i, 0] = self.optimal_mean + np.matmul(np.matmul(cov_matrix_tests.transpose(), self.covariance_matrix_inverse), self.optimal_y_mu)
+        for start, psi in self.cross_covariance_generator(x_pred, self.x_data_scaled, self.optimal_weights, self.optimal_p):
+            y_pred[start:start + psi.shape[0], :] = self.optimal_mean + np.matmul(psi, cov_inv_y_mu)
         return y_pred
 
+    def _covariance_inverse_y_mu(self):
+        """
+        Returns the vector C^-1 * (y - mean) used in predictions. Models trained (and pickled) before the vector was
+        stored fall back to the saved covariance matrix inverse.
+        """
+        cov_inv_y_mu = getattr(self, 'covariance_inverse_y_mu', None)
+        if cov_inv_y_mu is None:
+            cov_inv_y_mu = np.matmul(self.covariance_matrix_inverse, self.optimal_y_mu)
+        return cov_inv_y_mu
+
     def training(self):
         """
         Main function for Kriging training.
@@ -511,6 +620,7 @@ class KrigingModel:
         bh_results = self.parameter_optimization(p)
         # Calculate other variables and parameters
         optimal_theta, optimal_reg_param, optimal_mean, optimal_variance, optimal_cov_mat, opt_cov_inv, optimal_ymu = self.optimal_parameter_evaluation(bh_results.x, p)
+        self._distance_cache = {}
         # Training performance
         training_ss_error, rmse_error, y_training_predictions = self.error_calculation(optimal_theta, p, optimal_mean, opt_cov_inv, optimal_ymu, self.x_data_scaled, self.y_data)
         r2_training = self.r2_calculation(self.y_data, y_training_predictions)
@@ -524,13 +634,14 @@ class KrigingModel:
         self.optimal_covariance_matrix = optimal_cov_mat
         self.covariance_matrix_inverse = opt_cov_inv
         self.optimal_y_mu = optimal_ymu
+        self.covariance_inverse_y_mu = self.covariance_solve(optimal_cov_mat, optimal_ymu)
         self.output_predictions = y_training_predictions
         self.training_R2 = r2_training
         self.training_rmse = rmse_error
         self.pickle_save({'model' : self})
         return self
 
-    def generate_expression(self, variable_list):
+    def generate_expression(self, variable_list, block=None):
         """
         The ``generate_expression`` method returns the Pyomo expression for the Kriging model trained.
 
@@ -539,10 +650,18 @@ class KrigingModel:
         Args:
             variable_list(list)           : List of input variables to be used in generating expression. This can be the a list generated from the output of ``get_feature_vector``.  The user can also choose to supply a new list of the appropriate length.
 
+        Keyword Args:
+            block(Pyomo Block)            : Block on which to build a compact, indexed form of the model. When supplied, the scaled training points, Kriging weights and
+                                            :math:`C^{-1}(y - \\mu)` are added to **block** as Params, the basis terms as one indexed Expression and the model output as the
+                                            Expression ``block.output``. Build time and memory then scale linearly with the number of training points, and each basis term is
+                                            written once as a common subexpression. The block should be dedicated to the surrogate. Default is None (a single expression).
+
         Returns:
             Pyomo Expression              : Pyomo expression of the Kriging model based on the variables provided in **variable_list**
 
         """
+        if block is not None:
+            return self._generate_indexed_expression(variable_list, block)
         t1 = np.array([variable_list])
         phi_var = []
         for i in range(0, self.x_data.shape[0]):
@@ -552,12 +671,34 @@ class KrigingModel:
             phi_var.append(curr_term)
         phi_var_array = np.asarray(phi_var)
 
-        phi_inv_times_y_mu = np.matmul(self.covariance_matrix_inverse, self.optimal_y_mu)
+        phi_inv_times_y_mu = self._covariance_inverse_y_mu()
         phi_inv_times_y_mu = phi_inv_times_y_mu.reshape(phi_inv_times_y_mu.shape[0], )
         kriging_expr = self.optimal_mean[0,0]
         kriging_expr += sum(w * t for w, t in zip(np.nditer(phi_inv_times_y_mu), np.nditer(phi_var_array, flags=['refs_ok']) ))
         return kriging_expr
 
+    def _generate_indexed_expression(self, variable_list, block):
+        """
+        Builds the Kriging model on **block** as indexed Params and Expressions and returns the output Expression.
+        """
+        n_points, n_features = self.x_data_scaled.shape
+        cov_inv_y_mu = self._covariance_inverse_y_mu().reshape(-1)
+        x_min = self.x_data_min.reshape(-1)
+        x_range = self.x_data_max.reshape(-1) - x_min
+        p = self.optimal_p
+
+        block.points = Set(initialize=range(n_points), ordered=True)
+        block.features = Set(initialize=range(n_features), ordered=True)
+        block.x_train = Param(block.points, block.features, initialize=lambda b, i, j: float(self.x_data_scaled[i, j]))
+        block.theta = Param(block.features, initialize=lambda b, j: float(self.optimal_weights[j]))
+        block.basis_weights = Param(block.points, initialize=lambda b, i: float(cov_inv_y_mu[i]))
+        block.scaled_inputs = Expression(block.features, rule=lambda b, j: (variable_list[j] - x_min[j]) / x_range[j])
+        block.basis = Expression(block.points, rule=lambda b, i: exp(
+            -sum(b.theta[j] * (b.scaled_inputs[j] - b.x_train[i, j]) ** p for j in b.features)))
+        block.output = Expression(
+            expr=float(self.optimal_mean[0, 0]) + sum_product(block.basis_weights, block.basis, index=block.points))
+        return block.output
+
     def get_feature_vector(self):
         """
 
@@ -964,7 +964,7 @@ class RadialBasisFunctions:
         y_prediction_unscaled = self.y_data_min + y_prediction_scaled * (self.y_data_max - self.y_data_min)
         return y_prediction_unscaled
 
-    def generate_expression(self, variable_list):
+    def generate_expression(self, variable_list, block=None):
         """
         The ``generate_expression`` method returns the Pyomo expression for the RBF model trained.
 
@@ -973,10 +973,18 @@ class RadialBasisFunctions:
         Args:
             variable_list(list)           : List of input variables to be used in generating expression. This can be the a list generated from the output of ``get_feature_vector``. The user can also choose to supply a new list of the appropriate length.
 
+        Keyword Args:
+            block(Pyomo Block)            : Block on which to build a compact, indexed form of the model. When supplied, the RBF centres and weights are added to **block** as Params,
+                                            the distances and basis terms as indexed Expressions and the model output as the Expression ``block.output``. Build time and memory then
+                                            scale linearly with the number of centres, and each basis term is written once as a common subexpression. The block should be dedicated
+                                            to the surrogate. Default is None (a single expression).
+
         Returns:
             Pyomo Expression              : Pyomo expression of the RBF model based on the variables provided in **variable_list**
 
         """
+        if block is not None:
+            return self._generate_indexed_expression(variable_list, block)
         t1 = np.array([variable_list])
         basis_vector = []
         # Calculate distances from centres
@@ -1014,6 +1022,41 @@ class RadialBasisFunctions:
         ))
         return rbf_expr
 
+    def _generate_indexed_expression(self, variable_list, block):
+        """
+        Builds the RBF model on **block** as indexed Params and Expressions and returns the output Expression.
+        """
+        n_centres, n_features = self.centres.shape
+        weights = self.weights.reshape(-1)
+        x_min = self.x_data_min.reshape(-1)
+        x_range = self.x_data_max.reshape(-1) - x_min
+        sigma = self.sigma
+
+        if self.basis_function == 'linear':
+            basis_function = lambda d: d
+        elif self.basis_function == 'cubic':
+            basis_function = lambda d: d ** 3
+        elif self.basis_function == 'gaussian':
+            basis_function = lambda d: exp(-1 * ((sigma * d) ** 2))
+        elif self.basis_function == 'mq':
+            basis_function = lambda d: (((d * sigma) ** 2) + 1) ** 0.5
+        elif self.basis_function == 'imq':
+            basis_function = lambda d: 1 / ((((d * sigma) ** 2) + 1) ** 0.5)
+        elif self.basis_function == 'spline':
+            basis_function = lambda d: (d ** 2) * log(d)
+
+        block.points = Set(initialize=range(n_centres), ordered=True)
+        block.features = Set(initialize=range(n_features), ordered=True)
+        block.centres = Param(block.points, block.features, initialize=lambda b, i, j: float(self.centres[i, j]))
+        block.basis_weights = Param(block.points, initialize=lambda b, i: float(weights[i]))
+        block.scaled_inputs = Expression(block.features, rule=lambda b, j: (variable_list[j] - x_min[j]) / x_range[j])
+        block.distance = Expression(block.points, rule=lambda b, i: sum(
+            (b.scaled_inputs[j] - b.centres[i, j]) ** 2 for j in b.features) ** 0.5)
+        block.basis = Expression(block.points, rule=lambda b, i: basis_function(b.distance[i]))
+        block.output = Expression(expr=float(self.y_data_min[0]) + float(self.y_data_max[0] - self.y_data_min[0]) *
+                                  sum_product(block.basis_weights, block.basis, index=block.points))
+        return block.output
+
     def get_feature_vector(self):
         """
 
@@ -19,6 +19,7 @@ import numpy as np
 import pandas as pd
 import warnings
 import itertools
+from scipy.spatial import cKDTree
 
 __author__ = "Oluwamayowa Amusat"
 
@@ -144,30 +145,73 @@ class SamplingMethods:
         closest_point = sorted_distances[0, :-1]
         return closest_point
 
-    def points_selection(self, full_data, generated_sample_points):
+    def points_selection(self, full_data, generated_sample_points, replacement=True):
         """
-        Uses L2-distance evaluation (implemented in nearest_neighbour) to find closest available points in original data to those generated by the sampling technique.
-        Calls the nearest_neighbour function for each row in the input data.
+        Finds the closest available points in original data to those generated by the sampling technique.
+        A KD-tree of the input data is built once and queried for all the generated points together, rather than
+        computing and sorting the L2-distances to every data row for each generated point (see nearest_neighbour).
 
         Args:
             full_data: refers to the input dataset supplied by the user.
             generated_sample_points(NumPy Array): The vector of points (number_of_sample rows) for which the closest points in the original data are to be found. Each row represents a sample point.
 
+        Keyword Args:
+            replacement(bool): Whether a data point may be selected for more than one generated point. When False, the generated points are processed in order and each is assigned the closest data point not already selected. Default is True.
+
         Returns:
             equivalent_points: Array containing the points (in rows) most similar to those in generated_sample_points
-        """
 
-        equivalent_points = np.zeros((generated_sample_points.shape[0], generated_sample_points.shape[1] + 1))
-        for i in range(0, generated_sample_points.shape[0]):
-            closest_point = self.nearest_neighbour(full_data, generated_sample_points[i, :])
-            equivalent_points[i, :] = closest_point
-        return equivalent_points
+        Raises:
+            ValueError: When the generated points do not have the same number of features as the data, or when selecting without replacement and there are more generated points than data points.
+        """
+        x_data = full_data[:, :-1]
+        if generated_sample_points.shape[1] != x_data.shape[1]:
+            raise ValueError('Generated sample points must have the same number of features as the input data.')
+        no_points = generated_sample_points.shape[0]
+        if not replacement and no_points > full_data.shape[0]:
+            raise ValueError('Cannot select more samples than available data points without replacement.')
+
+        if x_data.shape[1] == 0:
+            # No features: all data points are equally close
+            closest = np.zeros(no_points, dtype=int) if replacement else np.arange(no_points)
+            return full_data[closest, :]
+
+        tree = cKDTree(x_data)
+        if replacement:
+            _, closest = tree.query(generated_sample_points, k=1)
+        else:
+            closest = self._nearest_unused_points(tree, generated_sample_points, full_data.shape[0])
+        return full_data[closest, :]
 
-    def sample_point_selection(self, full_data, sample_points, sampling_type):
+    @staticmethod
+    def _nearest_unused_points(tree, points, no_data):
+        """
+        Returns the index of the closest data point to each row of points that has not been assigned to a previous row.
+        The k closest data points are retrieved for all points in a single query; the search is widened for the
+        (usually few) points whose k closest data points have all been taken.
+        """
+        k = min(no_data, 8)
+        _, candidates = tree.query(points, k=k)
+        candidates = candidates.reshape(points.shape[0], k)
+        used = np.zeros(no_data, dtype=bool)
+        closest = np.zeros(points.shape[0], dtype=int)
+        for i in range(0, points.shape[0]):
+            row = candidates[i, :]
+            free = row[~used[row]]
+            search_size = k
+            while free.size == 0:
+                search_size = min(2 * search_size, no_data)
+                _, row = tree.query(points[i, :], k=search_size)
+                free = np.atleast_1d(row)[~used[row]]
+            closest[i] = free[0]
+            used[free[0]] = True
+        return closest
+
+    def sample_point_selection(self, full_data, sample_points, sampling_type, replacement=True):
         if sampling_type == 'selection':
             sd = FeatureScaling()
             scaled_data, data_min, data_max = sd.data_scaling_minmax(full_data)
-            points_closest_scaled = self.points_selection(scaled_data, sample_points)
+            points_closest_scaled = self.points_selection(scaled_data, sample_points, replacement=replacement)
             points_closest_unscaled = sd.data_unscaling_minmax(points_closest_scaled, data_min, data_max)
 
             unique_sample_points = np.unique(points_closest_unscaled, axis=0)
@@ -490,7 +534,7 @@ class LatinHypercubeSampling(SamplingMethods):
             vector_of_points[:, i] = z_col
         return vector_of_points
 
-    def sample_points(self):
+    def sample_points(self, replacement=True):
         """
         ``sample_points`` generates or selects Latin Hypercube samples from an input dataset or data range. When called, it:
 
@@ -498,6 +542,9 @@ class LatinHypercubeSampling(SamplingMethods):
             2. generates potential sample points by random shuffling, and
             3. when a dataset is provided, selects the closest available samples to the theoretical sample points from within the input data.
 
+        Keyword Args:
+            replacement(bool): In "selection" mode, whether the same data point may be selected for more than one generated sample point. When False, each generated point is matched to the closest data point not already selected, so no repeated samples are returned. Default is True.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing **number_of_samples** points selected or generated by LHS.
 
@@ -505,7 +552,7 @@ class LatinHypercubeSampling(SamplingMethods):
 
         vector_of_points = self.lhs_points_generation()  # Assumes [X, Y] data is supplied.
         generated_sample_points = self.random_shuffling(vector_of_points)
-        unique_sample_points = self.sample_point_selection(self.data, generated_sample_points, self.sampling_type)
+        unique_sample_points = self.sample_point_selection(self.data, generated_sample_points, self.sampling_type, replacement=replacement)
 
         if len(self.data_headers) > 0:
             unique_sample_points = pd.DataFrame(unique_sample_points, columns=self.data_headers)
@@ -631,10 +678,13 @@ class UniformSampling(SamplingMethods):
         if self.sampling_type == 'selection' and self.number_of_samples > data.shape[0]:
             raise Exception('Sample size cannot be greater than number of samples in the input data set')
 
-    def sample_points(self):
+    def sample_points(self, replacement=True):
         """
         ``sample_points`` generates or selects full-factorial designs from an input dataset or data range.
 
+        Keyword Args:
+            replacement(bool): In "selection" mode, whether the same data point may be selected for more than one generated sample point. When False, each generated point is matched to the closest data point not already selected, so no repeated samples are returned. Default is True.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing the sample points generated or selected by full-factorial sampling.
 
@@ -653,7 +703,7 @@ class UniformSampling(SamplingMethods):
                 points_spread.append(shifted_points)
         samples_list = list(itertools.product(*points_spread))
         samples_array = np.asarray(samples_list)
-        unique_sample_points = self.sample_point_selection(self.data, samples_array, self.sampling_type)
+        unique_sample_points = self.sample_point_selection(self.data, samples_array, self.sampling_type, replacement=replacement)
         if len(self.data_headers) > 0:
             unique_sample_points = pd.DataFrame(unique_sample_points, columns=self.data_headers)
         return unique_sample_points
@@ -778,7 +828,7 @@ class HaltonSampling(SamplingMethods):
             raise Exception(
                 'Dimensionality problem: This method is not available for problems with dimensionality > 10: the performance of the method degrades substantially at higher dimensions')
 
-    def sample_points(self):
+    def sample_points(self, replacement=True):
         """
         The ``sample_points`` method generates the Halton samples. The steps followed here are:
 
@@ -788,6 +838,9 @@ class HaltonSampling(SamplingMethods):
             4. Create the Halton samples by combining the corresponding elements of the Halton sequences for each prime.
             5. When in "selection" mode, determine the closest corresponding point in the input dataset using Euclidean distance minimization. This is done by calling the ``nearest_neighbours`` method in the sampling superclass.
 
+        Keyword Args:
+            replacement(bool): In "selection" mode, whether the same data point may be selected for more than one generated sample point. When False, each generated point is matched to the closest data point not already selected, so no repeated samples are returned. Default is True.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing **number_of_samples** Halton sample points.
 
@@ -799,7 +852,7 @@ class HaltonSampling(SamplingMethods):
         for i in range(0, no_features):
             sample_points[:, i] = self.data_sequencing(self.number_of_samples, prime_list[i])
         # Scale input data, then find data points closest in sample space. Unscale before returning points
-        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type)
+        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type, replacement=replacement)
         if len(self.data_headers) > 0:
             unique_sample_points = pd.DataFrame(unique_sample_points, columns=self.data_headers)
         return unique_sample_points
@@ -923,7 +976,7 @@ class HammersleySampling(SamplingMethods):
             raise Exception(
                 'Dimensionality problem: This method is not available for problems with dimensionality > 10: the performance of the method degrades substantially at higher dimensions')
 
-    def sample_points(self):
+    def sample_points(self, replacement=True):
         """
         The **sampling_type** method generates the Hammersley sample points. The steps followed here are:
 
@@ -934,6 +987,9 @@ class HammersleySampling(SamplingMethods):
             5. Create the Hammersley samples by combining the corresponding elements of the Hammersley sequences created in steps 3 and 4
             6. When in "selection" mode, determine the closest corresponding point in the input dataset using Euclidean distance minimization. This is done by calling the ``nearest_neighbours`` method in the sampling superclass.
 
+        Keyword Args:
+            replacement(bool): In "selection" mode, whether the same data point may be selected for more than one generated sample point. When False, each generated point is matched to the closest data point not already selected, so no repeated samples are returned. Default is True.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing **number_of_samples** Hammersley sample points.
 
@@ -948,7 +1004,7 @@ class HammersleySampling(SamplingMethods):
         for i in range(0, len(prime_list)):
             sample_points[:, i + 1] = self.data_sequencing(self.number_of_samples, prime_list[i])
 
-        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type)
+        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type, replacement=replacement)
         if len(self.data_headers) > 0:
             unique_sample_points = pd.DataFrame(unique_sample_points, columns=self.data_headers)
         return unique_sample_points
@@ -1160,27 +1216,31 @@ class CVTSampling(SamplingMethods):
         (3) Create the new centres as the weighted average of the current centres (initial_centres) and the mean data calculated in the second step. The weighting is done based on the number of iterations (counter).
 
         """
-        centres = np.zeros((initial_centres.shape[0], initial_centres.shape[1]))
-        current_centres = current_centres.reshape(current_centres.shape[0], 1)
-        for i in range(0, initial_centres.shape[0]):
-            data_matrix = current_random_points[current_centres[:, 0] == i]
-            m_prime, n_prime = data_matrix.shape
-            if m_prime == 0:
-                centres[i, :] = np.mean(initial_centres, axis=0)
-            else:
-                centres[i, :] = np.mean(data_matrix, axis=0)
+        no_centres, no_features = initial_centres.shape
+        current_centres = current_centres.reshape(current_centres.shape[0]).astype(int)
+        # Class sizes and per-class sums of the random points, for all classes at once
+        class_size = np.bincount(current_centres, minlength=no_centres)
+        centres = np.zeros((no_centres, no_features))
+        for j in range(0, no_features):
+            centres[:, j] = np.bincount(current_centres, weights=current_random_points[:, j], minlength=no_centres)
+        empty = class_size == 0
+        centres[~empty, :] /= class_size[~empty].reshape(-1, 1)
+        centres[empty, :] = np.mean(initial_centres, axis=0)
 
         # Weighted average based on previous number of iterations
         centres = ((counter * initial_centres) + centres) / (counter + 1)
         return centres
 
-    def sample_points(self):
+    def sample_points(self, replacement=True):
         """
         The ``sample_points`` method determines the best/optimal centre points (centroids) for a data set based on the minimization of the total distance between points and centres.
 
         Procedure based on McQueen's algorithm: iteratively minimize distance, and re-position centroids.
         Centre re-calculation done as the mean of each data cluster around each centre.
 
+        Keyword Args:
+            replacement(bool): In "selection" mode, whether the same data point may be selected for more than one generated sample point. When False, each generated point is matched to the closest data point not already selected, so no repeated samples are returned. Default is True.
+
         Returns:
             NumPy Array or Pandas Dataframe:     A numpy array or Pandas dataframe containing the final **number_of_samples** centroids obtained by the CVT algorithm.
 
@@ -1196,15 +1256,9 @@ class CVTSampling(SamplingMethods):
         while (cost_change > self.eps) and (counter <= 1000):
             cost_old = cost_new
             current_random_points = self.random_sample_selection(self.number_of_centres * size_multiple, n)
-            distance_matrix = np.zeros(
-                (current_random_points.shape[0], initial_centres.shape[0]))  # Vector to store distances from centroids
-            current_centres = np.zeros(
-                (current_random_points.shape[0], 1))  # Vector containing the centroid each point belongs to
-
-            # Calculate distance between random points and centres, sort and estimate new centres
-            for i in range(0, self.number_of_centres):
-                distance_matrix[:, i] = self.eucl_distance(current_random_points, initial_centres[i, :])
-            current_centres = (np.argmin(distance_matrix, axis=1))
+
+            # Find the closest centre to each random point (its class) with a KD-tree of the centres and estimate new centres
+            _, current_centres = cKDTree(initial_centres).query(current_random_points, k=1)
             new_centres = self.create_centres(initial_centres, current_random_points, current_centres, counter)
 
             # Estimate distance between new and old centres
@@ -1218,7 +1272,7 @@ class CVTSampling(SamplingMethods):
 
         sample_points = new_centres
 
-        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type)
+        unique_sample_points = self.sample_point_selection(self.data, sample_points, self.sampling_type, replacement=replacement)
         if len(self.data_headers) > 0:
             unique_sample_points = pd.DataFrame(unique_sample_points, columns=self.data_headers)
         return unique_sample_points
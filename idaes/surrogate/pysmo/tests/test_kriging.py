@@ -13,6 +13,7 @@
 import sys
 import os
 import io
+import pickle
 from unittest.mock import patch
 sys.path.append(os.path.abspath('..')) # current folder is ~/tests
 from idaes.surrogate.pysmo.kriging import (
@@ -20,6 +21,7 @@ from idaes.surrogate.pysmo.kriging import (
 )
 import numpy as np
 import pandas as pd
+from pyomo.environ import Block, ConcreteModel, Var, value
 from scipy.spatial import distance
 import scipy.optimize as opt
 import scipy.stats as stats
@@ -457,5 +459,136 @@ class TestKrigingModel:
         KrigingClass.parity_residual_plots()
 
 
+    @pytest.mark.unit
+    def test_pairwise_distance_tensor(self):
+        np.random.seed(0)
+        x = np.random.rand(7, 3)
+        p = 2
+        distances = KrigingModel.pairwise_distance_tensor(x, p)
+        assert distances.shape == (21, 3)
+        k = 0
+        for i in range(0, 7):
+            for j in range(i + 1, 7):
+                np.testing.assert_allclose(distances[k, :], np.abs(x[i, :] - x[j, :]) ** p)
+                k += 1
+
+
+    @pytest.mark.unit
+    def test_covariance_matrix_generator_vectorized(self):
+        np.random.seed(0)
+        x = np.random.rand(30, 3)
+        theta = np.array([0.5, 2, 10])
+        reg_param = 1e-4
+        p = 2
+        cov_matrix_exp = np.zeros((x.shape[0], x.shape[0]))
+        for i in range(0, x.shape[0]):
+            cov_matrix_exp[i, :] = np.exp(-1 * np.matmul(np.abs(x[i, :] - x) ** p, theta))
+        cov_matrix_exp += reg_param * np.eye(x.shape[0])
+        cov_matrix = KrigingModel.covariance_matrix_generator(x, theta, reg_param, p)
+        np.testing.assert_allclose(cov_matrix, cov_matrix_exp, rtol=1e-12, atol=1e-14)
+        # Supplying a precomputed distance tensor gives the same matrix
+        distances = KrigingModel.pairwise_distance_tensor(x, p)
+        np.testing.assert_array_equal(
+            KrigingModel.covariance_matrix_generator(x, theta, reg_param, p, distances=distances), cov_matrix)
+
+
+    @pytest.mark.unit
+    def test_objective_function_distance_cache(self):
+        KrigingClass = KrigingModel(np.array(self.training_data), regularization=True)
+        p = 2
+        var_vector = np.array([0.1, -0.3, 1e-4])
+        of_1 = KrigingClass.objective_function(var_vector, KrigingClass.x_data_scaled, KrigingClass.y_data, p)
+        assert p in KrigingClass._distance_cache
+        cached = KrigingClass._distance_cache[p]
+        of_2 = KrigingClass.objective_function(var_vector, KrigingClass.x_data_scaled, KrigingClass.y_data, p)
+        assert KrigingClass._distance_cache[p] is cached
+        assert of_1 == of_2
+
+        # Compare with the likelihood computed from the explicit inverse
+        theta = 10 ** var_vector[:-1]
+        cov_mat = KrigingClass.covariance_matrix_generator(KrigingClass.x_data_scaled, theta, var_vector[-1], p)
+        cov_inv = np.linalg.inv(cov_mat)
+        km = KrigingClass.kriging_mean(cov_inv, KrigingClass.y_data)
+        y_mu = KrigingClass.y_mu_calculation(KrigingClass.y_data, km)
+        ssd = KrigingClass.kriging_sd(cov_inv, y_mu, KrigingClass.y_data.shape[0])
+        log_like = 0.5 * KrigingClass.y_data.shape[0] * np.log(ssd) + 0.5 * np.log(np.linalg.det(cov_mat))
+        np.testing.assert_allclose(of_1, log_like[0, 0], rtol=1e-8)
+
+
+    @pytest.mark.unit
+    def test_objective_function_not_positive_definite(self):
+        KrigingClass = KrigingModel(np.array(self.training_data), regularization=True)
+        # Duplicate training points make the unregularized covariance matrix singular
+        x = np.vstack((KrigingClass.x_data_scaled, KrigingClass.x_data_scaled))
+        y = np.vstack((KrigingClass.y_data, KrigingClass.y_data))
+        var_vector = np.array([-3.0, -3.0, 0.0])
+        assert KrigingClass.objective_function(var_vector, x, y, 2) == 1e4
+
+
+    @pytest.mark.unit
+    def test_cross_covariance_generator(self):
+        np.random.seed(0)
+        x = np.random.rand(20, 2)
+        x_pred = np.random.rand(11, 2)
+        theta = np.array([1.5, 3])
+        blocks = list(KrigingModel.cross_covariance_generator(x_pred, x, theta, 2, chunk_size=4))
+        assert [start for start, _ in blocks] == [0, 4, 8]
+        psi = np.vstack([b for _, b in blocks])
+        psi_exp = np.exp(-1 * np.matmul(np.abs(x_pred[:, None, :] - x[None, :, :]) ** 2, theta))
+        np.testing.assert_allclose(psi, psi_exp, rtol=1e-12)
+
+
+    @pytest.mark.unit
+    def test_predict_output_batched(self):
+        np.random.seed(0)
+        KrigingClass = KrigingModel(np.array(self.training_data), fname='kriging_batched.pickle', overwrite=True)
+        KrigingClass.training()
+        assert KrigingClass._distance_cache == {}
+        x_test = np.random.rand(50, 2) * 10
+        y_pred = KrigingClass.predict_output(x_test)
+        x_test_scaled = (x_test - KrigingClass.x_data_min) / (KrigingClass.x_data_max - KrigingClass.x_data_min)
+        y_pred_exp = np.zeros((x_test.shape[0], 1))
+        for i in range(0, x_test.shape[0]):
+            cmt = np.matmul(np.abs(x_test_scaled[i, :] - KrigingClass.x_data_scaled) ** 2, KrigingClass.optimal_weights)
+            y_pred_exp[i, 0] = KrigingClass.optimal_mean + np.matmul(
+                np.matmul(np.exp(-1 * cmt), KrigingClass.covariance_matrix_inverse), KrigingClass.optimal_y_mu)
+        np.testing.assert_allclose(y_pred, y_pred_exp, rtol=1e-6)
+
+        # Models without the stored solve vector fall back to the covariance matrix inverse
+        KrigingClass.covariance_inverse_y_mu = None
+        np.testing.assert_allclose(KrigingClass.predict_output(x_test), y_pred_exp, rtol=1e-6)
+        os.remove('kriging_batched.pickle')
+
+
+    @pytest.mark.unit
+    def test_pickle_excludes_distance_cache(self):
+        KrigingClass = KrigingModel(np.array(self.training_data))
+        KrigingClass.objective_function(np.array([0, 0, 1e-4]), KrigingClass.x_data_scaled, KrigingClass.y_data, 2)
+        assert KrigingClass._distance_cache
+        loaded = pickle.loads(pickle.dumps(KrigingClass))
+        assert loaded._distance_cache == {}
+        assert KrigingClass._distance_cache
+
+
+    @pytest.mark.unit
+    def test_kriging_generate_expression_indexed(self):
+        np.random.seed(0)
+        KrigingClass = KrigingModel(np.array(self.training_data), fname='kriging_indexed.pickle', overwrite=True)
+        KrigingClass.training()
+        m = ConcreteModel()
+        m.x = Var([0, 1], initialize={0: 1.3, 1: 7.1})
+        m.surrogate = Block()
+        expr = KrigingClass.generate_expression([m.x[0], m.x[1]])
+        indexed_expr = KrigingClass.generate_expression([m.x[0], m.x[1]], block=m.surrogate)
+        assert indexed_expr is m.surrogate.output
+        assert len(m.surrogate.x_train) == 2 * len(m.surrogate.points) == 2 * len(self.training_data)
+        assert len(m.surrogate.basis) == len(self.training_data)
+        assert value(indexed_expr) == pytest.approx(value(expr), rel=1e-10)
+        assert value(indexed_expr) == pytest.approx(KrigingClass.predict_output(np.array([[1.3, 7.1]]))[0, 0], rel=1e-8)
+        m.x[0] = 8.2
+        assert value(indexed_expr) == pytest.approx(value(expr), rel=1e-10)
+        os.remove('kriging_indexed.pickle')
+
+
 if __name__ == '__main__':
     pytest.main()
\ No newline at end of file
@@ -20,6 +20,7 @@ from idaes.surrogate.pysmo.radial_basis_function import (
 )
 import numpy as np
 import pandas as pd
+from pyomo.environ import Block, ConcreteModel, Var, value
 from scipy.spatial import distance
 import pytest
 
@@ -1300,6 +1301,27 @@ class TestRadialBasisFunction:
             lv.append(p[i])
         rbf_expr = results.generate_expression((lv))
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("basis_function", ['linear', 'cubic', 'gaussian', 'mq', 'imq', 'spline'])
+    def test_rbf_generate_expression_indexed(self, basis_function):
+        data_feed = RadialBasisFunctions(np.array(self.training_data), basis_function=basis_function,
+                                         solution_method=None, regularization=False,
+                                         fname='rbf_indexed.pickle', overwrite=True)
+        data_feed.training()
+        m = ConcreteModel()
+        m.x = Var([0, 1], initialize={0: 1.3, 1: 7.1})
+        m.surrogate = Block()
+        expr = data_feed.generate_expression([m.x[0], m.x[1]])
+        indexed_expr = data_feed.generate_expression([m.x[0], m.x[1]], block=m.surrogate)
+        assert indexed_expr is m.surrogate.output
+        assert len(m.surrogate.centres) == 2 * len(m.surrogate.points) == 2 * len(self.training_data)
+        assert len(m.surrogate.basis) == len(self.training_data)
+        assert value(indexed_expr) == pytest.approx(value(expr), rel=1e-10)
+        assert value(indexed_expr) == pytest.approx(data_feed.predict_output(np.array([[1.3, 7.1]]))[0, 0], rel=1e-8)
+        m.x[1] = 2.4
+        assert value(indexed_expr) == pytest.approx(value(expr), rel=1e-10)
+        os.remove('rbf_indexed.pickle')
+
     @pytest.mark.unit
     @pytest.fixture(scope='module')
     @pytest.mark.parametrize("array_type", [np.array, pd.DataFrame])
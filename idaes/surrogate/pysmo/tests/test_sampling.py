@@ -241,6 +241,55 @@ class TestSamplingMethods:
                 input_array, generated_sample_points
             )
     @pytest.mark.unit
+    def test_points_selection_06(self):
+        # KD-tree selection matches nearest_neighbour on random data
+        np.random.seed(0)
+        input_array = np.random.rand(500, 4)
+        generated_sample_points = np.random.rand(50, 3)
+        SamplingClass = SamplingMethods()
+        equivalent_points = SamplingClass.points_selection(input_array, generated_sample_points)
+        for i in range(generated_sample_points.shape[0]):
+            np.testing.assert_array_equal(
+                equivalent_points[i, :],
+                SamplingClass.nearest_neighbour(input_array, generated_sample_points[i, :]))
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_01(self):
+        input_array = np.array(self.test_data_3d)
+        # All generated points are closest to the first row
+        generated_sample_points = np.array([[-0.5, 10], [-0.4, 10], [-0.3, 10]])
+        SamplingClass = SamplingMethods()
+        equivalent_points = SamplingClass.points_selection(
+            input_array, generated_sample_points, replacement=False)
+        np.testing.assert_array_equal(equivalent_points, input_array[0:3, :])
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_02(self):
+        # Matches a greedy brute-force selection, including points whose 8 closest rows are taken
+        np.random.seed(1)
+        input_array = np.random.rand(200, 3)
+        generated_sample_points = np.vstack((np.random.rand(30, 2), np.full((30, 2), 0.5)))
+        SamplingClass = SamplingMethods()
+        equivalent_points = SamplingClass.points_selection(
+            input_array, generated_sample_points, replacement=False)
+        available = input_array.copy()
+        for i in range(generated_sample_points.shape[0]):
+            closest = SamplingClass.nearest_neighbour(available, generated_sample_points[i, :])
+            np.testing.assert_array_equal(equivalent_points[i, :], closest)
+            available = available[np.any(available != closest, axis=1)]
+        assert np.unique(equivalent_points, axis=0).shape[0] == generated_sample_points.shape[0]
+
+    @pytest.mark.unit
+    def test_points_selection_without_replacement_03(self):
+        SamplingClass = SamplingMethods()
+        input_array = np.array(self.test_data_1d)
+        equivalent_points = SamplingClass.points_selection(
+            input_array, np.zeros((3, 0)), replacement=False)
+        np.testing.assert_array_equal(equivalent_points, input_array[0:3, :])
+        with pytest.raises(ValueError):
+            SamplingClass.points_selection(np.array(self.test_data_3d), np.zeros((11, 2)), replacement=False)
+
+    @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])
     def test_sample_point_selection_01(self, array_type):
         input_array = array_type(self.test_data_3d)
@@ -724,6 +773,16 @@ class TestLatinHypercubeSampling:
             )
             np.testing.assert_array_equal(expected_testing, out_testing)
 
+    @pytest.mark.unit
+    @pytest.mark.parametrize("as_frame", [False, True])
+    def test_sample_points_without_replacement(self, as_frame):
+        input_array = pd.DataFrame(self.full_data) if as_frame else self.y
+        np.random.seed(0)
+        LHSClass = LatinHypercubeSampling(input_array, number_of_samples=100, sampling_type="selection")
+        unique_sample_points = LHSClass.sample_points(replacement=False)
+        assert unique_sample_points.shape[0] == 100
+        assert len(np.unique(np.asarray(unique_sample_points), axis=0)) == 100
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [list])
     def test_sample_points_02(self, array_type):
@@ -2084,6 +2143,27 @@ class TestCVTSampling:
         np.testing.assert_array_equal(expected_output, output)
 
 
+    @pytest.mark.unit
+    def test_create_centres_05(self):
+        np.random.seed(0)
+        initial_centres = np.random.rand(20, 3)
+        current_random_points = np.random.rand(500, 3)
+        # Leave class 7 empty
+        current_centres = np.random.choice([i for i in range(20) if i != 7], 500)
+        counter = 3
+        expected_output = np.zeros((20, 3))
+        for i in range(20):
+            members = current_random_points[current_centres == i]
+            if members.shape[0] == 0:
+                expected_output[i, :] = np.mean(initial_centres, axis=0)
+            else:
+                expected_output[i, :] = np.mean(members, axis=0)
+        expected_output = (counter * initial_centres + expected_output) / (counter + 1)
+        output = CVTSampling.create_centres(
+            initial_centres, current_random_points, current_centres, counter
+        )
+        np.testing.assert_allclose(expected_output, output, rtol=1e-12)
+
     @pytest.mark.unit
     @pytest.mark.parametrize("array_type", [np.array])   
     def test_sample_points_01(self, array_type):
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of the bubble and dew point initial guesses calculated by
+GenericStateBlock.initialize for an indexed StateBlock using the
+benzene-toluene ideal property package.
+
+The guesses are computed in two ways:
+
+* per-block: a Newton iteration on Pyomo expressions for each StateBlock, as
+  used for Psat methods without a NumPy implementation.
+* batched: one NumPy Newton iteration for all StateBlocks sharing a
+  parameter block and phase pair.
+
+Usage: python bubble_dew_init_benchmark.py [number of StateBlocks]
+"""
+import sys
+import time
+
+import numpy as np
+from pyomo.environ import ConcreteModel
+
+from idaes.generic_models.properties.core.generic.generic_property import (
+    GenericParameterBlock,
+    _initialize_bubble_dew,
+    _initialize_bubble_dew_block,
+    _valid_VL_component_list)
+from idaes.generic_models.properties.core.examples.BT_ideal import (
+    configuration)
+
+
+def build(n):
+    m = ConcreteModel()
+    m.params = GenericParameterBlock(default=configuration)
+    m.props = m.params.build_state_block(
+        range(n), default={"defined_state": True})
+
+    rng = np.random.default_rng(0)
+    for k in m.props:
+        x = rng.random()
+        m.props[k].flow_mol.fix(1)
+        m.props[k].temperature.fix(340 + 40*rng.random())
+        m.props[k].pressure.fix(1e5*(0.8 + 0.5*rng.random()))
+        m.props[k].mole_frac_comp["benzene"].fix(x)
+        m.props[k].mole_frac_comp["toluene"].fix(1 - x)
+    return m
+
+
+def run(n):
+    t0 = time.time()
+    m = build(n)
+    print(f"{n} StateBlocks built in {time.time() - t0:.2f} s")
+
+    t0 = time.time()
+    _initialize_bubble_dew(m.props)
+    t_batched = time.time() - t0
+    batched = [m.props[k].temperature_bubble["Vap", "Liq"].value
+               for k in m.props]
+
+    t0 = time.time()
+    for k in m.props:
+        for pp in m.props[k].params._pe_pairs:
+            _initialize_bubble_dew_block(
+                m.props[k], pp, _valid_VL_component_list(m.props[k], pp))
+    t_block = time.time() - t0
+    per_block = [m.props[k].temperature_bubble["Vap", "Liq"].value
+                 for k in m.props]
+
+    assert np.allclose(batched, per_block, rtol=1e-8)
+
+    print(f"    per-block: {t_block:8.3f} s")
+    print(f"    batched:   {t_batched:8.3f} s")
+    print(f"    speedup:   {t_block/t_batched:8.1f} x")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of shifting a rolling horizon forward in time on the caprese
+CSTR controller model.
+
+Each sample, the values of all variables and the IPOPT bound multipliers
+are shifted forward by one sample time. This is done in two ways:
+
+* loop: for every time point, find_nearest_index is called and every
+  variable is indexed by time, as was done before the time shift map.
+* map: DynamicBlock.advance_by_time and advance_ipopt_multipliers, which
+  use a cached shift map and array of variable data objects.
+
+Usage: python caprese_shift_benchmark.py [ntfe] [n_samples]
+"""
+import sys
+import time
+
+from idaes.apps.caprese.examples.cstr_model import make_model
+from idaes.apps.caprese.dynamic_block import DynamicBlock
+from idaes.apps.caprese.nmpc_var import (
+        DiffVar, DerivVar, AlgVar, InputVar, FixedVar)
+
+VALUE_CTYPES = (DiffVar, DerivVar, AlgVar, InputVar, FixedVar)
+MULTIPLIER_CTYPES = (DiffVar, AlgVar, InputVar)
+
+
+def advance_by_time_loop(blk, t_shift, ctype=VALUE_CTYPES, tolerance=1e-8):
+    time = blk.time
+    for t in time:
+        idx = time.find_nearest_index(t + t_shift, tolerance)
+        if idx is None:
+            continue
+        ts = time[idx]
+        for var in blk.component_objects(ctype):
+            var[t].set_value(var[ts].value)
+
+
+def advance_ipopt_multipliers_loop(blk, t_shift, ctype=MULTIPLIER_CTYPES,
+        tolerance=1e-8):
+    time = blk.time
+    zL = blk.ipopt_zL_in
+    zU = blk.ipopt_zU_in
+    for t in time:
+        idx = time.find_nearest_index(t + t_shift, tolerance)
+        if idx is None:
+            continue
+        ts = time[idx]
+        for var in blk.component_objects(ctype):
+            if var[t] in zL and var[ts] in zL:
+                zL[var[t]] = zL[var[ts]]
+            if var[t] in zU and var[ts] in zU:
+                zU[var[t]] = zU[var[ts]]
+
+
+def make_block(ntfe, sample_time):
+    m = make_model(horizon=ntfe*0.1, ntfe=ntfe, ntcp=2, bounds=True)
+    inputs = [
+            m.fs.mixer.S_inlet.flow_vol[0],
+            m.fs.mixer.E_inlet.flow_vol[0],
+            ]
+    measurements = [
+            m.fs.cstr.outlet.conc_mol[0, 'C'],
+            m.fs.cstr.outlet.conc_mol[0, 'E'],
+            m.fs.cstr.outlet.conc_mol[0, 'S'],
+            m.fs.cstr.outlet.conc_mol[0, 'P'],
+            m.fs.cstr.outlet.temperature[0],
+            m.fs.cstr.volume[0],
+            ]
+    blk = DynamicBlock(
+            model=m,
+            time=m.fs.time,
+            inputs=inputs,
+            measurements=measurements,
+            )
+    blk.construct()
+    blk.set_sample_time(sample_time)
+    blk.add_ipopt_suffixes()
+    for i, t in enumerate(blk.time):
+        for var in blk.component_objects(VALUE_CTYPES):
+            var[t].set_value(float(i))
+        for var in blk.component_objects(MULTIPLIER_CTYPES):
+            blk.ipopt_zL_in[var[t]] = float(i)
+            blk.ipopt_zU_in[var[t]] = -float(i)
+    return blk
+
+
+def snapshot(blk):
+    values = [v.value for v in blk.get_vardata_array(VALUE_CTYPES).flat]
+    multipliers = blk.get_vardata_array(MULTIPLIER_CTYPES).flat
+    zL = [blk.ipopt_zL_in.get(v) for v in multipliers]
+    zU = [blk.ipopt_zU_in.get(v) for v in multipliers]
+    return values, zL, zU
+
+
+def run(ntfe, n_samples, sample_time=0.5):
+    t0 = time.time()
+    blk_loop = make_block(ntfe, sample_time)
+    blk_map = make_block(ntfe, sample_time)
+    n_vars = len(blk_map.get_vardata_array(VALUE_CTYPES))
+    print(f"ntfe={ntfe}: {n_vars} time-indexed variables, "
+          f"{len(blk_map.time)} time points, "
+          f"built in {time.time() - t0:.2f} s")
+
+    t0 = time.time()
+    for _ in range(n_samples):
+        advance_by_time_loop(blk_loop, sample_time)
+        advance_ipopt_multipliers_loop(blk_loop, sample_time)
+    t_loop = time.time() - t0
+
+    t0 = time.time()
+    for _ in range(n_samples):
+        blk_map.advance_one_sample()
+        blk_map.advance_ipopt_multipliers_one_sample()
+    t_map = time.time() - t0
+
+    loop_values, loop_zL, loop_zU = snapshot(blk_loop)
+    map_values, map_zL, map_zU = snapshot(blk_map)
+    assert loop_values == map_values
+    assert loop_zL == map_zL
+    assert loop_zU == map_zU
+
+    print(f"    {n_samples} samples, loop: {t_loop:8.3f} s")
+    print(f"    {n_samples} samples, map:  {t_map:8.3f} s")
+    print(f"    speedup:          {t_loop/t_map:8.1f} x")
+
+
+if __name__ == "__main__":
+    ntfe = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    run(ntfe, n_samples)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of finding related resources in a synthetic DMF workspace.
+
+The workspace has an SQLite resource database with groups of resources
+that record provenance: a surrogate model uses a flowsheet, which uses a
+number of data sets. Related resources are found in two ways:
+
+* scan: the relations of every resource in the database are read to build
+  a map of all relations, as was done before the relations table.
+* index: ResourceDB.find_related, which looks up the relations of each
+  resource it reaches in the relations table.
+
+Finally, the `dmf related` command is run on the workspace.
+
+Usage: python dmf_related_benchmark.py [n_resources] [group_size]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from click.testing import CliRunner
+
+from idaes.dmf import cli, resource
+from idaes.dmf.dmfbase import DMF, DMFConfig
+from idaes.dmf.resource import Resource, triple_from_resource_relations
+
+META = [Resource.ID_FIELD, "aliases", "type"]
+
+
+def find_related_scan(db, id_, outgoing=True, meta=META):
+    """Find related resources by building a map of all relations."""
+    relation_map = {}
+    for rsrc in db._documents():
+        uuid = rsrc[Resource.ID_FIELD]
+        for rrel in rsrc["relations"]:
+            rel = triple_from_resource_relations(uuid, rrel)
+            if (outgoing and rel.subject == uuid) or (
+                not outgoing and rel.object == uuid
+            ):
+                continue
+            key = rel.subject if outgoing else rel.object
+            meta_info = {k: rsrc[k] for k in meta}
+            relation_map.setdefault(key, []).append((rel, meta_info))
+    result, q, depth, visited = [], relation_map.get(id_, []), 0, {id_}
+    while q:
+        depth += 1
+        n = len(q)
+        for rel, meta_info in q[:n]:
+            result.append((depth, rel, meta_info))
+            next_id = rel.object if outgoing else rel.subject
+            if next_id not in visited:
+                q.extend(relation_map.get(next_id, []))
+                visited.add(next_id)
+        q = q[n:]
+    return result
+
+
+def make_group(g, group_size):
+    surrogate = Resource(value={"desc": f"surrogate {g}"}, type_="surrogate_model")
+    flowsheet = Resource(value={"desc": f"flowsheet {g}"}, type_="flowsheet")
+    surrogate.v["aliases"] = [f"surrogate{g}"]
+    flowsheet.v["aliases"] = [f"flowsheet{g}"]
+    group = [surrogate, flowsheet]
+    resource.create_relation(surrogate, resource.Predicates.uses, flowsheet)
+    for i in range(group_size - 2):
+        data = Resource(value={"desc": f"data {g}.{i}"}, type_="data")
+        data.v["aliases"] = [f"data{g}.{i}"]
+        resource.create_relation(flowsheet, resource.Predicates.uses, data)
+        group.append(data)
+    return group
+
+
+def run(tmpdir, n_resources, group_size):
+    DMFConfig._filename = os.path.join(tmpdir, ".dmf")
+    dmf = DMF(path=os.path.join(tmpdir, "ws"), create=True, save_path=True)
+    dmf.migrate_db()
+    t0 = time.time()
+    n_groups = n_resources // group_size
+    groups = [make_group(g, group_size) for g in range(n_groups)]
+    t_make = time.time() - t0
+    t0 = time.time()
+    dmf._db.put_many([r for group in groups for r in group])
+    print(f"{len(dmf._db)} resources in {n_groups} groups: "
+          f"created in {t_make:.2f} s, stored in {time.time() - t0:.2f} s")
+
+    # one query in each direction for a few groups
+    queries = []
+    for g in range(0, n_groups, max(1, n_groups // 5)):
+        queries.append((groups[g][0].id, True))
+        queries.append((groups[g][-1].id, False))
+
+    t0 = time.time()
+    scan = [find_related_scan(dmf._db, id_, outgoing) for id_, outgoing in queries]
+    t_scan = time.time() - t0
+
+    t0 = time.time()
+    index = [
+        list(dmf._db.find_related(id_, outgoing=outgoing, meta=META))
+        for id_, outgoing in queries
+    ]
+    t_index = time.time() - t0
+    assert scan == index
+
+    t0 = time.time()
+    result = CliRunner().invoke(
+        cli.related, ["--no-color", "--no-unicode", groups[n_groups // 2][0].id]
+    )
+    t_cli = time.time() - t0
+    assert result.exit_code == 0, result.output
+
+    print(f"    {len(queries)} queries, scan:  {t_scan:8.3f} s")
+    print(f"    {len(queries)} queries, index: {t_index:8.3f} s")
+    print(f"    speedup:             {t_scan/t_index:8.1f} x")
+    print(f"    dmf related:         {t_cli:8.3f} s")
+
+
+if __name__ == "__main__":
+    n_resources = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    group_size = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tmpdir = tempfile.mkdtemp()
+    try:
+        run(tmpdir, n_resources, group_size)
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
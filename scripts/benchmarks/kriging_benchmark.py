@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of the pysmo Kriging likelihood evaluation and prediction.
+
+For a synthetic data set the following are timed:
+
+* loop: the covariance matrix built row by row, an explicit inverse used for
+  the concentrated likelihood and a row loop for predictions, as was the case
+  before the vectorized implementation.
+* vectorized: KrigingModel.objective_function (cached pairwise distances and
+  a Cholesky solve) and KrigingModel.predict_output.
+
+Usage: python kriging_benchmark.py [number of samples] [number of features]
+"""
+import sys
+import time
+
+import numpy as np
+
+from idaes.surrogate.pysmo.kriging import KrigingModel
+
+
+def loop_objective(x, y, var_vector, p):
+    theta = 10 ** var_vector[:-1]
+    reg_param = var_vector[-1]
+    ns = y.shape[0]
+    distance_matrix = np.zeros((ns, ns))
+    for i in range(0, ns):
+        distance_matrix[i, :] = np.matmul(np.abs(x[i, :] - x) ** p, theta)
+    cov_mat = np.exp(-1 * distance_matrix) + reg_param * np.eye(ns)
+    L = np.linalg.cholesky(cov_mat)
+    lndetcov = 2 * np.sum(np.log(np.abs(np.diag(L))))
+    cov_inv = np.linalg.inv(cov_mat)
+    km = KrigingModel.kriging_mean(cov_inv, y)
+    y_mu = KrigingModel.y_mu_calculation(y, km)
+    ssd = KrigingModel.kriging_sd(cov_inv, y_mu, ns)
+    return ((0.5 * ns * np.log(ssd)) + (0.5 * lndetcov))[0, 0]
+
+
+def loop_predict(model, x_pred):
+    x_pred = (x_pred - model.x_data_min) / (model.x_data_max - model.x_data_min)
+    y_pred = np.zeros((x_pred.shape[0], 1))
+    for i in range(0, x_pred.shape[0]):
+        cmt = np.matmul(np.abs(x_pred[i, :] - model.x_data_scaled) ** model.optimal_p, model.optimal_weights)
+        y_pred[i, 0] = model.optimal_mean + np.matmul(
+            np.matmul(np.exp(-1 * cmt), model.covariance_matrix_inverse), model.optimal_y_mu)
+    return y_pred
+
+
+def run(ns, dims, n_evals=5):
+    np.random.seed(0)
+    x = np.random.rand(ns, dims)
+    y = np.sum(np.sin(3 * x), axis=1) + 0.01 * np.random.randn(ns)
+    model = KrigingModel(np.column_stack((x, y)), fname="kriging_benchmark.pickle", overwrite=True)
+    var_vectors = [np.append(np.random.uniform(-1, 1, dims), 1e-4) for _ in range(n_evals)]
+    p = 2
+
+    t0 = time.time()
+    f_loop = [loop_objective(model.x_data_scaled, model.y_data, v, p) for v in var_vectors]
+    t_loop = (time.time() - t0) / n_evals
+
+    t0 = time.time()
+    f_vec = [model.objective_function(v, model.x_data_scaled, model.y_data, p) for v in var_vectors]
+    t_vec = (time.time() - t0) / n_evals
+    np.testing.assert_allclose(f_loop, f_vec, rtol=1e-6)
+
+    # Prediction, using the parameters of the last likelihood evaluation
+    theta, reg_param, mean, variance, cov_mat, cov_inv, y_mu = model.optimal_parameter_evaluation(var_vectors[-1], p)
+    model.optimal_weights, model.optimal_p, model.optimal_mean = theta, p, mean
+    model.covariance_matrix_inverse, model.optimal_y_mu = cov_inv, y_mu
+    model.covariance_inverse_y_mu = model.covariance_solve(cov_mat, y_mu)
+    x_pred = np.random.rand(ns, dims)
+
+    t0 = time.time()
+    y_loop = loop_predict(model, x_pred)
+    t_pred_loop = time.time() - t0
+
+    t0 = time.time()
+    y_vec = model.predict_output(x_pred)
+    t_pred_vec = time.time() - t0
+    np.testing.assert_allclose(y_loop, y_vec, rtol=1e-5, atol=1e-8)
+
+    print(f"{ns} samples, {dims} features")
+    print(f"    likelihood evaluation, loop:       {t_loop:8.3f} s")
+    print(f"    likelihood evaluation, vectorized: {t_vec:8.3f} s")
+    print(f"    speedup:                           {t_loop/t_vec:8.1f} x")
+    print(f"    prediction of {ns} points, loop:       {t_pred_loop:8.3f} s")
+    print(f"    prediction of {ns} points, vectorized: {t_pred_vec:8.3f} s")
+    print(f"    speedup:                           {t_pred_loop/t_pred_vec:8.1f} x")
+
+
+if __name__ == "__main__":
+    ns = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    dims = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    run(ns, dims)
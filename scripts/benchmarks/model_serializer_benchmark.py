@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Round trip and timing benchmark of the model_serializer json (to_json and
+from_json) and columnar .npz (to_npz and from_npz) formats on the NGFC
+flowsheet and an indexed benzene-toluene StateBlock.
+
+For each model the state is saved in both formats, the model state is
+perturbed and then restored from each file, checking the restored state
+matches the saved state. The time to repeatedly save and restore the model
+state in memory with a SnapshotLayout is also reported.
+
+Usage: python model_serializer_benchmark.py [ngfc] [stateblock]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+from idaes.core import FlowsheetBlock
+import idaes.core.util.model_serializer as ms
+
+
+def build_ngfc():
+    from idaes.power_generation.flowsheets.NGFC.NGFC_flowsheet import (
+        build_power_island,
+        build_reformer,
+        set_power_island_inputs,
+        set_reformer_inputs,
+        connect_reformer_to_power_island)
+
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    build_power_island(m)
+    build_reformer(m)
+    set_power_island_inputs(m)
+    set_reformer_inputs(m)
+    connect_reformer_to_power_island(m)
+    return m
+
+
+def build_stateblock(n=2000):
+    from idaes.generic_models.properties.core.generic.generic_property import (
+        GenericParameterBlock)
+    from idaes.generic_models.properties.core.examples.BT_ideal import (
+        configuration)
+
+    m = pyo.ConcreteModel()
+    m.params = GenericParameterBlock(default=configuration)
+    m.props = m.params.build_state_block(
+        range(n), default={"defined_state": True})
+    for k in m.props:
+        m.props[k].flow_mol.fix(1)
+        m.props[k].temperature.fix(368)
+        m.props[k].pressure.fix(101325)
+        m.props[k].mole_frac_comp["benzene"].fix(0.5)
+        m.props[k].mole_frac_comp["toluene"].fix(0.5)
+    return m
+
+
+def state(m):
+    return [(v.value, v.fixed, v.lb, v.ub)
+            for v in m.component_data_objects(pyo.Var)] + \
+        [c.active for c in m.component_data_objects(
+            (pyo.Constraint, pyo.Block))]
+
+
+def perturb(m):
+    rng = np.random.default_rng(0)
+    for v in m.component_data_objects(pyo.Var):
+        v.value = rng.random()
+        v.setlb(None)
+        if rng.random() < 0.3:
+            v.fixed = not v.fixed
+    for c in m.component_data_objects(pyo.Constraint):
+        c.deactivate()
+
+
+def timed(f, *args, **kwargs):
+    t0 = time.time()
+    r = f(*args, **kwargs)
+    return time.time() - t0, r
+
+
+def run(name, build, tmpdir, repeat=10):
+    t0 = time.time()
+    m = build()
+    print(f"{name}: model built in {time.time() - t0:.2f} s")
+    s0 = state(m)
+
+    fjson = os.path.join(tmpdir, name + ".json.gz")
+    fnpz = os.path.join(tmpdir, name + ".npz")
+    t_to_json, _ = timed(ms.to_json, m, fname=fjson)
+    t_to_npz, layout = timed(ms.to_npz, m, fnpz)
+
+    perturb(m)
+    t_from_json, _ = timed(ms.from_json, m, fname=fjson)
+    assert state(m) == s0
+
+    perturb(m)
+    t_from_npz, _ = timed(ms.from_npz, m, fnpz)
+    assert state(m) == s0
+
+    perturb(m)
+    t_from_npz_layout, _ = timed(ms.from_npz, m, fnpz, layout=layout)
+    assert state(m) == s0
+
+    t_dict, _ = timed(lambda: [
+        ms.from_json(m, sd=ms.to_json(m, return_dict=True))
+        for i in range(repeat)])
+    t_layout, _ = timed(lambda: [
+        layout.restore(layout.capture()) for i in range(repeat)])
+    assert state(m) == s0
+
+    print(f"    file size json.gz / npz:       "
+          f"{os.path.getsize(fjson)/1e6:8.2f} / "
+          f"{os.path.getsize(fnpz)/1e6:8.2f} MB")
+    print(f"    save json.gz / npz:            "
+          f"{t_to_json:8.3f} / {t_to_npz:8.3f} s")
+    print(f"    load json.gz / npz:            "
+          f"{t_from_json:8.3f} / {t_from_npz:8.3f} s")
+    print(f"    load npz with layout:          {t_from_npz_layout:8.3f} s")
+    print(f"    in memory save+restore, dict:  {t_dict/repeat:8.3f} s")
+    print(f"    in memory save+restore, array: {t_layout/repeat:8.3f} s")
+
+
+if __name__ == "__main__":
+    cases = {"ngfc": build_ngfc, "stateblock": build_stateblock}
+    selected = sys.argv[1:] or list(cases)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for case in selected:
+            run(case, cases[case], tmpdir)
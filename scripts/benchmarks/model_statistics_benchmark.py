@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of the model statistics methods on the NGFC and subcritical power
+plant flowsheets.
+
+Each statistic reported by report_statistics is computed in two ways:
+
+* per-call: each statistics method is called on the model itself, which
+  requires a walk of the model (and of every constraint expression for the
+  incidence based statistics) for every method, as was the case before
+  ModelCensus was introduced.
+* census: a single ModelCensus is taken and all methods are called on it.
+
+Usage: python model_statistics_benchmark.py [ngfc] [subcritical]
+"""
+import sys
+import time
+
+import pyomo.environ as pyo
+
+from idaes.core import FlowsheetBlock
+import idaes.core.util.model_statistics as ms
+
+# Statistics reported by report_statistics
+STATISTICS = [
+    ms.degrees_of_freedom,
+    ms.number_variables,
+    ms.number_fixed_variables,
+    ms.number_unused_variables,
+    ms.number_fixed_unused_variables,
+    ms.number_variables_only_in_inequalities,
+    ms.number_fixed_variables_only_in_inequalities,
+    ms.number_total_constraints,
+    ms.number_total_equalities,
+    ms.number_deactivated_equalities,
+    ms.number_total_inequalities,
+    ms.number_deactivated_inequalities,
+    ms.number_total_objectives,
+    ms.number_deactivated_objectives,
+    ms.number_total_blocks,
+    ms.number_deactivated_blocks,
+    ms.number_expressions,
+]
+
+
+def build_ngfc():
+    from idaes.power_generation.flowsheets.NGFC.NGFC_flowsheet import (
+        build_power_island,
+        build_reformer,
+        set_power_island_inputs,
+        set_reformer_inputs,
+        connect_reformer_to_power_island)
+
+    m = pyo.ConcreteModel()
+    m.fs = FlowsheetBlock(default={"dynamic": False})
+    build_power_island(m)
+    build_reformer(m)
+    set_power_island_inputs(m)
+    set_reformer_inputs(m)
+    connect_reformer_to_power_island(m)
+    return m
+
+
+def build_subcritical():
+    from idaes.generic_models.properties import iapws95
+    if not iapws95.iapws95_available():
+        return None
+    from idaes.power_generation.flowsheets.subcritical_power_plant import (
+        subcritical_power_plant)
+    return subcritical_power_plant.get_model(dynamic=False, init=False)
+
+
+def run(name, build):
+    t0 = time.time()
+    m = build()
+    if m is None:
+        print(f"{name}: skipped (required property package not available)")
+        return
+    print(f"{name}: model built in {time.time() - t0:.2f} s")
+
+    t0 = time.time()
+    per_call = [f(m) for f in STATISTICS]
+    t_per_call = time.time() - t0
+
+    t0 = time.time()
+    census = ms.ModelCensus(m)
+    shared = [f(census) for f in STATISTICS]
+    t_census = time.time() - t0
+
+    assert per_call == shared
+
+    t0 = time.time()
+    ms.degrees_of_freedom(m)
+    t_dof = time.time() - t0
+
+    print(f"    degrees_of_freedom:       {t_dof:8.3f} s")
+    print(f"    all statistics, per-call: {t_per_call:8.3f} s")
+    print(f"    all statistics, census:   {t_census:8.3f} s")
+    print(f"    speedup:                  {t_per_call/t_census:8.1f} x")
+
+
+if __name__ == "__main__":
+    cases = {"ngfc": build_ngfc, "subcritical": build_subcritical}
+    selected = sys.argv[1:] or list(cases)
+    for case in selected:
+        run(case, cases[case])
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of pysmo sampling: nearest point selection and CVT centroids.
+
+* selection: points_selection (KD-tree, with and without replacement)
+  against calling nearest_neighbour (distances to every row plus a full sort)
+  for each generated point, as was done before.
+* CVT: CVTSampling.sample_points against the previous loops over centres for
+  the class assignment and centroid update.
+
+Usage: python sampling_benchmark.py [number of data rows] [number of samples]
+"""
+import sys
+import time
+
+import numpy as np
+
+from idaes.surrogate.pysmo.sampling import SamplingMethods, CVTSampling
+
+
+def loop_selection(full_data, points):
+    sm = SamplingMethods()
+    selected = np.zeros((points.shape[0], full_data.shape[1]))
+    for i in range(points.shape[0]):
+        selected[i, :] = sm.nearest_neighbour(full_data, points[i, :])
+    return selected
+
+
+def loop_cvt_iteration(centres, random_points, counter):
+    distance_matrix = np.zeros((random_points.shape[0], centres.shape[0]))
+    for i in range(centres.shape[0]):
+        distance_matrix[:, i] = CVTSampling.eucl_distance(random_points, centres[i, :])
+    classes = np.argmin(distance_matrix, axis=1)
+    new_centres = np.zeros(centres.shape)
+    for i in range(centres.shape[0]):
+        members = random_points[classes == i]
+        new_centres[i, :] = np.mean(members, axis=0) if members.shape[0] else np.mean(centres, axis=0)
+    return (counter * centres + new_centres) / (counter + 1)
+
+
+def vectorized_cvt_iteration(centres, random_points, counter):
+    from scipy.spatial import cKDTree
+    _, classes = cKDTree(centres).query(random_points, k=1)
+    return CVTSampling.create_centres(centres, random_points, classes, counter)
+
+
+def run(n_rows, n_samples, n_features=5):
+    np.random.seed(0)
+    full_data = np.random.rand(n_rows, n_features + 1)
+    points = np.random.rand(n_samples, n_features)
+    sm = SamplingMethods()
+
+    # The per-point loop is timed on a subset and scaled
+    n_loop = min(n_samples, 20)
+    t0 = time.time()
+    ref = loop_selection(full_data, points[:n_loop, :])
+    t_loop = (time.time() - t0) * n_samples / n_loop
+
+    t0 = time.time()
+    selected = sm.points_selection(full_data, points)
+    t_tree = time.time() - t0
+    np.testing.assert_array_equal(ref, selected[:n_loop, :])
+
+    t0 = time.time()
+    selected = sm.points_selection(full_data, points, replacement=False)
+    t_tree_nr = time.time() - t0
+    assert np.unique(selected, axis=0).shape[0] == n_samples
+
+    print(f"selection of {n_samples} samples from {n_rows} rows x {n_features} features")
+    print(f"    nearest_neighbour loop (est.): {t_loop:8.3f} s")
+    print(f"    KD-tree:                       {t_tree:8.3f} s")
+    print(f"    KD-tree without replacement:   {t_tree_nr:8.3f} s")
+
+    n_centres = min(n_samples, 100)
+    centres = np.random.rand(n_centres, n_features)
+    random_points = np.random.rand(1000 * n_centres, n_features)
+    t0 = time.time()
+    ref = loop_cvt_iteration(centres, random_points, 3)
+    t_loop = time.time() - t0
+    t0 = time.time()
+    new = vectorized_cvt_iteration(centres, random_points, 3)
+    t_vec = time.time() - t0
+    np.testing.assert_allclose(ref, new, rtol=1e-10)
+    print(f"CVT iteration, {n_centres} centres, {random_points.shape[0]} random points")
+    print(f"    loops:      {t_loop:8.3f} s")
+    print(f"    vectorized: {t_vec:8.3f} s")
+
+
+if __name__ == "__main__":
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_samples = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    run(n_rows, n_samples)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of the SOFC reduced order model construction and the NGFC
+flowsheet build.
+
+The following are timed:
+
+* loading the kriging coefficients by parsing the text data file and from
+  the memory-mapped .npy cache,
+* build_SOFC_ROM with a cold (no .npy) and a warm cache, and
+* the NGFC flowsheet build (power island, reformer and SOFC_ROM_setup), only
+  when the coefficient file distributed with the ROM is present.
+
+Usage: python sofc_rom_benchmark.py [coefficient data file]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+from idaes.power_generation.properties.NGFC.ROM import SOFC_ROM
+from model_statistics_benchmark import build_ngfc
+
+
+def clear_cache(path):
+    for cache in SOFC_ROM._coefficient_cache_files(path):
+        if os.path.exists(cache):
+            os.remove(cache)
+
+
+def time_rom(path):
+    t0 = time.time()
+    np.loadtxt(path, dtype=float)
+    t_text = time.time() - t0
+    SOFC_ROM.load_kriging_coefficients(path)
+    t0 = time.time()
+    SOFC_ROM.load_kriging_coefficients(path)
+    t_npy = time.time() - t0
+    print("kriging coefficients")
+    print(f"    parse text file:        {t_text:8.3f} s")
+    print(f"    load .npy cache:        {t_npy:8.3f} s")
+
+    print("build_SOFC_ROM")
+    for label in ("cold cache", "warm cache"):
+        if label == "cold cache":
+            clear_cache(path)
+        t0 = time.time()
+        SOFC_ROM.build_SOFC_ROM(pyo.ConcreteModel(), kriging_file=path)
+        print(f"    {label}:             {time.time() - t0:8.3f} s")
+
+
+def time_ngfc():
+    from idaes.power_generation.flowsheets.NGFC.NGFC_flowsheet import \
+        SOFC_ROM_setup
+    print("NGFC flowsheet build")
+    for label in ("cold cache", "warm cache"):
+        if label == "cold cache":
+            clear_cache(DEFAULT_FILE)
+        t0 = time.time()
+        m = build_ngfc()
+        t_fs = time.time() - t0
+        SOFC_ROM_setup(m)
+        t_total = time.time() - t0
+        print(f"    {label}: flowsheet {t_fs:8.3f} s,"
+              f" with SOFC ROM setup {t_total:8.3f} s")
+
+
+DEFAULT_FILE = os.path.join(os.path.dirname(SOFC_ROM.__file__),
+                            "kriging_coefficients.dat")
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_FILE
+    if not os.path.exists(path):
+        print(f"{path} not found")
+        sys.exit(1)
+    time_rom(path)
+    if os.path.exists(DEFAULT_FILE):
+        time_ngfc()
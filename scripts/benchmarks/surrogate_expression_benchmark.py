@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+##############################################################################
+# Institute for the Design of Advanced Energy Systems Process Systems
+# Engineering Framework (IDAES PSE Framework) Copyright (c) 2018-2020, by the
+# software owners: The Regents of the University of California, through
+# Lawrence Berkeley National Laboratory,  National Technology & Engineering
+# Solutions of Sandia, LLC, Carnegie Mellon University, West Virginia
+# University Research Corporation, et al. All rights reserved.
+#
+# Please see the files COPYRIGHT.txt and LICENSE.txt for full copyright and
+# license information, respectively. Both files are also available online
+# at the URL "https://github.com/IDAES/idaes-pse".
+##############################################################################
+"""
+Benchmark of Pyomo expression generation for pysmo Kriging and RBF surrogates.
+
+For a synthetic data set a Kriging and a Gaussian RBF surrogate are embedded in
+a model as a constraint, once with the single expression returned by
+generate_expression and once with the indexed Param/Expression form
+(generate_expression(..., block=...)). Expression build time and NL file
+writing time are reported for both.
+
+Usage: python surrogate_expression_benchmark.py [number of samples] [number of features]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pyomo.environ as pyo
+
+from idaes.surrogate.pysmo.kriging import KrigingModel
+from idaes.surrogate.pysmo.radial_basis_function import RadialBasisFunctions
+
+
+def kriging_surrogate(xy):
+    model = KrigingModel(xy)
+    var_vector = np.append(np.zeros(xy.shape[1] - 1), 1e-4)
+    theta, reg_param, mean, variance, cov_mat, cov_inv, y_mu = model.optimal_parameter_evaluation(var_vector, 2)
+    model.optimal_weights, model.optimal_p, model.optimal_mean = theta, 2, mean
+    model.covariance_matrix_inverse, model.optimal_y_mu = cov_inv, y_mu
+    model.covariance_inverse_y_mu = model.covariance_solve(cov_mat, y_mu)
+    return model
+
+
+def rbf_surrogate(xy):
+    model = RadialBasisFunctions(xy, basis_function='gaussian')
+    model.weights = np.random.rand(xy.shape[0], 1)
+    model.sigma = 1.0
+    model.x_data_min = model.data_min[:, :-1]
+    model.x_data_max = model.data_max[:, :-1]
+    model.y_data_min = model.data_min[:, -1]
+    model.y_data_max = model.data_max[:, -1]
+    return model
+
+
+def time_build(surrogate, dims, indexed):
+    m = pyo.ConcreteModel()
+    m.x = pyo.Var(range(dims), initialize=0.5, bounds=(0, 1))
+    m.y = pyo.Var()
+    m.surrogate = pyo.Block()
+    t0 = time.time()
+    variables = [m.x[j] for j in range(dims)]
+    if indexed:
+        expr = surrogate.generate_expression(variables, block=m.surrogate)
+    else:
+        expr = surrogate.generate_expression(variables)
+    m.c = pyo.Constraint(expr=m.y == expr)
+    m.o = pyo.Objective(expr=m.y)
+    t_build = time.time() - t0
+
+    fd, fname = tempfile.mkstemp(suffix=".nl")
+    os.close(fd)
+    t0 = time.time()
+    m.write(fname)
+    t_write = time.time() - t0
+    size = os.path.getsize(fname)
+    os.remove(fname)
+    return t_build, t_write, size
+
+
+def run(ns, dims):
+    np.random.seed(0)
+    x = np.random.rand(ns, dims)
+    xy = np.column_stack((x, np.sum(np.sin(3 * x), axis=1)))
+    for name, build in (("kriging", kriging_surrogate), ("rbf", rbf_surrogate)):
+        surrogate = build(xy)
+        print(f"{name}: {ns} samples, {dims} features")
+        for label, indexed in (("single expression", False), ("indexed", True)):
+            t_build, t_write, size = time_build(surrogate, dims, indexed)
+            print(f"    {label:18s} build: {t_build:7.3f} s   NL write: {t_write:7.3f} s   NL size: {size / 1e6:6.2f} MB")
+
+
+if __name__ == "__main__":
+    ns = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    dims = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    run(ns, dims)